@@ -0,0 +1,226 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from eth_typing import ChecksumAddress
+
+from ..crypto.utils import keccak_digest
+
+
+class _Bucket:
+
+    __slots__ = ('digest', 'leaves')
+
+    def __init__(self, digest: bytes, leaves: Tuple[Tuple[bytes, ChecksumAddress, bytes], ...]):
+        self.digest = digest
+        self.leaves = leaves
+
+    @classmethod
+    def from_leaves(cls, leaves: Dict[ChecksumAddress, bytes]) -> Optional['_Bucket']:
+        if not leaves:
+            return None
+        sorted_leaves = tuple(sorted((FleetMerkleTree.key_of(address), address, digest)
+                                     for address, digest in leaves.items()))
+        digest = keccak_digest(b"".join(key + digest for key, _address, digest in sorted_leaves))
+        return cls(digest, sorted_leaves)
+
+    def addresses(self) -> Iterator[ChecksumAddress]:
+        for _key, address, _digest in self.leaves:
+            yield address
+
+
+class _Branch:
+
+    __slots__ = ('digest', 'left', 'right')
+
+    def __init__(self, digest: bytes, left, right):
+        self.digest = digest
+        self.left = left
+        self.right = right
+
+    @classmethod
+    def from_children(cls, left, right) -> Optional['_Branch']:
+        if left is None and right is None:
+            return None
+        digest = keccak_digest(_digest(left) + _digest(right))
+        return cls(digest, left, right)
+
+
+_Subtree = Union[_Branch, _Bucket, None]
+
+
+def _digest(subtree: _Subtree) -> bytes:
+    return FleetMerkleTree.EMPTY_DIGEST if subtree is None else subtree.digest
+
+
+class FleetMerkleTree:
+    """
+    A persistent sparse Merkle tree of node metadata digests, keyed by checksum address.
+
+    Nodes are sorted by the hash of their address (so that nobody can crowd a subtree
+    by choosing their address) and placed in ``2 ** DEPTH`` buckets by its leading bits,
+    so updating a node only requires rehashing the path from its bucket to the root.
+    Updates return a new tree which shares all the untouched subtrees with the old one,
+    so the older trees stay valid.
+
+    Subtrees are addressed by their ``level`` (0 being the root, ``DEPTH`` being the buckets)
+    and ``prefix`` (the leading ``level`` bits of the address hashes they contain).
+    Empty subtrees have the digest of an empty bytestring,
+    so an empty tree has the same checksum as an empty fleet always had.
+    """
+
+    DEPTH = 16
+    EMPTY_DIGEST = keccak_digest(b"")
+
+    def __init__(self, root: _Subtree = None):
+        self._root = root
+
+    @property
+    def digest(self) -> bytes:
+        return _digest(self._root)
+
+    @property
+    def checksum(self) -> str:
+        return self.digest.hex()
+
+    @staticmethod
+    def key_of(checksum_address: ChecksumAddress) -> bytes:
+        return keccak_digest(checksum_address.encode())
+
+    @classmethod
+    def bucket_of(cls, checksum_address: ChecksumAddress) -> int:
+        return int.from_bytes(cls.key_of(checksum_address), byteorder="big") >> (256 - cls.DEPTH)
+
+    def with_updates(self,
+                     updated: Dict[ChecksumAddress, bytes],
+                     removed: Iterable[ChecksumAddress] = (),
+                     ) -> 'FleetMerkleTree':
+        """
+        Returns a new tree with the metadata of ``updated`` nodes (re)inserted
+        and the ``removed`` nodes deleted.
+        """
+        changes = {address: keccak_digest(metadata) for address, metadata in updated.items()}
+        changes.update((address, None) for address in removed)
+        if not changes:
+            return self
+        sorted_changes = sorted((self.bucket_of(address), address, digest) for address, digest in changes.items())
+        return FleetMerkleTree(self._update(self._root, 0, sorted_changes))
+
+    @classmethod
+    def _update(cls, subtree: _Subtree, level: int, changes: List[Tuple[int, ChecksumAddress, Optional[bytes]]]) -> _Subtree:
+        if level == cls.DEPTH:
+            leaves = {address: digest for _key, address, digest in subtree.leaves} if subtree else {}
+            for _bucket, address, digest in changes:
+                if digest is None:
+                    leaves.pop(address, None)
+                else:
+                    leaves[address] = digest
+            return _Bucket.from_leaves(leaves)
+
+        # The changes are sorted by bucket, so the ones going to the left subtree come first.
+        shift = cls.DEPTH - 1 - level
+        split = next((i for i, (bucket, _address, _digest) in enumerate(changes) if (bucket >> shift) & 1),
+                     len(changes))
+
+        left, right = (subtree.left, subtree.right) if subtree else (None, None)
+        if split > 0:
+            left = cls._update(left, level + 1, changes[:split])
+        if split < len(changes):
+            right = cls._update(right, level + 1, changes[split:])
+        return _Branch.from_children(left, right)
+
+    def _subtree(self, prefix: int, level: int) -> _Subtree:
+        self._check_level(level)
+        subtree = self._root
+        for depth in range(level):
+            if subtree is None:
+                break
+            bit = (prefix >> (level - 1 - depth)) & 1
+            subtree = subtree.right if bit else subtree.left
+        return subtree
+
+    def _check_level(self, level: int):
+        if not 0 <= level <= self.DEPTH:
+            raise ValueError(f"Level must be between 0 and {self.DEPTH}, got {level}")
+
+    def subtree_digest(self, prefix: int, level: int) -> bytes:
+        return _digest(self._subtree(prefix, level))
+
+    def subtree_digests(self, level: int) -> Dict[int, bytes]:
+        """
+        Returns the digests of all non-empty subtrees at ``level``, keyed by their prefixes.
+        """
+        self._check_level(level)
+        digests = {}
+
+        def collect(subtree: _Subtree, depth: int, prefix: int):
+            if subtree is None:
+                return
+            if depth == level:
+                digests[prefix] = subtree.digest
+                return
+            collect(subtree.left, depth + 1, prefix << 1)
+            collect(subtree.right, depth + 1, (prefix << 1) | 1)
+
+        collect(self._root, 0, 0)
+        return digests
+
+    def differing_subtrees(self,
+                           other: Union['FleetMerkleTree', Dict[int, bytes]],
+                           level: int
+                           ) -> List[int]:
+        """
+        Returns the sorted prefixes of subtrees at ``level`` which differ between this tree and ``other``.
+        ``other`` is either another tree, or the result of its ``subtree_digests(level)``
+        (e.g. received from a remote node).
+        """
+        self._check_level(level)
+        if isinstance(other, dict):
+            ours = self.subtree_digests(level)
+            return sorted(prefix for prefix in ours.keys() | other.keys()
+                          if ours.get(prefix, self.EMPTY_DIGEST) != other.get(prefix, self.EMPTY_DIGEST))
+
+        differing = []
+
+        # Only descending into the branches that differ.
+        def compare(ours: _Subtree, theirs: _Subtree, depth: int, prefix: int):
+            if _digest(ours) == _digest(theirs):
+                return
+            if depth == level:
+                differing.append(prefix)
+                return
+            compare(ours.left if ours else None, theirs.left if theirs else None, depth + 1, prefix << 1)
+            compare(ours.right if ours else None, theirs.right if theirs else None, depth + 1, (prefix << 1) | 1)
+
+        compare(self._root, other._root, 0, 0)
+        return differing
+
+    def addresses(self, prefix: int = 0, level: int = 0) -> Iterator[ChecksumAddress]:
+        """
+        Yields the addresses of nodes in the given subtree (the whole tree by default), sorted by their hashes.
+        """
+        def walk(subtree: _Subtree):
+            if subtree is None:
+                return
+            if isinstance(subtree, _Bucket):
+                yield from subtree.addresses()
+            else:
+                yield from walk(subtree.left)
+                yield from walk(subtree.right)
+
+        yield from walk(self._subtree(prefix, level))
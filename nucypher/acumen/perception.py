@@ -18,17 +18,18 @@
 
 import random
 import weakref
-from collections.abc import KeysView
-from typing import Optional, Dict, Iterable, List, Tuple, NamedTuple, Union, Any
+from collections import defaultdict
+from collections.abc import KeysView, Mapping
+from threading import RLock
+from typing import Optional, Dict, Iterable, List, Tuple, NamedTuple, Union, Any, Callable, Hashable
 
 import binascii
-import itertools
 import maya
 from bytestring_splitter import BytestringSplitter
 from eth_typing import ChecksumAddress
 
-from ..crypto.utils import keccak_digest
 from nucypher.utilities.logging import Logger
+from .merkle import FleetMerkleTree
 from .nicknames import Nickname
 
 
@@ -55,6 +56,103 @@ class StateDiff(NamedTuple):
         return not self.this_node_updated and not self.nodes_updated and not self.nodes_removed
 
 
+class _NodeMap(Mapping):
+    """
+    A persistent mapping of nodes by checksum address.
+
+    Nodes are placed in ``WIDTH ** DEPTH`` buckets by the hash of their address.
+    Updates return a new map which shares all the untouched branches and buckets with the old one,
+    so they only copy the paths to the changed buckets, and the older maps stay valid
+    (e.g. for threads still iterating over a previous fleet state).
+    """
+
+    BITS = 5
+    WIDTH = 2 ** BITS
+    DEPTH = 3
+
+    __slots__ = ('_root', '_size')
+
+    def __init__(self, root: Optional[tuple] = None, size: int = 0):
+        self._root = root
+        self._size = size
+
+    @classmethod
+    def _index_of(cls, checksum_address: ChecksumAddress, level: int) -> int:
+        return (hash(checksum_address) >> (cls.BITS * level)) & (cls.WIDTH - 1)
+
+    def _bucket_of(self, checksum_address: ChecksumAddress) -> Optional[dict]:
+        subtree = self._root
+        for level in range(self.DEPTH):
+            if subtree is None:
+                return None
+            subtree = subtree[self._index_of(checksum_address, level)]
+        return subtree
+
+    def __getitem__(self, checksum_address: ChecksumAddress) -> 'Ursula':
+        bucket = self._bucket_of(checksum_address)
+        if bucket is None:
+            raise KeyError(checksum_address)
+        return bucket[checksum_address]
+
+    def __contains__(self, checksum_address) -> bool:
+        bucket = self._bucket_of(checksum_address)
+        return bucket is not None and checksum_address in bucket
+
+    def __iter__(self):
+        def walk(subtree, level):
+            if subtree is None:
+                return
+            if level == self.DEPTH:
+                yield from subtree
+            else:
+                for child in subtree:
+                    yield from walk(child, level + 1)
+        yield from walk(self._root, 0)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def with_updates(self,
+                     updated: Dict[ChecksumAddress, 'Ursula'],
+                     removed: Iterable[ChecksumAddress] = (),
+                     ) -> '_NodeMap':
+        """Returns a new map with the ``updated`` nodes (re)inserted and the ``removed`` nodes deleted."""
+        changes = dict(updated)
+        changes.update((checksum_address, None) for checksum_address in removed)
+        if not changes:
+            return self
+        root, size_change = self._update(self._root, 0, changes)
+        return _NodeMap(root, self._size + size_change)
+
+    @classmethod
+    def _update(cls, subtree, level: int, changes: Dict[ChecksumAddress, Optional['Ursula']]) -> Tuple[Any, int]:
+        if level == cls.DEPTH:
+            bucket = dict(subtree) if subtree else {}
+            size_before = len(bucket)
+            for checksum_address, node in changes.items():
+                if node is None:
+                    bucket.pop(checksum_address, None)
+                else:
+                    bucket[checksum_address] = node
+            return (bucket or None), len(bucket) - size_before
+
+        grouped_changes = defaultdict(dict)
+        for checksum_address, node in changes.items():
+            grouped_changes[cls._index_of(checksum_address, level)][checksum_address] = node
+
+        children = list(subtree) if subtree else [None] * cls.WIDTH
+        size_change = 0
+        for index, child_changes in grouped_changes.items():
+            children[index], child_size_change = cls._update(children[index], level + 1, child_changes)
+            size_change += child_size_change
+        if not any(children):
+            return None, size_change
+        return tuple(children), size_change
+
+
 class FleetState:
     """
     Fleet state as perceived by a local Ursula.
@@ -70,30 +168,49 @@ class FleetState:
     - The metadata of ``this_node`` **can** change.
     - For the purposes of the fleet state, nodes with different metadata are considered different,
       even if they have the same checksum address.
+
+    The checksum of the state is the root of a Merkle tree of node metadata
+    (see ``FleetMerkleTree``), so updating it only takes ``O(log N)`` hashes.
+    Likewise, the nodes are kept in a persistent map, so a new state does not copy all the nodes.
     """
 
     @classmethod
     def new(cls, this_node: Optional['Ursula'] = None) -> 'FleetState':
         this_node_ref = weakref.ref(this_node) if this_node is not None else None
-        # Using empty checksum so that JSON library is not confused.
+        # An empty tree has the checksum of an empty bytestring, so that JSON library is not confused.
         # Plus, we do need some checksum anyway. It's a legitimate state after all.
-        return cls(checksum=keccak_digest(b"").hex(),
-                   nodes={},
+        return cls(tree=FleetMerkleTree(),
+                   nodes=_NodeMap(),
                    this_node_ref=this_node_ref,
                    this_node_metadata=None)
 
     def __init__(self,
-                 checksum: str,
-                 nodes: Dict[ChecksumAddress, 'Ursula'],
+                 tree: FleetMerkleTree,
+                 nodes: _NodeMap,
                  this_node_ref: Optional[weakref.ReferenceType],
                  this_node_metadata: Optional[bytes]):
 
-        self.checksum = checksum
-        self.nickname = Nickname.from_seed(checksum, length=1)
+        self.merkle_tree = tree
+        self.checksum = tree.checksum
+        self.nickname = Nickname.from_seed(self.checksum, length=1)
         self._nodes = nodes
         self.timestamp = maya.now()
         self._this_node_ref = this_node_ref
         self._this_node_metadata = this_node_metadata
+        self._memo = {}
+
+    def memoize(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Returns a value derived from this state, computing it on the first request.
+        Since a new state object is created every time the fleet state is recorded,
+        memoized values never outlive the state they were computed for.
+        """
+        try:
+            return self._memo[key]
+        except KeyError:
+            value = compute()
+            self._memo[key] = value
+            return value
 
     def archived(self) -> ArchivedFleetState:
         return ArchivedFleetState(checksum=self.checksum,
@@ -134,35 +251,27 @@ class FleetState:
             this_node = self._this_node_ref()
             this_node_metadata = bytes(this_node)
             this_node_updated = self._this_node_metadata != this_node_metadata
-            this_node_list = [this_node]
         else:
             this_node_metadata = self._this_node_metadata
             this_node_updated = False
-            this_node_list = []
 
         diff = self._calculate_diff(this_node_updated, nodes_to_add, nodes_to_remove)
 
         if not diff.empty():
-            # TODO: if nodes were kept in a Merkle tree,
-            # we'd have to only recalculate log(N) checksums.
-            # Is it worth it?
-            nodes = dict(self._nodes)
             nodes_to_add_dict = {node.checksum_address: node for node in nodes_to_add}
-            for checksum_address in diff.nodes_updated:
-                new_node = nodes_to_add_dict[checksum_address]
-                nodes[checksum_address] = new_node
-            for checksum_address in diff.nodes_removed:
-                del nodes[checksum_address]
-
-            all_nodes_sorted = sorted(itertools.chain(this_node_list, nodes.values()),
-                                      key=lambda node: node.checksum_address)
-            joined_metadata = b"".join(bytes(node) for node in all_nodes_sorted)
-            checksum = keccak_digest(joined_metadata).hex()
+            updated_nodes = {checksum_address: nodes_to_add_dict[checksum_address]
+                             for checksum_address in diff.nodes_updated}
+            nodes = self._nodes.with_updates(updated=updated_nodes, removed=diff.nodes_removed)
+            updated_metadata = {checksum_address: bytes(node) for checksum_address, node in updated_nodes.items()}
+            if this_node_updated:
+                updated_metadata[this_node.checksum_address] = this_node_metadata
+
+            tree = self.merkle_tree.with_updates(updated=updated_metadata, removed=diff.nodes_removed)
         else:
             nodes = self._nodes
-            checksum = self.checksum
+            tree = self.merkle_tree
 
-        new_state = FleetState(checksum=checksum,
+        new_state = FleetState(tree=tree,
                                nodes=nodes,
                                this_node_ref=self._this_node_ref,
                                this_node_metadata=this_node_metadata)
@@ -211,6 +320,38 @@ class FleetState:
         timestamp = maya.MayaDT(int.from_bytes(timestamp_bytes, byteorder="big"))
         return checksum, timestamp, remainder
 
+    summary_entry_length = 20 + 4  # canonical address, metadata timestamp
+
+    def summary(self) -> bytes:
+        """
+        Returns a compact summary of the known nodes: the canonical address and the metadata timestamp
+        of each one. Sent to teachers so that they only reply with the nodes we don't know about yet.
+        """
+        return b"".join(bytes.fromhex(node.checksum_address[2:]) + node.timestamp.epoch.to_bytes(4, byteorder="big")
+                        for node in self._nodes.values())
+
+    @classmethod
+    def unpack_summary(cls, data: bytes) -> Dict[bytes, int]:
+        if len(data) % cls.summary_entry_length != 0:
+            raise ValueError(f"Fleet summary length must be a multiple of {cls.summary_entry_length}, got {len(data)}")
+        summary = {}
+        for offset in range(0, len(data), cls.summary_entry_length):
+            address, timestamp_bytes = data[offset:offset+20], data[offset+20:offset+cls.summary_entry_length]
+            summary[address] = int.from_bytes(timestamp_bytes, byteorder="big")
+        return summary
+
+    def nodes_unknown_to(self, summary: Dict[bytes, int]) -> List['Ursula']:
+        """
+        Returns the nodes which are either missing from the unpacked ``summary``,
+        or have newer metadata than the one listed there.
+        """
+        unknown_nodes = []
+        for checksum_address, node in self._nodes.items():
+            known_timestamp = summary.get(bytes.fromhex(checksum_address[2:]))
+            if known_timestamp is None or node.timestamp.epoch > known_timestamp:
+                unknown_nodes.append(node)
+        return unknown_nodes
+
     def shuffled(self) -> List['Ursula']:
         nodes_we_know_about = list(self._nodes.values())
         random.shuffle(nodes_we_know_about)
@@ -245,6 +386,9 @@ class FleetSensor:
 
     If `this_node` is provided, it will be included in the state checksum
     (but not returned during iteration/lookups).
+
+    Nodes may be recorded and marked from any thread (e.g. the verification pipeline
+    and the teacher workers), while the learning thread records the fleet state.
     """
     log = Logger("Learning")
 
@@ -260,6 +404,7 @@ class FleetSensor:
         # temporary accumulator for new nodes to avoid updating the fleet state every time
         self._nodes_to_add = set()
         self._nodes_to_remove = set()  # Beginning of bucketing.
+        self._lock = RLock()  # guards the accumulators and the state updates
 
         self._auto_update_state = False
 
@@ -270,13 +415,13 @@ class FleetSensor:
             # (this object can be mutated externally).
             # This behavior is supposed to be consistent with that of the node storage
             # (where a newer object with the same `checksum_address` replaces an older one).
-            if node in self._nodes_to_add:
-                self._nodes_to_add.remove(node)
-            self._nodes_to_add.add(node)
+            with self._lock:
+                self._nodes_to_add.discard(node)
+                self._nodes_to_add.add(node)
 
-            if self._auto_update_state:
-                self.log.info(f"Updating fleet state after saving node {node}")
-                self.record_fleet_state()
+                if self._auto_update_state:
+                    self.log.info(f"Updating fleet state after saving node {node}")
+                    self.record_fleet_state()
         else:
             msg = f"Rejected node {node} because its domain is '{node.domain}' but we're only tracking '{self._domain}'"
             self.log.warn(msg)
@@ -356,23 +501,39 @@ class FleetSensor:
     def unpack_snapshot(data):
         return FleetState.unpack_snapshot(data)
 
-    def record_fleet_state(self, skip_this_node: bool = False) -> StateDiff:
-        new_state, diff = self._current_state.with_updated_nodes(nodes_to_add=self._nodes_to_add,
-                                                                 nodes_to_remove=self._nodes_to_remove,
-                                                                 skip_this_node=skip_this_node)
+    def summary(self) -> bytes:
+        return self.memoize('summary', FleetState.summary)
 
-        self._nodes_to_add = set()
-        self._nodes_to_remove = set()
-        self._current_state = new_state
-
-        # TODO: set a limit on the number of archived states?
-        # Two ways to collect archived states:
-        # 1. (current) add a state to the archive every time it changes
-        # 2. (possible) keep a dictionary of known states
-        #    and bump the timestamp of a previously encountered one
-        if not diff.empty():
-            archived_state = new_state.archived()
-            self._archived_states.append(archived_state)
+    @staticmethod
+    def unpack_summary(data: bytes) -> Dict[bytes, int]:
+        return FleetState.unpack_summary(data)
+
+    def memoize(self, key: Hashable, compute: Callable[[FleetState], Any]) -> Any:
+        """
+        Returns a value computed by ``compute`` for the current fleet state.
+        The value is kept until the next ``record_fleet_state()``.
+        """
+        state = self._current_state
+        return state.memoize(key, lambda: compute(state))
+
+    def record_fleet_state(self, skip_this_node: bool = False) -> StateDiff:
+        with self._lock:
+            new_state, diff = self._current_state.with_updated_nodes(nodes_to_add=self._nodes_to_add,
+                                                                     nodes_to_remove=self._nodes_to_remove,
+                                                                     skip_this_node=skip_this_node)
+
+            self._nodes_to_add = set()
+            self._nodes_to_remove = set()
+            self._current_state = new_state
+
+            # TODO: set a limit on the number of archived states?
+            # Two ways to collect archived states:
+            # 1. (current) add a state to the archive every time it changes
+            # 2. (possible) keep a dictionary of known states
+            #    and bump the timestamp of a previously encountered one
+            if not diff.empty():
+                archived_state = new_state.archived()
+                self._archived_states.append(archived_state)
 
         return diff
 
@@ -381,7 +542,8 @@ class FleetSensor:
 
     def mark_as(self, label: Exception, node: 'Ursula'):
         # TODO: for now we're not using `label` in any way, so we're just ignoring it
-        self._nodes_to_remove.add(node.checksum_address)
+        with self._lock:
+            self._nodes_to_remove.add(node.checksum_address)
 
     def record_remote_fleet_state(self,
                                   checksum_address: ChecksumAddress,
@@ -80,6 +80,7 @@ from nucypher.blockchain.eth.deployers import (
     StakingInterfaceDeployer,
     WorklockDeployer
 )
+from nucypher.blockchain.eth.events import ContractEventsThrottler
 from nucypher.blockchain.eth.interfaces import BlockchainInterfaceFactory
 from nucypher.blockchain.eth.multisig import Authorization, Proposal
 from nucypher.blockchain.eth.registry import BaseContractRegistry
@@ -106,7 +107,8 @@ from nucypher.config.constants import DEFAULT_CONFIG_ROOT
 from nucypher.crypto.powers import TransactingPower
 from nucypher.policy.hrac import HRAC
 from nucypher.policy.policies import Policy
-from nucypher.types import NuNits, Period
+from nucypher.types import NuNits, Period, PolicyInfo
+from nucypher.utilities.cache import LRUCache
 from nucypher.utilities.logging import Logger
 
 
@@ -1064,6 +1066,11 @@ class Worker(NucypherTokenActor):
     READY_POLL_RATE = 10
     READY_CLI_FEEDBACK_RATE = 60  # provide feedback to CLI every 60s
 
+    POLICY_STATUS_CACHE_SIZE = 10_000     # policies
+    POLICY_STATUS_TTL = 60 * 10           # seconds
+    INVALID_POLICY_STATUS_TTL = 30        # seconds; unknown, unpaid and disabled policies
+    POLICY_STATUS_CLOCK = time.monotonic
+
     class WorkerError(NucypherTokenActor.ActorError):
         pass
 
@@ -1101,6 +1108,12 @@ class Worker(NucypherTokenActor):
             self.stakes = StakeList(registry=self.registry, checksum_address=self.checksum_address)
             self.work_tracker = work_tracker or WorkTracker(worker=self, stakes=self.stakes)
 
+        # On-chain policy status, indexed by HRAC
+        self._policy_status_cache = LRUCache(maxsize=self.POLICY_STATUS_CACHE_SIZE,
+                                             ttl=self.POLICY_STATUS_TTL,
+                                             clock=self.POLICY_STATUS_CLOCK)
+        self._last_revocations_block = None
+
     def block_until_ready(self, poll_rate: int = None, timeout: int = None, feedback_rate: int = None):
         """
         Polls the staking_agent and blocks until the staking address is not
@@ -1221,12 +1234,81 @@ class Worker(NucypherTokenActor):
 
     def verify_active_policy(self, hrac: HRAC) -> None:
         policy = self.policy_agent.fetch_policy(policy_id=bytes(hrac))
+        self._check_policy_is_active(hrac=hrac, policy=policy)
+
+    @staticmethod
+    def _check_policy_is_active(hrac: HRAC, policy: PolicyInfo) -> None:
         if policy.disabled:
             raise Policy.Inactive(f'{hrac} is a disabled policy.')
         expired = datetime.utcnow() >= datetime.utcfromtimestamp(policy.end_timestamp)
         if expired:
             raise Policy.Expired(f'{hrac} is an expired policy.')
 
+    def verify_policy(self, hrac: HRAC) -> None:
+        """
+        Performs the checks of both `verify_policy_payment` and `verify_active_policy`,
+        caching the on-chain policy state. Unknown, unpaid and disabled policies
+        are cached for a shorter time; expiration is checked on every call.
+
+        Active policies are only cached while revocations are being watched
+        (see `watching_revocations`), otherwise a revocation would go unnoticed.
+        """
+        status = self._policy_status_cache.get(hrac)
+        if status is None:
+            try:
+                self.verify_policy_payment(hrac=hrac)
+            except (Policy.Unknown, Policy.Unpaid) as e:
+                status = e.__class__, str(e)
+                ttl = self.INVALID_POLICY_STATUS_TTL
+            else:
+                status = self.policy_agent.fetch_policy(policy_id=bytes(hrac))
+                if status.disabled:
+                    ttl = self.INVALID_POLICY_STATUS_TTL
+                else:
+                    ttl = self.POLICY_STATUS_TTL if self.watching_revocations else None
+            if ttl:
+                self._policy_status_cache.put(hrac, status, ttl=ttl)
+
+        if isinstance(status, PolicyInfo):
+            self._check_policy_is_active(hrac=hrac, policy=status)
+        else:
+            error_class, message = status
+            raise error_class(message)
+
+    @property
+    def watching_revocations(self) -> bool:
+        """Whether `invalidate_revoked_policies` is being called periodically."""
+        return False
+
+    def invalidate_policy(self, hrac: HRAC) -> None:
+        """Drops the cached status of a policy."""
+        self._policy_status_cache.invalidate(hrac)
+
+    def invalidate_revoked_policies(self) -> None:
+        """
+        Drops the cached status of the policies with arrangements revoked since the previous call.
+        """
+        latest_block = self.policy_agent.blockchain.client.block_number
+        if self._last_revocations_block is None:
+            # Nothing was cached before this point
+            self._last_revocations_block = latest_block
+            return
+
+        from_block = self._last_revocations_block + 1
+        if from_block > latest_block:
+            return
+
+        events_throttler = ContractEventsThrottler(agent=self.policy_agent,
+                                                   event_name=('PolicyRevoked', 'ArrangementRevoked'),
+                                                   from_block=from_block,
+                                                   to_block=latest_block)
+        for event_record in events_throttler:
+            hrac = HRAC(bytes(event_record.args['policyId']))
+            self.invalidate_policy(hrac)
+            self.log.debug(f"Policy {hrac} was revoked ({event_record.raw_event['event']})")
+
+        self._last_revocations_block = latest_block
+
 
 class BlockchainPolicyAuthor(NucypherTokenActor):
     """Alice base class for blockchain operations, mocking up new policies!"""
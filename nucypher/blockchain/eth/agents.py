@@ -18,9 +18,8 @@ import os
 
 import random
 import sys
-from bisect import bisect_right
 from itertools import accumulate
-from typing import Dict, Iterable, List, Tuple, Type, Union, Any, Optional, cast, Iterator
+from typing import Dict, Iterable, List, Tuple, Type, Union, Any, Optional, cast, Iterator, Sequence
 
 from constant_sorrow.constants import (  # type: ignore
     CONTRACT_CALL,
@@ -35,6 +34,7 @@ from web3.contract import Contract, ContractFunction
 from web3.types import Wei, Timestamp, TxReceipt, TxParams, Nonce
 
 from nucypher.blockchain.eth.aragon import Artifact, Action
+from nucypher.blockchain.eth.calls import ContractCallBatcher
 from nucypher.blockchain.eth.constants import (
     ADJUDICATOR_CONTRACT_NAME,
     DISPATCHER_CONTRACT_NAME,
@@ -72,6 +72,7 @@ from nucypher.types import (
     WorklockParameters,
     StakerFlags,
     StakerInfo,
+    StakerStatus,
     PeriodDelta,
     StakingEscrowParameters,
     PolicyInfo, ArrangementInfo
@@ -123,6 +124,7 @@ class EthereumContractAgent:
 
         self.__contract = contract
         self.events = ContractEvents(contract)
+        self.call_batcher = ContractCallBatcher(w3=self.blockchain.w3)
         if not transaction_gas:
             transaction_gas = EthereumContractAgent.DEFAULT_TRANSACTION_GAS_LIMITS['default']
         self.transaction_gas = transaction_gas
@@ -156,6 +158,10 @@ class EthereumContractAgent:
             return None
         return self.contract.functions.owner().call()
 
+    def batch_call(self, functions: Iterable[ContractFunction]) -> List[Any]:
+        """Calls many contract functions in as few requests as possible, returning their results in order."""
+        return self.call_batcher.call(functions)
+
 
 class NucypherTokenAgent(EthereumContractAgent):
 
@@ -265,6 +271,9 @@ class StakingEscrowAgent(EthereumContractAgent):
     class NotEnoughStakers(Exception):
         """Raised when the are not enough stakers available to complete an operation"""
 
+    # (current period, locked tokens per period offset) of the last projection
+    _locked_tokens_projection: Optional[Tuple[Period, List[NuNits]]] = None
+
     #
     # Staker Network Status
     #
@@ -283,7 +292,7 @@ class StakingEscrowAgent(EthereumContractAgent):
     def get_stakers(self) -> List[ChecksumAddress]:
         """Returns a list of stakers"""
         num_stakers: int = self.get_staker_population()
-        stakers: List[ChecksumAddress] = [self.contract.functions.stakers(i).call() for i in range(num_stakers)]
+        stakers: List[ChecksumAddress] = self.batch_call(self.contract.functions.stakers(i) for i in range(num_stakers))
         return stakers
 
     @contract_api(CONTRACT_CALL)
@@ -295,26 +304,26 @@ class StakingEscrowAgent(EthereumContractAgent):
         The third contains stakers that have missed commitments before current period
         """
 
-        num_stakers: int = self.get_staker_population()
+        stakers: List[ChecksumAddress] = self.get_stakers()
         current_period: Period = self.get_current_period()
         active_stakers: List[ChecksumAddress] = list()
         pending_stakers: List[ChecksumAddress] = list()
         missing_stakers: List[ChecksumAddress] = list()
 
-        for i in range(num_stakers):
-            staker = self.contract.functions.stakers(i).call()
-            last_committed_period = self.get_last_committed_period(staker)
+        last_committed_periods = self.batch_call(self.contract.functions.getLastCommittedPeriod(staker)
+                                                 for staker in stakers)
+        for staker, last_committed_period in zip(stakers, last_committed_periods):
             if last_committed_period == current_period + 1:
                 active_stakers.append(staker)
             elif last_committed_period == current_period:
                 pending_stakers.append(staker)
             else:
-                locked_stake = self.non_withdrawable_stake(staker_address=staker)
-                if locked_stake == 0:
-                    # don't include stakers with expired stakes
-                    continue
                 missing_stakers.append(staker)
 
+        # don't include stakers with expired stakes
+        locked_stakes = self.non_withdrawable_stakes(staker_addresses=missing_stakers)
+        missing_stakers = [staker for staker, locked_stake in zip(missing_stakers, locked_stakes) if locked_stake != 0]
+
         return active_stakers, pending_stakers, missing_stakers
 
     @contract_api(CONTRACT_CALL)
@@ -378,6 +387,56 @@ class StakingEscrowAgent(EthereumContractAgent):
         all_locked_tokens, _stakers = self.get_all_active_stakers(periods=periods, pagination_size=pagination_size)
         return all_locked_tokens
 
+    @contract_api(CONTRACT_CALL)
+    def get_all_locked_tokens_projection(self, periods: int, pagination_size: Optional[int] = None) -> List[NuNits]:
+        """
+        Returns the locked tokens of all active stakers for each of the next `periods` periods,
+        i.e. the values of `get_all_locked_tokens(p)` for `p` in `1..periods`.
+
+        Instead of one staker enumeration per period, the active stakers and their sub-stakes are
+        fetched once and the locked tokens of every future period are computed in a single pass.
+        The projection is cached until the current period changes.
+        """
+        if not periods > 0:
+            raise ValueError("Period must be > 0")
+
+        current_period = self.get_current_period()
+        if self._locked_tokens_projection is None or self._locked_tokens_projection[0] != current_period:
+            projection = self.__project_locked_tokens(current_period=current_period, pagination_size=pagination_size)
+            self._locked_tokens_projection = (current_period, projection)
+
+        _current_period, projection = self._locked_tokens_projection
+        return [projection[offset] if offset < len(projection) else NuNits(0) for offset in range(1, periods + 1)]
+
+    def __project_locked_tokens(self, current_period: Period, pagination_size: Optional[int] = None) -> List[NuNits]:
+        """
+        Computes the locked tokens of all active stakers for every period offset from `current_period`
+        until the last sub-stake unlocks.
+
+        Stakers without tokens locked for the next period have none locked afterwards either,
+        since sub-stakes always begin by the next period.
+        """
+        _locked_tokens, active_stakers = self.get_all_active_stakers(periods=1, pagination_size=pagination_size)
+        stakers = list(active_stakers)
+
+        functions = self.contract.functions
+        substakes_lengths = self.batch_call(functions.getSubStakesLength(staker) for staker in stakers)
+        substakes = [(staker, index) for staker, length in zip(stakers, substakes_lengths) for index in range(length)]
+        substakes_info = self.batch_call(functions.getSubStakeInfo(*substake) for substake in substakes)
+        last_periods = self.batch_call(functions.getLastPeriodOfSubStake(*substake) for substake in substakes)
+
+        # Locked tokens only change when a sub-stake begins or ends, so record those changes
+        # per period offset and accumulate them over all offsets at once.
+        horizon = max((last_period - current_period for last_period in last_periods), default=0)
+        changes = [0] * (horizon + 2)
+        for (first_period, *_others, locked_value), last_period in zip(substakes_info, last_periods):
+            if last_period <= current_period:
+                continue
+            changes[max(first_period - current_period, 0)] += locked_value
+            changes[last_period - current_period + 1] -= locked_value
+
+        return [NuNits(locked_tokens) for locked_tokens in accumulate(changes)]
+
     #
     # StakingEscrow Contract API
     #
@@ -610,6 +669,13 @@ class StakingEscrowAgent(EthereumContractAgent):
                                  self.contract.functions.getLockedTokens(staker_address, 1).call())
         return NuNits(staked_amount)
 
+    @contract_api(CONTRACT_CALL)
+    def non_withdrawable_stakes(self, staker_addresses: List[ChecksumAddress]) -> List[NuNits]:
+        """Batched version of `non_withdrawable_stake` for many stakers, in the order given."""
+        locked_tokens = self.batch_call(self.contract.functions.getLockedTokens(staker_address, periods)
+                                        for staker_address in staker_addresses for periods in (0, 1))
+        return [NuNits(max(locked_tokens[i], locked_tokens[i + 1])) for i in range(0, len(locked_tokens), 2)]
+
     @contract_api(CONTRACT_CALL)
     def calculate_staking_reward(self, staker_address: ChecksumAddress) -> NuNits:
         token_amount: NuNits = self.owned_tokens(staker_address)
@@ -641,6 +707,30 @@ class StakingEscrowAgent(EthereumContractAgent):
         wind_down_flag, restake_flag, measure_work_flag, snapshot_flag, migration_flag = flags
         return StakerFlags(wind_down_flag, restake_flag, measure_work_flag, snapshot_flag, migration_flag)
 
+    @contract_api(CONTRACT_CALL)
+    def get_stakers_status(self, staker_addresses: List[ChecksumAddress]) -> List[StakerStatus]:
+        """Returns the status of many stakers, in the order given, using batched contract calls."""
+        functions = self.contract.functions
+        calls_per_staker = (functions.getAllTokens,
+                            functions.getLastCommittedPeriod,
+                            functions.getWorkerFromStaker,
+                            functions.getFlags,
+                            lambda staker_address: functions.getLockedTokens(staker_address, 0),
+                            lambda staker_address: functions.getLockedTokens(staker_address, 1))
+        results = self.batch_call(call(staker_address) for staker_address in staker_addresses for call in calls_per_staker)
+
+        stakers_status = list()
+        for index in range(0, len(results), len(calls_per_staker)):
+            owned_tokens, last_committed_period, worker, flags, current_locked, next_locked = \
+                results[index:index + len(calls_per_staker)]
+            stakers_status.append(StakerStatus(owned_tokens=NuNits(owned_tokens),
+                                               last_committed_period=Period(last_committed_period),
+                                               worker=to_checksum_address(worker),
+                                               flags=StakerFlags(*flags),
+                                               current_locked_tokens=NuNits(current_locked),
+                                               next_locked_tokens=NuNits(next_locked)))
+        return stakers_status
+
     @contract_api(CONTRACT_CALL)
     def is_restaking(self, staker_address: ChecksumAddress) -> bool:
         flags = self.get_flags(staker_address)
@@ -751,9 +841,11 @@ class StakingEscrowAgent(EthereumContractAgent):
         Returns an iterator of all staker addresses via cumulative sum, on-network.
         Staker addresses are returned in the order in which they registered with the StakingEscrow contract's ledger
         """
-        for index in range(self.get_staker_population()):
-            staker_address: ChecksumAddress = self.contract.functions.stakers(index).call()
-            yield staker_address
+        population = self.get_staker_population()
+        batch_size = self.call_batcher.batch_size
+        for start in range(0, population, batch_size):
+            indices = range(start, min(start + batch_size, population))
+            yield from self.batch_call(self.contract.functions.stakers(index) for index in indices)
 
     def get_stakers_reservoir(self,
                               duration: int,
@@ -847,6 +939,30 @@ class PolicyManagerAgent(EthereumContractAgent):
                                                    transacting_power=transacting_power)  # TODO: Gas management - #842
         return receipt
 
+    @contract_api(TRANSACTION)
+    def create_policies(self,
+                        transacting_power: TransactingPower,
+                        policies: Sequence[Tuple[bytes, Wei, Timestamp, List[ChecksumAddress]]],
+                        owner_address: Optional[ChecksumAddress] = None) -> List[TxReceipt]:
+        """
+        Creates a batch of policies, given as (policy_id, value, end_timestamp, node_addresses) tuples,
+        with one `createPolicy` transaction each, broadcast with consecutive nonces.
+        (The contract's `createPolicies` requires the same nodes for all the policies.)
+        Raises `BlockchainInterface.BatchTransactionFailed` if some of the policies were not created.
+        """
+        owner_address = owner_address or transacting_power.account
+        transactions = []
+        for policy_id, value, end_timestamp, node_addresses in policies:
+            contract_function: ContractFunction = self.contract.functions.createPolicy(
+                policy_id,
+                owner_address,
+                end_timestamp,
+                node_addresses)
+            transactions.append((contract_function, {'value': value}))
+        receipts = self.blockchain.send_transactions(transactions=transactions,
+                                                     transacting_power=transacting_power)
+        return receipts
+
     @contract_api(CONTRACT_CALL)
     def fetch_policy(self, policy_id: bytes) -> PolicyInfo:
         """
@@ -910,6 +1026,12 @@ class PolicyManagerAgent(EthereumContractAgent):
         fee_amount = self.contract.functions.nodes(staker_address).call()[0]
         return fee_amount
 
+    @contract_api(CONTRACT_CALL)
+    def get_fee_amounts(self, staker_addresses: List[ChecksumAddress]) -> List[Wei]:
+        """Batched version of `get_fee_amount` for many stakers, in the order given."""
+        nodes = self.batch_call(self.contract.functions.nodes(staker_address) for staker_address in staker_addresses)
+        return [node[0] for node in nodes]
+
     @contract_api(CONTRACT_CALL)
     def get_fee_rate_range(self) -> Tuple[Wei, Wei, Wei]:
         """Check minimum, default & maximum fee rate for all policies ('global fee range')"""
@@ -922,6 +1044,11 @@ class PolicyManagerAgent(EthereumContractAgent):
         min_rate = self.contract.functions.getMinFeeRate(staker_address).call()
         return min_rate
 
+    @contract_api(CONTRACT_CALL)
+    def get_min_fee_rates(self, staker_addresses: List[ChecksumAddress]) -> List[Wei]:
+        """Batched version of `get_min_fee_rate` for many stakers, in the order given."""
+        return self.batch_call(self.contract.functions.getMinFeeRate(staker_address) for staker_address in staker_addresses)
+
     @contract_api(CONTRACT_CALL)
     def get_raw_min_fee_rate(self, staker_address: ChecksumAddress) -> Wei:
         """Check minimum acceptable fee rate set by staker for their associated worker"""
@@ -1567,6 +1694,9 @@ class ContractAgency:
 class WeightedSampler:
     """
     Samples random elements with probabilities proportional to given weights.
+
+    The weights are kept in a Fenwick tree (binary indexed tree),
+    so that both drawing an element and removing its weight take O(log n).
     """
 
     def __init__(self, weighted_elements: Dict[Any, int]):
@@ -1574,9 +1704,52 @@ class WeightedSampler:
             elements, weights = zip(*weighted_elements.items())
         else:
             elements, weights = [], []
-        self.totals = list(accumulate(weights))
         self.elements = elements
-        self.__length = len(self.totals)
+
+        # 1-based Fenwick tree, built in O(n): the node ``i`` holds the sum of the ``i & -i`` weights ending at ``i``
+        totals = [0, *accumulate(weights)]
+        self.__initial_tree = [totals[i] - totals[i - (i & -i)] for i in range(len(totals))]
+        self.__initial_weights = list(weights)
+        self.__initial_total = totals[-1]
+
+        # The highest power of 2 not exceeding the number of elements, where the tree search starts
+        self.__top_step = 1 << (len(weights).bit_length() - 1) if weights else 0
+
+        self.reset()
+
+    def reset(self) -> None:
+        """Puts back all the elements sampled so far, with their original weights."""
+        self.__weights = self.__initial_weights.copy()
+        self.__tree = self.__initial_tree.copy()
+        self.__total = self.__initial_total
+        self.__length = len(self.__weights)
+
+    def __find(self, position: int) -> int:
+        """
+        Returns the index of the first element for which the cumulative weight exceeds ``position``
+        (the same as ``bisect_right`` on the list of cumulative weights).
+        """
+        tree = self.__tree
+        idx = 0
+        step = self.__top_step
+        while step:
+            next_idx = idx + step
+            if next_idx < len(tree) and tree[next_idx] <= position:
+                idx = next_idx
+                position -= tree[idx]
+            step >>= 1
+        return idx
+
+    def __remove(self, idx: int) -> None:
+        """Sets the weight of the element ``idx`` to 0."""
+        weight = self.__weights[idx]
+        self.__weights[idx] = 0
+        self.__total -= weight
+        tree = self.__tree
+        i = idx + 1
+        while i < len(tree):
+            tree[i] -= weight
+            i += i & -i
 
     def sample_no_replacement(self, rng, quantity: int) -> list:
         """
@@ -1584,8 +1757,8 @@ class WeightedSampler:
         The probability of an element to appear is proportional
         to the weight provided to the constructor.
 
-        The elements will not repeat; every time an element is sampled its weight is set to 0.
-        (does not mutate the object and only applies to the current invocation of the method).
+        The elements will not repeat; every time an element is sampled its weight is set to 0
+        until the sampler is ``reset()``.
         """
 
         if quantity == 0:
@@ -1597,16 +1770,10 @@ class WeightedSampler:
         samples = []
 
         for i in range(quantity):
-            position = rng.randint(0, self.totals[-1] - 1)
-            idx = bisect_right(self.totals, position)
+            position = rng.randint(0, self.__total - 1)
+            idx = self.__find(position)
             samples.append(self.elements[idx])
-
-            # Adjust the totals so that they correspond
-            # to the weight of the element `idx` being set to 0.
-            prev_total = self.totals[idx - 1] if idx > 0 else 0
-            weight = self.totals[idx] - prev_total
-            for j in range(idx, len(self.totals)):
-                self.totals[j] -= weight
+            self.__remove(idx)
 
         self.__length -= quantity
 
@@ -1625,6 +1792,10 @@ class StakersReservoir:
     def __len__(self):
         return len(self._sampler)
 
+    def reset(self) -> None:
+        """Makes all the stakers available again, e.g. to reuse the reservoir for another policy."""
+        self._sampler.reset()
+
     def draw(self, quantity):
         if quantity > len(self):
             raise StakingEscrowAgent.NotEnoughStakers(f'Cannot sample {quantity} out of {len(self)} total stakers')
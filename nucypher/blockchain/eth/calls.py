@@ -0,0 +1,175 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+from typing import Any, Dict, Iterable, List, Tuple
+
+import requests
+from hexbytes import HexBytes
+from web3 import HTTPProvider, Web3
+from web3._utils.abi import get_abi_output_types, map_abi_data
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+from web3._utils.request import make_post_request
+from web3.contract import ContractFunction
+from web3.types import BlockIdentifier
+
+from nucypher.utilities.logging import Logger
+
+
+class ContractCallBatcher:
+    """
+    Performs many read-only contract calls with as few round trips to the provider as possible.
+
+    With an HTTP provider, calls are grouped into JSON-RPC batch requests of at most `batch_size` calls.
+    A batch rejected by the provider (e.g. too large, or rate limited) is split in halves and retried,
+    down to single calls. Calls that fail individually, and all calls over other providers,
+    go through the regular `ContractFunction.call`, so errors are raised as usual.
+
+    Other read-only JSON-RPC requests, such as `eth_getBlockByNumber`, can be batched the same way with `request()`.
+    """
+
+    DEFAULT_BATCH_SIZE = 100
+
+    class BatchRejected(Exception):
+        """Raised when the provider fails to answer a batch request as a whole."""
+
+    def __init__(self, w3: Web3, batch_size: int = DEFAULT_BATCH_SIZE):
+        if batch_size < 1:
+            raise ValueError(f"Batch size must be a positive number, got {batch_size}")
+        self.w3 = w3
+        self.batch_size = batch_size
+        self.log = Logger(self.__class__.__name__)
+
+    @property
+    def batches_requests(self) -> bool:
+        return isinstance(self.w3.provider, HTTPProvider)
+
+    def call(self, functions: Iterable[ContractFunction], block_identifier: BlockIdentifier = 'latest') -> List[Any]:
+        """
+        Calls all the `functions` and returns their results, in order.
+        Unless a specific block is given, all the calls are made against the same, latest block.
+        """
+        functions = list(functions)
+        if not functions:
+            return []
+        if block_identifier == 'latest':
+            block_identifier = self.w3.eth.blockNumber
+
+        if not self.batches_requests:
+            return [function.call(block_identifier=block_identifier) for function in functions]
+
+        results = list()
+        for start in range(0, len(functions), self.batch_size):
+            batch = functions[start:start + self.batch_size]
+            results.extend(self.__call_batch(batch, block_identifier=block_identifier))
+        return results
+
+    def request(self, method: str, params: Iterable[list]) -> List[Any]:
+        """
+        Makes the JSON-RPC request `method` once for each of `params`, and returns the raw results, in order.
+        Requests are batched like contract calls; those that fail individually, and all requests
+        over other providers, are made one by one through web3, so errors are raised as usual.
+        """
+        params = list(params)
+        if not self.batches_requests:
+            return [self.w3.manager.request_blocking(method, request_params) for request_params in params]
+
+        results = list()
+        for start in range(0, len(params), self.batch_size):
+            results.extend(self.__request_in_batch(method, params[start:start + self.batch_size]))
+        return results
+
+    def __request_in_batch(self, method: str, params: List[list]) -> List[Any]:
+        try:
+            responses = self.__post_batch([(method, request_params) for request_params in params])
+        except self.BatchRejected as e:
+            if len(params) == 1:
+                return [self.w3.manager.request_blocking(method, params[0])]
+            self.log.debug(f"Splitting batch of {len(params)} {method} requests: {e}")
+            half = len(params) // 2
+            return self.__request_in_batch(method, params[:half]) + self.__request_in_batch(method, params[half:])
+
+        results = list()
+        for request_params, response in zip(params, responses):
+            if 'error' in response or response.get('result') is None:
+                results.append(self.w3.manager.request_blocking(method, request_params))
+            else:
+                results.append(response['result'])
+        return results
+
+    def __call_batch(self, functions: List[ContractFunction], block_identifier: BlockIdentifier) -> List[Any]:
+        try:
+            responses = self.__request_batch(functions, block_identifier=block_identifier)
+        except self.BatchRejected as e:
+            if len(functions) == 1:
+                return [functions[0].call(block_identifier=block_identifier)]
+            self.log.debug(f"Splitting batch of {len(functions)} contract calls: {e}")
+            half = len(functions) // 2
+            return self.__call_batch(functions[:half], block_identifier=block_identifier) + \
+                   self.__call_batch(functions[half:], block_identifier=block_identifier)
+
+        results = list()
+        for function, response in zip(functions, responses):
+            return_data = HexBytes(response.get('result') or b'')
+            if 'error' in response or not return_data:
+                # Let web3 raise the appropriate error for this call, if it fails again.
+                results.append(function.call(block_identifier=block_identifier))
+            else:
+                results.append(self.__decode(function, return_data))
+        return results
+
+    def __request_batch(self,
+                        functions: List[ContractFunction],
+                        block_identifier: BlockIdentifier
+                        ) -> List[Dict[str, Any]]:
+        if isinstance(block_identifier, int):
+            block_identifier = hex(block_identifier)
+        return self.__post_batch([('eth_call',
+                                   [{'to': function.address, 'data': function._encode_transaction_data()},
+                                    block_identifier])
+                                  for function in functions])
+
+    def __post_batch(self, requests_batch: List[Tuple[str, list]]) -> List[Dict[str, Any]]:
+        """Sends a JSON-RPC batch request, and returns the responses in the order of the requests."""
+        payload = [{'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params}
+                   for request_id, (method, params) in enumerate(requests_batch)]
+
+        provider = self.w3.provider
+        try:
+            raw_response = make_post_request(provider.endpoint_uri,
+                                             json.dumps(payload).encode(),
+                                             **provider.get_request_kwargs())
+            responses = json.loads(raw_response)
+        except (requests.RequestException, ValueError) as e:
+            raise self.BatchRejected(str(e))
+
+        # Providers answer batches they refuse with a single error object.
+        if not isinstance(responses, list):
+            raise self.BatchRejected(str(responses.get('error', responses)))
+        responses_by_id = {response.get('id'): response for response in responses}
+        if set(responses_by_id) != set(range(len(requests_batch))):
+            raise self.BatchRejected(f"Got {len(responses)} responses to {len(requests_batch)} requests")
+        return [responses_by_id[request_id] for request_id in range(len(requests_batch))]
+
+    def __decode(self, function: ContractFunction, return_data: HexBytes) -> Any:
+        """Decodes the return data of a call exactly as `ContractFunction.call` does."""
+        output_types = get_abi_output_types(function.abi)
+        output_data = self.w3.codec.decode_abi(output_types, return_data)
+        normalized_data = map_abi_data(BASE_RETURN_NORMALIZERS, output_types, output_data)
+        if len(normalized_data) == 1:
+            return normalized_data[0]
+        return normalized_data
@@ -0,0 +1,390 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+import sqlite3
+from collections import defaultdict
+from pathlib import Path
+from threading import RLock
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+from eth_utils import to_checksum_address
+from hexbytes import HexBytes
+from web3.types import BlockIdentifier
+
+from nucypher.blockchain.eth.events import ContractEventsThrottler, EventRecord
+from nucypher.config.constants import DEFAULT_CONFIG_ROOT
+
+
+def _encode_arg(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return {'bytes': value.hex()}
+    if isinstance(value, (list, tuple)):
+        return [_encode_arg(item) for item in value]
+    return value
+
+
+def _decode_arg(value: Any) -> Any:
+    if isinstance(value, dict):
+        return HexBytes(value['bytes'])
+    if isinstance(value, list):
+        return [_decode_arg(item) for item in value]
+    return value
+
+
+def _arg_matches(value: Any, expected: Any) -> bool:
+    if isinstance(expected, (list, tuple)):
+        # Like web3 argument filters, a list of values matches any of them
+        return any(_arg_matches(value, option) for option in expected)
+    if isinstance(value, bytes) and isinstance(expected, str):
+        # e.g. policy IDs given as hex strings on the command line
+        try:
+            return value == HexBytes(expected)
+        except ValueError:
+            return False
+    if isinstance(value, str) and isinstance(expected, str):
+        # Addresses may not be in the same (checksum) case
+        return value.lower() == expected.lower()
+    return value == expected
+
+
+def _topic_value(abi_type: str, value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return [_topic_value(abi_type, option) for option in value]
+    if abi_type.startswith('bytes') and isinstance(value, str):
+        return HexBytes(value)
+    if abi_type == 'address' and isinstance(value, str):
+        return to_checksum_address(value)
+    return value
+
+
+def _is_topic_type(abi_type: str) -> bool:
+    # Indexed dynamic types (strings, arrays...) are only stored as hashes
+    return abi_type in ('address', 'bool') or \
+        (abi_type.startswith(('uint', 'int', 'bytes')) and abi_type[-1].isdigit())
+
+
+class ContractEventIndex:
+    """
+    A local index of contract events, stored in SQLite and keyed by chain, contract, event and block.
+
+    Each event is fetched from the provider once: the indexed block range of an event only
+    grows, backwards or forwards, to cover the ranges requested. Range and argument filter
+    queries are then served locally.
+
+    Since the latest blocks may still be reorganized, every forward sync rolls back the last
+    `reorg_depth` indexed blocks of the event and indexes them again.
+
+    Argument filters on indexed arguments are passed to the provider as topic filters; the events
+    matching them are indexed separately from all the events, in their own block range,
+    so that following the events of a single staker does not index the events of all the others.
+
+    Long-running consumers that only move forward, like the metrics collectors, `prune` the events they
+    have already processed, so that the index does not grow with the chain.
+    """
+
+    DEFAULT_FILEPATH = DEFAULT_CONFIG_ROOT / 'events.sqlite'
+    DEFAULT_REORG_DEPTH = 12
+    IN_MEMORY = ':memory:'
+
+    _SCHEMA_VERSION = 2
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS events (
+            contract TEXT NOT NULL,
+            event TEXT NOT NULL,
+            scope TEXT NOT NULL,
+            block_number INTEGER NOT NULL,
+            log_index INTEGER NOT NULL,
+            transaction_index INTEGER NOT NULL,
+            transaction_hash TEXT NOT NULL,
+            block_hash TEXT NOT NULL,
+            args TEXT NOT NULL,
+            PRIMARY KEY (contract, event, scope, block_number, log_index)
+        );
+        CREATE TABLE IF NOT EXISTS indexed_ranges (
+            contract TEXT NOT NULL,
+            event TEXT NOT NULL,
+            scope TEXT NOT NULL,
+            first_block INTEGER NOT NULL,
+            last_block INTEGER NOT NULL,
+            PRIMARY KEY (contract, event, scope)
+        );
+    """
+    _UNFILTERED = ''
+
+    def __init__(self,
+                 db_filepath: Union[Path, str] = IN_MEMORY,
+                 reorg_depth: int = DEFAULT_REORG_DEPTH,
+                 max_blocks_per_call: int = ContractEventsThrottler.DEFAULT_MAX_BLOCKS_PER_CALL):
+        if reorg_depth < 0:
+            raise ValueError(f"Reorg depth must be >= 0, got {reorg_depth}")
+        self.db_filepath = db_filepath
+        self.reorg_depth = reorg_depth
+        self.max_blocks_per_call = max_blocks_per_call
+
+        if db_filepath != self.IN_MEMORY:
+            Path(db_filepath).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(db_filepath), check_same_thread=False)
+        self._lock = RLock()
+        with self._lock, self._db:
+            schema_version, = self._db.execute('PRAGMA user_version').fetchone()
+            if schema_version != self._SCHEMA_VERSION:
+                # The index is only a cache of the blockchain, so an older one is simply rebuilt
+                self._db.executescript('DROP TABLE IF EXISTS events; DROP TABLE IF EXISTS indexed_ranges;')
+                self._db.execute(f'PRAGMA user_version = {self._SCHEMA_VERSION}')
+            self._db.executescript(self._SCHEMA)
+
+    @classmethod
+    def for_blockchain(cls, blockchain: 'BlockchainInterface', **kwargs) -> 'ContractEventIndex':
+        """
+        Returns an index stored on disk for public chains, and in memory for local
+        development chains, whose history does not outlive the process.
+        """
+        db_filepath = cls.IN_MEMORY if blockchain.client.is_local else cls.DEFAULT_FILEPATH
+        return cls(db_filepath=db_filepath, **kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    @staticmethod
+    def _contract_key(agent: 'EthereumContractAgent') -> str:
+        return f'{agent.blockchain.client.chain_id}:{agent.contract_address}'
+
+    @staticmethod
+    def topic_filters(agent: 'EthereumContractAgent', event_names: Sequence[str], argument_filters: Dict) -> Dict:
+        """
+        Returns the argument filters that can be applied as topic filters to all the events,
+        i.e. those on arguments indexed by all of them.
+        """
+        topic_filters = dict()
+        for name, expected in argument_filters.items():
+            abi_types = {agent.events.indexed_inputs(event_name).get(name) for event_name in event_names}
+            if len(abi_types) == 1:
+                abi_type = abi_types.pop()
+                if abi_type is not None and _is_topic_type(abi_type):
+                    topic_filters[name] = _topic_value(abi_type, expected)
+        return topic_filters
+
+    @classmethod
+    def _scope_of(cls, topic_filters: Dict) -> str:
+        if not topic_filters:
+            return cls._UNFILTERED
+        normalized = {name: _encode_arg(value.lower() if isinstance(value, str) else value)
+                      for name, value in topic_filters.items()}
+        return json.dumps(normalized, sort_keys=True)
+
+    def indexed_range(self,
+                      agent: 'EthereumContractAgent',
+                      event_name: str,
+                      **topic_filters
+                      ) -> Union[Tuple[int, int], None]:
+        """Returns the first and last blocks indexed for an event, with the given topic filters, if any."""
+        with self._lock:
+            cursor = self._db.execute('SELECT first_block, last_block FROM indexed_ranges '
+                                      'WHERE contract=? AND event=? AND scope=?',
+                                      (self._contract_key(agent), event_name, self._scope_of(topic_filters)))
+            row = cursor.fetchone()
+        return tuple(row) if row else None
+
+    def sync(self,
+             agent: 'EthereumContractAgent',
+             event_name: str,
+             from_block: int = 0,
+             to_block: BlockIdentifier = 'latest',
+             **topic_filters
+             ) -> int:
+        """
+        Indexes the events of `event_name` in the given block range that were not indexed yet.
+        Returns the last block of the range.
+        """
+        return self.sync_events(agent=agent,
+                                event_names=[event_name],
+                                from_block=from_block,
+                                to_block=to_block,
+                                **topic_filters)
+
+    def sync_events(self,
+                    agent: 'EthereumContractAgent',
+                    event_names: Sequence[str],
+                    from_block: int = 0,
+                    to_block: BlockIdentifier = 'latest',
+                    **topic_filters
+                    ) -> int:
+        """
+        Indexes the events of all `event_names` in the given block range that were not indexed yet.
+        Events of several names are fetched together, with a single `getLogs` call per batch of blocks.
+        Only the events matching the topic filters, on indexed arguments (see `topic_filters()`), are indexed.
+        Returns the last block of the range.
+        """
+        if to_block == 'latest':
+            to_block = agent.blockchain.client.block_number
+        if to_block < from_block:
+            raise ValueError(f"Invalid events block range: to_block {to_block} must be greater than or equal "
+                             f"to from_block {from_block}")
+
+        contract = self._contract_key(agent)
+        scope = self._scope_of(topic_filters)
+        with self._lock:
+            sync_plans = {event_name: self.__plan_sync(agent, event_name, from_block, to_block, topic_filters)
+                          for event_name in event_names}
+            ranges_to_fetch = [block_range for ranges, _ in sync_plans.values() for block_range in ranges]
+            fetched_events = defaultdict(list)
+            for start, end in self.__merge_ranges(ranges_to_fetch):
+                for event in self.__fetch(agent, event_names, start, end, topic_filters):
+                    event_name = event_names[0] if len(event_names) == 1 else event['event']
+                    fetched_events[event_name].append(event)
+
+            with self._db:
+                for event_name, (ranges, (first_block, last_block)) in sync_plans.items():
+                    for start, end in ranges:
+                        events = [event for event in fetched_events[event_name]
+                                  if start <= event['blockNumber'] <= end]
+                        self._db.execute('DELETE FROM events '
+                                         'WHERE contract=? AND event=? AND scope=? AND block_number BETWEEN ? AND ?',
+                                         (contract, event_name, scope, start, end))
+                        self._db.executemany('INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                             [(contract, event_name, scope, *self.__row_of(event))
+                                              for event in events])
+                    self._db.execute('INSERT OR REPLACE INTO indexed_ranges VALUES (?, ?, ?, ?, ?)',
+                                     (contract, event_name, scope, first_block, last_block))
+        return to_block
+
+    def prune(self, agent: 'EthereumContractAgent', event_names: Sequence[str], before_block: int) -> int:
+        """
+        Drops the indexed events of `event_names` emitted before `before_block`, whatever their topic filters,
+        e.g. once all the consumers of the index have moved past them. Returns the number of events dropped.
+        """
+        contract = self._contract_key(agent)
+        dropped = 0
+        with self._lock, self._db:
+            for event_name in event_names:
+                cursor = self._db.execute('DELETE FROM events WHERE contract=? AND event=? AND block_number < ?',
+                                          (contract, event_name, before_block))
+                dropped += cursor.rowcount
+                self._db.execute('DELETE FROM indexed_ranges WHERE contract=? AND event=? AND last_block < ?',
+                                 (contract, event_name, before_block))
+                self._db.execute('UPDATE indexed_ranges SET first_block=? '
+                                 'WHERE contract=? AND event=? AND first_block < ?',
+                                 (before_block, contract, event_name, before_block))
+        return dropped
+
+    def events(self,
+               agent: 'EthereumContractAgent',
+               event_name: str,
+               from_block: int = 0,
+               to_block: BlockIdentifier = 'latest',
+               **argument_filters
+               ) -> List[EventRecord]:
+        """
+        Returns the events of `event_name` in the given block range matching the argument filters,
+        in the order they were emitted, syncing the index first if needed.
+
+        The events are read from the index of all the events if it already covers the block range,
+        otherwise only the events matching the filters on indexed arguments are synced.
+        """
+        if to_block == 'latest':
+            to_block = agent.blockchain.client.block_number
+
+        topic_filters = dict()
+        unfiltered_range = self.indexed_range(agent=agent, event_name=event_name)
+        covered = unfiltered_range is not None and unfiltered_range[0] <= from_block and to_block <= unfiltered_range[1]
+        if argument_filters and not covered:
+            topic_filters = self.topic_filters(agent=agent, event_names=[event_name], argument_filters=argument_filters)
+
+        to_block = self.sync(agent=agent, event_name=event_name, from_block=from_block, to_block=to_block,
+                             **topic_filters)
+        with self._lock:
+            rows = self._db.execute('SELECT block_number, log_index, transaction_index, transaction_hash, block_hash, '
+                                    'args FROM events WHERE contract=? AND event=? AND scope=? '
+                                    'AND block_number BETWEEN ? AND ? ORDER BY block_number, log_index',
+                                    (self._contract_key(agent), event_name, self._scope_of(topic_filters),
+                                     from_block, to_block)).fetchall()
+
+        events = list()
+        for block_number, log_index, transaction_index, transaction_hash, block_hash, args in rows:
+            args = {name: _decode_arg(value) for name, value in json.loads(args).items()}
+            if not all(_arg_matches(args.get(name), expected) for name, expected in argument_filters.items()):
+                continue
+            events.append({'args': args,
+                           'event': event_name,
+                           'address': agent.contract_address,
+                           'blockNumber': block_number,
+                           'logIndex': log_index,
+                           'transactionIndex': transaction_index,
+                           'transactionHash': HexBytes(transaction_hash),
+                           'blockHash': HexBytes(block_hash)})
+        return EventRecord.from_page(events)
+
+    def __plan_sync(self,
+                    agent: 'EthereumContractAgent',
+                    event_name: str,
+                    from_block: int,
+                    to_block: int,
+                    topic_filters: Dict
+                    ) -> Tuple[List[Tuple[int, int]], Tuple[int, int]]:
+        """Returns the block ranges of an event to (re)index, and its indexed range afterwards."""
+        indexed_range = self.indexed_range(agent=agent, event_name=event_name, **topic_filters)
+        if indexed_range is None:
+            return [(from_block, to_block)], (from_block, to_block)
+
+        first_block, last_block = indexed_range
+        ranges_to_fetch = list()
+        if from_block < first_block:
+            ranges_to_fetch.append((from_block, first_block - 1))
+            first_block = from_block
+        if to_block > last_block:
+            rollback_block = max(first_block, last_block - self.reorg_depth + 1)
+            ranges_to_fetch.append((rollback_block, to_block))
+            last_block = to_block
+        return ranges_to_fetch, (first_block, last_block)
+
+    @staticmethod
+    def __merge_ranges(block_ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        merged = list()
+        for start, end in sorted(block_ranges):
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def __fetch(self,
+                agent: 'EthereumContractAgent',
+                event_names: Sequence[str],
+                from_block: int,
+                to_block: int,
+                topic_filters: Dict
+                ) -> List[Dict]:
+        event_name = event_names[0] if len(event_names) == 1 else event_names
+        events_throttler = ContractEventsThrottler(agent=agent,
+                                                   event_name=event_name,
+                                                   from_block=from_block,
+                                                   to_block=to_block,
+                                                   max_blocks_per_call=self.max_blocks_per_call,
+                                                   **topic_filters)
+        return [event_record.raw_event for event_record in events_throttler]
+
+    @staticmethod
+    def __row_of(event: Dict) -> Tuple:
+        args = json.dumps({name: _encode_arg(value) for name, value in dict(event['args']).items()})
+        return (event['blockNumber'],
+                event['logIndex'],
+                event['transactionIndex'],
+                HexBytes(event['transactionHash']).hex(),
+                HexBytes(event['blockHash']).hex(),
+                args)
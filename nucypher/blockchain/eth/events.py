@@ -15,26 +15,131 @@ You should have received a copy of the GNU Affero General Public License
 along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 import os
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Union
 
+from eth_utils import event_abi_to_log_topic, to_int
+from hexbytes import HexBytes
+from web3._utils.events import construct_event_topic_set, get_event_data
 from web3.contract import Contract
+from web3.exceptions import BlockNotFound
+from web3.types import BlockIdentifier
 
+from nucypher.blockchain.eth.calls import ContractCallBatcher
 from nucypher.blockchain.eth.interfaces import BlockchainInterfaceFactory
 from nucypher.config.constants import NUCYPHER_EVENTS_THROTTLE_MAX_BLOCKS
+from nucypher.utilities.cache import LRUCache
+
+
+class BlockTimestampCache:
+    """
+    A bounded cache of block timestamps shared by event records, keyed by provider and block number.
+    Each block is fetched from the blockchain once, no matter how many events it contains.
+    """
+
+    DEFAULT_MAX_BLOCKS = 10_000
+
+    def __init__(self, max_blocks: int = DEFAULT_MAX_BLOCKS):
+        self._timestamps = LRUCache(maxsize=max_blocks)
+
+    def resolve(self, block_numbers: Iterable[int]) -> Dict[int, Optional[int]]:
+        """
+        Returns the timestamps of all the unique `block_numbers`.
+        The missing ones are fetched with JSON-RPC batch requests over HTTP providers,
+        and one request per block over others.
+        Timestamps are `None` if there is no blockchain connection, or for blocks the provider does not know (yet);
+        those are not cached.
+        """
+        block_numbers = set(block_numbers)
+        try:
+            blockchain = BlockchainInterfaceFactory.get_interface()
+        except BlockchainInterfaceFactory.NoRegisteredInterfaces:
+            return dict.fromkeys(block_numbers)
+
+        timestamps = dict()
+        for block_number in block_numbers:
+            timestamps[block_number] = self._timestamps.get((blockchain.provider_uri, block_number))
+
+        missing_blocks = sorted(block_number for block_number, timestamp in timestamps.items() if timestamp is None)
+        for block_number, timestamp in zip(missing_blocks, self.__fetch(blockchain, missing_blocks)):
+            if timestamp is not None:
+                self._timestamps.put((blockchain.provider_uri, block_number), timestamp)
+            timestamps[block_number] = timestamp
+        return timestamps
+
+    @classmethod
+    def __fetch(cls, blockchain, block_numbers: List[int]) -> List[Optional[int]]:
+        batcher = ContractCallBatcher(w3=blockchain.w3)
+        if len(block_numbers) < 2 or not batcher.batches_requests:
+            return [cls.__timestamp(cls.__get_block(blockchain, block_number)) for block_number in block_numbers]
+        blocks = batcher.request('eth_getBlockByNumber', ([hex(block_number), False] for block_number in block_numbers))
+        return [cls.__timestamp(block) for block in blocks]
+
+    @staticmethod
+    def __get_block(blockchain, block_number: int) -> Optional[dict]:
+        try:
+            return blockchain.client.get_block(block_number)
+        except BlockNotFound:
+            return None
+
+    @staticmethod
+    def __timestamp(block: Optional[dict]) -> Optional[int]:
+        if block is None:
+            return None
+        timestamp = block['timestamp']
+        return to_int(hexstr=timestamp) if isinstance(timestamp, str) else timestamp
+
+    def get(self, block_number: int) -> Optional[int]:
+        return self.resolve([block_number])[block_number]
+
+    def batch(self, block_numbers: Iterable[int]) -> Callable[[int], Optional[int]]:
+        """
+        Returns a lazy resolver for a page of events: the first lookup resolves
+        the timestamps of all the `block_numbers` of the page at once.
+        """
+        block_numbers = set(block_numbers)
+        resolved = dict()
+
+        def timestamp_of(block_number: int) -> Optional[int]:
+            if not resolved:
+                resolved.update(self.resolve(block_numbers))
+            if block_number not in resolved:
+                return self.get(block_number)
+            return resolved[block_number]
+
+        return timestamp_of
+
+    def clear(self) -> None:
+        self._timestamps.clear()
+
+
+BLOCK_TIMESTAMPS = BlockTimestampCache()
 
 
 class EventRecord:
-    def __init__(self, event: dict):
+    def __init__(self, event: dict, timestamp_resolver: Callable[[int], Optional[int]] = None):
         self.raw_event = dict(event)
         self.args = dict(event['args'])
         self.block_number = event['blockNumber']
         self.transaction_hash = event['transactionHash'].hex()
+        self.__timestamp_resolver = timestamp_resolver or BLOCK_TIMESTAMPS.get
+        self.__timestamp = None
 
-        try:
-            blockchain = BlockchainInterfaceFactory.get_interface()
-        except BlockchainInterfaceFactory.NoRegisteredInterfaces:
-            self.timestamp = None
-        else:
-            self.timestamp = blockchain.client.w3.eth.getBlock(self.block_number)['timestamp']
+    @property
+    def timestamp(self) -> Optional[int]:
+        """Timestamp of the block of this event, fetched on first access."""
+        if self.__timestamp is None:
+            self.__timestamp = self.__timestamp_resolver(self.block_number)
+        return self.__timestamp
+
+    @classmethod
+    def from_page(cls, events: Iterable[dict]) -> Iterable['EventRecord']:
+        """
+        Wraps a page of events, such as the result of a single `getLogs` call,
+        so that all their block timestamps are resolved together when first needed.
+        """
+        events = list(events)
+        timestamp_resolver = BLOCK_TIMESTAMPS.batch(event['blockNumber'] for event in events)
+        return [cls(event, timestamp_resolver=timestamp_resolver) for event in events]
 
     def __repr__(self):
         pairs_to_show = dict(self.args.items())
@@ -49,6 +154,7 @@ class ContractEvents:
     def __init__(self, contract: Contract):
         self.contract = contract
         self.names = tuple(e.event_name for e in contract.events)
+        self.__event_abis = None
 
     def __get_web3_event_by_name(self, event_name: str):
         if event_name not in self.names:
@@ -67,13 +173,68 @@ class ContractEvents:
                 to_block = 'latest'
 
             entries = event_method.getLogs(fromBlock=from_block, toBlock=to_block, argument_filters=argument_filters)
-            for entry in entries:
-                yield EventRecord(entry)
+            for event_record in EventRecord.from_page(entries):
+                yield event_record
         return wrapper
 
     def __getattr__(self, event_name: str):
         return self[event_name]
 
+    def __event_abi_by_topic(self, topic: bytes) -> Optional[dict]:
+        if self.__event_abis is None:
+            event_abis = (abi for abi in self.contract.abi if abi['type'] == 'event' and not abi.get('anonymous'))
+            self.__event_abis = {event_abi_to_log_topic(abi): abi for abi in event_abis}
+        return self.__event_abis.get(bytes(HexBytes(topic)))
+
+    def __event_abi_by_name(self, event_name: str) -> dict:
+        self.__get_web3_event_by_name(event_name)  # validate
+        return next(abi for abi in self.contract.abi if abi['type'] == 'event' and abi['name'] == event_name)
+
+    def indexed_inputs(self, event_name: str) -> Dict[str, str]:
+        """Returns the names and ABI types of the indexed arguments of an event, which can be filtered by topic."""
+        event_abi = self.__event_abi_by_name(event_name)
+        return {arg['name']: arg['type'] for arg in event_abi['inputs'] if arg['indexed']}
+
+    def logs(self,
+             event_names: Sequence[str],
+             from_block: int,
+             to_block: BlockIdentifier = 'latest',
+             **argument_filters
+             ) -> Iterable[EventRecord]:
+        """
+        Retrieves the events of all `event_names` in a block range with a single
+        `getLogs` call filtered by contract address; logs are decoded locally, by topic.
+
+        Argument filters on indexed arguments are applied by the provider, as topic filters;
+        if the arguments are not at the same positions in all the events, there is one `getLogs` call per event.
+        """
+        topic_sets = list()
+        for event_name in event_names:
+            event_abi = self.__event_abi_by_name(event_name)
+            topic_sets.append(construct_event_topic_set(event_abi, self.contract.web3.codec, argument_filters))
+
+        if all(topics[1:] == topic_sets[0][1:] for topics in topic_sets):
+            # Any of the event signatures, with the same argument topics
+            topic_sets = [[[topics[0] for topics in topic_sets], *topic_sets[0][1:]]]
+
+        logs = list()
+        for topics in topic_sets:
+            logs.extend(self.contract.web3.eth.getLogs({'address': self.contract.address,
+                                                        'fromBlock': from_block,
+                                                        'toBlock': to_block,
+                                                        'topics': topics}))
+        if len(topic_sets) > 1:
+            logs.sort(key=lambda log: (log['blockNumber'], log['logIndex']))
+        entries = list()
+        for log in logs:
+            if not log['topics']:
+                continue  # anonymous event
+            event_abi = self.__event_abi_by_topic(log['topics'][0])
+            if event_abi is None or event_abi['name'] not in event_names:
+                continue
+            entries.append(get_event_data(self.contract.web3.codec, event_abi, log))
+        return EventRecord.from_page(entries)
+
     def __iter__(self):
         for event_name in self.names:
             yield self[event_name]
@@ -82,18 +243,28 @@ class ContractEvents:
 class ContractEventsThrottler:
     """
     Enables Contract events to be retrieved in batches.
+    The block timestamps of each batch of events are resolved together, on first access.
+
+    Events of several names can be retrieved together, with a single `getLogs` call per batch.
     """
     # default to 1000 - smallest default heard about so far (alchemy)
     DEFAULT_MAX_BLOCKS_PER_CALL = int(os.environ.get(NUCYPHER_EVENTS_THROTTLE_MAX_BLOCKS, 1000))
 
     def __init__(self,
                  agent: 'EthereumContractAgent',
-                 event_name: str,
+                 event_name: Union[str, Sequence[str]],
                  from_block: int,
                  to_block: int = None,  # defaults to latest block
                  max_blocks_per_call: int = DEFAULT_MAX_BLOCKS_PER_CALL,
                  **argument_filters):
-        self.event_filter = agent.events[event_name]
+        if isinstance(event_name, str):
+            self.event_filter = agent.events[event_name]
+        else:
+            event_names = tuple(event_name)
+            self.event_filter = lambda from_block, to_block, **filters: agent.events.logs(event_names=event_names,
+                                                                                          from_block=from_block,
+                                                                                          to_block=to_block,
+                                                                                          **filters)
         self.from_block = from_block
         self.to_block = to_block if to_block is not None else agent.blockchain.client.block_number
         # validity check of block range
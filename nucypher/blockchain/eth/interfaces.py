@@ -22,8 +22,8 @@ import pprint
 from pathlib import Path
 
 from eth.typing import TransactionDict
-from typing import Callable, NamedTuple, Tuple, Union, Optional
-from typing import List
+from typing import Callable, Dict, NamedTuple, Tuple, Union, Optional
+from typing import List, Sequence
 from urllib.parse import urlparse
 
 import requests
@@ -109,6 +109,20 @@ class BlockchainInterface:
     class UnknownContract(InterfaceError):
         pass
 
+    class BatchTransactionFailed(InterfaceError):
+        """
+        Some of the transactions sent with `send_transactions()` were not broadcast, or failed.
+        The receipts of the others are in `receipts`, with `None` for the failed ones,
+        and `failures` maps the indices of the failed transactions to their errors.
+        """
+
+        def __init__(self, receipts: List[Optional[TxReceipt]], failures: Dict[int, Exception]):
+            self.receipts = receipts
+            self.failures = failures
+            first_index = min(failures)
+            super().__init__(f"{len(failures)} of {len(receipts)} transactions failed; "
+                             f"transaction #{first_index}: {failures[first_index]}")
+
     REASONS = {
         INSUFFICIENT_ETH: 'insufficient funds for gas * price + value',
     }
@@ -465,9 +479,11 @@ class BlockchainInterface:
                       payload: dict = None,
                       transaction_gas_limit: int = None,
                       use_pending_nonce: bool = True,
+                      nonce: Optional[int] = None,
                       ) -> dict:
 
-        nonce = self.client.get_transaction_count(account=sender_address, pending=use_pending_nonce)
+        if nonce is None:
+            nonce = self.client.get_transaction_count(account=sender_address, pending=use_pending_nonce)
         base_payload = {
                         'nonce': nonce,
                         'from': sender_address}
@@ -489,6 +505,7 @@ class BlockchainInterface:
                                    transaction_gas_limit: Optional[int] = None,
                                    gas_estimation_multiplier: Optional[float] = None,
                                    use_pending_nonce: Optional[bool] = None,
+                                   nonce: Optional[int] = None,
                                    ) -> dict:
 
         if transaction_gas_limit is not None:
@@ -503,7 +520,8 @@ class BlockchainInterface:
         payload = self.build_payload(sender_address=sender_address,
                                      payload=payload,
                                      transaction_gas_limit=transaction_gas_limit,
-                                     use_pending_nonce=use_pending_nonce)
+                                     use_pending_nonce=use_pending_nonce,
+                                     nonce=nonce)
         self.__log_transaction(transaction_dict=payload, contract_function=contract_function)
         try:
             if 'gas' not in payload:  # i.e., transaction_gas_limit is not None
@@ -551,41 +569,75 @@ class BlockchainInterface:
         # Setup
         #
 
-        # TODO # 1754 - Move this to singleton - I do not approve... nor does Bogdan?
-        if GlobalLoggerSettings._json_ipc:
-            emitter = JSONRPCStdoutEmitter()
+        emitter = self.__make_emitter()
+
+        signed_raw_transaction = self.__sign_transaction(transacting_power=transacting_power,
+                                                         transaction_dict=transaction_dict,
+                                                         transaction_name=transaction_name,
+                                                         emitter=emitter)
+        try:
+            txhash = self.__broadcast_transaction(signed_raw_transaction=signed_raw_transaction,
+                                                  transaction_dict=transaction_dict,
+                                                  transaction_name=transaction_name,
+                                                  emitter=emitter)
+        except (TestTransactionFailed, ValueError):
+            raise  # TODO: Unify with Transaction failed handling -- Entry point for _handle_failed_transaction
         else:
-            emitter = StdoutEmitter()
+            if fire_and_forget:
+                return txhash
 
-        #
-        # Sign
-        #
+        return self.__wait_for_receipt(txhash=txhash,
+                                       transaction_name=transaction_name,
+                                       confirmations=confirmations,
+                                       emitter=emitter)
 
+    @staticmethod
+    def __transaction_cost(transaction_dict: TransactionDict) -> str:
         # TODO: Show the USD Price:  https://api.coinmarketcap.com/v1/ticker/ethereum/
         price = transaction_dict['gasPrice']
         price_gwei = Web3.fromWei(price, 'gwei')
         cost_wei = price * transaction_dict['gas']
         cost = Web3.fromWei(cost_wei, 'ether')
-
+        return f'{cost} ETH @ {price_gwei} gwei'
+
+    def __sign_transaction(self,
+                           transacting_power: TransactingPower,
+                           transaction_dict: TransactionDict,
+                           transaction_name: str,
+                           emitter
+                           ) -> bytes:
         if transacting_power.is_device:
             emitter.message(f'Confirm transaction {transaction_name} on hardware wallet... '
-                            f'({cost} ETH @ {price_gwei} gwei)',
+                            f'({self.__transaction_cost(transaction_dict)})',
                             color='yellow')
-        signed_raw_transaction = transacting_power.sign_transaction(transaction_dict)
-
-        #
-        # Broadcast
-        #
-        emitter.message(f'Broadcasting {transaction_name} Transaction ({cost} ETH @ {price_gwei} gwei)',
+        return transacting_power.sign_transaction(transaction_dict)
+
+    def __broadcast_transaction(self,
+                                signed_raw_transaction: bytes,
+                                transaction_dict: TransactionDict,
+                                transaction_name: str,
+                                emitter
+                                ) -> HexBytes:
+        emitter.message(f'Broadcasting {transaction_name} Transaction ({self.__transaction_cost(transaction_dict)})',
                         color='yellow')
-        try:
-            txhash = self.client.send_raw_transaction(signed_raw_transaction)  # <--- BROADCAST
-            emitter.message(f'TXHASH {txhash.hex()}', color='yellow')
-        except (TestTransactionFailed, ValueError):
-            raise  # TODO: Unify with Transaction failed handling -- Entry point for _handle_failed_transaction
-        else:
-            if fire_and_forget:
-                return txhash
+        txhash = self.client.send_raw_transaction(signed_raw_transaction)  # <--- BROADCAST
+        emitter.message(f'TXHASH {txhash.hex()}', color='yellow')
+        return txhash
+
+    @staticmethod
+    def __make_emitter():
+        # TODO # 1754 - Move this to singleton - I do not approve... nor does Bogdan?
+        if GlobalLoggerSettings._json_ipc:
+            return JSONRPCStdoutEmitter()
+        return StdoutEmitter()
+
+    def __wait_for_receipt(self,
+                           txhash: HexBytes,
+                           transaction_name: str,
+                           confirmations: int,
+                           emitter
+                           ) -> TxReceipt:
+        """Blocks for the receipt (and confirmations) of a broadcast transaction, and checks its status."""
 
         #
         # Receipt
@@ -666,6 +718,85 @@ class BlockchainInterface:
                                                                 fire_and_forget=fire_and_forget)
         return txhash_or_receipt
 
+    def send_transactions(self,
+                          transactions: Sequence[Tuple[ContractFunction, dict]],
+                          transacting_power: TransactingPower,
+                          gas_estimation_multiplier: Optional[float] = 1.15,  # TODO: Workaround for #2635, #2337
+                          confirmations: int = 0,
+                          ) -> List[TxReceipt]:
+        """
+        Sends a batch of (contract function, payload) transactions from the same account.
+        The nonces are assigned consecutively, starting from the pending transaction count,
+        so all the transactions are broadcast before waiting for any of the receipts.
+        Returns the receipts in the order of the transactions.
+
+        A transaction that fails does not stop the others: if any fails, `BatchTransactionFailed`
+        is raised once all the others are mined, with the receipts of those.
+
+        A transaction that cannot be built or signed, or that the node rejects, does not use its nonce,
+        so it doesn't hold up the next ones. If broadcasting fails otherwise (e.g. the connection is lost),
+        the node may have accepted the transaction: the next ones are not sent, since they could either
+        replace it or wait behind a nonce gap.
+        """
+        if not transactions:
+            return []
+
+        nonce = self.client.get_transaction_count(account=transacting_power.account, pending=True)
+
+        emitter = self.__make_emitter()
+        broadcast = dict()
+        failures = dict()
+        for index, (contract_function, payload) in enumerate(transactions):
+            transaction_name = contract_function.fn_name.upper()
+            try:
+                transaction = self.build_contract_transaction(contract_function=contract_function,
+                                                              sender_address=transacting_power.account,
+                                                              payload=payload,
+                                                              gas_estimation_multiplier=gas_estimation_multiplier,
+                                                              nonce=nonce)
+                signed_raw_transaction = self.__sign_transaction(transacting_power=transacting_power,
+                                                                 transaction_dict=transaction,
+                                                                 transaction_name=transaction_name,
+                                                                 emitter=emitter)
+            except Exception as error:
+                self.log.warn(f"[{transaction_name}] transaction #{index} was not signed: {error}")
+                failures[index] = error
+                continue
+
+            try:
+                txhash = self.__broadcast_transaction(signed_raw_transaction=signed_raw_transaction,
+                                                      transaction_dict=transaction,
+                                                      transaction_name=transaction_name,
+                                                      emitter=emitter)
+            except (TestTransactionFailed, ValueError) as error:
+                # Rejected by the node (an RPC error response), so the nonce was not used
+                self.log.warn(f"[{transaction_name}] transaction #{index} was rejected: {error}")
+                failures[index] = error
+                continue
+            except Exception as error:
+                self.log.warn(f"[{transaction_name}] transaction #{index} may not have been broadcast: {error}; "
+                              f"not sending the {len(transactions) - index - 1} remaining transactions")
+                for remaining_index in range(index, len(transactions)):
+                    failures[remaining_index] = error
+                break
+            broadcast[index] = (txhash, transaction_name)
+            nonce += 1
+
+        receipts = [None] * len(transactions)
+        for index, (txhash, transaction_name) in broadcast.items():
+            try:
+                receipts[index] = self.__wait_for_receipt(txhash=txhash,
+                                                          transaction_name=transaction_name,
+                                                          confirmations=confirmations,
+                                                          emitter=emitter)
+            except Exception as error:
+                self.log.warn(f"[{transaction_name}] transaction #{index} failed: {error}")
+                failures[index] = error
+
+        if failures:
+            raise self.BatchTransactionFailed(receipts=receipts, failures=failures)
+        return receipts
+
     def get_contract_by_name(self,
                              registry: BaseContractRegistry,
                              contract_name: str,
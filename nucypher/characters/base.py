@@ -344,7 +344,6 @@ class Character(Learner):
         # If we're federated only, we assume that all other nodes in our domain are as well.
         known_node_class.set_federated_mode(federated_only)
 
-    # TODO: Unused
     def store_metadata(self, filepath: Path) -> Path:
         """
         Save this node to the disk.
@@ -16,7 +16,7 @@
 """
 
 from base64 import b64decode
-from typing import Union
+from typing import List, Union
 
 import maya
 
@@ -103,6 +103,40 @@ class AliceInterface(CharacterPublicInterface):
 
         return response_data
 
+    @attach_schema(alice.GrantManyPolicies)
+    def grant_many(self, grants: List[dict]) -> dict:
+
+        from nucypher.characters.lawful import Bob
+        requests = []
+        for grant in grants:
+            bob = Bob.from_public_keys(encrypting_key=grant['bob_encrypting_key'],
+                                       verifying_key=grant['bob_verifying_key'])
+            policy_params = dict(threshold=grant['threshold'],
+                                 shares=grant['shares'],
+                                 value=grant.get('value'),
+                                 rate=grant.get('rate'),
+                                 expiration=grant['expiration'])
+            requests.append((bob, grant['label'], policy_params))
+
+        try:
+            new_policies = self.implementer.grant_many(requests)
+            failures = dict()
+        except self.implementer.PartialGrant as e:
+            # The published policies are paid for, so they are returned along with the errors of the others
+            new_policies, failures = e.policies, e.failures
+
+        alice_verifying_key = self.implementer.stamp.as_umbral_pubkey()
+        response_data = {'policies': [{'treasure_map': new_policy.treasure_map,
+                                       'policy_encrypting_key': new_policy.public_key,
+                                       'alice_verifying_key': alice_verifying_key}
+                                      for new_policy in new_policies],
+                         'failures': [{'label': policy.label,
+                                       'bob_verifying_key': policy.bob.stamp.as_umbral_pubkey(),
+                                       'error': str(error)}
+                                      for policy, error in failures.items()]}
+
+        return response_data
+
     @attach_schema(alice.Revoke)
     def revoke(self, label: bytes, bob_verifying_key: bytes) -> dict:
 
@@ -17,6 +17,7 @@
 
 
 import click
+from marshmallow import fields as marshmallow_fields
 from marshmallow import validates_schema
 
 from nucypher.characters.control.specifications import fields as character_fields
@@ -107,6 +108,23 @@ class GrantPolicy(PolicyBaseSchema):
     alice_verifying_key = character_fields.Key(dump_only=True)
 
 
+class GrantFailure(BaseSchema):
+
+    # output
+    label = character_fields.Label(dump_only=True)
+    bob_verifying_key = character_fields.Key(dump_only=True)
+    error = marshmallow_fields.String(dump_only=True)
+
+
+class GrantManyPolicies(BaseSchema):
+
+    grants = base_fields.List(marshmallow_fields.Nested(GrantPolicy), required=True, load_only=True)
+
+    # output
+    policies = base_fields.List(marshmallow_fields.Nested(GrantPolicy), dump_only=True)
+    failures = base_fields.List(marshmallow_fields.Nested(GrantFailure), dump_only=True)
+
+
 class DerivePolicyEncryptionKey(BaseSchema):
 
     label = character_fields.Label(
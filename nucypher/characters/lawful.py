@@ -18,13 +18,14 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 
 import contextlib
 import json
+import math
 import time
 from base64 import b64encode
 from datetime import datetime
 from json.decoder import JSONDecodeError
 from pathlib import Path
 from queue import Queue
-from typing import Dict, Iterable, List, NamedTuple, Tuple, Union, Optional, Sequence, Set, Any
+from typing import Dict, Iterable, List, NamedTuple, Tuple, Union, Optional, Sequence, Set, Any, Type
 
 import maya
 from bytestring_splitter import (
@@ -81,27 +82,33 @@ from nucypher.crypto.powers import (
     TransactingPower,
     TLSHostingPower,
 )
+from nucypher.crypto.encryption import BatchEncryptor
+from nucypher.crypto.reencryption import BatchReencryptor
 from nucypher.crypto.signing import InvalidSignature
 from nucypher.crypto.splitters import key_splitter, signature_splitter
+from nucypher.crypto.utils import keccak_digest
 from nucypher.crypto.umbral_adapter import (
     PublicKey,
     VerificationError,
-    reencrypt,
     VerifiedKeyFrag,
 )
-from nucypher.datastore.datastore import DatastoreTransactionError, RecordNotFound
+from nucypher.datastore.datastore import DatastoreTransactionError
 from nucypher.datastore.queries import find_expired_policies
+from nucypher.datastore.writer import BatchedRecordWriter
 from nucypher.network.exceptions import NodeSeemsToBeDown
 from nucypher.network.middleware import RestMiddleware
 from nucypher.network.nodes import NodeSprout, TEACHER_NODES, Teacher
 from nucypher.network.protocols import InterfaceInfo, parse_node_uri
-from nucypher.network.retrieval import RetrievalClient, ReencryptionResponse
-from nucypher.network.server import ProxyRESTServer, make_rest_app
+from nucypher.network.retrieval import RetrievalClient, ReencryptionRequest, ReencryptionResponse
+from nucypher.network.server import REENCRYPTION_LOG_EXTENSION, ProxyRESTServer, make_rest_app
 from nucypher.network.trackers import AvailabilityTracker
 from nucypher.policy.hrac import HRAC
 from nucypher.policy.kits import MessageKit, PolicyMessageKit
 from nucypher.policy.maps import TreasureMap, EncryptedTreasureMap, AuthorizedKeyFrag
 from nucypher.policy.policies import Policy
+from nucypher.policy.reservoir import StakersSnapshot
+from nucypher.utilities.cache import LRUCache
+from nucypher.utilities.concurrency import WorkerPool
 from nucypher.utilities.logging import Logger
 from nucypher.utilities.networking import validate_worker_ip
 
@@ -110,6 +117,20 @@ class Alice(Character, BlockchainPolicyAuthor):
     banner = ALICE_BANNER
     _interface_class = AliceInterface
     _default_crypto_powerups = [SigningPower, DecryptingPower, DelegatingPower]
+    _kfrag_encryption_processes = 1  # encrypts kfrags in the calling thread; `None` spawns a worker per core
+    _concurrent_grants = 8  # policies making arrangements at the same time in `grant_many()`
+
+    class PartialGrant(RuntimeError):
+        """
+        Raised by `grant_many()` when some of the policies could not be enacted after others were.
+        The enacted policies are in `policies`, in the order of the grants, and are active policies;
+        `failures` maps the policies that were not enacted to their errors.
+        """
+
+        def __init__(self, policies: List['EnactedPolicy'], failures: Dict[Policy, Exception]):
+            self.policies = policies
+            self.failures = failures
+            super().__init__(f"{len(failures)} of {len(policies) + len(failures)} policies were not enacted")
 
     def __init__(self,
 
@@ -153,6 +174,9 @@ class Alice(Character, BlockchainPolicyAuthor):
 
             self._policy_queue = Queue()
             self._policy_queue.put(READY)
+
+            # Encrypts kfrags for Ursulas when constructing treasure maps
+            self.kfrag_encryptor = BatchEncryptor(processes=self._kfrag_encryption_processes)
         else:
             self.threshold = STRANGER_ALICE
             self.shares = STRANGER_ALICE
@@ -192,6 +216,11 @@ class Alice(Character, BlockchainPolicyAuthor):
         self.store_policy_credentials = store_policy_credentials
         self.store_character_cards = store_character_cards
 
+    def disenchant(self):
+        super().disenchant()
+        with contextlib.suppress(AttributeError):  # strangers and partially initialized Alices
+            self.kfrag_encryptor.shutdown()
+
     def get_card(self) -> 'Card':
         from nucypher.policy.identity import Card
         card = Card.from_character(self)
@@ -341,16 +370,7 @@ class Alice(Character, BlockchainPolicyAuthor):
         #
 
         # If we're federated only, we need to block to make sure we have enough nodes.
-        if self.federated_only and len(self.known_nodes) < policy.shares:
-            good_to_go = self.block_until_number_of_known_nodes_is(number_of_nodes_to_know=policy.shares,
-                                                                   learn_on_this_thread=True,
-                                                                   timeout=timeout)
-            if not good_to_go:
-                raise ValueError(
-                    "To make a Policy in federated mode, you need to know about "
-                    "all the Ursulas you need (in this case, {}); there's no other way to "
-                    "know which nodes to use.  Either pass them here or when you make the Policy, "
-                    "or run the learning loop on a network with enough Ursulas.".format(policy.shares))
+        self.__block_until_enough_federated_nodes(shares=policy.shares, timeout=timeout)
 
         self.log.debug(f"Enacting {policy} ... ")
         enacted_policy = policy.enact(network_middleware=self.network_middleware,
@@ -359,6 +379,115 @@ class Alice(Character, BlockchainPolicyAuthor):
         self.add_active_policy(enacted_policy)
         return enacted_policy
 
+    def grant_many(self,
+                   grants: Iterable[Tuple["Bob", bytes, dict]],
+                   timeout: int = None,
+                   ) -> List['EnactedPolicy']:
+        """
+        Grants a number of policies at once, each given as a (bob, label, policy_params) tuple,
+        with the same policy parameters as `grant()`.
+
+        The stakers are read from the blockchain once for all the policies with the same duration,
+        the arrangements of several policies are proposed at the same time,
+        and the policies are published with consecutive nonces, without waiting for each transaction
+        to be mined before sending the next one. Nothing is published unless all the policies
+        found enough Ursulas.
+
+        Returns the enacted policies in the order of the grants. If some of the policies fail to be published,
+        raises `PartialGrant` with the ones that were, after recording them as active policies.
+        """
+
+        timeout = timeout or self.timeout
+
+        policies = []
+        for bob, label, policy_params in grants:
+            policy = self.create_policy(bob=bob, label=label, **policy_params)
+            self._check_grant_requirements(policy=policy)
+            policies.append(policy)
+        if not policies:
+            return []
+
+        # The same (bob, label) twice would be the same policy on the blockchain,
+        # and publishing it a second time would fail after the first one was paid for.
+        hracs = [policy.hrac for policy in policies]
+        if len(set(hracs)) != len(hracs):
+            duplicates = {policy.label for policy in policies if hracs.count(policy.hrac) > 1}
+            raise ValueError(f"The same policy is granted more than once: {', '.join(map(repr, sorted(duplicates)))}")
+        self.log.debug(f"Generated {len(policies)} new policy proposals ... ")
+
+        max_shares = max(policy.shares for policy in policies)
+        self.__block_until_enough_federated_nodes(shares=max_shares, timeout=timeout)
+
+        # See `Policy.enact()`
+        if not self._learning_task.running:
+            self.start_learning_loop()
+        # Learn here once, instead of in each of the policies' threads
+        self.block_until_number_of_known_nodes_is(max_shares, learn_on_this_thread=True, eager=True)
+
+        stakers = None if self.federated_only else StakersSnapshot(staking_agent=self.staking_agent)
+
+        def worker(policy):
+            reservoir = None if stakers is None else stakers.make_reservoir(duration_periods=policy.payment_periods)
+            return policy._make_arrangements(network_middleware=self.network_middleware,
+                                             timeout=timeout,
+                                             reservoir=reservoir)
+
+        def value_factory(successes):
+            batch = pending_policies.copy()
+            pending_policies.clear()
+            return batch
+
+        pending_policies = list(policies)
+        rounds = math.ceil(len(policies) / self._concurrent_grants)
+        worker_pool = WorkerPool(worker=worker,
+                                 value_factory=value_factory,
+                                 target_successes=len(policies),
+                                 timeout=(rounds + 1) * timeout,
+                                 threadpool_size=self._concurrent_grants,
+                                 name='grant_many')
+        worker_pool.start()
+        try:
+            arrangements = worker_pool.block_until_target_successes()
+        except (WorkerPool.OutOfValues, WorkerPool.TimedOut):
+            # Report the error of the first policy that failed, if any
+            failures = worker_pool.get_failures()
+            for policy in policies:
+                if policy in failures:
+                    _type, exception, _traceback = failures[policy]
+                    raise exception
+            raise
+        finally:
+            worker_pool.cancel()
+            worker_pool.join()
+
+        self.log.debug(f"Enacting {len(policies)} policies ... ")
+        failures = type(policies[0])._enact_many_arrangements({policy: arrangements[policy] for policy in policies})
+
+        # The policies that were published are paid for, so they are recorded even if others failed.
+        enacted_policies = []
+        for policy in policies:
+            if policy in failures:
+                continue
+            enacted_policy = policy._make_enacted_policy(arrangements[policy])
+            self.add_active_policy(enacted_policy)
+            enacted_policies.append(enacted_policy)
+
+        if failures:
+            raise self.PartialGrant(policies=enacted_policies, failures=failures)
+        return enacted_policies
+
+    def __block_until_enough_federated_nodes(self, shares: int, timeout: int) -> None:
+        if self.federated_only and len(self.known_nodes) < shares:
+            good_to_go = self.block_until_number_of_known_nodes_is(number_of_nodes_to_know=shares,
+                                                                   learn_on_this_thread=True,
+                                                                   timeout=timeout)
+            if not good_to_go:
+                raise ValueError(
+                    "To make a Policy in federated mode, you need to know about "
+                    "all the Ursulas you need (in this case, {}); there's no other way to "
+                    "know which nodes to use.  Either pass them here or when you make the Policy, "
+                    "or run the learning loop on a network with enough Ursulas.".format(shares))
+
     def get_policy_encrypting_key_from_label(self, label: bytes) -> PublicKey:
         alice_delegating_power = self._crypto_power.power_ups(DelegatingPower)
         policy_pubkey = alice_delegating_power.get_pubkey_from_label(label)
@@ -486,6 +615,14 @@ class Alice(Character, BlockchainPolicyAuthor):
             response = controller(method_name='grant', control_request=request)
             return response
 
+        @alice_flask_control.route("/grant_many", methods=['PUT'])
+        def grant_many() -> Response:
+            """
+            Character control endpoint for granting a number of policies at once.
+            """
+            response = controller(method_name='grant_many', control_request=request)
+            return response
+
         @alice_flask_control.route("/revoke", methods=['DELETE'])
         def revoke():
             """
@@ -560,6 +697,8 @@ class Bob(Character):
             alice_verifying_key: PublicKey, # KeyFrag signer's key
             encrypted_treasure_map: EncryptedTreasureMap,
             policy_encrypting_key: PublicKey, # TODO: #2792
+            concurrency: int = RetrievalClient.DEFAULT_CONCURRENCY,
+            request_timeout: float = RetrievalClient.DEFAULT_REQUEST_TIMEOUT,
             ) -> List[PolicyMessageKit]:
         """
         Attempts to retrieve reencrypted capsule fragments
@@ -573,6 +712,9 @@ class Bob(Character):
         with the kits containing the capsule fragments obtained during the retrieval.
         These kits can be used as an external cache to preserve the cfrags between
         several retrieval attempts.
+
+        If ``concurrency`` is greater than 1, up to that many Ursulas are queried in parallel.
+        ``request_timeout`` is the deadline for each individual reencryption request.
         """
 
         if encrypted_treasure_map.hrac in self._treasure_maps:
@@ -594,7 +736,7 @@ class Bob(Character):
         retrieval_kits = [message_kit.as_retrieval_kit() for message_kit in message_kits]
 
         # Retrieve capsule frags
-        client = RetrievalClient(learner=self)
+        client = RetrievalClient(learner=self, concurrency=concurrency, request_timeout=request_timeout)
         retrieval_results = client.retrieve_cfrags(
             treasure_map=treasure_map,
             retrieval_kits=retrieval_kits,
@@ -677,6 +819,15 @@ class Ursula(Teacher, Character, Worker):
     ]
 
     _pruning_interval = 60  # seconds
+    _revocations_polling_interval = 60  # seconds
+    _reencryption_processes = None  # defaults to the number of cores
+    _verified_kfrags_cache_size = 1000  # policies
+    _strangers_cache_size = 1000  # characters
+
+    # Evidence of re-encryption requests is written to the datastore in batches, off the request path
+    _reencryption_log_flush_interval = BatchedRecordWriter.DEFAULT_FLUSH_INTERVAL  # seconds
+    _reencryption_log_batch_size = BatchedRecordWriter.DEFAULT_MAX_BATCH_SIZE
+    _reencryption_log_durability = BatchedRecordWriter.BATCHED
 
     class NotEnoughUrsulas(Learner.NotEnoughTeachers, StakingEscrowAgent.NotEnoughStakers):
         """
@@ -741,6 +892,11 @@ class Ursula(Teacher, Character, Worker):
             self._availability_check = availability_check
             self._availability_tracker = AvailabilityTracker(ursula=self)
 
+            # Re-encryption
+            self._reencryptor = BatchReencryptor(processes=self._reencryption_processes)
+            self._verified_kfrags = LRUCache(maxsize=self._verified_kfrags_cache_size)
+            self._strangers = LRUCache(maxsize=self._strangers_cache_size)
+
             # Datastore Pruning
             self.__pruning_task: Union[Deferred, None] = None
             self._datastore_pruning_task = LoopingCall(f=self.__prune_datastore)
@@ -778,6 +934,9 @@ class Ursula(Teacher, Character, Worker):
                     self.stop(halt_reactor=False)
                     raise
 
+                # Policy Revocations
+                self._policy_revocations_task = LoopingCall(f=self.__watch_policy_revocations)
+
             self.rest_server = self._make_local_server(host=rest_host,
                                                        port=rest_port,
                                                        db_filepath=db_filepath,
@@ -848,18 +1007,31 @@ class Ursula(Teacher, Character, Worker):
     def __prune_datastore(self) -> None:
         """Deletes all expired arrangements, kfrags, and treasure maps in the datastore."""
         now = maya.MayaDT.from_datetime(datetime.fromtimestamp(self._datastore_pruning_task.clock.seconds()))
+        result = 0
         try:
             with find_expired_policies(self.datastore, now) as expired_policies:
                 for policy in expired_policies:
                     policy.delete()
-                result = len(expired_policies)
-        except RecordNotFound:
-            self.log.debug("No expired policy arrangements found.")
+                    result += 1
         except DatastoreTransactionError:
             self.log.warn(f"Failed to prune policy arrangements; DB session rolled back.")
         else:
             if result > 0:
                 self.log.debug(f"Pruned {result} policy arrangements.")
+            else:
+                self.log.debug("No expired policy arrangements found.")
+
+    def __watch_policy_revocations(self) -> None:
+        """Invalidates the cached status of policies revoked on-chain."""
+        try:
+            self.invalidate_revoked_policies()
+        except Exception as e:
+            self.log.warn(f"Failed to check for policy revocations: {e}")
+
+    @property
+    def watching_revocations(self) -> bool:
+        task = getattr(self, '_policy_revocations_task', None)
+        return bool(task and task.running)
 
     def __preflight(self) -> None:
         """Called immediately before running services
@@ -930,6 +1102,7 @@ class Ursula(Teacher, Character, Worker):
             self.work_tracker.start(commit_now=True)  # requirement_func=self._availability_tracker.status)  # TODO: #2277
             if emitter:
                 emitter.message(f"✓ Work Tracking", color='green')
+            self._policy_revocations_task.start(interval=self._revocations_polling_interval, now=True)
 
         #
         # Non-order dependant services
@@ -976,12 +1149,20 @@ class Ursula(Teacher, Character, Worker):
         # CAUTION #
         """
         self.log.debug(f"---------Stopping {self}")
+        # Release the re-encryption workers and flush the log first,
+        # so a failure in the teardown below can't leave them running.
+        with contextlib.suppress(AttributeError):
+            self._reencryptor.shutdown()
+        with contextlib.suppress(AttributeError, PowerUpError):
+            self.reencryption_log.stop()
         # Handles the shutdown of a partially initialized character.
         with contextlib.suppress(AttributeError):  # TODO: Is this acceptable here, what are alternatives?
             self._availability_tracker.stop()
             self.stop_learning_loop()
             if not self.federated_only:
                 self.work_tracker.stop()
+                if self._policy_revocations_task.running:
+                    self._policy_revocations_task.stop()
             if self._datastore_pruning_task.running:
                 self._datastore_pruning_task.stop()
         if halt_reactor:
@@ -999,6 +1180,8 @@ class Ursula(Teacher, Character, Worker):
 
         # `rest_server` holds references to the datastore (directly and via `rest_app`).
         # An open datastore hogs up file descriptors.
+        with contextlib.suppress(AttributeError):
+            self.reencryption_log.stop()
         self.rest_server = INVALIDATED
 
     def rest_information(self):
@@ -1323,6 +1506,11 @@ class Ursula(Teacher, Character, Worker):
         else:
             return rest_app_on_server
 
+    @property
+    def reencryption_log(self) -> BatchedRecordWriter:
+        """Writes evidence of re-encryption requests to the datastore, in batches."""
+        return self.rest_app.extensions[REENCRYPTION_LOG_EXTENSION]
+
     def interface_info_with_metadata(self):
         # TODO: Do we ever actually use this without using the rest of the serialized Ursula?  337
         return constants.BYTESTRING_IS_URSULA_IFACE_INFO + bytes(self)
@@ -1360,14 +1548,48 @@ class Ursula(Teacher, Character, Worker):
 
         return verified_kfrag
 
-    def _reencrypt(self, kfrag: VerifiedKeyFrag, capsules) -> ReencryptionResponse:
-        cfrags = []
-        for capsule in capsules:
-            cfrag = reencrypt(capsule, kfrag)
-            cfrags.append(cfrag)
-            self.log.info(f"Re-encrypted capsule {capsule} -> made {cfrag}.")
+    def stranger_from_verifying_key(self, character_class: Type[Character], verifying_key: PublicKey) -> Character:
+        """Returns a stranger of `character_class` with the given verifying key, built once and cached."""
+        key = (character_class, bytes(verifying_key))
+        stranger = self._strangers.get(key)
+        if stranger is None:
+            stranger = character_class.from_public_keys(verifying_key=verifying_key)
+            self._strangers.put(key, stranger)
+        return stranger
+
+    @staticmethod
+    def __verified_kfrag_key(reenc_request: ReencryptionRequest) -> Tuple[HRAC, bytes, bytes]:
+        # The kfrag is verified against the author's key, so it is part of the key too.
+        return (reenc_request.hrac,
+                bytes(reenc_request.alice_verifying_key),
+                keccak_digest(bytes(reenc_request.encrypted_kfrag)))
+
+    def get_verified_kfrag(self, reenc_request: ReencryptionRequest) -> Optional[VerifiedKeyFrag]:
+        """
+        Returns the kfrag previously decrypted and verified for the same policy and encrypted kfrag,
+        if any, so that repeated requests skip straight to re-encryption.
+        """
+        if reenc_request.hrac in self.revoked_policies:
+            return None
+        return self._verified_kfrags.get(self.__verified_kfrag_key(reenc_request))
+
+    def remember_verified_kfrag(self, reenc_request: ReencryptionRequest, verified_kfrag: VerifiedKeyFrag) -> None:
+        self._verified_kfrags.put(self.__verified_kfrag_key(reenc_request), verified_kfrag)
 
-        return ReencryptionResponse.construct_by_ursula(capsules, cfrags, self.stamp)
+    def invalidate_policy(self, hrac: HRAC) -> None:
+        """Drops everything cached about a policy, e.g. when it is revoked."""
+        if not self.federated_only:
+            super().invalidate_policy(hrac)
+        for key, _verified_kfrag in self._verified_kfrags.items():
+            if key[0] == hrac:
+                self._verified_kfrags.invalidate(key)
+
+    def _reencrypt(self, kfrag: VerifiedKeyFrag, capsules) -> ReencryptionResponse:
+        serialized_cfrags = self._reencryptor.reencrypt(kfrag=kfrag, capsules=capsules)
+        self.log.info(f"Re-encrypted {len(capsules)} capsules.")
+        return ReencryptionResponse.construct_from_serialized_cfrags(capsules=capsules,
+                                                                     serialized_cfrags=serialized_cfrags,
+                                                                     stamp=self.stamp)
 
     def status_info(self, omit_known_nodes: bool = False) -> 'LocalUrsulaStatus':
 
@@ -55,6 +55,7 @@ from nucypher.cli.options import (
     option_teacher_uri,
     option_threshold,
     option_lonely,
+    option_learning_concurrency,
     option_max_gas_price,
     option_key_material
 )
@@ -89,6 +90,7 @@ class AliceConfigOptions:
                  max_gas_price: int,  # gwei
                  signer_uri: str,
                  lonely: bool,
+                 learning_concurrency: int,
                  ):
 
         self.dev = dev
@@ -103,6 +105,7 @@ class AliceConfigOptions:
         self.registry_filepath = registry_filepath
         self.middleware = middleware
         self.lonely = lonely
+        self.learning_concurrency = learning_concurrency
 
     def create_config(self, emitter, config_file):
 
@@ -124,7 +127,8 @@ class AliceConfigOptions:
                 gas_strategy=self.gas_strategy,
                 max_gas_price=self.max_gas_price,
                 federated_only=True,
-                lonely=self.lonely
+                lonely=self.lonely,
+                learning_concurrency=self.learning_concurrency
             )
 
         else:
@@ -146,7 +150,8 @@ class AliceConfigOptions:
                     rest_port=self.discovery_port,
                     checksum_address=self.pay_with,
                     registry_filepath=self.registry_filepath,
-                    lonely=self.lonely
+                    lonely=self.lonely,
+                    learning_concurrency=self.learning_concurrency
                 )
             except FileNotFoundError:
                 return handle_missing_configuration_file(
@@ -169,6 +174,7 @@ group_config_options = group_options(
     registry_filepath=option_registry_filepath,
     middleware=option_middleware,
     lonely=option_lonely,
+    learning_concurrency=option_learning_concurrency,
 )
 
 
@@ -232,7 +238,8 @@ class AliceFullConfigOptions:
                        light=self.light,
                        threshold=self.threshold,
                        shares=self.shares,
-                       payment_periods=self.payment_periods)
+                       payment_periods=self.payment_periods,
+                       learning_concurrency=opts.learning_concurrency)
         # Depends on defaults being set on Configuration classes, filtrates None values
         updates = {k: v for k, v in payload.items() if v is not None}
         return updates
@@ -52,6 +52,7 @@ from nucypher.cli.options import (
     option_signer_uri,
     option_teacher_uri,
     option_lonely,
+    option_learning_concurrency,
     option_max_gas_price,
     option_key_material
 )
@@ -81,7 +82,8 @@ class BobConfigOptions:
                  gas_strategy: str,
                  max_gas_price: int,
                  signer_uri: str,
-                 lonely: bool
+                 lonely: bool,
+                 learning_concurrency: int
                  ):
 
         self.provider_uri = provider_uri
@@ -96,6 +98,7 @@ class BobConfigOptions:
         self.middleware = middleware
         self.federated_only = federated_only
         self.lonely = lonely
+        self.learning_concurrency = learning_concurrency
 
     def create_config(self, emitter: StdoutEmitter, config_file: Path) -> BobConfiguration:
         if self.dev:
@@ -110,7 +113,8 @@ class BobConfigOptions:
                 federated_only=True,
                 checksum_address=self.checksum_address,
                 network_middleware=self.middleware,
-                lonely=self.lonely
+                lonely=self.lonely,
+                learning_concurrency=self.learning_concurrency
             )
         else:
             if not config_file:
@@ -130,7 +134,8 @@ class BobConfigOptions:
                     max_gas_price=self.max_gas_price,
                     registry_filepath=self.registry_filepath,
                     network_middleware=self.middleware,
-                    lonely=self.lonely
+                    lonely=self.lonely,
+                    learning_concurrency=self.learning_concurrency
                 )
             except FileNotFoundError:
                 handle_missing_configuration_file(character_config_class=BobConfiguration,
@@ -156,7 +161,8 @@ class BobConfigOptions:
             signer_uri=self.signer_uri,
             gas_strategy=self.gas_strategy,
             max_gas_price=self.max_gas_price,
-            lonely=self.lonely
+            lonely=self.lonely,
+            learning_concurrency=self.learning_concurrency
         )
 
     def get_updates(self) -> dict:
@@ -168,7 +174,8 @@ class BobConfigOptions:
                        signer_uri=self.signer_uri,
                        gas_strategy=self.gas_strategy,
                        max_gas_price=self.max_gas_price,
-                       lonely=self.lonely
+                       lonely=self.lonely,
+                       learning_concurrency=self.learning_concurrency
                        )
         # Depends on defaults being set on Configuration classes, filtrates None values
         updates = {k: v for k, v in payload.items() if v is not None}
@@ -189,6 +196,7 @@ group_config_options = group_options(
     middleware=option_middleware,
     federated_only=option_federated_only,
     lonely=option_lonely,
+    learning_concurrency=option_learning_concurrency,
 )
 
 
@@ -26,6 +26,7 @@ from nucypher.blockchain.eth.constants import (
     POLICY_MANAGER_CONTRACT_NAME,
     STAKING_ESCROW_CONTRACT_NAME
 )
+from nucypher.blockchain.eth.event_index import ContractEventIndex
 from nucypher.blockchain.eth.networks import NetworksInventory
 from nucypher.blockchain.eth.utils import estimate_block_number_for_period
 from nucypher.cli.config import group_general_config
@@ -212,6 +213,7 @@ def events(general_config, registry_options, contract_name, from_block, to_block
                                        message=f'Event filter must be specified as name-value pairs of '
                                                f'the form `<name>=<value>` - {str(e)}')
 
+    event_index = ContractEventIndex.for_blockchain(blockchain)
     emitter.echo(f"Retrieving events from block {from_block} to {to_block}")
     for contract_name in contract_names:
         agent = ContractAgency.get_agent_by_contract_name(contract_name, registry)
@@ -235,7 +237,8 @@ def events(general_config, registry_options, contract_name, from_block, to_block
                             from_block=from_block,
                             to_block=to_block,
                             argument_filters=argument_filters,
-                            csv_output_file=csv_output_file)
+                            csv_output_file=csv_output_file,
+                            event_index=event_index)
 
 
 @status.command(name='fee-range')
@@ -53,6 +53,7 @@ from nucypher.cli.options import (
     option_signer_uri,
     option_teacher_uri,
     option_lonely,
+    option_learning_concurrency,
     option_max_gas_price,
     option_key_material
 )
@@ -64,6 +65,7 @@ from nucypher.config.constants import (
     NUCYPHER_ENVVAR_WORKER_ETH_PASSWORD,
     TEMPORARY_DOMAIN
 )
+from nucypher.config.storages import LocalFileBasedNodeStorage
 from nucypher.crypto.keystore import Keystore
 
 
@@ -87,7 +89,8 @@ class UrsulaConfigOptions:
                  max_gas_price: int,  # gwei
                  signer_uri: str,
                  availability_check: bool,
-                 lonely: bool
+                 lonely: bool,
+                 learning_concurrency: int
                  ):
 
         if federated_only:
@@ -111,6 +114,7 @@ class UrsulaConfigOptions:
         self.max_gas_price = max_gas_price
         self.availability_check = availability_check
         self.lonely = lonely
+        self.learning_concurrency = learning_concurrency
 
     def create_config(self, emitter, config_file):
         if self.dev:
@@ -130,7 +134,8 @@ class UrsulaConfigOptions:
                 rest_host=self.rest_host,
                 rest_port=self.rest_port,
                 db_filepath=self.db_filepath,
-                availability_check=self.availability_check
+                availability_check=self.availability_check,
+                learning_concurrency=self.learning_concurrency
             )
         else:
             if not config_file:
@@ -153,7 +158,8 @@ class UrsulaConfigOptions:
                     poa=self.poa,
                     light=self.light,
                     federated_only=self.federated_only,
-                    availability_check=self.availability_check
+                    availability_check=self.availability_check,
+                    learning_concurrency=self.learning_concurrency
                 )
             except FileNotFoundError:
                 return handle_missing_configuration_file(character_config_class=UrsulaConfiguration, config_file=config_file)
@@ -196,7 +202,8 @@ class UrsulaConfigOptions:
                                             max_gas_price=self.max_gas_price,
                                             poa=self.poa,
                                             light=self.light,
-                                            availability_check=self.availability_check)
+                                            availability_check=self.availability_check,
+                                            learning_concurrency=self.learning_concurrency)
 
     def get_updates(self) -> dict:
         payload = dict(rest_host=self.rest_host,
@@ -212,7 +219,8 @@ class UrsulaConfigOptions:
                        max_gas_price=self.max_gas_price,
                        poa=self.poa,
                        light=self.light,
-                       availability_check=self.availability_check)
+                       availability_check=self.availability_check,
+                       learning_concurrency=self.learning_concurrency)
         # Depends on defaults being set on Configuration classes, filtrates None values
         updates = {k: v for k, v in payload.items() if v is not None}
         return updates
@@ -236,6 +244,7 @@ group_config_options = group_options(
     dev=option_dev,
     availability_check=click.option('--availability-check/--disable-availability-check', help="Enable or disable self-health checks while running", is_flag=True, default=None),
     lonely=option_lonely,
+    learning_concurrency=option_learning_concurrency,
 )
 
 
@@ -417,7 +426,11 @@ def save_metadata(general_config, character_options, config_file):
     emitter = setup_emitter(general_config, character_options.config_options.worker_address)
     _pre_launch_warnings(emitter, dev=character_options.config_options.dev, force=None)
     _, URSULA = character_options.create_character(emitter, config_file, general_config.json_ipc, load_seednodes=False)
-    metadata_path = URSULA.write_node_metadata(node=URSULA)
+    if isinstance(URSULA.node_storage, LocalFileBasedNodeStorage):
+        # A file of its own, rather than the store of all the known nodes
+        metadata_path = URSULA.store_metadata(filepath=URSULA.node_storage.generate_metadata_filepath(URSULA.stamp))
+    else:
+        metadata_path = URSULA.write_node_metadata(node=URSULA)
     emitter.message(SUCCESSFUL_MANUALLY_SAVE_METADATA.format(metadata_path=metadata_path), color='green')
 
 
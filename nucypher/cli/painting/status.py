@@ -22,8 +22,6 @@ import maya
 from typing import List
 from web3.main import Web3
 
-from nucypher.config.constants import TEMPORARY_DOMAIN
-from nucypher.blockchain.eth.actors import Staker
 from nucypher.blockchain.eth.agents import (
     AdjudicatorAgent,
     ContractAgency,
@@ -120,7 +118,8 @@ def paint_locked_tokens_status(emitter, agent, periods) -> None:
 
     MAX_ROWS = 30
     period_range = list(range(1, periods + 1))
-    token_counter = Counter({day: agent.get_all_locked_tokens(day) for day in period_range})
+    projection = agent.get_all_locked_tokens_projection(periods)
+    token_counter = Counter(dict(zip(period_range, projection)))
 
     width = 60  # Adjust to desired width
     longest_key = max(len(str(key)) for key in token_counter)
@@ -156,26 +155,28 @@ def paint_stakers(emitter, stakers: List[str], registry: BaseContractRegistry) -
     emitter.echo(f"{'Checksum address':42}  Staker information")
     emitter.echo('=' * (42 + 2 + 53))
 
-    for staker_address in stakers:
-        staker = Staker(domain=TEMPORARY_DOMAIN,
-                        checksum_address=staker_address,
-                        registry=registry)
+    policy_agent = ContractAgency.get_agent(PolicyManagerAgent, registry=registry)
+    stakers_status = staking_agent.get_stakers_status(staker_addresses=stakers)
+    fee_amounts = policy_agent.get_fee_amounts(staker_addresses=stakers)
+    min_fee_rates = policy_agent.get_min_fee_rates(staker_addresses=stakers)
+    for staker_address, staker_status, fee_amount, min_fee_rate in zip(stakers, stakers_status, fee_amounts, min_fee_rates):
         nickname = Nickname.from_seed(staker_address)
         emitter.echo(f"{staker_address}  {'Nickname:':10} {nickname} {nickname.icon}")
         tab = " " * len(staker_address)
 
-        owned_tokens = staker.owned_tokens()
-        last_committed_period = staker.last_committed_period
-        worker = staker.worker_address
-        is_restaking = staker.is_restaking
-        is_winding_down = staker.is_winding_down
-        is_taking_snapshots = staker.is_taking_snapshots
+        owned_tokens = NU.from_nunits(staker_status.owned_tokens)
+        last_committed_period = staker_status.last_committed_period
+        worker = staker_status.worker
+        is_restaking = staker_status.flags.restake_flag
+        is_winding_down = staker_status.flags.wind_down_flag
+        is_taking_snapshots = staker_status.flags.snapshot_flag
 
         missing_commitments = current_period - last_committed_period
         owned_in_nu = round(owned_tokens, 2)
-        current_locked_tokens = round(staker.locked_tokens(periods=0), 2)
-        next_locked_tokens = round(staker.locked_tokens(periods=1), 2)
-        reward_amount = round(NU.from_nunits(staking_agent.calculate_staking_reward(staker_address=staker_address)), 2)
+        current_locked_tokens = round(NU.from_nunits(staker_status.current_locked_tokens), 2)
+        next_locked_tokens = round(NU.from_nunits(staker_status.next_locked_tokens), 2)
+        non_withdrawable_stake = max(staker_status.current_locked_tokens, staker_status.next_locked_tokens)
+        reward_amount = round(NU.from_nunits(staker_status.owned_tokens - non_withdrawable_stake), 2)
 
         emitter.echo(f"{tab}  {'Owned:':10} {owned_in_nu}")
         emitter.echo(f"{tab}  Staked in current period: {current_locked_tokens}")
@@ -206,8 +207,8 @@ def paint_stakers(emitter, stakers: List[str], registry: BaseContractRegistry) -
         else:
             emitter.echo(f"{worker}")
 
-        fees = prettify_eth_amount(staker.calculate_policy_fee())
+        fees = prettify_eth_amount(fee_amount)
         emitter.echo(f"{tab}  Unclaimed fees: {fees}")
 
-        min_rate = prettify_eth_amount(staker.min_fee_rate)
+        min_rate = prettify_eth_amount(min_fee_rate)
         emitter.echo(f"{tab}  Min fee rate: {min_rate}")
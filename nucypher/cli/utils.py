@@ -26,7 +26,7 @@ from constant_sorrow.constants import NO_CONTROL_PROTOCOL
 from web3.types import BlockIdentifier
 
 from nucypher.blockchain.eth.agents import EthereumContractAgent
-from nucypher.blockchain.eth.events import EventRecord
+from nucypher.blockchain.eth.event_index import ContractEventIndex
 from nucypher.blockchain.eth.interfaces import (
     BlockchainDeployerInterface,
     BlockchainInterface,
@@ -264,7 +264,9 @@ def retrieve_events(emitter: StdoutEmitter,
                     from_block: BlockIdentifier,
                     to_block: BlockIdentifier,
                     argument_filters: Dict,
-                    csv_output_file: Optional[Path] = None) -> None:
+                    csv_output_file: Optional[Path] = None,
+                    event_index: Optional[ContractEventIndex] = None) -> None:
+    event_index = event_index or ContractEventIndex()
     if csv_output_file:
         if csv_output_file.exists():
             click.confirm(CONFIRM_OVERWRITE_EVENTS_CSV_FILE.format(csv_file=csv_output_file), abort=True)
@@ -273,7 +275,8 @@ def retrieve_events(emitter: StdoutEmitter,
                                                     event_name=event_name,
                                                     from_block=from_block,
                                                     to_block=to_block,
-                                                    argument_filters=argument_filters)
+                                                    argument_filters=argument_filters,
+                                                    event_index=event_index)
         if available_events:
             emitter.echo(f"{agent.contract_name}::{event_name} events written to {csv_output_file}",
                          bold=True,
@@ -281,8 +284,11 @@ def retrieve_events(emitter: StdoutEmitter,
         else:
             emitter.echo(f'No {agent.contract_name}::{event_name} events found', color='yellow')
     else:
-        event = agent.contract.events[event_name]
         emitter.echo(f"{event_name}:", bold=True, color='yellow')
-        entries = event.getLogs(fromBlock=from_block, toBlock=to_block, argument_filters=argument_filters)
-        for event_record in entries:
-            emitter.echo(f"  - {EventRecord(event_record)}")
+        event_records = event_index.events(agent=agent,
+                                           event_name=event_name,
+                                           from_block=from_block,
+                                           to_block=to_block,
+                                           **(argument_filters or dict()))
+        for event_record in event_records:
+            emitter.echo(f"  - {event_record}")
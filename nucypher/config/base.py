@@ -339,6 +339,9 @@ class CharacterConfiguration(BaseConfiguration):
     # Gas
     DEFAULT_GAS_STRATEGY = 'fast'
 
+    # Learning
+    DEFAULT_LEARNING_CONCURRENCY = 1
+
     # Fields specified here are *not* passed into the Character's constructor
     # and can be understood as configuration fields only.
     _CONFIG_FIELDS = ('config_root',
@@ -381,6 +384,7 @@ class CharacterConfiguration(BaseConfiguration):
                  interface_signature: Signature = None,
                  network_middleware: RestMiddleware = None,
                  lonely: bool = False,
+                 learning_concurrency: int = None,
 
                  # Node Storage
                  known_nodes: set = None,
@@ -448,6 +452,7 @@ class CharacterConfiguration(BaseConfiguration):
         self.reload_metadata = reload_metadata
         self.known_nodes = known_nodes or set()  # handpicked
         self.lonely = lonely
+        self.learning_concurrency = learning_concurrency or self.DEFAULT_LEARNING_CONCURRENCY
 
         # Configuration
         self.__dev_mode = dev_mode
@@ -692,6 +697,7 @@ class CharacterConfiguration(BaseConfiguration):
             save_metadata=self.save_metadata,
             node_storage=self.node_storage.payload(),
             lonely=self.lonely,
+            learning_concurrency=self.learning_concurrency,
         )
 
         # Optional values (mode)
@@ -16,10 +16,13 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 import binascii
+import mmap
+import os
 import tempfile
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Optional, Set, Union
+from threading import RLock
+from typing import Any, Dict, Iterator, Optional, Set, Tuple, Union
 
 import OpenSSL
 from bytestring_splitter import BytestringSplittingError
@@ -33,8 +36,14 @@ from nucypher.blockchain.eth.registry import BaseContractRegistry
 from nucypher.config.constants import DEFAULT_CONFIG_ROOT
 from nucypher.config.util import cast_paths_from
 from nucypher.crypto.signing import SignatureStamp
+from nucypher.crypto.umbral_adapter import PublicKey
 from nucypher.utilities.logging import Logger
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows: node metadata is stored in a file per node, see `NodeMetadataDirectory`
+
 
 class NodeStorage(ABC):
     _name = NotImplemented
@@ -244,9 +253,271 @@ class ForgetfulNodeStorage(NodeStorage):
         self.__certificates = dict()
 
 
+class NodeMetadataStore:
+    """
+    An append-only file of node metadata, memory-mapped for reading,
+    with an in-memory index of the records keyed by node stamp.
+
+    Each record is the length of the metadata (4 bytes), the stamp and the metadata.
+    A record supersedes the earlier ones for the same stamp;
+    superseded records are dropped when the file is compacted, on opening.
+
+    The file is shared by all the characters using the same storage root, possibly in several processes:
+    records are appended with O_APPEND under a shared lock, while checking the tail of the file
+    and compacting it take an exclusive lock. Each process indexes the records appended by the others
+    as soon as it sees the file grow, and reopens the file if it was replaced by a compaction.
+    """
+
+    MAGIC = b'NUNODES\x01'
+    STAMP_LENGTH = PublicKey.serialized_size()
+    _LENGTH_SIZE = 4
+
+    class InvalidStore(NodeStorage.NodeStorageError):
+        """The file is not a node metadata store"""
+
+    def __init__(self, filepath: Path):
+        self.filepath = filepath
+        self.log = Logger(self.__class__.__name__)
+        self.__lock = RLock()
+        self.__fd = None
+        self.__mmap = None
+        self.__index: Dict[bytes, Tuple[int, int]] = dict()  # stamp -> (offset, length) of the metadata
+        self.__scanned = 0  # the end of the last indexed record
+        self.__superseded = 0
+
+    #
+    # File
+    #
+
+    def __open(self) -> None:
+        while self.__fd is None:
+            self.filepath.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.filepath, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o666)
+            # Exclusive, so that no other process is in the middle of appending a record
+            # while we check the tail of the file.
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            if self.__is_replaced(fd):
+                # Compacted by another process since we opened it
+                os.close(fd)
+                continue
+
+            self.__fd = fd
+            try:
+                compacted = self.__load()
+            except BaseException:
+                self.close()
+                raise
+            if compacted:
+                self.close()
+            else:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def __is_replaced(self, fd: int) -> bool:
+        try:
+            return os.stat(self.filepath).st_ino != os.fstat(fd).st_ino
+        except FileNotFoundError:
+            return True
+
+    def __load(self) -> bool:
+        """
+        Indexes the file, which must be locked exclusively.
+        Returns ``True`` if it was compacted, and has to be opened again.
+        """
+        size = os.fstat(self.__fd).st_size
+        if size == 0:
+            os.write(self.__fd, self.MAGIC)
+            size = len(self.MAGIC)
+        self.__remap(size)
+        if self.__mmap[:len(self.MAGIC)] != self.MAGIC:
+            raise self.InvalidStore(f"{self.filepath} is not a node metadata store")
+
+        self.__scanned = len(self.MAGIC)
+        self.__scan()
+        if self.__scanned < size:
+            # A record was not written completely, e.g. the process was interrupted
+            self.log.warn(f"Dropping {size - self.__scanned} bytes of incomplete node metadata in {self.filepath}")
+            os.ftruncate(self.__fd, self.__scanned)
+            self.__remap(self.__scanned)
+
+        if self.__superseded > len(self.__index):
+            self.__compact()
+            return True
+        return False
+
+    def __remap(self, size: int) -> None:
+        if self.__mmap is not None:
+            self.__mmap.close()
+        self.__mmap = mmap.mmap(self.__fd, size, access=mmap.ACCESS_READ)
+
+    def __scan(self) -> None:
+        """Indexes the complete records mapped past the last indexed one."""
+        header_size = self._LENGTH_SIZE + self.STAMP_LENGTH
+        size = len(self.__mmap)
+        offset = self.__scanned
+        while offset + header_size <= size:
+            length = int.from_bytes(self.__mmap[offset:offset + self._LENGTH_SIZE], 'big')
+            stamp = self.__mmap[offset + self._LENGTH_SIZE:offset + header_size]
+            end = offset + header_size + length
+            if end > size:
+                # Incomplete, possibly still being written by another process
+                break
+            if stamp in self.__index:
+                self.__superseded += 1
+            self.__index[stamp] = (offset + header_size, length)
+            offset = end
+        self.__scanned = offset
+
+    def __refresh(self) -> None:
+        """Catches up with the records appended, or the compaction done, by other processes."""
+        self.__open()
+        if self.__is_replaced(self.__fd):
+            self.close()
+            self.__open()
+            return
+        size = os.fstat(self.__fd).st_size
+        if size != len(self.__mmap):
+            self.__remap(size)
+            self.__scan()
+
+    def __compact(self) -> None:
+        compacted_filepath = self.filepath.with_suffix('.compacting')
+        with open(compacted_filepath, 'wb') as file:
+            file.write(self.MAGIC)
+            for stamp, (offset, length) in self.__index.items():
+                file.write(self.__record(stamp, self.__mmap[offset:offset + length]))
+            file.flush()
+            os.fsync(file.fileno())
+        self.log.debug(f"Dropping {self.__superseded} superseded node metadata records from {self.filepath}")
+        # Still holding the exclusive lock on the old file, so the processes waiting to append to it
+        # will see that it was replaced once they get the lock.
+        os.replace(compacted_filepath, self.filepath)
+
+    def __record(self, stamp: bytes, metadata: bytes) -> bytes:
+        return len(metadata).to_bytes(self._LENGTH_SIZE, 'big') + stamp + metadata
+
+    def close(self) -> None:
+        with self.__lock:
+            if self.__mmap is not None:
+                self.__mmap.close()
+                self.__mmap = None
+            if self.__fd is not None:
+                os.close(self.__fd)  # releases the lock, if any
+                self.__fd = None
+            self.__index, self.__scanned, self.__superseded = dict(), 0, 0
+
+    #
+    # Records
+    #
+
+    def put(self, stamp: bytes, metadata: bytes) -> None:
+        if len(stamp) != self.STAMP_LENGTH:
+            raise ValueError(f"Node stamps are {self.STAMP_LENGTH} bytes long, got {len(stamp)}")
+        record = self.__record(stamp, metadata)
+        with self.__lock:
+            while True:
+                self.__open()
+                fcntl.flock(self.__fd, fcntl.LOCK_SH)
+                try:
+                    replaced = self.__is_replaced(self.__fd)
+                    if not replaced:
+                        # A single write at the end of the file, wherever other processes left it
+                        os.write(self.__fd, record)
+                finally:
+                    fcntl.flock(self.__fd, fcntl.LOCK_UN)
+                if not replaced:
+                    break
+                self.close()
+            # Indexes this record, along with any appended by other processes before it.
+            self.__refresh()
+
+    def get(self, stamp: bytes) -> bytes:
+        with self.__lock:
+            self.__refresh()
+            offset, length = self.__index[stamp]
+            return self.__mmap[offset:offset + length]
+
+    def stamps(self) -> Set[bytes]:
+        with self.__lock:
+            self.__refresh()
+            return set(self.__index)
+
+    def items(self) -> Iterator[Tuple[bytes, bytes]]:
+        """Yields the stamps and metadata of the stored nodes."""
+        for stamp in self.stamps():
+            yield stamp, self.get(stamp)
+
+    def __contains__(self, stamp: bytes) -> bool:
+        with self.__lock:
+            self.__refresh()
+            return stamp in self.__index
+
+    def __len__(self) -> int:
+        with self.__lock:
+            self.__refresh()
+            return len(self.__index)
+
+
+class NodeMetadataDirectory:
+    """
+    The metadata of each node in a file of its own, named after the node stamp.
+    Used instead of ``NodeMetadataStore`` where file locks are not available (i.e. on Windows).
+    """
+
+    FILENAME_TEMPLATE = '{}.node'
+
+    def __init__(self, filepath: Path):
+        self.filepath = filepath  # the directory
+
+    def __metadata_filepath(self, stamp: bytes) -> Path:
+        return self.filepath / self.FILENAME_TEMPLATE.format(stamp.hex())
+
+    def close(self) -> None:
+        pass
+
+    def put(self, stamp: bytes, metadata: bytes) -> None:
+        self.filepath.mkdir(parents=True, exist_ok=True)
+        metadata_filepath = self.__metadata_filepath(stamp)
+        # Readers never see a partially written file
+        temp_filepath = metadata_filepath.with_suffix('.tmp')
+        temp_filepath.write_bytes(metadata)
+        os.replace(temp_filepath, metadata_filepath)
+
+    def get(self, stamp: bytes) -> bytes:
+        try:
+            return self.__metadata_filepath(stamp).read_bytes()
+        except FileNotFoundError:
+            raise KeyError(stamp)
+
+    def stamps(self) -> Set[bytes]:
+        if not self.filepath.is_dir():
+            return set()
+        stamps = set()
+        for metadata_filepath in self.filepath.glob(self.FILENAME_TEMPLATE.format('*')):
+            try:
+                stamps.add(bytes.fromhex(metadata_filepath.stem))
+            except ValueError:
+                continue  # not a node metadata file
+        return stamps
+
+    def items(self) -> Iterator[Tuple[bytes, bytes]]:
+        """Yields the stamps and metadata of the stored nodes."""
+        for stamp in self.stamps():
+            try:
+                yield stamp, self.get(stamp)
+            except KeyError:
+                continue  # removed in the meantime
+
+    def __contains__(self, stamp: bytes) -> bool:
+        return self.__metadata_filepath(stamp).is_file()
+
+    def __len__(self) -> int:
+        return len(self.stamps())
+
+
 class LocalFileBasedNodeStorage(NodeStorage):
     _name = 'local'
-    __METADATA_FILENAME_TEMPLATE = '{}.node'
+    __METADATA_FILENAME_TEMPLATE = NodeMetadataDirectory.FILENAME_TEMPLATE
+    METADATA_STORE_FILENAME = 'nodes.db'
 
     class NoNodeMetadataFileFound(FileNotFoundError, NodeStorage.UnknownNode):
         pass
@@ -269,6 +540,7 @@ class LocalFileBasedNodeStorage(NodeStorage):
         self.metadata_dir = metadata_dir
         self.certificates_dir = certificates_dir
         self._cache_storage_filepaths(config_root=config_root)
+        self.__metadata_store = None
 
     @property
     def source(self) -> Path:
@@ -345,17 +617,49 @@ class LocalFileBasedNodeStorage(NodeStorage):
         metadata_path = metadata_dir or self.metadata_dir / self.__METADATA_FILENAME_TEMPLATE.format(stamp)
         return metadata_path
 
-    def __read_metadata(self, filepath: Path):
+    def generate_metadata_filepath(self, stamp: Union[SignatureStamp, bytes, str]) -> Path:
+        """The path of a standalone metadata file of the node, in the storage root, outside of the metadata store."""
+        return Path(self.root_dir) / self.__generate_metadata_filepath(stamp=stamp).name
+
+    @property
+    def metadata_store(self) -> Union[NodeMetadataStore, NodeMetadataDirectory]:
+        """
+        The store of the metadata of all the known nodes.
+        Metadata files of a previous version of the storage are moved into the store on first access.
+        Without file locks (i.e. on Windows), the metadata files are kept as they are.
+        """
+        if fcntl is None:
+            if self.__metadata_store is None or self.__metadata_store.filepath != self.metadata_dir:
+                self.__metadata_store = NodeMetadataDirectory(filepath=self.metadata_dir)
+            return self.__metadata_store
+
+        filepath = self.metadata_dir / self.METADATA_STORE_FILENAME
+        if self.__metadata_store is None or self.__metadata_store.filepath != filepath:
+            self.__metadata_store = NodeMetadataStore(filepath=filepath)
+            self.__migrate_metadata_files()
+        return self.__metadata_store
+
+    def __migrate_metadata_files(self) -> None:
+        if not self.metadata_dir.is_dir():
+            return
+        metadata_filepaths = list(self.metadata_dir.glob(self.__METADATA_FILENAME_TEMPLATE.format('*')))
+        for filepath in metadata_filepaths:
+            try:
+                stamp = bytes.fromhex(filepath.stem)
+                self.__metadata_store.put(stamp, filepath.read_bytes())
+            except ValueError:
+                self.log.warn(f"Not a node metadata file, leaving it as is: {filepath}")
+            else:
+                filepath.unlink()
+        if metadata_filepaths:
+            self.log.info(f"Moved {len(metadata_filepaths)} node metadata files to {self.__metadata_store.filepath}")
+
+    def __parse_metadata(self, node_bytes: bytes):
 
         from nucypher.characters.lawful import Ursula
 
         try:
-            with open(filepath, "rb") as seed_file:
-                seed_file.seek(0)
-                node_bytes = self.decode_node_bytes(seed_file.read())
-                node = Ursula.from_bytes(node_bytes, fail_fast=True)
-        except FileNotFoundError:
-            raise self.NoNodeMetadataFileFound
+            node = Ursula.from_bytes(self.decode_node_bytes(node_bytes), fail_fast=True)
         except (BytestringSplittingError, Ursula.UnexpectedVersion):
             raise self.InvalidNodeMetadata
 
@@ -372,30 +676,29 @@ class LocalFileBasedNodeStorage(NodeStorage):
     # API
     #
     def all(self, federated_only: bool, certificates_only: bool = False) -> Set[Union[Any, Certificate]]:
-        filenames = list((self.certificates_dir if certificates_only else self.metadata_dir).iterdir())
-        self.log.info("Found {} known node metadata files at {}".format(len(filenames), self.metadata_dir))
-
-        known_certificates = set()
         if certificates_only:
+            filenames = list(self.certificates_dir.iterdir())
+            known_certificates = set()
             for filename in filenames:
                 certificate = self.__read_node_tls_certificate(self.certificates_dir / filename)
                 known_certificates.add(certificate)
             return known_certificates
 
         else:
+            metadata_store = self.metadata_store
+            self.log.info("Found {} known nodes at {}".format(len(metadata_store), metadata_store.filepath))
             known_nodes = set()
             invalid_metadata = []
-            for filename in filenames:
-                metadata_path = self.metadata_dir / filename
+            for stamp, node_bytes in metadata_store.items():
                 try:
-                    node = self.__read_metadata(filepath=metadata_path)
+                    node = self.__parse_metadata(node_bytes)
                 except self.NodeStorageError:
-                    invalid_metadata.append(filename)
+                    invalid_metadata.append(stamp.hex())
                 else:
                     known_nodes.add(node)
 
             if invalid_metadata:
-                self.log.warn(f"Couldn't read metadata in {self.metadata_dir} for the following files: {invalid_metadata}")
+                self.log.warn(f"Couldn't read metadata in {metadata_store.filepath} for the following nodes: {invalid_metadata}")
             return known_nodes
 
     @validate_checksum_address
@@ -403,8 +706,15 @@ class LocalFileBasedNodeStorage(NodeStorage):
         if certificate_only is True:
             certificate = self.__read_node_tls_certificate(stamp=stamp)
             return certificate
-        metadata_path = self.__generate_metadata_filepath(stamp=stamp)
-        node = self.__read_metadata(filepath=metadata_path)
+        if isinstance(stamp, SignatureStamp):
+            stamp = bytes(stamp)
+        if isinstance(stamp, str):
+            stamp = bytes.fromhex(stamp)
+        try:
+            node_bytes = self.metadata_store.get(stamp)
+        except KeyError:
+            raise self.NoNodeMetadataFileFound
+        node = self.__parse_metadata(node_bytes)
         return node
 
     def store_node_certificate(self, certificate: Certificate, port: int, force: bool = True):
@@ -412,9 +722,14 @@ class LocalFileBasedNodeStorage(NodeStorage):
         return certificate_filepath
 
     def store_node_metadata(self, node, filepath: Optional[Path] = None) -> Path:
-        filepath = self.__generate_metadata_filepath(stamp=node.stamp, metadata_dir=filepath)
-        self.__write_metadata(filepath=filepath, node=node)
-        return filepath
+        if filepath:
+            # Standalone metadata file, outside of the store
+            filepath = self.__generate_metadata_filepath(stamp=node.stamp, metadata_dir=filepath)
+            self.__write_metadata(filepath=filepath, node=node)
+            return filepath
+        metadata_store = self.metadata_store
+        metadata_store.put(bytes(node.stamp), self.encode_node_bytes(bytes(node)))
+        return metadata_store.filepath
 
     def clear(self, metadata: bool = True, certificates: bool = True) -> None:
         """Forget all stored nodes and certificates"""
@@ -427,6 +742,9 @@ class LocalFileBasedNodeStorage(NodeStorage):
                     dir_item.unlink()
 
         if metadata is True:
+            if self.__metadata_store is not None:
+                self.__metadata_store.close()
+                self.__metadata_store = None
             __destroy_dir_contents(self.metadata_dir)
         if certificates is True:
             __destroy_dir_contents(self.certificates_dir)
@@ -0,0 +1,101 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+from typing import List, Optional, Sequence, Tuple
+
+import nucypher.crypto.umbral_adapter as umbral  # need it to mock `umbral.encrypt`
+from nucypher.crypto.umbral_adapter import Capsule, PublicKey
+
+
+def encrypt_serialized(recipient_keys_bytes: Sequence[bytes],
+                       plaintexts: Sequence[bytes]
+                       ) -> List[Tuple[bytes, bytes]]:
+    """
+    Encrypts each plaintext for the corresponding serialized public key,
+    returning pairs of serialized capsules and ciphertexts.
+    Umbral objects cannot be pickled, so this is what gets sent to the worker processes.
+    """
+    results = []
+    for recipient_key_bytes, plaintext in zip(recipient_keys_bytes, plaintexts):
+        capsule, ciphertext = umbral.encrypt(PublicKey.from_bytes(recipient_key_bytes), plaintext)
+        results.append((bytes(capsule), ciphertext))
+    return results
+
+
+class BatchEncryptor:
+    """
+    Encrypts batches of plaintexts, each for its own recipient, returning capsules and
+    ciphertexts in the order of the given plaintexts.
+
+    Batches of at least ``parallel_threshold`` plaintexts are split into chunks
+    and processed by a pool of ``processes`` worker processes (all the cores by default),
+    which is started on first use. Smaller batches are processed in the calling thread.
+
+    Only public keys and plaintexts are sent to the workers, so anything that needs
+    a secret key (e.g. signing) has to be done by the caller.
+    """
+
+    DEFAULT_PARALLEL_THRESHOLD = 8  # plaintexts
+
+    def __init__(self,
+                 processes: Optional[int] = None,
+                 parallel_threshold: int = DEFAULT_PARALLEL_THRESHOLD):
+        self.processes = processes if processes is not None else (os.cpu_count() or 1)
+        self.parallel_threshold = parallel_threshold
+        self._executor = None
+        self._executor_lock = Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # Not forking, since the parent process is running the reactor and other threads.
+                self._executor = ProcessPoolExecutor(max_workers=self.processes,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+    def encrypt(self,
+                recipient_keys: Sequence[PublicKey],
+                plaintexts: Sequence[bytes]
+                ) -> List[Tuple[Capsule, bytes]]:
+        if len(recipient_keys) != len(plaintexts):
+            raise ValueError(f"Got {len(recipient_keys)} recipient keys for {len(plaintexts)} plaintexts")
+
+        if self.processes < 2 or len(plaintexts) < self.parallel_threshold:
+            return [umbral.encrypt(recipient_key, plaintext)
+                    for recipient_key, plaintext in zip(recipient_keys, plaintexts)]
+
+        keys_bytes = [bytes(recipient_key) for recipient_key in recipient_keys]
+        chunk_size = math.ceil(len(plaintexts) / self.processes)
+        offsets = range(0, len(plaintexts), chunk_size)
+        executor = self._get_executor()
+        results = executor.map(encrypt_serialized,
+                               [keys_bytes[i:i+chunk_size] for i in offsets],
+                               [plaintexts[i:i+chunk_size] for i in offsets])
+        return [(Capsule.from_bytes(capsule_bytes), ciphertext)
+                for chunk_result in results
+                for capsule_bytes, ciphertext in chunk_result]
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
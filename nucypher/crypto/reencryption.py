@@ -0,0 +1,83 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+from typing import List, Optional, Sequence
+
+from nucypher.crypto.umbral_adapter import Capsule, VerifiedKeyFrag, reencrypt
+
+
+def reencrypt_serialized(kfrag_bytes: bytes, capsules_bytes: Sequence[bytes]) -> List[bytes]:
+    """
+    Re-encrypts serialized capsules with a serialized (and already verified) kfrag,
+    returning serialized cfrags.
+    Umbral objects cannot be pickled, so this is what gets sent to the worker processes.
+    """
+    kfrag = VerifiedKeyFrag.from_verified_bytes(kfrag_bytes)
+    return [bytes(reencrypt(Capsule.from_bytes(capsule_bytes), kfrag)) for capsule_bytes in capsules_bytes]
+
+
+class BatchReencryptor:
+    """
+    Re-encrypts batches of capsules with a single kfrag, returning serialized cfrags
+    in the order of the given capsules.
+
+    Batches of at least ``parallel_threshold`` capsules are split into chunks
+    and processed by a pool of ``processes`` worker processes (all the cores by default),
+    which is started on first use. Smaller batches are processed in the calling thread.
+    """
+
+    DEFAULT_PARALLEL_THRESHOLD = 64  # capsules
+
+    def __init__(self,
+                 processes: Optional[int] = None,
+                 parallel_threshold: int = DEFAULT_PARALLEL_THRESHOLD):
+        self.processes = processes if processes is not None else (os.cpu_count() or 1)
+        self.parallel_threshold = parallel_threshold
+        self._executor = None
+        self._executor_lock = Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # Not forking, since the parent process is running the reactor and other threads.
+                self._executor = ProcessPoolExecutor(max_workers=self.processes,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+    def reencrypt(self, kfrag: VerifiedKeyFrag, capsules: Sequence[Capsule]) -> List[bytes]:
+        kfrag_bytes = bytes(kfrag)
+        capsules_bytes = [bytes(capsule) for capsule in capsules]
+
+        if self.processes < 2 or len(capsules) < self.parallel_threshold:
+            return reencrypt_serialized(kfrag_bytes, capsules_bytes)
+
+        chunk_size = math.ceil(len(capsules_bytes) / self.processes)
+        chunks = [capsules_bytes[i:i+chunk_size] for i in range(0, len(capsules_bytes), chunk_size)]
+        executor = self._get_executor()
+        results = executor.map(reencrypt_serialized, [kfrag_bytes] * len(chunks), chunks)
+        return [cfrag_bytes for chunk_result in results for cfrag_bytes in chunk_result]
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
@@ -15,7 +15,7 @@ You should have received a copy of the GNU Affero General Public License
 along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 import msgpack
-from typing import Any, Callable, Iterable, NamedTuple, Union
+from typing import Any, Callable, Iterable, NamedTuple, Optional, Tuple, Union
 
 
 class DBWriteError(Exception):
@@ -45,10 +45,38 @@ class RecordField(NamedTuple):
     The optional `decode` is any callable that takes the unpack'd encoded
     field value and returns the `field_type`. If you implement `encode`, you
     will probably always want to provide a `decode`.
+
+    The optional `index` declares a secondary index on the field. It is any
+    callable that takes the field value (as a `field_type`) and returns a
+    fixed-width `bytes` sort key whose lexicographic order matches the order
+    of the values. Indexed fields are kept in a separate index database by
+    the `Datastore` and can be streamed in order with `Datastore.query_range`.
     """
     field_type: Any
     encode: Callable[[Any], bytes] = lambda field: field
     decode: Callable[[bytes], Any] = lambda field: field
+    index: Optional[Callable[[Any], bytes]] = None
+
+
+def index_prefix(record_type: str, record_field: str) -> bytes:
+    """
+    Returns the prefix shared by all the index entries of a record field.
+    """
+    return f'{record_type}:{record_field}:'.encode()
+
+
+def index_entry(record_type: str,
+                record_field: str,
+                sort_key: bytes,
+                record_id: Union[int, str]) -> Tuple[bytes, bytes]:
+    """
+    Returns the key and value of the index entry for a record.
+    The packed record ID is appended to the key so that records sharing a
+    sort key have distinct entries, and stored as the value so that it can
+    be recovered without parsing the key.
+    """
+    packed_id = msgpack.packb(record_id)
+    return index_prefix(record_type, record_field) + sort_key + packed_id, packed_id
 
 
 class DatastoreRecord:
@@ -61,9 +89,11 @@ class DatastoreRecord:
     def __init__(self,
                  db_transaction: 'lmdb.Transaction',
                  record_id: Union[int, str],
-                 writeable: bool = False) -> None:
+                 writeable: bool = False,
+                 index_db: Optional['lmdb._Database'] = None) -> None:
         self._record_id = record_id
         self.__db_transaction = db_transaction
+        self.__index_db = index_db
         self.__writeable = writeable
 
     def __setattr__(self, attr: str, value: Any) -> None:
@@ -84,6 +114,9 @@ class DatastoreRecord:
         `RecordField.encode` function and pack it with msgpack. Then the value
         gets written to the database. If the value is unable to be written,
         this will raise a `DBWriteError`.
+
+        If the `RecordField` declares an `index`, the index entry of the
+        record is updated in the same transaction.
         """
         # When writeable is None (meaning, it hasn't been __init__ yet), then
         # we allow any attribute to be set on the instance.
@@ -102,11 +135,15 @@ class DatastoreRecord:
 
             # We delete records by setting the record to `None`.
             if value is None:
+                if record_field.index:
+                    self.__update_index(attr, record_field, None)
                 return self.__delete_record(attr)
 
             if not type(value) == record_field.field_type:
                 raise TypeError(f'Given record is type {type(value)}; expected {record_field.field_type}')
             field_value = msgpack.packb(record_field.encode(value))
+            if record_field.index:
+                self.__update_index(attr, record_field, value)
             self.__write_raw_record(attr, field_value)
 
     def __getattr__(self, attr: str) -> Any:
@@ -162,6 +199,29 @@ class DatastoreRecord:
             # We do this check to ensure that the key was actually deleted.
             raise DBWriteError(f"Couldn't delete the record (key: {key}) from the database.")
 
+    def __update_index(self, record_field_name: str, record_field: 'RecordField', value: Any) -> None:
+        """
+        Replaces the index entry of an indexed field with the one for `value`,
+        or removes it if `value` is `None`.
+        If the record has no index database to write to, this method raises
+        a `DBWriteError` rather than let the index go stale.
+        """
+        if self.__index_db is None:
+            raise DBWriteError(f"Can't write the indexed {record_field_name} record without an index database.")
+
+        record_type = type(self).__name__
+        key = self.__storagekey.format(record_field=record_field_name, record_id=self._record_id).encode()
+        old_field_value = self.__db_transaction.get(key, default=None)
+        if old_field_value is not None:
+            old_value = record_field.decode(msgpack.unpackb(old_field_value))
+            old_entry, _ = index_entry(record_type, record_field_name, record_field.index(old_value), self._record_id)
+            self.__db_transaction.delete(old_entry, db=self.__index_db)
+
+        if value is not None:
+            entry, packed_id = index_entry(record_type, record_field_name, record_field.index(value), self._record_id)
+            if not self.__db_transaction.put(entry, packed_id, overwrite=True, db=self.__index_db):
+                raise DBWriteError(f"Couldn't write the index entry (key: {entry}) to the database.")
+
     def __get_record_field(self, attr: str) -> 'RecordField':
         """
         Uses `getattr` to return the `RecordField` object for a given
@@ -17,13 +17,15 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 from pathlib import Path
 
 import lmdb
+import msgpack
 from contextlib import contextmanager, suppress
 from functools import partial
-from typing import Any, Callable, Generator, List, NamedTuple, Optional, Type, Union
+from typing import Any, Callable, Generator, Iterator, List, NamedTuple, Optional, Type, Union
 
-from nucypher.datastore.base import DatastoreRecord, DBWriteError
+from nucypher.datastore.base import DatastoreRecord, DBWriteError, RecordField, index_entry, index_prefix
 
 DatastoreQueryResult = Generator[List[Type['DatastoreRecord']], None, None]
+DatastoreStream = Generator[Iterator[Type['DatastoreRecord']], None, None]
 
 class RecordNotFound(Exception):
     """
@@ -85,6 +87,11 @@ class Datastore:
     # We can set this arbitrarily high (1TB) to prevent any run-time crashes.
     LMDB_MAP_SIZE = 1_000_000_000_000
 
+    # Secondary indexes of `RecordField`s live in their own named database,
+    # next to the main (unnamed) database holding the records.
+    LMDB_MAX_DBS = 1
+    INDEX_DB_NAME = b'indexes'
+
     def __init__(self, db_path: Path) -> None:
         """
         Initializes a Datastore object by path.
@@ -92,7 +99,9 @@ class Datastore:
         :param db_path: Filepath to a lmdb database.
         """
         self.db_path = db_path
-        self.__db_env = lmdb.open(str(db_path), map_size=self.LMDB_MAP_SIZE)
+        self.__db_env = lmdb.open(str(db_path), map_size=self.LMDB_MAP_SIZE, max_dbs=self.LMDB_MAX_DBS)
+        self.__index_db = self.__db_env.open_db(self.INDEX_DB_NAME)
+        self.__built_indexes = set()
 
     @contextmanager
     def describe(self,
@@ -122,7 +131,7 @@ class Datastore:
             record_id = int(record_id)
 
         with self.__db_env.begin(write=writeable) as datastore_tx:
-            record = record_type(datastore_tx, record_id, writeable=writeable)
+            record = record_type(datastore_tx, record_id, writeable=writeable, index_db=self.__index_db)
             try:
                 yield record
             except (AttributeError, TypeError, DBWriteError) as tx_err:
@@ -134,6 +143,35 @@ class Datastore:
                 # Now we ensure that the record is not writeable
                 record.__dict__['_DatastoreRecord__writeable'] = False
 
+    @contextmanager
+    def describe_many(self,
+                      record_type: Type['DatastoreRecord'],
+                      record_ids: List[Union[int, str]],
+                      writeable: bool = False) -> DatastoreQueryResult:
+        """
+        Like `describe`, for several records of `record_type` at once: the
+        records identified by `record_ids` are returned in the same order,
+        within a single transaction. Writing a batch of records this way
+        commits (and syncs to disk) once, rather than once per record.
+        """
+        records = list()
+        with self.__db_env.begin(write=writeable) as datastore_tx:
+            for record_id in record_ids:
+                with suppress(ValueError):
+                    # If the ID can be converted to an int, we do it.
+                    record_id = int(record_id)
+                records.append(record_type(datastore_tx, record_id, writeable=writeable, index_db=self.__index_db))
+            try:
+                yield records
+            except (AttributeError, TypeError, DBWriteError) as tx_err:
+                # Handle `RecordNotFound` cases when `writeable` is `False`.
+                if not writeable and isinstance(tx_err, AttributeError):
+                    raise RecordNotFound(tx_err)
+                raise DatastoreTransactionError(f'An error was encountered during the transaction (no data was written): {tx_err}')
+            finally:
+                for record in records:
+                    record.__dict__['_DatastoreRecord__writeable'] = False
+
     @contextmanager
     def query_by(self,
               record_type: Type['DatastoreRecord'],
@@ -191,7 +229,7 @@ class Datastore:
                 elif curr_key.record_id in valid_records:
                     continue
 
-                record = partial(record_type, datastore_tx, curr_key.record_id)
+                record = partial(record_type, datastore_tx, curr_key.record_id, index_db=self.__index_db)
 
                 # We pass the field to the filter_func if `filter_field` and
                 # `filter_func` are both provided. In the event that the
@@ -232,3 +270,118 @@ class Datastore:
             finally:
                 for record in valid_records:
                     record.__dict__['_DatastoreRecord__writeable'] = False
+
+    @contextmanager
+    def query_range(self,
+                    record_type: Type['DatastoreRecord'],
+                    index_field: str,
+                    start: Optional[Any] = None,
+                    end: Optional[Any] = None,
+                    limit: Optional[int] = None,
+                    writeable: bool = False,
+                    ) -> DatastoreStream:
+        """
+        Streams the records of `record_type` in the order of the indexed
+        `index_field`, lazily, from the secondary index of the field.
+
+        The optional `start` and `end` are inclusive bounds given as values
+        of the `index_field` (e.g. a `MayaDT` for an expiration). The optional
+        `limit` caps the number of records streamed. Only the index entries
+        in the range are visited, so the cost of a query is proportional to
+        the number of matches rather than to the number of records.
+
+        Unlike `query_by`, no `RecordNotFound` is raised when nothing matches;
+        the stream is just empty. Records may be deleted while streaming.
+
+        If `index_field` isn't an indexed `RecordField` of `record_type`,
+        this method raises a `TypeError`.
+        """
+        record_field = getattr(record_type, f'_{index_field}', None)
+        if not isinstance(record_field, RecordField) or record_field.index is None:
+            raise TypeError(f'No indexed RecordField found on {record_type.__name__} for {index_field}.')
+        self.__build_index(record_type, index_field)
+
+        streamed_records = list()
+        with self.__db_env.begin(write=writeable) as datastore_tx:
+            records = self.__stream_index(datastore_tx=datastore_tx,
+                                          record_type=record_type,
+                                          index_field=index_field,
+                                          start=record_field.index(start) if start is not None else None,
+                                          end=record_field.index(end) if end is not None else None,
+                                          limit=limit,
+                                          writeable=writeable,
+                                          streamed_records=streamed_records)
+            try:
+                yield records
+            except (AttributeError, TypeError, DBWriteError) as tx_err:
+                # Handle `RecordNotFound` cases when `writeable` is `False`.
+                if not writeable and isinstance(tx_err, AttributeError):
+                    raise RecordNotFound(tx_err)
+                raise DatastoreTransactionError(f'An error was encountered during the transaction (no data was written): {tx_err}')
+            finally:
+                for record in streamed_records:
+                    record.__dict__['_DatastoreRecord__writeable'] = False
+
+    def __stream_index(self,
+                       datastore_tx: 'lmdb.Transaction',
+                       record_type: Type['DatastoreRecord'],
+                       index_field: str,
+                       start: Optional[bytes],
+                       end: Optional[bytes],
+                       limit: Optional[int],
+                       writeable: bool,
+                       streamed_records: List[Type['DatastoreRecord']],
+                       ) -> Iterator[Type['DatastoreRecord']]:
+        """
+        Walks the index entries of `index_field` between the `start` and
+        `end` sort keys, yielding the corresponding records.
+        """
+        prefix = index_prefix(record_type.__name__, index_field)
+        db_cursor = datastore_tx.cursor(db=self.__index_db)
+
+        # The cursor is positioned again before each entry, just past the
+        # previous one, so that streamed records can be deleted in between.
+        seek_key = prefix + (start or b'')
+        while limit is None or len(streamed_records) < limit:
+            if not db_cursor.set_range(seek_key):
+                break
+            index_key, packed_id = db_cursor.key(), db_cursor.value()
+            if not index_key.startswith(prefix):
+                break
+            sort_key = index_key[len(prefix):len(index_key) - len(packed_id)]
+            if end is not None and sort_key > end:
+                break
+            seek_key = index_key + b'\x00'
+
+            record = record_type(datastore_tx, msgpack.unpackb(packed_id), writeable=writeable, index_db=self.__index_db)
+            streamed_records.append(record)
+            yield record
+
+    def __build_index(self, record_type: Type['DatastoreRecord'], index_field: str) -> None:
+        """
+        Indexes the records of `record_type` written before the index of
+        `index_field` existed. This scans the records once per datastore,
+        after which a marker entry records that the index is complete.
+        """
+        marker = f'{record_type.__name__}:{index_field}'.encode()
+        if marker in self.__built_indexes:
+            return
+
+        record_field = getattr(record_type, f'_{index_field}')
+        with self.__db_env.begin(write=True) as datastore_tx:
+            if datastore_tx.get(marker, db=self.__index_db) is None:
+                field_key = f'{record_type.__name__}:{index_field}:'.encode()
+                db_cursor = datastore_tx.cursor()
+                if db_cursor.set_range(field_key):
+                    for db_key in db_cursor.iternext(keys=True, values=False):
+                        if not db_key.startswith(field_key):
+                            break
+                        record_id = DatastoreKey.from_bytestring(db_key).record_id
+                        value = getattr(record_type(datastore_tx, record_id), index_field)
+                        entry, packed_id = index_entry(record_type.__name__,
+                                                       index_field,
+                                                       record_field.index(value),
+                                                       record_id)
+                        datastore_tx.put(entry, packed_id, overwrite=True, db=self.__index_db)
+                datastore_tx.put(marker, b'', db=self.__index_db)
+        self.__built_indexes.add(marker)
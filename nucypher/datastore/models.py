@@ -27,7 +27,8 @@ class PolicyArrangement(DatastoreRecord):
     _expiration = RecordField(
             MayaDT,
             encode=lambda maya_date: maya_date.iso8601().encode(),
-            decode=lambda maya_bytes: MayaDT.from_iso8601(maya_bytes.decode()))
+            decode=lambda maya_bytes: MayaDT.from_iso8601(maya_bytes.decode()),
+            index=lambda maya_date: round(maya_date.epoch * 1_000_000).to_bytes(8, 'big'))
     _kfrag = RecordField(
             VerifiedKeyFrag,
             encode=bytes,
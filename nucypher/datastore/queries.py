@@ -16,12 +16,12 @@
 """
 
 import functools
-from typing import Callable, List, Type
+from typing import Callable, List, Optional, Type
 
 import maya
 
 from nucypher.datastore.base import DatastoreRecord
-from nucypher.datastore.datastore import Datastore, DatastoreQueryResult, RecordNotFound
+from nucypher.datastore.datastore import Datastore, DatastoreQueryResult, DatastoreStream, RecordNotFound
 from nucypher.datastore.models import PolicyArrangement, ReencryptionRequest
 
 
@@ -46,11 +46,12 @@ def unwrap_records(func: Callable[..., DatastoreQueryResult]) -> Callable[..., L
     return wrapper
 
 
-def find_expired_policies(ds: Datastore, cutoff: maya.MayaDT) -> DatastoreQueryResult:
-    return ds.query_by(PolicyArrangement,
-                       filter_field='expiration',
-                       filter_func=lambda expiration: expiration <= cutoff,
-                       writeable=True)
+def find_expired_policies(ds: Datastore, cutoff: maya.MayaDT, limit: Optional[int] = None) -> DatastoreStream:
+    return ds.query_range(PolicyArrangement,
+                          index_field='expiration',
+                          end=cutoff,
+                          limit=limit,
+                          writeable=True)
 
 
 @unwrap_records
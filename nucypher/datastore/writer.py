@@ -0,0 +1,169 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import time
+from queue import Empty, Queue
+from threading import Event, Lock, Thread
+from typing import Any, Dict, List, Tuple, Type, Union
+
+from nucypher.datastore.base import DatastoreRecord
+from nucypher.datastore.datastore import Datastore
+from nucypher.utilities.logging import Logger
+
+PendingRecord = Tuple[Union[int, str], Dict[str, Any]]
+
+
+class BatchedRecordWriter:
+    """
+    Writes new records of a `record_type` to a `Datastore` behind the caller's back:
+    records are queued in memory and written by a background thread, many records
+    per transaction, so that writers do not wait for the datastore.
+
+    The durability policy is one of:
+
+    * ``BATCHED`` (default): a batch is written once it has `max_batch_size` records,
+      or `flush_interval` seconds after its first record was queued. Queued records are
+      written on `flush()` and `stop()`, but are lost if the process crashes.
+    * ``IMMEDIATE``: records are written by `put()` itself, before returning.
+
+    The queue holds at most `max_queue_size` records; beyond that, `put()` waits for
+    the writer to catch up. The background thread only runs while there are records to write.
+    """
+
+    BATCHED = 'batched'
+    IMMEDIATE = 'immediate'
+    DURABILITY_POLICIES = (BATCHED, IMMEDIATE)
+
+    DEFAULT_FLUSH_INTERVAL = 1  # seconds
+    DEFAULT_MAX_BATCH_SIZE = 100
+    DEFAULT_MAX_QUEUE_SIZE = 10_000
+
+    def __init__(self,
+                 datastore: Datastore,
+                 record_type: Type[DatastoreRecord],
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+                 durability: str = BATCHED):
+        if durability not in self.DURABILITY_POLICIES:
+            raise ValueError(f"Unknown durability policy '{durability}'; valid policies are {self.DURABILITY_POLICIES}")
+        self.datastore = datastore
+        self.record_type = record_type
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self.durability = durability
+        self.log = Logger(self.__class__.__name__)
+
+        self._queue = Queue(maxsize=max_queue_size)
+        self._lock = Lock()
+        self._writer = None
+        self._stopped = False
+
+    def put(self, record_id: Union[int, str], **fields) -> None:
+        """Writes a new record with the given field values, now or later depending on the durability policy."""
+        if self.durability == self.IMMEDIATE or self._stopped:
+            self._write([(record_id, fields)])
+            return
+        self._queue.put((record_id, fields))
+        with self._lock:
+            if self._writer is None:
+                self._writer = Thread(target=self.__write_queued_records,
+                                      name=f'{self.record_type.__name__}Writer',
+                                      daemon=True)
+                self._writer.start()
+
+    def flush(self) -> None:
+        """Writes all the records queued so far, and waits until they are written."""
+        flushed = None
+        with self._lock:
+            if self._writer is not None:
+                # Records queued before the marker are written before it is reached.
+                flushed = Event()
+                self._queue.put(flushed)
+        if flushed is not None:
+            flushed.wait()
+            return
+
+        # No background writer: write the queued records in the calling thread.
+        while True:
+            batch, flush_requests = self.__collect_batch(timeout=None)
+            if batch:
+                self._write(batch)
+            for flush_request in flush_requests:
+                flush_request.set()
+            if not batch and not flush_requests:
+                return
+
+    def stop(self) -> None:
+        """Writes the queued records; records put afterwards are written immediately."""
+        self._stopped = True
+        self.flush()
+
+    def pending(self) -> int:
+        """Number of records waiting in the queue, not including the batch being collected."""
+        return self._queue.qsize()
+
+    def _write(self, batch: List[PendingRecord]) -> None:
+        with self.datastore.describe_many(self.record_type,
+                                          [record_id for record_id, _fields in batch],
+                                          writeable=True) as records:
+            for record, (_record_id, fields) in zip(records, batch):
+                for field_name, value in fields.items():
+                    setattr(record, field_name, value)
+
+    def __collect_batch(self, timeout: Union[float, None]) -> Tuple[List[PendingRecord], List[Event]]:
+        """
+        Collects queued records, up to `max_batch_size`, and stops early at a flush request.
+        With a `timeout`, waits for the first record for that long, and for more records until
+        `timeout` seconds after the first one; otherwise, only takes the records already queued.
+        """
+        batch, flush_requests = list(), list()
+        deadline = None
+        while len(batch) < self.max_batch_size:
+            try:
+                if timeout is None:
+                    item = self._queue.get_nowait()
+                else:
+                    wait = timeout if deadline is None else deadline - time.monotonic()
+                    item = self._queue.get(timeout=max(wait, 0))
+            except Empty:
+                break
+            if isinstance(item, Event):
+                flush_requests.append(item)
+                break
+            batch.append(item)
+            if deadline is None and timeout is not None:
+                deadline = time.monotonic() + timeout
+        return batch, flush_requests
+
+    def __write_queued_records(self) -> None:
+        while True:
+            batch, flush_requests = self.__collect_batch(timeout=self.flush_interval)
+            if batch:
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    self.log.warn(f"Failed to write {len(batch)} {self.record_type.__name__} records: {e}")
+            for flush_request in flush_requests:
+                flush_request.set()
+            if not batch and not flush_requests:
+                with self._lock:
+                    # The queue is checked under the lock, so that a record put
+                    # right now either is seen here or starts a new writer.
+                    if self._queue.empty():
+                        self._writer = None
+                        return
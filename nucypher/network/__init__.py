@@ -14,4 +14,5 @@ GNU Affero General Public License for more details.
 You should have received a copy of the GNU Affero General Public License
 along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
-LEARNING_LOOP_VERSION = 2  # TODO: Rename to DISCOVERY_LOOP_VERSION
+# 3: the fleet state checksum is the root of a Merkle tree of the node metadata (see `FleetMerkleTree`)
+LEARNING_LOOP_VERSION = 3  # TODO: Rename to DISCOVERY_LOOP_VERSION
@@ -19,8 +19,12 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 import socket
 import ssl
 import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Hashable
 
 import requests
+from requests.adapters import HTTPAdapter
 from bytestring_splitter import VariableLengthBytestring
 from constant_sorrow.constants import CERTIFICATE_NOT_SAVED, EXEMPT_FROM_VERIFICATION
 from cryptography import x509
@@ -32,18 +36,89 @@ from nucypher.utilities.logging import Logger
 EXEMPT_FROM_VERIFICATION.bool_value(False)
 
 
+class SessionPool:
+    """
+    Keeps a ``requests.Session`` per node, identified by its host, port and pinned certificate,
+    so that the TCP connections and TLS sessions are reused between requests to the same node.
+
+    The number of sessions and of connections kept alive in each of them is bounded,
+    and the sessions which were not used for ``idle_timeout`` seconds are dropped.
+    Dropped sessions are not closed, since another thread may still be sending a request with them;
+    their connections are closed once the last request is done and the session is garbage collected.
+    """
+
+    DEFAULT_MAX_SESSIONS = 256
+    DEFAULT_CONNECTIONS_PER_SESSION = 4
+    DEFAULT_IDLE_TIMEOUT = 300
+
+    def __init__(self,
+                 max_sessions: int = DEFAULT_MAX_SESSIONS,
+                 connections_per_session: int = DEFAULT_CONNECTIONS_PER_SESSION,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 clock: Callable[[], float] = time.monotonic):
+
+        if max_sessions < 1:
+            raise ValueError(f"The number of sessions must be a positive number, got {max_sessions}")
+
+        self.max_sessions = max_sessions
+        self.connections_per_session = connections_per_session
+        self.idle_timeout = idle_timeout
+        self._clock = clock
+        self._sessions = OrderedDict()  # {(host, certificate_filepath): (session, last_used)}, least recent first
+        self._lock = Lock()
+
+    def _make_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.connections_per_session)
+        session.mount("https://", adapter)
+        return session
+
+    def get(self, host: str, certificate_filepath: Hashable) -> requests.Session:
+        """
+        Returns the session for the given ``host:port`` and certificate, creating it if necessary.
+        """
+        key = (host, certificate_filepath)
+        now = self._clock()
+        with self._lock:
+            while self._sessions:
+                oldest_key, (_oldest_session, last_used) = next(iter(self._sessions.items()))
+                if now - last_used < self.idle_timeout:
+                    break
+                del self._sessions[oldest_key]
+
+            try:
+                session, _last_used = self._sessions.pop(key)
+            except KeyError:
+                session = self._make_session()
+                while len(self._sessions) >= self.max_sessions:
+                    self._sessions.popitem(last=False)
+            self._sessions[key] = (session, now)
+        return session
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = [session for session, _last_used in self._sessions.values()]
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
 class NucypherMiddlewareClient:
     library = requests
     timeout = 1.2
 
-    def __init__(self, registry=None, *args, **kwargs):
+    def __init__(self, registry=None, session_pool: SessionPool = None, *args, **kwargs):
         self.registry = registry
+        self.session_pool = session_pool or SessionPool()
 
     @staticmethod
     def response_cleaner(response):
         return response
 
-    def verify_and_parse_node_or_host_and_port(self, node_or_sprout, host, port):
+    def verify_and_parse_node_or_host_and_port(self, node_or_sprout, host, port, certificate_filepath=None):
         """
         Does two things:
         1) Verifies the node (unless it is EXEMPT_FROM_VERIFICATION, like when we initially get its certificate)
@@ -54,21 +129,32 @@ class NucypherMiddlewareClient:
             if node_or_sprout is not EXEMPT_FROM_VERIFICATION:
                 node = node_or_sprout.mature()  # Morph into a node.
                 node.verify_node(network_middleware_client=self, registry=self.registry)
-        return self.parse_node_or_host_and_port(node_or_sprout, host, port)
+        return self.parse_node_or_host_and_port(node_or_sprout, host, port, certificate_filepath)
 
-    def parse_node_or_host_and_port(self, node, host, port):
+    def parse_node_or_host_and_port(self, node, host, port, certificate_filepath=None):
         if node:
             if any((host, port)):
                 raise ValueError("Don't pass host and port if you are passing the node.")
             host = node.rest_url()
-            certificate_filepath = node.certificate_filepath
+            node_certificate_filepath = node.certificate_filepath
         elif all((host, port)):
             host = f"{host}:{port}"
-            certificate_filepath = CERTIFICATE_NOT_SAVED
+            node_certificate_filepath = CERTIFICATE_NOT_SAVED
         else:
             raise ValueError("You need to pass either the node or a host and port.")
 
-        return host, certificate_filepath, self.library
+        if certificate_filepath:
+            filepaths_are_different = node_certificate_filepath != certificate_filepath
+            node_has_a_cert = node_certificate_filepath is not CERTIFICATE_NOT_SAVED
+            if node_has_a_cert and filepaths_are_different:
+                raise ValueError("Don't try to pass a node with a certificate_filepath while also passing a"
+                                 " different certificate_filepath.  What do you even expect?")
+        else:
+            certificate_filepath = node_certificate_filepath
+
+        # Keyed by the certificate actually used for verification, so that a kept-alive connection
+        # verified against one certificate is never reused for a request pinned to another one.
+        return host, certificate_filepath, self.session_pool.get(host, certificate_filepath)
 
     def invoke_method(self, method, url, *args, **kwargs):
         self.clean_params(kwargs)
@@ -103,16 +189,10 @@ class NucypherMiddlewareClient:
                            port=None,
                            certificate_filepath=None,
                            *args, **kwargs):
-            host, node_certificate_filepath, http_client = self.verify_and_parse_node_or_host_and_port(node_or_sprout, host, port)
-
-            if certificate_filepath:
-                filepaths_are_different = node_certificate_filepath != certificate_filepath
-                node_has_a_cert = node_certificate_filepath is not CERTIFICATE_NOT_SAVED
-                if node_has_a_cert and filepaths_are_different:
-                    raise ValueError("Don't try to pass a node with a certificate_filepath while also passing a"
-                                     " different certificate_filepath.  What do you even expect?")
-            else:
-                certificate_filepath = node_certificate_filepath
+            host, certificate_filepath, http_client = self.verify_and_parse_node_or_host_and_port(node_or_sprout,
+                                                                                                   host,
+                                                                                                   port,
+                                                                                                   certificate_filepath)
 
             method = getattr(http_client, method_name)
 
@@ -218,12 +298,12 @@ class RestMiddleware:
         )
         return response
 
-    def reencrypt(self, ursula: 'Ursula', reencryption_request_bytes: bytes):
+    def reencrypt(self, ursula: 'Ursula', reencryption_request_bytes: bytes, timeout: float = 2):
         response = self.client.post(
             node_or_sprout=ursula,
             path=f"reencrypt",
             data=reencryption_request_bytes,
-            timeout=2
+            timeout=timeout
         )
         return response
 
@@ -239,7 +319,13 @@ class RestMiddleware:
                            node,
                            announce_nodes=None,
                            nodes_i_need=None,
-                           fleet_checksum=None):
+                           fleet_checksum=None,
+                           fleet_summary=None):
+        """
+        Exchanges node metadata with a teacher.  If ``fleet_summary`` (see ``FleetSensor.summary()``)
+        is given, the teacher only replies with the nodes missing or outdated in it.
+        Teachers which do not support it respond with 404 (raising ``NotFound``).
+        """
         if nodes_i_need:
             # TODO: This needs to actually do something.  NRN
             # Include node_ids in the request; if the teacher node doesn't know about the
@@ -251,7 +337,15 @@ class RestMiddleware:
         else:
             params = {}
 
-        if announce_nodes:
+        if fleet_summary is not None:
+            announced_nodes = bytes().join(bytes(VariableLengthBytestring(n)) for n in announce_nodes or ())
+            payload = bytes(VariableLengthBytestring(announced_nodes)) + fleet_summary
+            response = self.client.post(node_or_sprout=node,
+                                        path="node_metadata/delta",
+                                        params=params,
+                                        data=payload,
+                                        )
+        elif announce_nodes:
             payload = bytes().join(bytes(VariableLengthBytestring(n)) for n in announce_nodes)
             response = self.client.post(node_or_sprout=node,
                                         path="node_metadata",
@@ -21,7 +21,7 @@ from collections import defaultdict, deque
 from contextlib import suppress
 from pathlib import Path
 from queue import Queue
-from typing import Callable, Iterable, List, Optional, Set, Tuple, Union
+from typing import Callable, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
 
 import maya
 import requests
@@ -48,7 +48,7 @@ from twisted.internet import reactor, task
 from twisted.internet.defer import Deferred
 
 from nucypher.acumen.nicknames import Nickname
-from nucypher.acumen.perception import FleetSensor
+from nucypher.acumen.perception import FleetSensor, FleetState
 from nucypher.blockchain.economics import EconomicsFactory
 from nucypher.blockchain.eth.agents import ContractAgency, StakingEscrowAgent
 from nucypher.blockchain.eth.constants import NULL_ADDRESS
@@ -65,7 +65,9 @@ from nucypher.network import LEARNING_LOOP_VERSION
 from nucypher.network.exceptions import NodeSeemsToBeDown
 from nucypher.network.middleware import RestMiddleware
 from nucypher.network.protocols import SuspiciousActivity
+from nucypher.network.verification import NodeVerificationPipeline
 from nucypher.policy.kits import MessageKit, PolicyMessageKit
+from nucypher.utilities.concurrency import WorkerPool
 from nucypher.utilities.logging import Logger
 
 TEACHER_NODES = {
@@ -175,6 +177,14 @@ class DiscoveryCanceller:
         # learning_deferred.callback(RELAX)
 
 
+class TeacherResponse(NamedTuple):
+    """A verified and parsed response of a teacher to a learning request."""
+    fleet_state_checksum: str
+    fleet_state_updated: maya.MayaDT
+    sprouts: List[NodeSprout]  # or FLEET_STATES_MATCH
+    learning_deltas: bool
+
+
 class Learner:
     """
     Any participant in the "learning loop" - a class inheriting from
@@ -187,6 +197,7 @@ class Learner:
     _LONG_LEARNING_DELAY = 90
     LEARNING_TIMEOUT = 10
     _ROUNDS_WITHOUT_NODES_AFTER_WHICH_TO_SLOW_DOWN = 10
+    _CONCURRENT_LEARNING_TIMEOUT = 20  # How long to wait for the teachers queried at once
 
     # For Keeps
     __DEFAULT_NODE_STORAGE = ForgetfulNodeStorage
@@ -205,6 +216,11 @@ class Learner:
 
     _DEBUG_MODE = False
 
+    verification_pipeline = None  # type: Optional[NodeVerificationPipeline]
+
+    # Send a summary of the known nodes to teachers, so that they only reply with the nodes we don't know about.
+    delta_learning = True
+
     class NotEnoughNodes(RuntimeError):
         pass
 
@@ -237,10 +253,23 @@ class Learner:
                  lonely: bool = False,
                  verify_node_bonding: bool = True,
                  include_self_in_the_state: bool = False,
+                 learning_concurrency: int = 1,
+                 verification_workers: int = 0,
                  ) -> None:
 
         self.log = Logger("learning-loop")  # type: Logger
 
+        if learning_concurrency < 1:
+            raise ValueError(f"Learning concurrency must be at least 1, got {learning_concurrency}")
+        self.learning_concurrency = learning_concurrency
+
+        # With verification workers, eagerly learned nodes are verified in the background.
+        if verification_workers:
+            self.verification_pipeline = NodeVerificationPipeline(verify=self._verify_node_in_background,
+                                                                  workers=verification_workers)
+        else:
+            self.verification_pipeline = None
+
         self.suspicious_activities_witnessed = defaultdict(list)  # TODO: Combine with buckets / node labeling
 
         self.learning_deferred = Deferred()
@@ -256,6 +285,7 @@ class Learner:
 
         self._abort_on_learning_error = abort_on_learning_error
         self._node_ids_to_learn_about_immediately = set()
+        self._teachers_without_delta_learning = set()
 
         self.__known_nodes = self.tracker_class(domain=domain, this_node=self if include_self_in_the_state else None)
         self._verify_node_bonding = verify_node_bonding
@@ -425,26 +455,13 @@ class Learner:
         if self.save_metadata:
             self.node_storage.store_node_metadata(node=node)
 
-        if eager:
-            node.mature()
-            stranger_certificate = node.certificate
-
-            # Store node's certificate - It has been seen.
-            certificate_filepath = self.node_storage.store_node_certificate(certificate=stranger_certificate, port=node.rest_interface.port)
-
-            # In some cases (seed nodes or other temp stored certs),
-            # this will update the filepath from the temp location to this one.
-            node.certificate_filepath = certificate_filepath
-
-            # Use this to control whether or not this node performs
-            # blockchain calls to determine if stranger nodes are bonded.
-            # Note: self.registry is composed on blockchainy character subclasses.
-            registry = self.registry if self._verify_node_bonding else None  # TODO: Federated mode?
+        if eager and self.verification_pipeline is not None:
+            # The outcome will be in the pipeline's buckets.
+            self.verification_pipeline.submit(node, force=force_verification_recheck)
 
+        elif eager:
             try:
-                node.verify_node(force=force_verification_recheck,
-                                 network_middleware_client=self.network_middleware.client,
-                                 registry=registry)
+                self._verify_node(node, force=force_verification_recheck)
             except SSLError:
                 # TODO: Bucket this node as having bad TLS info - maybe it's an update that hasn't fully propagated?  567
                 return False
@@ -469,6 +486,48 @@ class Learner:
 
         return node
 
+    def _verify_node(self, node, force: bool = False) -> None:
+        """
+        Matures a node, stores its certificate and verifies it.
+        """
+        node.mature()
+        stranger_certificate = node.certificate
+
+        # Store node's certificate - It has been seen.
+        certificate_filepath = self.node_storage.store_node_certificate(certificate=stranger_certificate, port=node.rest_interface.port)
+
+        # In some cases (seed nodes or other temp stored certs),
+        # this will update the filepath from the temp location to this one.
+        node.certificate_filepath = certificate_filepath
+
+        # Use this to control whether or not this node performs
+        # blockchain calls to determine if stranger nodes are bonded.
+        # Note: self.registry is composed on blockchainy character subclasses.
+        registry = self.registry if self._verify_node_bonding else None  # TODO: Federated mode?
+
+        node.verify_node(force=force,
+                         network_middleware_client=self.network_middleware.client,
+                         registry=registry)
+
+    def _verify_node_in_background(self, node, force: bool = False) -> str:
+        """
+        Verifies a node for the verification pipeline, and returns the bucket it belongs to.
+        """
+        try:
+            self._verify_node(node, force=force)
+        except SSLError:
+            # TODO: Bucket this node as having bad TLS info - maybe it's an update that hasn't fully propagated?  567
+            return NodeVerificationPipeline.UNREACHABLE
+        except NodeSeemsToBeDown:
+            return NodeVerificationPipeline.UNREACHABLE
+        except node.NotStaking:
+            return NodeVerificationPipeline.NOT_STAKING
+        except (node.InvalidNode, SuspiciousActivity) as e:
+            self.log.warn(f"Verification Failed - {node} is invalid: {e}")
+            self.known_nodes.mark_as(node.InvalidNode, node)
+            return NodeVerificationPipeline.INVALID
+        return NodeVerificationPipeline.VERIFIED
+
     def start_learning_loop(self, now=False):
         if self._learning_task.running:
             return False
@@ -493,6 +552,9 @@ class Learner:
         if self._learning_task.running:
             self._learning_task.stop()
 
+        if self.verification_pipeline is not None:
+            self.verification_pipeline.stop()
+
         if self._learning_deferred is RELAX:
             assert False
 
@@ -758,6 +820,9 @@ class Learner:
         """
         Sends a request to node_url to find out about known nodes.
 
+        If ``learning_concurrency`` is greater than 1, that many teachers are queried concurrently,
+        and the nodes learned from all of them are recorded in a single new fleet state.
+
         TODO: Does this (and related methods) belong on FleetSensor for portability?
 
         TODO: A lot of other code can be simplified if this is converted to async def.  That's a project, though.
@@ -776,8 +841,84 @@ class Learner:
 
         self._learning_round += 1
 
+        if self.learning_concurrency > 1:
+            return self._learn_from_teacher_nodes_concurrently(eager=eager, canceller=canceller, remembered=remembered)
+
         current_teacher = self.current_teacher_node()  # Will raise if there's no available teacher.
 
+        teacher_response = self._request_nodes_from_teacher(current_teacher, canceller=canceller, cycle=True)
+        if not isinstance(teacher_response, TeacherResponse):
+            return teacher_response
+
+        sprouts = self._remember_nodes_from_teacher(current_teacher, teacher_response, eager=eager, remembered=remembered)
+        if remembered:
+            self.known_nodes.record_fleet_state()
+        return sprouts
+
+    def _learn_from_teacher_nodes_concurrently(self, eager: bool, canceller, remembered: List) -> List:
+        """
+        Queries the next ``learning_concurrency`` teachers at once,
+        and remembers the nodes they sent before recording a single new fleet state.
+        Returns the combined sprouts.
+        """
+        teachers = []
+        for _ in range(self.learning_concurrency):
+            teacher = self.current_teacher_node()  # Will raise if there's no available teacher.
+            self.cycle_teacher_node()
+            if teacher in teachers:
+                break  # We went through all the nodes we know about.
+            teachers.append(teacher)
+
+        def worker(teacher):
+            return self._request_nodes_from_teacher(teacher, canceller=canceller, cycle=False)
+
+        def value_factory(_successes, teachers_to_query=list(teachers)):
+            batch = list(teachers_to_query)
+            teachers_to_query.clear()
+            return batch
+
+        worker_pool = WorkerPool(worker=worker,
+                                 value_factory=value_factory,
+                                 target_successes=len(teachers),
+                                 timeout=self._CONCURRENT_LEARNING_TIMEOUT,
+                                 threadpool_size=len(teachers),
+                                 name='learn_from_teachers')
+        worker_pool.start()
+        try:
+            worker_pool.block_until_target_successes()
+        except (WorkerPool.OutOfValues, WorkerPool.TimedOut):
+            # Some of the teachers failed or did not respond in time; learn from the rest.
+            pass
+        finally:
+            worker_pool.cancel()
+            worker_pool.join()
+        responses = worker_pool.get_successes()
+
+        sprouts = []
+        for teacher in teachers:
+            teacher_response = responses.get(teacher)
+            if isinstance(teacher_response, TeacherResponse):
+                result = self._remember_nodes_from_teacher(teacher, teacher_response, eager=eager, remembered=remembered)
+                if result is not FLEET_STATES_MATCH:
+                    sprouts.extend(result)
+
+        if remembered:
+            self.known_nodes.record_fleet_state()
+
+        # Unexpected errors would have crashed the learning round with a single teacher;
+        # now that we have learned what we could, let them crash it as well.
+        failures = worker_pool.get_failures()
+        if failures:
+            _type, exception, traceback = list(failures.values())[0]
+            raise exception.with_traceback(traceback)
+
+        return sprouts
+
+    def _request_nodes_from_teacher(self, current_teacher, canceller=None, cycle: bool = True):
+        """
+        Requests the known nodes from a teacher, and verifies and parses its response.
+        Returns a ``TeacherResponse``, or the outcome of the learning round if there is nothing to learn.
+        """
         if isinstance(self, Teacher):
             announce_nodes = [self]
         else:
@@ -791,11 +932,29 @@ class Learner:
         if canceller and canceller.stop_now:
             return RELAX
 
+        learning_deltas = self.delta_learning and \
+            current_teacher.checksum_address not in self._teachers_without_delta_learning
+
         try:
-            response = self.network_middleware.get_nodes_via_rest(node=current_teacher,
-                                                                  nodes_i_need=self._node_ids_to_learn_about_immediately,
-                                                                  announce_nodes=announce_nodes,
-                                                                  fleet_checksum=self.known_nodes.checksum)
+            try:
+                response = self.network_middleware.get_nodes_via_rest(
+                    node=current_teacher,
+                    nodes_i_need=self._node_ids_to_learn_about_immediately,
+                    announce_nodes=announce_nodes,
+                    fleet_checksum=self.known_nodes.checksum,
+                    fleet_summary=self.known_nodes.summary() if learning_deltas else None)
+            except RestMiddleware.NotFound:
+                if not learning_deltas:
+                    raise
+                # An older teacher; fall back to receiving all of its known nodes, now and in the future.
+                self.log.debug(f"Teacher {current_teacher} does not support delta learning.")
+                self._teachers_without_delta_learning.add(current_teacher.checksum_address)
+                learning_deltas = False
+                response = self.network_middleware.get_nodes_via_rest(
+                    node=current_teacher,
+                    nodes_i_need=self._node_ids_to_learn_about_immediately,
+                    announce_nodes=announce_nodes,
+                    fleet_checksum=self.known_nodes.checksum)
         # These except clauses apply to the current_teacher itself, not the learned-about nodes.
         except NodeSeemsToBeDown as e:
             unresponsive_nodes.add(current_teacher)
@@ -826,8 +985,9 @@ class Learner:
                 f"(hex={bytes(current_teacher).hex()}):{e}.")  # To track down 2345 / 1698
             raise
         finally:
-            # Is cycling happening in the right order?
-            self.cycle_teacher_node()
+            if cycle:
+                # Is cycling happening in the right order?
+                self.cycle_teacher_node()
 
         # Before we parse the response, let's handle some edge cases.
         if response.status_code == 204:
@@ -868,6 +1028,35 @@ class Learner:
         fleet_state_checksum, fleet_state_updated, node_payload = FleetSensor.unpack_snapshot(node_payload)
 
         if constant_or_bytes(node_payload) is FLEET_STATES_MATCH:
+            return TeacherResponse(fleet_state_checksum=fleet_state_checksum,
+                                   fleet_state_updated=fleet_state_updated,
+                                   sprouts=FLEET_STATES_MATCH,
+                                   learning_deltas=learning_deltas)
+
+        # Note: There was previously a version check here, but that required iterating through node bytestrings twice,
+        # so it has been removed.  When we create a new Ursula bytestring version, let's put the check
+        # somewhere more performant, like mature() or verify_node().
+
+        # With delta learning, a teacher has nothing to send if we already know all of its nodes.
+        sprouts = self.node_class.batch_from_bytes(node_payload) if node_payload else []
+
+        return TeacherResponse(fleet_state_checksum=fleet_state_checksum,
+                               fleet_state_updated=fleet_state_updated,
+                               sprouts=sprouts,
+                               learning_deltas=learning_deltas)
+
+    def _remember_nodes_from_teacher(self,
+                                     current_teacher,
+                                     teacher_response: 'TeacherResponse',
+                                     eager: bool,
+                                     remembered: List):
+        """
+        Remembers the nodes received from a teacher (without recording a new fleet state),
+        adding the ones which were new to ``remembered``.
+        """
+        fleet_state_checksum, fleet_state_updated, sprouts, learning_deltas = teacher_response
+
+        if sprouts is FLEET_STATES_MATCH:
             self.known_nodes.record_remote_fleet_state(
                 current_teacher.checksum_address,
                 fleet_state_checksum,
@@ -876,12 +1065,6 @@ class Learner:
 
             return FLEET_STATES_MATCH
 
-        # Note: There was previously a version check here, but that required iterating through node bytestrings twice,
-        # so it has been removed.  When we create a new Ursula bytestring version, let's put the check
-        # somewhere more performant, like mature() or verify_node().
-
-        sprouts = self.node_class.batch_from_bytes(node_payload)
-
         for sprout in sprouts:
             fail_fast = True  # TODO  NRN
             try:
@@ -927,12 +1110,19 @@ class Learner:
                           f"Propagated by: {current_teacher}"
                 self.log.warn(message)
 
+        # A teacher only sends the nodes we don't know about, so we can't count its population.
+        # But after this round we know at least as much as it does, so use our own as an estimate.
+        if learning_deltas:
+            teacher_population = max(len(sprouts), self.known_nodes.population)
+        else:
+            teacher_population = len(sprouts)
+
         # Is cycling happening in the right order?
         self.known_nodes.record_remote_fleet_state(
             current_teacher.checksum_address,
             fleet_state_checksum,
             fleet_state_updated,
-            len(sprouts))
+            teacher_population)
 
         ###################
 
@@ -941,8 +1131,6 @@ class Learner:
                                                         current_teacher,
                                                         len(sprouts),
                                                         len(remembered)))
-        if remembered:
-            self.known_nodes.record_fleet_state()
         return sprouts
 
 
@@ -1045,15 +1233,60 @@ class Teacher:
         nodes_to_consider = list(self.known_nodes.values()) + [self]
         return sorted(nodes_to_consider, key=lambda n: n.checksum_address)
 
-    def bytestring_of_known_nodes(self):
-        payload = self.known_nodes.snapshot()
-        ursulas_as_vbytes = (VariableLengthBytestring(n) for n in self.known_nodes)
+    def bytestring_of_known_nodes(self, fleet_state: Optional[FleetState] = None):
+        if fleet_state is None:
+            fleet_state = self.known_nodes.current_state
+        payload = fleet_state.snapshot()
+        ursulas_as_vbytes = (VariableLengthBytestring(n) for n in fleet_state)
         ursulas_as_bytes = bytes().join(bytes(u) for u in ursulas_as_vbytes)
         ursulas_as_bytes += VariableLengthBytestring(bytes(self))
 
         payload += ursulas_as_bytes
         return payload
 
+    def signed_bytestring_of_known_nodes(self) -> bytes:
+        """
+        Returns the signed list of known nodes served by the ``node_metadata`` endpoint.
+        Memoized for the current fleet state, since serializing and signing the whole fleet
+        is expensive and learners poll for it all the time.
+        """
+        def sign_known_nodes(fleet_state: FleetState) -> bytes:
+            known_nodes_bytestring = self.bytestring_of_known_nodes(fleet_state)
+            return bytes(self.stamp(known_nodes_bytestring)) + known_nodes_bytestring
+
+        # This node's metadata is a part of the payload, and it can change independently of the fleet state.
+        return self.known_nodes.memoize(('known_nodes', bytes(self)), sign_known_nodes)
+
+    def signed_bytestring_of_unknown_nodes(self, learner_summary: bytes, announced_nodes: Iterable = ()) -> bytes:
+        """
+        Returns the signed list of known nodes, in the same format as ``signed_bytestring_of_known_nodes()``,
+        but only with the nodes which are missing or outdated in the learner's fleet summary.
+        The nodes announced by the learner (usually, the learner itself) are not sent back.
+        """
+        fleet_state = self.known_nodes.current_state
+        summary = FleetSensor.unpack_summary(learner_summary)
+        for node in announced_nodes:
+            summary[bytes.fromhex(node.checksum_address[2:])] = node.timestamp.epoch
+
+        unknown_nodes = fleet_state.nodes_unknown_to(summary)
+        known_timestamp = summary.get(bytes.fromhex(self.checksum_address[2:]))
+        if known_timestamp is None or self.timestamp.epoch > known_timestamp:
+            unknown_nodes.append(self)
+
+        payload = fleet_state.snapshot()
+        payload += bytes().join(bytes(VariableLengthBytestring(n)) for n in unknown_nodes)
+        return bytes(self.stamp(payload)) + payload
+
+    def signed_fleet_states_match(self) -> bytes:
+        """
+        Returns the signed response to a learner which already has the current fleet state.
+        """
+        def sign_fleet_states_match(fleet_state: FleetState) -> bytes:
+            payload = fleet_state.snapshot() + bytes(FLEET_STATES_MATCH)
+            return bytes(self.stamp(payload)) + payload
+
+        return self.known_nodes.memoize('fleet_states_match', sign_fleet_states_match)
+
     #
     # Stamp
     #
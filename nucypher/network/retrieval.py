@@ -16,8 +16,10 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 from collections import defaultdict
+from queue import Queue, Empty
 import random
-from typing import Dict, Sequence, List
+import sys
+from typing import Dict, Sequence, List, Optional
 
 from bytestring_splitter import BytestringSplitter, VariableLengthBytestring
 from eth_typing.evm import ChecksumAddress
@@ -43,6 +45,7 @@ from nucypher.network.nodes import Learner
 from nucypher.policy.hrac import HRAC, hrac_splitter
 from nucypher.policy.kits import MessageKit, RetrievalKit, RetrievalResult
 from nucypher.policy.maps import TreasureMap
+from nucypher.utilities.concurrency import Success, Failure, SharedExecutor, get_shared_executor
 
 
 class RetrievalPlan:
@@ -116,13 +119,25 @@ class RetrievalPlan:
             self._processed_capsules[work_order.ursula_address].add(capsule)
             self._results[capsule][work_order.ursula_address] = cfrag
 
+    def has_ursulas_left(self) -> bool:
+        return bool(self._ursulas_pick_order)
+
+    def is_satisfied(self) -> bool:
+        """
+        Returns `True` if all the capsules have enough cfrags for decryption.
+        """
+        return all(len(addresses) >= self._threshold for addresses in self._queried_addresses.values())
+
+    def missing_cfrags(self) -> int:
+        """
+        Returns the largest number of cfrags still missing for any of the capsules,
+        that is the minimum number of successful queries required to complete the plan.
+        """
+        return max(max(self._threshold - len(addresses), 0)
+                   for addresses in self._queried_addresses.values())
+
     def is_complete(self) -> bool:
-        return (
-            # there are no more Ursulas to query
-            not bool(self._ursulas_pick_order) or
-            # all the capsules have enough cfrags for decryption
-            all(len(addresses) >= self._threshold for addresses in self._queried_addresses.values())
-            )
+        return not self.has_ursulas_left() or self.is_satisfied()
 
     def results(self) -> List['RetrievalResult']:
         return [RetrievalResult(self._results[capsule]) for capsule in self._capsules]
@@ -189,6 +204,18 @@ class ReencryptionRequest:
         capsules = capsule_splitter.repeat(remainder)
         return cls(hrac, alice_vk, bob_vk, ekfrag, capsules)
 
+    @property
+    def alice_verifying_key(self) -> PublicKey:
+        return self._alice_verifying_key
+
+    @property
+    def bob_verifying_key(self) -> PublicKey:
+        return self._bob_verifying_key
+
+    @property
+    def publisher_verifying_key(self) -> PublicKey:
+        return self.encrypted_kfrag.sender_verifying_key
+
     def alice(self) -> 'Alice':
         from nucypher.characters.lawful import Alice
         return Alice.from_public_keys(verifying_key=self._alice_verifying_key)
@@ -213,19 +240,39 @@ class ReencryptionResponse:
                             cfrags: List[VerifiedCapsuleFrag],
                             stamp: SignatureStamp,
                             ) -> 'ReencryptionResponse':
+        return cls.construct_from_serialized_cfrags(capsules=capsules,
+                                                    serialized_cfrags=[bytes(cfrag) for cfrag in cfrags],
+                                                    stamp=stamp)
 
-        # un-verify
-        cfrags = [CapsuleFrag.from_bytes(bytes(cfrag)) for cfrag in cfrags]
-
+    @classmethod
+    def construct_from_serialized_cfrags(cls,
+                                         capsules: List[Capsule],
+                                         serialized_cfrags: List[bytes],
+                                         stamp: SignatureStamp,
+                                         ) -> 'ReencryptionResponse':
+        """
+        Signs and wraps already serialized cfrags.
+        The same bytes are used for the signature and for the serialized response,
+        so the cfrags are never re-serialized (or "un-verified" through parsing) on Ursula's side.
+        """
         capsules_bytes = b''.join(bytes(capsule) for capsule in capsules)
-        cfrags_bytes = b''.join(bytes(cfrag) for cfrag in cfrags)
+        cfrags_bytes = b''.join(serialized_cfrags)
         signature = stamp(capsules_bytes + cfrags_bytes)
-        return cls(cfrags, signature)
+        response = cls(cfrags=None, signature=signature)
+        response._serialized_cfrags = list(serialized_cfrags)
+        return response
 
-    def __init__(self, cfrags: List[CapsuleFrag], signature: Signature):
-        self.cfrags = cfrags
+    def __init__(self, cfrags: Optional[List[CapsuleFrag]], signature: Signature):
+        self._cfrags = cfrags
+        self._serialized_cfrags = None
         self.signature = signature
 
+    @property
+    def cfrags(self) -> List[CapsuleFrag]:
+        if self._cfrags is None:
+            self._cfrags = [CapsuleFrag.from_bytes(cfrag_bytes) for cfrag_bytes in self._serialized_cfrags]
+        return self._cfrags
+
     @classmethod
     def from_bytes(cls, data: bytes):
         signature, cfrags_bytes = signature_splitter(data, return_remainder=True)
@@ -239,16 +286,42 @@ class ReencryptionResponse:
         return cls(cfrags, signature)
 
     def __bytes__(self):
+        if self._serialized_cfrags is not None:
+            return bytes(self.signature) + b''.join(self._serialized_cfrags)
         return bytes(self.signature) + b''.join(bytes(cfrag) for cfrag in self.cfrags)
 
 
 class RetrievalClient:
     """
     Capsule frag retrieval machinery shared between Bob and Porter.
+
+    By default Ursulas are queried one at a time. If ``concurrency`` is greater than 1,
+    up to that many reencryption requests are kept in flight: the first ``threshold``
+    requests are sent at once, and an extra speculative request is launched
+    every ``stagger_timeout`` seconds without a response.
+    The retrieval stops as soon as every capsule has ``threshold`` cfrags.
+    Concurrent requests run in the threads of a ``SharedExecutor`` (the process-wide one by default).
     """
 
-    def __init__(self, learner: Learner):
+    DEFAULT_CONCURRENCY = 1
+    DEFAULT_REQUEST_TIMEOUT = 2  # seconds
+    DEFAULT_STAGGER_TIMEOUT = 0.5  # seconds
+
+    def __init__(self,
+                 learner: Learner,
+                 concurrency: int = DEFAULT_CONCURRENCY,
+                 request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+                 stagger_timeout: float = DEFAULT_STAGGER_TIMEOUT,
+                 executor: Optional[SharedExecutor] = None):
+
+        if concurrency < 1:
+            raise ValueError(f"Retrieval concurrency must be a positive number, got {concurrency}")
+
         self._learner = learner
+        self._concurrency = concurrency
+        self._request_timeout = request_timeout
+        self._stagger_timeout = stagger_timeout
+        self._executor = executor or get_shared_executor()
         self.log = Logger(self.__class__.__name__)
 
     def _ensure_ursula_availability(self, treasure_map: TreasureMap, timeout=10):
@@ -299,7 +372,7 @@ class RetrievalClient:
         middleware = self._learner.network_middleware
 
         try:
-            response = middleware.reencrypt(ursula, bytes(reencryption_request))
+            response = middleware.reencrypt(ursula, bytes(reencryption_request), timeout=self._request_timeout)
         except NodeSeemsToBeDown as e:
             # TODO: What to do here?  Ursula isn't supposed to be down.  NRN
             message = (f"Ursula ({ursula}) seems to be down "
@@ -376,15 +449,7 @@ class RetrievalClient:
 
         retrieval_plan = RetrievalPlan(treasure_map=treasure_map, retrieval_kits=retrieval_kits)
 
-        while not retrieval_plan.is_complete():
-            # TODO (#2789): Currently we'll only query one Ursula once during the retrieval.
-            # Alternatively we may re-query Ursulas that were offline until the timeout expires.
-
-            work_order = retrieval_plan.get_work_order()
-
-            if work_order.ursula_address not in self._learner.known_nodes:
-                continue
-
+        def make_request(work_order: RetrievalWorkOrder) -> Dict[Capsule, VerifiedCapsuleFrag]:
             ursula = self._learner.known_nodes[work_order.ursula_address]
             reencryption_request = ReencryptionRequest.from_work_order(
                 work_order=work_order,
@@ -392,17 +457,97 @@ class RetrievalClient:
                 alice_verifying_key=alice_verifying_key,
                 bob_verifying_key=bob_verifying_key)
 
+            return self._request_reencryption(ursula=ursula,
+                                              reencryption_request=reencryption_request,
+                                              delegating_key=policy_encrypting_key,
+                                              receiving_key=bob_encrypting_key)
+
+        if self._concurrency > 1:
+            self._execute_plan_concurrently(retrieval_plan, make_request)
+        else:
+            self._execute_plan(retrieval_plan, make_request)
+
+        return retrieval_plan.results()
+
+    def _next_work_order(self, retrieval_plan: RetrievalPlan) -> Optional[RetrievalWorkOrder]:
+        """
+        Returns the next work order for a known Ursula, or `None` if the plan is complete.
+        """
+        while not retrieval_plan.is_complete():
+            work_order = retrieval_plan.get_work_order()
+            if work_order.ursula_address in self._learner.known_nodes:
+                return work_order
+        return None
+
+    def _execute_plan(self, retrieval_plan: RetrievalPlan, make_request):
+        while True:
+            # TODO (#2789): Currently we'll only query one Ursula once during the retrieval.
+            # Alternatively we may re-query Ursulas that were offline until the timeout expires.
+
+            work_order = self._next_work_order(retrieval_plan)
+            if work_order is None:
+                break
+
             try:
-                cfrags = self._request_reencryption(ursula=ursula,
-                                                    reencryption_request=reencryption_request,
-                                                    delegating_key=policy_encrypting_key,
-                                                    receiving_key=bob_encrypting_key)
+                cfrags = make_request(work_order)
             except Exception as e:
                 # TODO (#2789): at this point we can separate the exceptions to "acceptable"
                 # (Ursula is not reachable) and "unacceptable" (Ursula provided bad results).
-                self.log.warn(f"Ursula {ursula} failed to reencrypt: {e}")
+                self.log.warn(f"Ursula {work_order.ursula_address} failed to reencrypt: {e}")
                 continue
 
             retrieval_plan.update(work_order, cfrags)
 
-        return retrieval_plan.results()
+    def _execute_plan_concurrently(self, retrieval_plan: RetrievalPlan, make_request):
+        """
+        Executes the plan keeping several requests in flight.
+        The plan is only accessed from the calling thread;
+        worker threads only perform the requests and report the results back.
+        """
+
+        results = Queue()
+
+        def worker(work_order):
+            try:
+                results.put(Success(work_order, make_request(work_order)))
+            except Exception:
+                results.put(Failure(work_order, sys.exc_info()))
+
+        executor_queue = self._executor.queue(name=self.__class__.__name__, max_concurrency=self._concurrency)
+
+        in_flight = 0
+        speculative_requests = 0
+        try:
+            while not retrieval_plan.is_satisfied():
+
+                # Every capsule needs `missing_cfrags()` more responses at most,
+                # so that many requests are sent at once, plus the speculative ones
+                # launched while the requests in flight were taking too long.
+                target = min(self._concurrency, retrieval_plan.missing_cfrags() + speculative_requests)
+                while in_flight < target:
+                    work_order = self._next_work_order(retrieval_plan)
+                    if work_order is None:
+                        break
+                    executor_queue.submit(worker, work_order)
+                    in_flight += 1
+
+                if in_flight == 0:
+                    # Nobody left to ask.
+                    break
+
+                try:
+                    result = results.get(timeout=self._stagger_timeout)
+                except Empty:
+                    speculative_requests += 1
+                    continue
+
+                in_flight -= 1
+                if isinstance(result, Success):
+                    retrieval_plan.update(result.value, result.result)
+                else:
+                    _type, exception, _traceback = result.exc_info
+                    self.log.warn(f"Ursula {result.value.ursula_address} failed to reencrypt: {exception}")
+        finally:
+            # The requests still in flight are bounded by the request timeout,
+            # but there's no need for the caller to wait for them; the ones not started are dropped.
+            executor_queue.cancel()
@@ -16,14 +16,17 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 
+import time
 import uuid
 import weakref
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Tuple
 
+from bytestring_splitter import BytestringSplitter, BytestringSplittingError, VariableLengthBytestring
 from constant_sorrow import constants
-from constant_sorrow.constants import FLEET_STATES_MATCH, RELAX, NOT_STAKING
-from flask import Flask, Response, jsonify, request
+from constant_sorrow.constants import RELAX, NOT_STAKING
+from flask import Flask, Response, g, jsonify, request
 from mako import exceptions as mako_exceptions
 from mako.template import Template
 
@@ -34,6 +37,7 @@ from nucypher.crypto.powers import KeyPairBasedPower, PowerUpError
 from nucypher.crypto.signing import InvalidSignature
 from nucypher.datastore.datastore import Datastore
 from nucypher.datastore.models import ReencryptionRequest as ReencryptionRequestModel
+from nucypher.datastore.writer import BatchedRecordWriter
 from nucypher.network import LEARNING_LOOP_VERSION
 from nucypher.network.exceptions import NodeSeemsToBeDown
 from nucypher.network.protocols import InterfaceInfo
@@ -48,6 +52,15 @@ TEMPLATES_DIR = HERE / "templates"
 
 status_template = Template(filename=str(TEMPLATES_DIR / "basic_status.mako")).get_def('main')
 
+# Delta learning requests: the announced nodes, followed by the learner's fleet summary.
+delta_request_splitter = BytestringSplitter(VariableLengthBytestring)
+
+# Key of the request metrics in the REST app extensions, installed by the prometheus exporter.
+REST_METRICS_EXTENSION = 'rest_metrics'
+
+# Key of the writer of re-encryption request evidence in the REST app extensions.
+REENCRYPTION_LOG_EXTENSION = 'reencryption_log'
+
 
 class ProxyRESTServer:
     SERVER_VERSION = LEARNING_LOOP_VERSION
@@ -113,6 +126,55 @@ def _make_rest_app(datastore: Datastore, this_node, domain: str, log: Logger) ->
     rest_app = Flask("ursula-service")
     rest_app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_CONTENT_LENGTH
 
+    # Evidence of re-encryption requests is queued and written in batches, off the request path.
+    reencryption_log = BatchedRecordWriter(datastore=datastore,
+                                           record_type=ReencryptionRequestModel,
+                                           flush_interval=this_node._reencryption_log_flush_interval,
+                                           max_batch_size=this_node._reencryption_log_batch_size,
+                                           durability=this_node._reencryption_log_durability)
+    rest_app.extensions[REENCRYPTION_LOG_EXTENSION] = reencryption_log
+
+    #
+    # Request metrics, only recorded while the prometheus exporter is running
+    #
+
+    @rest_app.before_request
+    def start_request_metrics():
+        metrics = rest_app.extensions.get(REST_METRICS_EXTENSION)
+        if metrics:
+            # Label by route rule, not path, to keep the number of labels bounded
+            endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+            g.request_metrics = (metrics, endpoint, time.perf_counter())
+            metrics.request_started(endpoint)
+
+    @rest_app.after_request
+    def observe_request_metrics(response):
+        request_metrics = g.get('request_metrics')
+        if request_metrics:
+            metrics, endpoint, start = request_metrics
+            metrics.observe_request(endpoint=endpoint,
+                                    method=request.method,
+                                    status=response.status_code,
+                                    duration=time.perf_counter() - start)
+        return response
+
+    @rest_app.teardown_request
+    def finish_request_metrics(exception=None):
+        request_metrics = g.pop('request_metrics', None)
+        if request_metrics:
+            metrics, endpoint, _start = request_metrics
+            metrics.request_finished(endpoint)
+
+    @contextmanager
+    def reencryption_phase(phase: str):
+        metrics = rest_app.extensions.get(REST_METRICS_EXTENSION)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if metrics:
+                metrics.observe_reencryption_phase(phase=phase, duration=time.perf_counter() - start)
+
     @rest_app.route("/public_information")
     def public_information():
         """REST endpoint for public keys and address."""
@@ -129,9 +191,7 @@ def _make_rest_app(datastore: Datastore, this_node, domain: str, log: Logger) ->
         if not this_node.known_nodes:
             return Response(b"", headers=headers, status=204)
 
-        known_nodes_bytestring = this_node.bytestring_of_known_nodes()
-        signature = this_node.stamp(known_nodes_bytestring)
-        return Response(bytes(signature) + known_nodes_bytestring, headers=headers)
+        return Response(this_node.signed_bytestring_of_known_nodes(), headers=headers)
 
     @rest_app.route('/node_metadata', methods=["POST"])
     def node_metadata_exchange():
@@ -141,9 +201,7 @@ def _make_rest_app(datastore: Datastore, this_node, domain: str, log: Logger) ->
         if learner_fleet_state == this_node.known_nodes.checksum:
             # log.debug("Learner already knew fleet state {}; doing nothing.".format(learner_fleet_state))  # 1712
             headers = {'Content-Type': 'application/octet-stream'}
-            payload = this_node.known_nodes.snapshot() + bytes(FLEET_STATES_MATCH)
-            signature = this_node.stamp(payload)
-            return Response(bytes(signature) + payload, headers=headers)
+            return Response(this_node.signed_fleet_states_match(), headers=headers)
 
         sprouts = _node_class.batch_from_bytes(request.data)
 
@@ -153,6 +211,27 @@ def _make_rest_app(datastore: Datastore, this_node, domain: str, log: Logger) ->
         # TODO: What's the right status code here?  202?  Different if we already knew about the node(s)?
         return all_known_nodes()
 
+    @rest_app.route('/node_metadata/delta', methods=["POST"])
+    def node_metadata_delta_exchange():
+        headers = {'Content-Type': 'application/octet-stream'}
+
+        learner_fleet_state = request.args.get('fleet')
+        if learner_fleet_state == this_node.known_nodes.checksum:
+            return Response(this_node.signed_fleet_states_match(), headers=headers)
+
+        try:
+            announced_nodes_bytes, learner_summary = delta_request_splitter(request.data, return_remainder=True)
+            sprouts = _node_class.batch_from_bytes(announced_nodes_bytes) if announced_nodes_bytes else []
+            payload = this_node.signed_bytestring_of_unknown_nodes(learner_summary=learner_summary,
+                                                                   announced_nodes=sprouts)
+        except (BytestringSplittingError, ValueError) as e:
+            return Response(f"Invalid fleet summary: {e}", status=400)
+
+        for node in sprouts:
+            this_node.remember_node(node)
+
+        return Response(payload, headers=headers)
+
     @rest_app.route('/consider_arrangement', methods=['POST'])
     def consider_arrangement():
         arrangement = Arrangement.from_bytes(request.data)
@@ -181,11 +260,14 @@ def _make_rest_app(datastore: Datastore, this_node, domain: str, log: Logger) ->
 
     @rest_app.route('/reencrypt', methods=["POST"])
     def reencrypt():
-        # TODO: Cache & Optimize
+        from nucypher.characters.lawful import Alice, Bob
 
         reenc_request = ReencryptionRequest.from_bytes(request.data)
+        metrics = rest_app.extensions.get(REST_METRICS_EXTENSION)
+        if metrics:
+            metrics.observe_reencryption_capsules(len(reenc_request.capsules))
         hrac = reenc_request.hrac
-        bob = reenc_request.bob()
+        bob = this_node.stranger_from_verifying_key(Bob, reenc_request.bob_verifying_key)
         log.info(f"Work Order from {bob} for policy {hrac}")
 
         # Right off the bat, if this HRAC is already known to be revoked, reject the order.
@@ -193,79 +275,85 @@ def _make_rest_app(datastore: Datastore, this_node, domain: str, log: Logger) ->
             return Response(response="Invalid KFrag sender.", status=401)  # 401 - Unauthorized
 
         # Alice & Publisher
-        alice = reenc_request.alice()
-        policy_publisher = reenc_request.publisher()
+        alice = this_node.stranger_from_verifying_key(Alice, reenc_request.alice_verifying_key)
+        policy_publisher = this_node.stranger_from_verifying_key(Alice, reenc_request.publisher_verifying_key)
 
         # Bob
         bob_ip_address = request.remote_addr
         bob_verifying_key = bob.stamp.as_umbral_pubkey()
         bob_identity_message = f"[{bob_ip_address}] Bob({bytes(bob.stamp).hex()})"
 
-        # Verify & Decrypt KFrag Payload
-        try:
-            plaintext_kfrag_payload = this_node.verify_from(stranger=alice,
-                                                            message_kit=reenc_request.encrypted_kfrag,
-                                                            decrypt=True)
-        except InvalidSignature:
-            return Response(response="Invalid KFrag sender.", status=401)  # 401 - Unauthorized
-        except DecryptingKeypair.DecryptionFailed:
-            return Response(response="KFrag decryption failed.", status=403)   # 403 - Forbidden
-
-        # Verify KFrag Authorization (offchain)
-        from nucypher.policy.maps import AuthorizedKeyFrag
-        try:
-            authorized_kfrag = AuthorizedKeyFrag.from_bytes(plaintext_kfrag_payload)
-        except ValueError:
-            message = f'{bob_identity_message} Invalid AuthorizedKeyFrag.'
-            log.info(message)
-            this_node.suspicious_activities_witnessed['unauthorized'].append(message)
-            return Response(message, status=400)  # 400 - General error
-
-        try:
-            verified_kfrag = this_node.verify_kfrag_authorization(hrac=reenc_request.hrac,
-                                                                  author=alice,
-                                                                  publisher=policy_publisher,
-                                                                  authorized_kfrag=authorized_kfrag)
-
-        except Policy.Unauthorized:
-            message = f'{bob_identity_message} Unauthorized work order.'
-            log.info(message)
-            this_node.suspicious_activities_witnessed['unauthorized'].append(message)
-            return Response(message, status=401)  # 401 - Unauthorized
+        # A kfrag already decrypted and verified for this policy can be reused as is.
+        verified_kfrag = this_node.get_verified_kfrag(reenc_request)
+        if verified_kfrag is None:
+
+            # Verify & Decrypt KFrag Payload
+            with reencryption_phase('kfrag_decryption'):
+                try:
+                    plaintext_kfrag_payload = this_node.verify_from(stranger=alice,
+                                                                    message_kit=reenc_request.encrypted_kfrag,
+                                                                    decrypt=True)
+                except InvalidSignature:
+                    return Response(response="Invalid KFrag sender.", status=401)  # 401 - Unauthorized
+                except DecryptingKeypair.DecryptionFailed:
+                    return Response(response="KFrag decryption failed.", status=403)   # 403 - Forbidden
+
+            # Verify KFrag Authorization (offchain)
+            from nucypher.policy.maps import AuthorizedKeyFrag
+            with reencryption_phase('authorization'):
+                try:
+                    authorized_kfrag = AuthorizedKeyFrag.from_bytes(plaintext_kfrag_payload)
+                except ValueError:
+                    message = f'{bob_identity_message} Invalid AuthorizedKeyFrag.'
+                    log.info(message)
+                    this_node.suspicious_activities_witnessed['unauthorized'].append(message)
+                    return Response(message, status=400)  # 400 - General error
+
+                try:
+                    verified_kfrag = this_node.verify_kfrag_authorization(hrac=reenc_request.hrac,
+                                                                          author=alice,
+                                                                          publisher=policy_publisher,
+                                                                          authorized_kfrag=authorized_kfrag)
+
+                except Policy.Unauthorized:
+                    message = f'{bob_identity_message} Unauthorized work order.'
+                    log.info(message)
+                    this_node.suspicious_activities_witnessed['unauthorized'].append(message)
+                    return Response(message, status=401)  # 401 - Unauthorized
+
+            this_node.remember_verified_kfrag(reenc_request, verified_kfrag)
 
         if not this_node.federated_only:
 
-            # Verify Policy Payment (onchain)
-            try:
-                this_node.verify_policy_payment(hrac=hrac)
-            except Policy.Unpaid:
-                message = f"{bob_identity_message} Policy {hrac} is unpaid."
-                record = (policy_publisher, message)
-                this_node.suspicious_activities_witnessed['freeriders'].append(record)
-                return Response(message, status=402)  # 402 - Payment Required
-            except Policy.Unknown:
-                message = f"{bob_identity_message} Policy {hrac} is not a published policy."
-                return Response(message, status=404)  # 404 - Not Found
-
-            # Verify Active Policy (onchain)
-            try:
-                this_node.verify_active_policy(hrac=hrac)
-            except Policy.Inactive:
-                message = f"{bob_identity_message} Policy {hrac} is not active."
-                return Response(message, status=403)  # 403 - Forbidden
-            except this_node.PolicyInfo.Expired:
-                message = f"{bob_identity_message} Policy {hrac} is expired."
-                return Response(message, status=403)  # 403 - Forbidden
+            # Verify Policy Payment & Active Policy (onchain, cached)
+            with reencryption_phase('payment'):
+                try:
+                    this_node.verify_policy(hrac=hrac)
+                except Policy.Unpaid:
+                    message = f"{bob_identity_message} Policy {hrac} is unpaid."
+                    record = (policy_publisher, message)
+                    this_node.suspicious_activities_witnessed['freeriders'].append(record)
+                    return Response(message, status=402)  # 402 - Payment Required
+                except Policy.Unknown:
+                    message = f"{bob_identity_message} Policy {hrac} is not a published policy."
+                    return Response(message, status=404)  # 404 - Not Found
+                except Policy.Inactive:
+                    message = f"{bob_identity_message} Policy {hrac} is not active."
+                    return Response(message, status=403)  # 403 - Forbidden
+                except Policy.Expired:
+                    message = f"{bob_identity_message} Policy {hrac} is expired."
+                    return Response(message, status=403)  # 403 - Forbidden
 
         # Re-encrypt
         # TODO: return a sensible response if it fails
-        response = this_node._reencrypt(kfrag=verified_kfrag,
-                                        capsules=reenc_request.capsules)
+        with reencryption_phase('reencryption'):
+            response = this_node._reencrypt(kfrag=verified_kfrag,
+                                            capsules=reenc_request.capsules)
 
         # Now, Ursula saves evidence of this workorder to her database...
         # Note: we give the work order a random ID to store it under.
-        with datastore.describe(ReencryptionRequestModel, str(uuid.uuid4()), writeable=True) as new_request:
-            new_request.bob_verifying_key = bob_verifying_key
+        with reencryption_phase('datastore_write'):
+            reencryption_log.put(str(uuid.uuid4()), bob_verifying_key=bob_verifying_key)
 
         headers = {'Content-Type': 'application/octet-stream'}
         return Response(headers=headers, response=bytes(response))
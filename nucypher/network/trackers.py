@@ -15,16 +15,22 @@
  along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import math
 import random
+import time
 
 import maya
-from twisted.internet import reactor
+from twisted.internet import reactor, threads
+from twisted.internet.defer import Deferred
 from twisted.internet.task import LoopingCall
-from typing import Union
+from twisted.python.failure import Failure
+from typing import Dict, List, Sequence, Tuple, Union
 
 from nucypher.network.exceptions import NodeSeemsToBeDown
 from nucypher.network.middleware import RestMiddleware
 from nucypher.network.nodes import NodeSprout
+from nucypher.utilities.cache import LRUCache
+from nucypher.utilities.concurrency import WorkerPool
 from nucypher.utilities.logging import Logger
 
 
@@ -40,6 +46,12 @@ class AvailabilityTracker:
     SENSITIVITY = 0.5     # Threshold
     CHARGE_RATE = 0.9     # Measurement Multiplier
 
+    MAX_CONCURRENT_CHECKS = 5       # Ursulas checked at the same time
+    SAMPLE_DEADLINE = 10            # Seconds for all the checks of a sample
+    UNREACHABLE_TTL = 60 * 30       # Seconds to skip a node that could not be checked
+    UNREACHABLE_CACHE_SIZE = 1000   # Ursulas
+    LATENCY_PERCENTILES = (50, 90, 99)
+
     class Unreachable(RuntimeError):
         pass
 
@@ -69,6 +81,8 @@ class AvailabilityTracker:
         self.__active_measurement = False
         self.__task = LoopingCall(self.maintain)
         self.responders = set()
+        self.unreachable = LRUCache(maxsize=self.UNREACHABLE_CACHE_SIZE, ttl=self.UNREACHABLE_TTL)
+        self.latency_percentiles: Dict[int, float] = dict()  # of the last measured sample
 
     @property
     def excuses(self):
@@ -138,7 +152,7 @@ class AvailabilityTracker:
         if self.running:
             self.__task.stop()
 
-    def maintain(self) -> None:
+    def maintain(self) -> Union[Deferred, None]:
         known_nodes_is_smaller_than_sample_size = len(self._ursula.known_nodes) < self.SAMPLE_SIZE
 
         # If there are no known nodes or too few known nodes, skip this round...
@@ -168,10 +182,18 @@ class AvailabilityTracker:
             self.log.debug(f"Continuing to measure availability (Score: {self.score}).")
             self.__active_measurement = True
 
-        try:
-            self.measure_sample()
-        finally:
-            self.__active_measurement = False
+        # The remote nodes are checked off the reactor thread, which must stay free to serve their callbacks;
+        # their responses are scored back in the reactor thread.
+        ursulas = self.sample(quantity=self.SAMPLE_SIZE)
+        d = threads.deferToThread(self.check_sample, ursulas)
+        d.addCallback(self.record_sample, ursulas)
+        d.addBoth(self.__finish_measurement)
+        return d
+
+    def __finish_measurement(self, result) -> None:
+        self.__active_measurement = False
+        if isinstance(result, Failure):
+            return result
 
         delta = maya.now() - self._start_time
         self.log.info(f"Current availability score is {self.score} measured since {delta}")
@@ -187,7 +209,11 @@ class AvailabilityTracker:
                     return
 
     def sample(self, quantity: int) -> list:
+        """Samples known nodes, preferring the ones that were not found unreachable recently."""
         population = tuple(self._ursula.known_nodes.values())
+        reachable = [node for node in population if node.checksum_address not in self.unreachable]
+        if len(reachable) >= quantity:
+            population = reachable
         ursulas = random.sample(population=population, k=quantity)
         return ursulas
 
@@ -213,40 +239,111 @@ class AvailabilityTracker:
         Measure self-availability from a sample of Ursulas or automatically from known nodes.
         Handle the possibility of unreachable or invalid remote nodes in the sample.
         """
+        if not ursulas:
+            ursulas = self.sample(quantity=self.SAMPLE_SIZE)
+        self.record_sample(self.check_sample(ursulas), ursulas)
+
+    def __check(self, ursula_or_sprout: Union['Ursula', NodeSprout]) -> Tuple[object, float]:
+        """Returns the response of a remote node to an uptime check, and how long it took."""
+        start = time.monotonic()
+        try:
+            response = self._ursula.network_middleware.check_rest_availability(initiator=self._ursula,
+                                                                               responder=ursula_or_sprout)
+        except RestMiddleware.BadRequest as e:
+            response = e
+        return response, time.monotonic() - start
+
+    def check_sample(self, ursulas: Sequence[Union['Ursula', NodeSprout]]) -> Tuple[Dict, Dict]:
+        """
+        Checks self-availability with the given remote nodes concurrently,
+        at most ``MAX_CONCURRENT_CHECKS`` at a time, for up to ``SAMPLE_DEADLINE`` seconds.
+        Returns the responses and the failures (as exception info) of the nodes that could be checked;
+        does not change the score.
+        """
+        if not ursulas:
+            return dict(), dict()
+
+        def value_factory(_successes, ursulas_to_check=list(ursulas)):
+            batch = list(ursulas_to_check)
+            ursulas_to_check.clear()
+            return batch
+
+        worker_pool = WorkerPool(worker=self.__check,
+                                 value_factory=value_factory,
+                                 target_successes=len(ursulas),
+                                 timeout=self.SAMPLE_DEADLINE,
+                                 threadpool_size=min(len(ursulas), self.MAX_CONCURRENT_CHECKS),
+                                 name='availability_checks')
+        worker_pool.start()
+        try:
+            worker_pool.block_until_target_successes()
+        except (WorkerPool.OutOfValues, WorkerPool.TimedOut):
+            # Some of the nodes could not be checked; score the rest.
+            pass
+        finally:
+            # Checks still running past the deadline are abandoned rather than waited for
+            worker_pool.cancel()
+        return worker_pool.get_successes(), worker_pool.get_failures()
+
+    def record_sample(self, checks: Tuple[Dict, Dict], ursulas: Sequence[Union['Ursula', NodeSprout]]) -> None:
+        """Scores the outcomes of the checks of a sample (see ``check_sample()``)."""
 
         # TODO: Relocate?
         Unreachable = (*NodeSeemsToBeDown,
                        self._ursula.NotStaking,
                        self._ursula.network_middleware.UnexpectedResponse)
 
-        if not ursulas:
-            ursulas = self.sample(quantity=self.SAMPLE_SIZE)
-
+        responses, failures = checks
+        latencies = []
         for ursula_or_sprout in ursulas:
-            try:
-                self.measure(ursula_or_sprout=ursula_or_sprout)
-            except self._ursula.network_middleware.NotFound:
+            if ursula_or_sprout in responses:
+                response, latency = responses[ursula_or_sprout]
+                latencies.append(latency)
+                self.__record_response(ursula_or_sprout, response)
+                continue
+
+            self.unreachable.put(ursula_or_sprout.checksum_address, True)
+            if ursula_or_sprout not in failures:
+                self.log.debug(f'{ursula_or_sprout} did not respond to uptime check '
+                               f'within {self.SAMPLE_DEADLINE} seconds')
+                continue
+
+            _exception_type, exception, traceback = failures[ursula_or_sprout]
+            if isinstance(exception, self._ursula.network_middleware.NotFound):
                 # Ignore this measurement and move on because the remote node is not compatible.
                 self.record(None, reason={"error": "Remote node did not support 'ping' endpoint."})
-            except Unreachable as e:
+            elif isinstance(exception, Unreachable):
                 # This node is either not an Ursula, not available, does not support uptime checks, or is not staking...
                 # ...do nothing and move on without changing the score.
-                self.log.debug(f'{ursula_or_sprout} responded to uptime check with {e.__class__.__name__}')
-                continue
+                self.log.debug(f'{ursula_or_sprout} responded to uptime check with {exception.__class__.__name__}')
+            else:
+                raise exception.with_traceback(traceback)
+
+        if latencies:
+            self.latency_percentiles = {percentile: self._percentile(latencies, percentile)
+                                        for percentile in self.LATENCY_PERCENTILES}
+            self.log.debug(f"Uptime check latencies by percentile: {self.latency_percentiles}")
+
+    @staticmethod
+    def _percentile(values: List[float], percentile: int) -> float:
+        """Nearest-rank percentile."""
+        ordered = sorted(values)
+        rank = max(math.ceil(percentile / 100 * len(ordered)), 1)
+        return ordered[rank - 1]
 
     def measure(self, ursula_or_sprout: Union['Ursula', NodeSprout]) -> None:
         """Measure self-availability from a single remote node that participates uptime checks."""
-        try:
-            response = self._ursula.network_middleware.check_rest_availability(initiator=self._ursula, responder=ursula_or_sprout)
-        except RestMiddleware.BadRequest as e:
-            self.responders.add(ursula_or_sprout.checksum_address)
-            self.record(False, reason=e.reason)
+        response, _latency = self.__check(ursula_or_sprout)
+        self.__record_response(ursula_or_sprout, response)
+
+    def __record_response(self, ursula_or_sprout: Union['Ursula', NodeSprout], response) -> None:
+        self.responders.add(ursula_or_sprout.checksum_address)
+        self.unreachable.invalidate(ursula_or_sprout.checksum_address)
+        if isinstance(response, RestMiddleware.BadRequest):
+            self.record(False, reason=response.reason)
+        elif response.status_code == 200:
+            self.record(True)
+        elif response.status_code == 400:
+            self.record(False, reason={'failed': f"{ursula_or_sprout.checksum_address} reported unavailability."})
         else:
-            # Record response
-            self.responders.add(ursula_or_sprout.checksum_address)
-            if response.status_code == 200:
-                self.record(True)
-            elif response.status_code == 400:
-                self.record(False, reason={'failed': f"{ursula_or_sprout.checksum_address} reported unavailability."})
-            else:
-                self.record(None, reason={"error": f"{ursula_or_sprout.checksum_address} returned {response.status_code} from 'ping' endpoint."})
+            self.record(None, reason={"error": f"{ursula_or_sprout.checksum_address} returned {response.status_code} from 'ping' endpoint."})
@@ -0,0 +1,195 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import time
+from collections import deque
+from queue import Empty, Full, Queue
+from threading import Lock, Thread
+from typing import Callable, Dict, List, NamedTuple, Set
+
+from eth_typing import ChecksumAddress
+
+from nucypher.utilities.logging import Logger
+
+
+class VerificationMetrics(NamedTuple):
+    queue_depth: int
+    submitted: int
+    dropped: int
+    outcomes: Dict[str, int]
+    throughput: float  # nodes per second
+
+
+class NodeVerificationPipeline:
+    """
+    Verifies nodes in the background: nodes are put in a bounded queue,
+    from which a pool of worker threads takes them, matures and verifies them,
+    and sorts them into buckets according to the outcome.
+
+    ``verify`` does the actual work; it receives a node and the "force" flag,
+    and returns the name of the bucket the node belongs to.
+    """
+
+    VERIFIED = 'verified'
+    UNREACHABLE = 'unreachable'
+    NOT_STAKING = 'not_staking'
+    INVALID = 'invalid'
+    BUCKETS = (VERIFIED, UNREACHABLE, NOT_STAKING, INVALID)
+
+    DEFAULT_WORKERS = 8
+    DEFAULT_QUEUE_SIZE = 1000
+    THROUGHPUT_WINDOW = 60  # seconds
+
+    _STOP = object()
+
+    def __init__(self,
+                 verify: Callable[['Ursula', bool], str],
+                 workers: int = DEFAULT_WORKERS,
+                 queue_size: int = DEFAULT_QUEUE_SIZE,
+                 clock: Callable[[], float] = time.monotonic):
+
+        if workers < 1:
+            raise ValueError(f"The number of workers must be a positive number, got {workers}")
+
+        self.log = Logger("node-verification")
+        self._verify = verify
+        self.workers = workers
+        self._clock = clock
+        self._queue = Queue(maxsize=queue_size)
+        self._threads = []  # type: List[Thread]
+        self._lock = Lock()
+
+        self._pending = set()  # type: Set[ChecksumAddress]
+        self._submitted = 0
+        self._dropped = 0
+        self._outcomes = {bucket: 0 for bucket in self.BUCKETS}
+        self._completion_times = deque()
+        self._started_at = None
+
+        self.buckets = {bucket: set() for bucket in self.BUCKETS}  # type: Dict[str, Set[ChecksumAddress]]
+
+    @property
+    def running(self) -> bool:
+        return bool(self._threads)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            self._started_at = self._clock()
+            self._threads = [Thread(target=self._work, daemon=True) for _ in range(self.workers)]
+            for thread in self._threads:
+                thread.start()
+
+    def stop(self, timeout: float = None) -> None:
+        """
+        Drops the queued nodes and stops the workers once they are done with the current ones.
+        """
+        with self._lock:
+            threads, self._threads = self._threads, []
+        if not threads:
+            return
+
+        while True:
+            try:
+                node, _force = self._queue.get_nowait()
+            except Empty:
+                break
+            else:
+                if node is not self._STOP:
+                    with self._lock:
+                        self._pending.discard(node.checksum_address)
+
+        for _ in threads:
+            self._queue.put((self._STOP, False))
+        for thread in threads:
+            thread.join(timeout)
+
+    def submit(self, node: 'Ursula', force: bool = False) -> bool:
+        """
+        Queues a node for verification without blocking.
+        Returns ``False`` if it was dropped because the queue is full.
+        A node which is already in the queue is not queued again.
+        """
+        if not self.running:
+            self.start()
+
+        with self._lock:
+            if node.checksum_address in self._pending:
+                return True
+            self._pending.add(node.checksum_address)
+            self._submitted += 1
+
+        try:
+            self._queue.put_nowait((node, force))
+        except Full:
+            with self._lock:
+                self._pending.discard(node.checksum_address)
+                self._dropped += 1
+            self.log.debug(f"Verification queue is full, dropping {node}")
+            return False
+        return True
+
+    def _work(self) -> None:
+        while True:
+            node, force = self._queue.get()
+            if node is self._STOP:
+                return
+
+            try:
+                bucket = self._verify(node, force)
+            except Exception as e:
+                self.log.warn(f"Unexpected error while verifying {node}: {e}")
+                bucket = self.INVALID
+
+            self._record_outcome(node.checksum_address, bucket)
+
+    def _record_outcome(self, checksum_address: ChecksumAddress, bucket: str) -> None:
+        now = self._clock()
+        with self._lock:
+            self._pending.discard(checksum_address)
+            for addresses in self.buckets.values():
+                addresses.discard(checksum_address)
+            self.buckets[bucket].add(checksum_address)
+            self._outcomes[bucket] += 1
+
+            self._completion_times.append(now)
+            while self._completion_times and self._completion_times[0] < now - self.THROUGHPUT_WINDOW:
+                self._completion_times.popleft()
+
+    def bucket_of(self, checksum_address: ChecksumAddress) -> str:
+        """
+        Returns the bucket the node was put in by its last verification, or ``None`` if it was not verified yet.
+        """
+        with self._lock:
+            for bucket, addresses in self.buckets.items():
+                if checksum_address in addresses:
+                    return bucket
+        return None
+
+    def metrics(self) -> VerificationMetrics:
+        now = self._clock()
+        with self._lock:
+            recent = sum(1 for completed_at in self._completion_times if completed_at >= now - self.THROUGHPUT_WINDOW)
+            window = self.THROUGHPUT_WINDOW
+            if self._started_at is not None:
+                window = min(window, now - self._started_at)
+            return VerificationMetrics(queue_depth=self._queue.qsize(),
+                                       submitted=self._submitted,
+                                       dropped=self._dropped,
+                                       outcomes=dict(self._outcomes),
+                                       throughput=recent / window if window > 0 else 0.0)
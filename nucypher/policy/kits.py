@@ -16,7 +16,7 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 
-from typing import Dict, Optional, Iterable, Set
+from typing import Dict, Optional, Iterable, Set, List, Sequence
 
 from bytestring_splitter import BytestringSplitter, VariableLengthBytestring
 from constant_sorrow.constants import (
@@ -35,6 +35,7 @@ from nucypher.crypto.splitters import (
     signature_splitter,
     checksum_address_splitter,
     )
+from nucypher.crypto.encryption import BatchEncryptor
 import nucypher.crypto.umbral_adapter as umbral # need it to mock `umbral.encrypt`
 from nucypher.crypto.umbral_adapter import PublicKey, VerifiedCapsuleFrag, Capsule, Signature
 
@@ -86,6 +87,28 @@ class MessageKit:
 
         return message_kit
 
+    @classmethod
+    def author_many(cls,
+                    recipient_keys: Sequence[PublicKey],
+                    plaintexts: Sequence[bytes],
+                    signer: 'SignatureStamp',
+                    encryptor: BatchEncryptor,
+                    ) -> List['MessageKit']:
+        """
+        Same as ``author()`` (signing the plaintext) for a number of recipients at once,
+        with the encryption done by ``encryptor``. Signing stays in this process.
+        """
+        # TODO (#2743, see also #2556): make a portable constant or remove completely
+        sig_header = SIGNATURE_TO_FOLLOW
+
+        payloads = [sig_header + bytes(signer(plaintext)) + plaintext for plaintext in plaintexts]
+        sender_verifying_key = signer.as_umbral_pubkey()
+        return [cls(ciphertext=ciphertext,
+                    capsule=capsule,
+                    sender_verifying_key=sender_verifying_key,
+                    signature=None)
+                for capsule, ciphertext in encryptor.encrypt(recipient_keys, payloads)]
+
     def __init__(self,
                  capsule: Capsule,
                  ciphertext: bytes,
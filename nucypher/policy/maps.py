@@ -29,6 +29,7 @@ from eth_typing.evm import ChecksumAddress
 
 from nucypher.blockchain.eth.constants import ETH_ADDRESS_BYTE_LENGTH
 from nucypher.crypto.constants import EIP712_MESSAGE_SIGNATURE_SIZE
+from nucypher.crypto.encryption import BatchEncryptor
 from nucypher.crypto.powers import DecryptingPower, SigningPower
 from nucypher.crypto.signing import SignatureStamp, InvalidSignature
 from nucypher.crypto.splitters import signature_splitter, kfrag_splitter
@@ -63,8 +64,13 @@ class TreasureMap:
                                ursulas: Sequence['Ursula'],
                                verified_kfrags: Sequence[VerifiedKeyFrag],
                                threshold: int,
+                               encryptor: Optional[BatchEncryptor] = None,
                                ) -> 'TreasureMap':
-        """Create a new treasure map for a collection of ursulas and kfrags."""
+        """
+        Create a new treasure map for a collection of ursulas and kfrags.
+        The kfrags are encrypted with ``encryptor`` if given (e.g. to use a process pool),
+        and one at a time in the calling thread otherwise.
+        """
 
         if threshold < 1 or threshold > 255:
             raise ValueError("The threshold must be between 1 and 255.")
@@ -74,17 +80,23 @@ class TreasureMap:
                 f"The number of destinations ({len(ursulas)}) "
                 f"must be equal or greater than the threshold ({threshold})")
 
+        if encryptor is None:
+            encryptor = BatchEncryptor(processes=1)
+
         # Encrypt each kfrag for an Ursula.
-        destinations = {}
-        for ursula, verified_kfrag in zip(ursulas, verified_kfrags):
-            kfrag_payload = bytes(AuthorizedKeyFrag.construct_by_publisher(hrac=hrac,
-                                                                           verified_kfrag=verified_kfrag,
-                                                                           publisher_stamp=publisher.stamp))
-            encrypted_kfrag = MessageKit.author(recipient_key=ursula.public_keys(DecryptingPower),
-                                                plaintext=kfrag_payload,
-                                                signer=publisher.stamp)
-
-            destinations[ursula.checksum_address] = encrypted_kfrag
+        shares = list(zip(ursulas, verified_kfrags))
+        kfrag_payloads = [bytes(AuthorizedKeyFrag.construct_by_publisher(hrac=hrac,
+                                                                         verified_kfrag=verified_kfrag,
+                                                                         publisher_stamp=publisher.stamp))
+                          for _ursula, verified_kfrag in shares]
+        encrypted_kfrags = MessageKit.author_many(recipient_keys=[ursula.public_keys(DecryptingPower)
+                                                                  for ursula, _kfrag in shares],
+                                                  plaintexts=kfrag_payloads,
+                                                  signer=publisher.stamp,
+                                                  encryptor=encryptor)
+
+        destinations = {ursula.checksum_address: encrypted_kfrag
+                        for (ursula, _kfrag), encrypted_kfrag in zip(shares, encrypted_kfrags)}
 
         return cls(threshold=threshold, hrac=hrac, destinations=destinations)
 
@@ -23,6 +23,7 @@ import maya
 from bytestring_splitter import BytestringSplitter, VariableLengthBytestring
 from eth_typing.evm import ChecksumAddress
 
+from nucypher.blockchain.eth.interfaces import BlockchainInterface
 from nucypher.crypto.powers import TransactingPower
 from nucypher.crypto.splitters import key_splitter
 from nucypher.crypto.umbral_adapter import PublicKey, VerifiedKeyFrag, Signature
@@ -164,6 +165,22 @@ class Policy(ABC):
     def _enact_arrangements(self, arrangements: Dict['Ursula', Arrangement]):
         pass
 
+    @classmethod
+    def _enact_many_arrangements(cls,
+                                 policies_arrangements: Dict['Policy', Dict['Ursula', Arrangement]]
+                                 ) -> Dict['Policy', Exception]:
+        """
+        Same as `_enact_arrangements()` for a number of policies of the same publisher.
+        A policy failing to be enacted does not stop the others; returns the errors of the failed ones.
+        """
+        failures = dict()
+        for policy, arrangements in policies_arrangements.items():
+            try:
+                policy._enact_arrangements(arrangements)
+            except Exception as error:
+                failures[policy] = error
+        return failures
+
     def _propose_arrangement(self,
                              address: ChecksumAddress,
                              network_middleware: RestMiddleware,
@@ -205,17 +222,18 @@ class Policy(ABC):
                            network_middleware: RestMiddleware,
                            handpicked_ursulas: Optional[Iterable['Ursula']] = None,
                            timeout: int = 10,
+                           reservoir: Optional[MergedReservoir] = None,
                            ) -> Dict['Ursula', Arrangement]:
         """
-        Pick some Ursula addresses and send them arrangement proposals.
+        Pick some Ursula addresses (from `reservoir` if given) and send them arrangement proposals.
         Returns a dictionary of Ursulas to Arrangements if it managed to get `shares` responses.
         """
 
-        if handpicked_ursulas is None:
-            handpicked_ursulas = []
-        handpicked_addresses = [ChecksumAddress(ursula.checksum_address) for ursula in handpicked_ursulas]
-
-        reservoir = self._make_reservoir(handpicked_addresses)
+        if reservoir is None:
+            if handpicked_ursulas is None:
+                handpicked_ursulas = []
+            handpicked_addresses = [ChecksumAddress(ursula.checksum_address) for ursula in handpicked_ursulas]
+            reservoir = self._make_reservoir(handpicked_addresses)
         value_factory = PrefetchStrategy(reservoir, self.shares)
 
         def worker(address):
@@ -228,7 +246,8 @@ class Policy(ABC):
                                  target_successes=self.shares,
                                  timeout=timeout,
                                  stagger_timeout=1,
-                                 threadpool_size=self.shares)
+                                 threadpool_size=self.shares,
+                                 name='make_arrangements')
         worker_pool.start()
         try:
             successes = worker_pool.block_until_target_successes()
@@ -281,11 +300,19 @@ class Policy(ABC):
 
         self._enact_arrangements(arrangements)
 
+        return self._make_enacted_policy(arrangements)
+
+    def _make_enacted_policy(self, arrangements: Dict['Ursula', Arrangement]) -> 'EnactedPolicy':
+        """
+        Encrypts the kfrags for the Ursulas that accepted the arrangements, and the treasure map for Bob.
+        """
+
         treasure_map = TreasureMap.construct_by_publisher(hrac=self.hrac,
                                                           publisher=self.publisher,
                                                           ursulas=list(arrangements),
                                                           verified_kfrags=self.kfrags,
-                                                          threshold=self.threshold)
+                                                          threshold=self.threshold,
+                                                          encryptor=self.publisher.kfrag_encryptor)
 
         enc_treasure_map = self._encrypt_treasure_map(treasure_map)
 
@@ -430,6 +457,27 @@ class BlockchainPolicy(Policy):
     def _enact_arrangements(self, arrangements: Dict['Ursula', Arrangement]) -> None:
         self._publish_to_blockchain(ursulas=list(arrangements))
 
+    @classmethod
+    def _enact_many_arrangements(cls,
+                                 policies_arrangements: Dict['Policy', Dict['Ursula', Arrangement]]
+                                 ) -> Dict['Policy', Exception]:
+        if not policies_arrangements:
+            return dict()
+
+        policies = [(bytes(policy.hrac),
+                     policy.value,
+                     policy.expiration.epoch,
+                     [ursula.checksum_address for ursula in arrangements])
+                    for policy, arrangements in policies_arrangements.items()]
+
+        publisher = next(iter(policies_arrangements)).publisher
+        try:
+            publisher.policy_agent.create_policies(transacting_power=publisher.transacting_power, policies=policies)
+        except BlockchainInterface.BatchTransactionFailed as error:
+            ordered_policies = list(policies_arrangements)
+            return {ordered_policies[index]: failure for index, failure in error.failures.items()}
+        return dict()
+
     def _encrypt_treasure_map(self, treasure_map):
         transacting_power = self.publisher._crypto_power.power_ups(TransactingPower)
         return treasure_map.encrypt(publisher=self.publisher,
@@ -14,7 +14,8 @@ GNU Affero General Public License for more details.
 You should have received a copy of the GNU Affero General Public License
 along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
-from typing import Iterable, List, Optional
+from threading import Lock
+from typing import Dict, Iterable, List, Optional
 
 from eth_typing import ChecksumAddress
 
@@ -108,3 +109,26 @@ class PrefetchStrategy:
         if not batch:
             return None
         return batch
+
+
+class StakersSnapshot:
+    """
+    The currently registered stakers, read from the blockchain once per policy duration
+    and shared by any number of policies, each sampling from its own reservoir.
+    """
+
+    def __init__(self, staking_agent: StakingEscrowAgent, pagination_size: int = None):
+        self.staking_agent = staking_agent
+        self.pagination_size = pagination_size
+        self._stakers: Dict[int, Dict[ChecksumAddress, int]] = {}
+        self._lock = Lock()
+
+    def make_reservoir(self, duration_periods: int) -> MergedReservoir:
+        with self._lock:
+            if duration_periods not in self._stakers:
+                n_tokens, stakers_map = self.staking_agent.get_all_active_stakers(periods=duration_periods,
+                                                                                  pagination_size=self.pagination_size)
+                # Like `make_decentralized_staker_reservoir()`, an empty reservoir if there are no locked tokens.
+                self._stakers[duration_periods] = stakers_map if n_tokens else {}
+            stakers_map = self._stakers[duration_periods]
+        return MergedReservoir((), StakersReservoir(stakers_map))
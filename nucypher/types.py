@@ -79,6 +79,15 @@ class StakerFlags(NamedTuple):
     migration_flag: bool
 
 
+class StakerStatus(NamedTuple):
+    owned_tokens: NuNits
+    last_committed_period: Period
+    worker: ChecksumAddress
+    flags: StakerFlags
+    current_locked_tokens: NuNits
+    next_locked_tokens: NuNits
+
+
 class StakerInfo(NamedTuple):
     value: NuNits
     current_committed_period: Period
@@ -17,13 +17,15 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 
 import io
 import sys
+import time
 import traceback
-from queue import Queue
-from threading import Thread, Event, Lock
-from typing import Callable, List, Any, Optional, Dict
+import weakref
+from collections import deque
+from queue import Queue, Empty
+from threading import Thread, Event, Lock, Condition
+from typing import Callable, List, Any, Optional, Dict, Deque, Tuple
 
 from constant_sorrow.constants import PRODUCER_STOPPED, TIMEOUT_TRIGGERED
-from twisted.python.threadpool import ThreadPool
 
 
 class Success:
@@ -90,6 +92,213 @@ class Future:
             return self._value.value
 
 
+class ExecutorQueue:
+    """
+    A queue of tasks of one client of a ``SharedExecutor``,
+    running at most ``max_concurrency`` of them at the same time.
+    """
+
+    def __init__(self, executor: 'SharedExecutor', name: str, max_concurrency: int):
+        self.executor = executor
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self._pending: Deque[Tuple[float, Callable, tuple]] = deque()
+        self._running = 0
+
+    def submit(self, task: Callable, *args) -> None:
+        """Schedules ``task(*args)`` to be called in one of the executor's threads."""
+        self.executor._submit(self, task, args)
+
+    def cancel(self) -> int:
+        """Drops the tasks that have not started yet. Returns the number of dropped tasks."""
+        return self.executor._cancel(self)
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def running(self) -> int:
+        return self._running
+
+    def _runnable(self) -> bool:
+        return bool(self._pending) and self._running < self.max_concurrency
+
+
+class SharedExecutor:
+    """
+    A bounded pool of long-lived threads shared by short-lived clients (e.g. ``WorkerPool``),
+    so that they do not have to start and stop threads of their own.
+
+    Each client schedules its tasks through its own ``ExecutorQueue``, with a concurrency limit;
+    free threads take tasks from the runnable queues in turn,
+    so a client with many slow tasks cannot starve the others.
+    Threads are started on demand, up to ``max_threads``, and exit after ``idle_timeout`` seconds without work.
+
+    Every queue with pending tasks keeps at least one thread: a thread done with a task
+    moves on to another queue only if someone else runs the tasks of its last one,
+    and if all threads are busy, the first task of an idle queue gets an extra thread beyond ``max_threads``,
+    which exits once the queue is drained or run by another thread.
+    Thus clients whose tasks wait on other clients (e.g. nested worker pools) cannot deadlock
+    when the limit is taken up by the waiting tasks.
+    """
+
+    DEFAULT_MAX_THREADS = 256
+    DEFAULT_IDLE_TIMEOUT = 60  # seconds
+
+    def __init__(self, max_threads: int = DEFAULT_MAX_THREADS, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.max_threads = max_threads
+        self.idle_timeout = idle_timeout
+        self._condition = Condition()
+        self._runnable_queues: Deque[ExecutorQueue] = deque()
+        self._threads = 0
+        self._idle_threads = 0
+        self._wakeups = 0  # idle threads notified of new tasks that have not woken up yet
+        self._wait_observers: List[Callable[[str, float], None]] = []
+        self._queues = weakref.WeakSet()
+
+    def queue(self, name: str, max_concurrency: int) -> ExecutorQueue:
+        """Creates a new queue for a client of the executor."""
+        if max_concurrency < 1:
+            raise ValueError(f"Concurrency limit must be positive, got {max_concurrency}")
+        queue = ExecutorQueue(executor=self, name=name, max_concurrency=min(max_concurrency, self.max_threads))
+        with self._condition:
+            self._queues.add(queue)
+        return queue
+
+    def add_wait_observer(self, observer: Callable[[str, float], None]) -> None:
+        """
+        Registers a callable invoked with the queue name and the time (in seconds)
+        each task waited in its queue before starting.
+        """
+        with self._condition:
+            self._wait_observers.append(observer)
+
+    def threads(self) -> int:
+        return self._threads
+
+    def queue_stats(self) -> Dict[str, Tuple[int, int]]:
+        """Returns the numbers of pending and running tasks of the live queues, summed by queue name."""
+        stats = dict()
+        with self._condition:
+            for queue in self._queues:
+                pending, running = stats.get(queue.name, (0, 0))
+                stats[queue.name] = (pending + len(queue._pending), running + queue._running)
+        return stats
+
+    def _submit(self, queue: ExecutorQueue, task: Callable, args: tuple) -> None:
+        with self._condition:
+            queue._pending.append((time.monotonic(), task, args))
+            if not queue._runnable():
+                # Will be picked up when one of the running tasks of the queue is done
+                return
+            if queue not in self._runnable_queues:
+                self._runnable_queues.append(queue)
+            if len(queue._pending) + queue._running > queue.max_concurrency:
+                # Enough threads are already on their way to this queue
+                return
+            if self._idle_threads > self._wakeups:
+                self._wakeups += 1
+                self._condition.notify()
+            elif self._threads < self.max_threads:
+                self._threads += 1
+                Thread(target=self._work, daemon=True).start()
+            elif queue._running == 0:
+                # All threads are busy with other queues, which may be waiting for this one.
+                self._threads += 1
+                Thread(target=self._work, args=(self._take_task(queue),), daemon=True).start()
+
+    def _cancel(self, queue: ExecutorQueue) -> int:
+        with self._condition:
+            cancelled = len(queue._pending)
+            queue._pending.clear()
+            if queue in self._runnable_queues:
+                self._runnable_queues.remove(queue)
+            return cancelled
+
+    def _take_task(self, queue: ExecutorQueue) -> Tuple[ExecutorQueue, float, Callable, tuple]:
+        """Takes the oldest task of a runnable queue. Must be called with the condition acquired."""
+        enqueued_at, task, args = queue._pending.popleft()
+        queue._running += 1
+        if queue in self._runnable_queues:
+            self._runnable_queues.remove(queue)
+        if queue._runnable():
+            # Round-robin: the queue goes behind the others
+            self._runnable_queues.append(queue)
+        return queue, time.monotonic() - enqueued_at, task, args
+
+    def _next_task(self, last_queue: Optional['weakref.ref[ExecutorQueue]'] = None
+                   ) -> Optional[Tuple[ExecutorQueue, float, Callable, tuple]]:
+        """Takes a task from the next runnable queue, waiting for one up to the idle timeout."""
+        with self._condition:
+            queue = last_queue() if last_queue is not None else None
+            if queue is not None and queue._running == 0 and queue._runnable():
+                # Nobody else runs the tasks of the last queue, and the other threads may be waiting for them
+                return self._take_task(queue)
+            del queue  # idle threads must not keep the queues alive
+
+            if self._threads > self.max_threads:
+                # An extra thread is not needed anymore
+                self._threads -= 1
+                return None
+
+            deadline = time.monotonic() + self.idle_timeout
+            while not self._runnable_queues:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._threads -= 1
+                    return None
+                self._idle_threads += 1
+                self._condition.wait(remaining)
+                self._idle_threads -= 1
+                if self._wakeups:
+                    self._wakeups -= 1
+
+            return self._take_task(self._runnable_queues[0])
+
+    def _task_done(self, queue: ExecutorQueue) -> None:
+        with self._condition:
+            queue._running -= 1
+            # The thread that ran the task takes the next one right away, so nothing to notify
+            if queue._runnable() and queue not in self._runnable_queues:
+                self._runnable_queues.append(queue)
+
+    def _run(self, queue: ExecutorQueue, wait: float, task: Callable, args: tuple) -> None:
+        for observer in self._wait_observers:
+            try:
+                observer(queue.name, wait)
+            except Exception:
+                pass  # metrics must not break the tasks
+        try:
+            task(*args)
+        except BaseException:
+            pass  # tasks are expected to report their own errors
+        finally:
+            self._task_done(queue)
+
+    def _work(self, next_task: Optional[Tuple[ExecutorQueue, float, Callable, tuple]] = None) -> None:
+        last_queue = None
+        while True:
+            if next_task is None:
+                next_task = self._next_task(last_queue=last_queue)
+                if next_task is None:
+                    return
+            last_queue = weakref.ref(next_task[0])
+            self._run(*next_task)
+            next_task = None  # idle threads must not keep the queues alive
+
+
+_SHARED_EXECUTOR = None
+_SHARED_EXECUTOR_LOCK = Lock()
+
+
+def get_shared_executor() -> SharedExecutor:
+    """Returns the process-wide executor, creating it on first use."""
+    global _SHARED_EXECUTOR
+    with _SHARED_EXECUTOR_LOCK:
+        if _SHARED_EXECUTOR is None:
+            _SHARED_EXECUTOR = SharedExecutor()
+        return _SHARED_EXECUTOR
+
+
 class WorkerPoolException(Exception):
     """Generalized exception class for WorkerPool failures."""
     def __init__(self, message_prefix: str, failures: Dict):
@@ -129,8 +338,13 @@ class WorkerPool:
     drawn from the given value factory object,
     and wait for their completion and a given number of successes
     (a worker returning something without throwing an exception).
+
+    The workers run in the threads of a ``SharedExecutor`` (the process-wide one by default),
+    at most ``threadpool_size`` at a time.
     """
 
+    DEFAULT_THREADPOOL_SIZE = 20
+
     class TimedOut(WorkerPoolException):
         """Raised if waiting for the target number of successes timed out."""
         def __init__(self, timeout: float, *args, **kwargs):
@@ -150,7 +364,9 @@ class WorkerPool:
                  target_successes,
                  timeout: float,
                  stagger_timeout: float = 0,
-                 threadpool_size: int = None):
+                 threadpool_size: int = None,
+                 name: str = 'worker_pool',
+                 executor: Optional[SharedExecutor] = None):
 
         # TODO: make stagger_timeout a part of the value factory?
 
@@ -160,15 +376,13 @@ class WorkerPool:
         self._stagger_timeout = stagger_timeout
         self._target_successes = target_successes
 
-        thread_pool_kwargs = {}
-        if threadpool_size is not None:
-            thread_pool_kwargs['minthreads'] = threadpool_size
-            thread_pool_kwargs['maxthreads'] = threadpool_size
-        self._threadpool = ThreadPool(**thread_pool_kwargs)
+        executor = executor or get_shared_executor()
+        self._executor_queue = executor.queue(name=name,
+                                              max_concurrency=threadpool_size or self.DEFAULT_THREADPOOL_SIZE)
 
-        # These three tasks must be run in separate threads
-        # to avoid being blocked by workers in the thread pool.
-        self._bail_on_timeout_thread = Thread(target=self._bail_on_timeout)
+        # These two tasks must be run in separate threads
+        # to avoid being blocked by the workers.
+        # The results processing thread also cancels the pool on timeout.
         self._produce_values_thread = Thread(target=self._produce_values)
         self._process_results_thread = Thread(target=self._process_results)
 
@@ -182,30 +396,20 @@ class WorkerPool:
         self._target_value = Future()
         self._producer_error = Future()
         self._results_lock = Lock()
-        self._threadpool_stop_lock = Lock()
-        self._threadpool_stopped = False
 
     def start(self):
         # TODO: check if already started?
-        self._threadpool.start()
         self._produce_values_thread.start()
         self._process_results_thread.start()
-        self._bail_on_timeout_thread.start()
 
     def cancel(self):
         """
-        Cancels the tasks enqueued in the thread pool and stops the producer thread.
+        Cancels the tasks enqueued in the executor and stops the producer thread.
         """
         self._cancel_event.set()
-
-    def _stop_threadpool(self):
-        # This can be called from multiple threads
-        # (`join()` itself can be called from multiple threads,
-        # and we also attempt to stop the pool from the `_process_results()` thread).
-        with self._threadpool_stop_lock:
-            if not self._threadpool_stopped:
-                self._threadpool.stop()
-                self._threadpool_stopped = True
+        # The workers that have not started yet are reported as cancelled right away
+        for _ in range(self._executor_queue.cancel()):
+            self._result_queue.put(Cancelled())
 
     def _check_for_producer_error(self):
         # Check for any unexpected exceptions in the producer thread
@@ -220,12 +424,6 @@ class WorkerPool:
         """
         self._produce_values_thread.join()
         self._process_results_thread.join()
-        self._bail_on_timeout_thread.join()
-
-        # In most cases `_threadpool` will be stopped by the `_process_results()` thread.
-        # But in case there's some unexpected bug in its code, we're making sure the pool is stopped
-        # to avoid the whole process hanging.
-        self._stop_threadpool()
 
         self._check_for_producer_error()
 
@@ -265,14 +463,6 @@ class WorkerPool:
         with self._results_lock:
             return dict(self._successes)
 
-    def _bail_on_timeout(self):
-        """
-        A service thread that cancels the pool on timeout.
-        """
-        if not self._cancel_event.wait(timeout=self._timeout):
-            self._target_value.set(TIMEOUT_TRIGGERED)
-        self._cancel_event.set()
-
     def _worker_wrapper(self, value):
         """
         A wrapper that catches exceptions thrown by the worker
@@ -293,11 +483,20 @@ class WorkerPool:
         """
         A service thread that processes worker results
         and waits for the target number of successes to be reached.
+        Cancels the pool on timeout.
         """
+        deadline = time.monotonic() + self._timeout
+        timed_out = False
         producer_stopped = False
         success_event_reached = False
         while True:
-            result = self._result_queue.get()
+            try:
+                result = self._result_queue.get(timeout=None if timed_out else max(deadline - time.monotonic(), 0))
+            except Empty:
+                timed_out = True
+                self._target_value.set(TIMEOUT_TRIGGERED)
+                self.cancel()
+                continue
 
             if result == PRODUCER_STOPPED:
                 producer_stopped = True
@@ -317,12 +516,10 @@ class WorkerPool:
                         self._failures[result.value] = result.exc_info
 
             if producer_stopped and self._finished_tasks == self._started_tasks:
-                self.cancel() # to cancel the timeout thread
+                self._cancel_event.set()
                 self._target_value.set(PRODUCER_STOPPED)
                 break
 
-        self._stop_threadpool()
-
     def _produce_values(self):
         while True:
             try:
@@ -334,10 +531,7 @@ class WorkerPool:
 
                 self._started_tasks += len(batch)
                 for value in batch:
-                    # There is a possible race between `callInThread()` and `stop()`,
-                    # But we never execute them at the same time,
-                    # because `join()` checks that the producer thread is stopped.
-                    self._threadpool.callInThread(self._worker_wrapper, value)
+                    self._executor_queue.submit(self._worker_wrapper, value)
 
                 self._sleep(self._stagger_timeout)
 
@@ -23,7 +23,7 @@ import maya
 from web3.types import BlockIdentifier
 
 from nucypher.blockchain.eth.agents import EthereumContractAgent
-from nucypher.blockchain.eth.events import EventRecord
+from nucypher.blockchain.eth.event_index import ContractEventIndex
 
 
 def generate_events_csv_filepath(contract_name: str, event_name: str) -> Path:
@@ -35,20 +35,24 @@ def write_events_to_csv_file(csv_file: Path,
                              event_name: str,
                              argument_filters: Dict = None,
                              from_block: Optional[BlockIdentifier] = 0,
-                             to_block: Optional[BlockIdentifier] = 'latest') -> bool:
+                             to_block: Optional[BlockIdentifier] = 'latest',
+                             event_index: Optional[ContractEventIndex] = None) -> bool:
     """
     Write events to csv file.
     :return: True if data written to file, False if there was no event data to write
     """
-    event_type = agent.contract.events[event_name]
-    entries = event_type.getLogs(fromBlock=from_block, toBlock=to_block, argument_filters=argument_filters)
-    if not entries:
+    event_index = event_index or ContractEventIndex()
+    event_records = event_index.events(agent=agent,
+                                       event_name=event_name,
+                                       from_block=from_block,
+                                       to_block=to_block,
+                                       **(argument_filters or dict()))
+    if not event_records:
         return False
 
     with open(csv_file, mode='w') as events_file:
         events_writer = None
-        for event_record in entries:
-            event_record = EventRecord(event_record)
+        for event_record in event_records:
             event_row = OrderedDict()
             event_row['event_name'] = event_name
             event_row['block_number'] = event_record.block_number
@@ -28,6 +28,9 @@ from nucypher.control.controllers import JSONRPCController, WebController
 from nucypher.crypto.powers import DecryptingPower
 from nucypher.crypto.umbral_adapter import PublicKey
 from nucypher.network.nodes import Learner
+from nucypher.network.retrieval import RetrievalClient
+from nucypher.policy.kits import RetrievalKit, RetrievalResult
+from nucypher.policy.maps import TreasureMap
 from nucypher.policy.reservoir import (
     make_federated_staker_reservoir,
     make_decentralized_staker_reservoir,
@@ -78,8 +81,12 @@ the Pipe for nucypher network operations
                  federated_only: bool = False,
                  node_class: object = Ursula,
                  provider_uri: str = None,
+                 retrieval_concurrency: int = RetrievalClient.DEFAULT_CONCURRENCY,
+                 retrieval_request_timeout: float = RetrievalClient.DEFAULT_REQUEST_TIMEOUT,
                  *args, **kwargs):
         self.federated_only = federated_only
+        self.retrieval_concurrency = retrieval_concurrency
+        self.retrieval_request_timeout = retrieval_request_timeout
 
         if not self.federated_only:
             if not provider_uri:
@@ -142,12 +149,31 @@ the Pipe for nucypher network operations
                                  target_successes=quantity,
                                  timeout=self.DEFAULT_EXECUTION_TIMEOUT,
                                  stagger_timeout=1,
-                                 threadpool_size=quantity)
+                                 threadpool_size=quantity,
+                                 name='get_ursulas')
         worker_pool.start()
         successes = worker_pool.block_until_target_successes()
         ursulas_info = successes.values()
         return list(ursulas_info)
 
+    def retrieve_cfrags(self,
+                        treasure_map: TreasureMap,
+                        retrieval_kits: Sequence[RetrievalKit],
+                        alice_verifying_key: PublicKey,
+                        bob_encrypting_key: PublicKey,
+                        bob_verifying_key: PublicKey,
+                        policy_encrypting_key: PublicKey,
+                        ) -> List[RetrievalResult]:
+        client = RetrievalClient(learner=self,
+                                 concurrency=self.retrieval_concurrency,
+                                 request_timeout=self.retrieval_request_timeout)
+        return client.retrieve_cfrags(treasure_map=treasure_map,
+                                      retrieval_kits=retrieval_kits,
+                                      alice_verifying_key=alice_verifying_key,
+                                      bob_encrypting_key=bob_encrypting_key,
+                                      bob_verifying_key=bob_verifying_key,
+                                      policy_encrypting_key=policy_encrypting_key)
+
     def exec_work_order(self, ursula_address: ChecksumAddress, work_order_payload: bytes) -> bytes:
         self.block_until_specific_nodes_are_known(addresses={ursula_address}, learn_on_this_thread=True)
         ursula = self.known_nodes[ursula_address]
@@ -14,7 +14,7 @@
  You should have received a copy of the GNU Affero General Public License
  along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
-from nucypher.blockchain.eth.events import ContractEventsThrottler
+from nucypher.blockchain.eth.event_index import ContractEventIndex
 from nucypher.blockchain.eth.utils import estimate_block_number_for_period
 
 try:
@@ -32,8 +32,9 @@ from nucypher.blockchain.eth.agents import ContractAgency, PolicyManagerAgent, S
 from nucypher.blockchain.eth.interfaces import BlockchainInterfaceFactory
 from nucypher.blockchain.eth.registry import BaseContractRegistry
 from nucypher.datastore.queries import get_policy_arrangements, get_reencryption_requests
+from nucypher.utilities.concurrency import SharedExecutor, get_shared_executor
 
-from typing import Dict, Union
+from typing import Dict, List, Optional, Union
 
 ContractAgents = Union[StakingEscrowAgent, WorkLockAgent, PolicyManagerAgent]
 
@@ -107,6 +108,20 @@ class UrsulaInfoMetricsCollector(BaseMetricsCollector):
             "availability_score_gauge": Gauge(f'{metrics_prefix}_availability_score',
                                               'Availability score',
                                               registry=registry),
+            "availability_latency_gauge": Gauge(f'{metrics_prefix}_availability_check_latency_seconds',
+                                                'Latency of the last sample of uptime checks, by percentile',
+                                                labelnames=('percentile',),
+                                                registry=registry),
+            "verification_queue_depth_gauge": Gauge(f'{metrics_prefix}_node_verification_queue_depth',
+                                                    'Number of nodes waiting for background verification',
+                                                    registry=registry),
+            "verification_throughput_gauge": Gauge(f'{metrics_prefix}_node_verification_throughput',
+                                                   'Nodes verified in the background per second',
+                                                   registry=registry),
+            "verification_outcomes_gauge": Gauge(f'{metrics_prefix}_node_verification_outcomes',
+                                                 'Number of background node verifications by outcome',
+                                                 labelnames=('outcome',),
+                                                 registry=registry),
         }
 
     def _collect_internal(self) -> None:
@@ -125,9 +140,18 @@ class UrsulaInfoMetricsCollector(BaseMetricsCollector):
         self.metrics["known_nodes_gauge"].set(len(self.ursula.known_nodes))
         if self.ursula._availability_tracker and self.ursula._availability_tracker.running:
             self.metrics["availability_score_gauge"].set(self.ursula._availability_tracker.score)
+            for percentile, latency in self.ursula._availability_tracker.latency_percentiles.items():
+                self.metrics["availability_latency_gauge"].labels(percentile=percentile).set(latency)
         else:
             self.metrics["availability_score_gauge"].set(-1)
 
+        if self.ursula.verification_pipeline is not None:
+            verification_metrics = self.ursula.verification_pipeline.metrics()
+            self.metrics["verification_queue_depth_gauge"].set(verification_metrics.queue_depth)
+            self.metrics["verification_throughput_gauge"].set(verification_metrics.throughput)
+            for outcome, count in verification_metrics.outcomes.items():
+                self.metrics["verification_outcomes_gauge"].labels(outcome=outcome).set(count)
+
         # TODO (#2797): for now we leave a terminology discrepancy here, for backward compatibility reasons.
         # Update "work orders" to "reencryption requests" when possible.
         reencryption_requests = get_reencryption_requests(self.ursula.datastore)
@@ -149,6 +173,49 @@ class UrsulaInfoMetricsCollector(BaseMetricsCollector):
         self.metrics["host_info"].info(base_payload)
 
 
+class WorkerPoolMetricsCollector(BaseMetricsCollector):
+    """Collector for the executor shared by worker pools."""
+
+    # Queue wait is expected to be short, unless a pool has more workers than its concurrency limit
+    QUEUE_WAIT_BUCKETS = (.001, .005, .01, .05, .1, .5, 1, 5, 10, 30, float('inf'))
+
+    def __init__(self, executor: Optional[SharedExecutor] = None):
+        super().__init__()
+        self.executor = executor or get_shared_executor()
+        self._pools = set()
+
+    def initialize(self, metrics_prefix: str, registry: CollectorRegistry) -> None:
+        self.metrics = {
+            "queue_wait_histogram": Histogram(f'{metrics_prefix}_worker_pool_queue_wait_seconds',
+                                              'Time workers wait for a thread of the shared executor',
+                                              labelnames=('pool',),
+                                              buckets=self.QUEUE_WAIT_BUCKETS,
+                                              registry=registry),
+            "pending_tasks_gauge": Gauge(f'{metrics_prefix}_worker_pool_pending_tasks',
+                                         'Number of workers waiting for a thread',
+                                         labelnames=('pool',),
+                                         registry=registry),
+            "running_tasks_gauge": Gauge(f'{metrics_prefix}_worker_pool_running_tasks',
+                                         'Number of running workers',
+                                         labelnames=('pool',),
+                                         registry=registry),
+            "threads_gauge": Gauge(f'{metrics_prefix}_worker_pool_threads',
+                                   'Number of threads of the shared executor',
+                                   registry=registry),
+        }
+        queue_wait_histogram = self.metrics["queue_wait_histogram"]
+        self.executor.add_wait_observer(lambda pool, wait: queue_wait_histogram.labels(pool=pool).observe(wait))
+
+    def _collect_internal(self) -> None:
+        stats = self.executor.queue_stats()
+        self._pools.update(stats)
+        for pool in self._pools:
+            pending, running = stats.get(pool, (0, 0))
+            self.metrics["pending_tasks_gauge"].labels(pool=pool).set(pending)
+            self.metrics["running_tasks_gauge"].labels(pool=pool).set(running)
+        self.metrics["threads_gauge"].set(self.executor.threads())
+
+
 class BlockchainMetricsCollector(BaseMetricsCollector):
     """Collector for Blockchain specific metrics."""
     def __init__(self, provider_uri: str):
@@ -293,10 +360,12 @@ class EventMetricsCollector(BaseMetricsCollector):
                  event_name: str,
                  event_args_config: Dict[str, tuple],
                  argument_filters: Dict[str, str],
-                 contract_agent: ContractAgents):
+                 contract_agent: ContractAgents,
+                 event_index: Optional[ContractEventIndex] = None):
         super().__init__()
         self.event_name = event_name
         self.contract_agent = contract_agent
+        self.event_index = event_index or ContractEventIndex()
 
         # this way we don't have to deal with 'latest' at all
         self.filter_current_from_block = self.contract_agent.blockchain.client.block_number
@@ -311,19 +380,38 @@ class EventMetricsCollector(BaseMetricsCollector):
             self.metrics[metric_key] = metric_class(metric_name, metric_doc, registry=registry)
 
     def _collect_internal(self) -> None:
-        from_block = self.filter_current_from_block
         to_block = self.contract_agent.blockchain.client.block_number
+        self.process_events(to_block=to_block)
+        self.prune_events(event_index=self.event_index,
+                          agent=self.contract_agent,
+                          event_names=[self.event_name],
+                          before_block=self.filter_current_from_block)
+
+    @staticmethod
+    def prune_events(event_index: ContractEventIndex,
+                     agent: ContractAgents,
+                     event_names: List[str],
+                     before_block: int) -> None:
+        """
+        Drops the indexed events that were already processed, except for the last blocks,
+        which may still be reorganized, so that the index does not grow with the chain.
+        """
+        event_index.prune(agent=agent, event_names=event_names, before_block=before_block - event_index.reorg_depth)
+
+    def process_events(self, to_block: int) -> None:
+        """Updates metrics with the events emitted since the last check, up to and including `to_block`."""
+        from_block = self.filter_current_from_block
         if from_block >= to_block:
             # we've already checked the latest block and waiting for a new block
             # nothing to see here
             return
 
-        events_throttler = ContractEventsThrottler(agent=self.contract_agent,
-                                                   event_name=self.event_name,
-                                                   from_block=from_block,
-                                                   to_block=to_block,
-                                                   **self.filter_arguments)
-        for event_record in events_throttler:
+        event_records = self.event_index.events(agent=self.contract_agent,
+                                                event_name=self.event_name,
+                                                from_block=from_block,
+                                                to_block=to_block,
+                                                **self.filter_arguments)
+        for event_record in event_records:
             self._event_occurred(event_record.raw_event)
 
         # update last block checked for the next round - from/to block range is inclusive
@@ -367,12 +455,12 @@ class CommitmentMadeEventMetricsCollector(EventMetricsCollector):
                 seconds_per_period=self.contract_agent.staking_parameters()[1],
                 latest_block=latest_block)
 
-            events_throttler = ContractEventsThrottler(agent=self.contract_agent,
-                                                       event_name=self.event_name,
-                                                       from_block=block_number_for_previous_period,
-                                                       to_block=latest_block,
-                                                       **arg_filters)
-            for event_record in events_throttler:
+            event_records = self.event_index.events(agent=self.contract_agent,
+                                                    event_name=self.event_name,
+                                                    from_block=block_number_for_previous_period,
+                                                    to_block=latest_block,
+                                                    **arg_filters)
+            for event_record in event_records:
                 self._event_occurred(event_record.raw_event)
 
             # update last block checked since we just looked for this event up to and including latest block
@@ -450,3 +538,68 @@ class WorkLockRefundEventMetricsCollector(EventMetricsCollector):
     def _event_occurred(self, event) -> None:
         super()._event_occurred(event)
         self.metrics["worklock_deposited_eth_gauge"].set(self.contract_agent.get_deposited_eth(self.staker_address))
+
+
+class ContractEventsMetricsCollector(BaseMetricsCollector):
+    """
+    Collects the metrics of all the event collectors of a contract together.
+
+    On each collection, the events of all the monitored names are fetched with a single address-filtered
+    `getLogs` call per batch of blocks, decoded locally and dispatched to each event collector, so the
+    number of RPC calls does not grow with the number of monitored events. When all the collectors
+    filter the events by the same indexed arguments, those are passed to `getLogs` as topics.
+    """
+    def __init__(self,
+                 event_collectors: List[EventMetricsCollector],
+                 event_index: Optional[ContractEventIndex] = None):
+        super().__init__()
+        if not event_collectors:
+            raise ValueError('At least one event collector must be provided')
+        contract_addresses = {collector.contract_agent.contract_address for collector in event_collectors}
+        if len(contract_addresses) > 1:
+            raise ValueError(f'Event collectors must all monitor the same contract, got {contract_addresses}')
+
+        self.contract_agent = event_collectors[0].contract_agent
+        self.event_collectors = event_collectors
+        self.event_index = event_index or event_collectors[0].event_index
+        for collector in event_collectors:
+            # events are synced once for all collectors, and each of them reads its own from the index
+            collector.event_index = self.event_index
+
+    def initialize(self, metrics_prefix: str, registry: CollectorRegistry) -> None:
+        self.metrics = dict()
+        for collector in self.event_collectors:
+            collector.initialize(metrics_prefix=metrics_prefix, registry=registry)
+
+    def _collect_internal(self) -> None:
+        to_block = self.contract_agent.blockchain.client.block_number
+        pending_collectors = [collector for collector in self.event_collectors
+                              if collector.filter_current_from_block < to_block]
+        if not pending_collectors:
+            # we've already checked the latest block and waiting for a new block
+            return
+
+        event_names = sorted({collector.event_name for collector in pending_collectors})
+        from_block = min(collector.filter_current_from_block for collector in pending_collectors)
+
+        # Only the events matching the argument filters shared by all the collectors (e.g. the staker address)
+        # are fetched and indexed, as long as they can be filtered by topic
+        argument_filters = pending_collectors[0].filter_arguments
+        if any(collector.filter_arguments != argument_filters for collector in pending_collectors):
+            argument_filters = dict()
+        topic_filters = self.event_index.topic_filters(agent=self.contract_agent,
+                                                       event_names=event_names,
+                                                       argument_filters=argument_filters)
+        self.event_index.sync_events(agent=self.contract_agent,
+                                     event_names=event_names,
+                                     from_block=from_block,
+                                     to_block=to_block,
+                                     **topic_filters)
+        for collector in pending_collectors:
+            collector.process_events(to_block=to_block)
+
+        EventMetricsCollector.prune_events(
+            event_index=self.event_index,
+            agent=self.contract_agent,
+            event_names=sorted({collector.event_name for collector in self.event_collectors}),
+            before_block=min(collector.filter_current_from_block for collector in self.event_collectors))
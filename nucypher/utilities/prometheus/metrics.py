@@ -30,27 +30,36 @@ except ImportError:
     raise DevelopmentInstallationRequired(importable_name='prometheus_client')
 
 import json
+import time
+from threading import Lock
 
 from nucypher.utilities.prometheus.collector import (
     MetricsCollector,
     UrsulaInfoMetricsCollector,
+    WorkerPoolMetricsCollector,
     BlockchainMetricsCollector,
     StakerMetricsCollector,
     WorkerMetricsCollector,
     WorkLockMetricsCollector,
     EventMetricsCollector,
+    ContractEventsMetricsCollector,
     ReStakeEventMetricsCollector,
     WindDownEventMetricsCollector,
     WorkerBondedEventMetricsCollector,
     CommitmentMadeEventMetricsCollector,
     WorkLockRefundEventMetricsCollector)
 
-from typing import List
+from typing import List, Optional
 
-from twisted.internet import reactor, task
+from twisted.internet import defer, reactor, task
+from twisted.python.failure import Failure
 from twisted.web.resource import Resource
 
 from nucypher.blockchain.eth.agents import ContractAgency, StakingEscrowAgent, PolicyManagerAgent, WorkLockAgent
+from nucypher.blockchain.eth.event_index import ContractEventIndex
+from nucypher.utilities.concurrency import SharedExecutor, get_shared_executor
+from nucypher.utilities.logging import Logger
+from nucypher.utilities.prometheus.rest import RESTMetrics
 
 
 class PrometheusMetricsConfig:
@@ -60,7 +69,9 @@ class PrometheusMetricsConfig:
                  metrics_prefix: str,
                  listen_address: str = '',  # default to localhost ip
                  collection_interval: int = 90,  # every 1.5 minutes
-                 start_now: bool = False):
+                 start_now: bool = False,
+                 collector_timeout: int = 60,
+                 collection_threads: int = 4):
 
         if not port:
             raise ValueError('port must be provided')
@@ -72,6 +83,8 @@ class PrometheusMetricsConfig:
         self.listen_address = listen_address
         self.collection_interval = collection_interval
         self.start_now = start_now
+        self.collector_timeout = collector_timeout
+        self.collection_threads = collection_threads
 
 
 class MetricsEncoder(json.JSONEncoder):
@@ -148,6 +161,104 @@ def collect_prometheus_metrics(metrics_collectors: List[MetricsCollector]) -> No
         collector.collect()
 
 
+class MetricsCollectionTask:
+    """
+    Periodically collects metrics in the threads of a ``SharedExecutor`` (the process-wide one by default),
+    off the reactor thread, so that slow blockchain providers do not stall the node's services.
+
+    Collectors run concurrently, and a round of collection waits at most `collector_timeout`
+    seconds for each of them. A collector still running after that is not started again until it
+    finishes. Collectors update their metrics in place, so a failed or timed out collection keeps
+    the last good values. The duration, failures and timeouts of each collector are exported too.
+    """
+
+    def __init__(self,
+                 metrics_collectors: List[MetricsCollector],
+                 metrics_prefix: str,
+                 registry: CollectorRegistry = REGISTRY,
+                 collector_timeout: int = 60,
+                 max_threads: int = 4,
+                 executor: Optional[SharedExecutor] = None):
+        self.log = Logger(self.__class__.__name__)
+        self.collector_timeout = collector_timeout
+        executor = executor or get_shared_executor()
+        self._executor_queue = executor.queue(name=self.__class__.__name__, max_concurrency=max_threads)
+        self._task = task.LoopingCall(self.collect)
+
+        self._collectors = dict()
+        for collector in metrics_collectors:
+            # collectors of the same class are told apart by their position
+            label = collector.__class__.__name__
+            while label in self._collectors:
+                label = f'{collector.__class__.__name__}_{len(self._collectors)}'
+            self._collectors[label] = collector
+        self._running = set()
+        self._lock = Lock()
+
+        self.duration_gauge = Gauge(f'{metrics_prefix}_collector_duration_seconds',
+                                    'Duration of the last collection of each collector',
+                                    ['collector'],
+                                    registry=registry)
+        self.failures_counter = Counter(f'{metrics_prefix}_collector_failures',
+                                        'Failed collections of each collector',
+                                        ['collector'],
+                                        registry=registry)
+        self.timeouts_counter = Counter(f'{metrics_prefix}_collector_timeouts',
+                                        'Timed out collections of each collector',
+                                        ['collector'],
+                                        registry=registry)
+
+    def start(self, interval: int, now: bool = False) -> None:
+        reactor.addSystemEventTrigger('before', 'shutdown', self.stop)
+        self._task.start(interval=interval, now=now)
+
+    def stop(self) -> None:
+        if self._task.running:
+            self._task.stop()
+        # Collectors still running are bounded by their providers' timeouts,
+        # but there's no need to wait for them; the ones not started are dropped.
+        self._executor_queue.cancel()
+
+    def collect(self) -> defer.Deferred:
+        """Runs a round of collection; the returned deferred fires once all collectors finished or timed out."""
+        deferreds = [self.__collect_in_thread(label, collector) for label, collector in self._collectors.items()]
+        return defer.DeferredList(deferreds)
+
+    def __collect_in_thread(self, label: str, collector: MetricsCollector) -> defer.Deferred:
+        with self._lock:
+            if label in self._running:
+                self.log.debug(f"Skipping {label} metrics collection, the previous one is still running")
+                return defer.succeed(None)
+            self._running.add(label)
+
+        d = defer.Deferred()
+        self._executor_queue.submit(self.__timed_collect, d, label, collector)
+        d.addTimeout(self.collector_timeout, reactor)
+        d.addErrback(self.__handle_failure, label)
+        return d
+
+    def __timed_collect(self, d: defer.Deferred, label: str, collector: MetricsCollector) -> None:
+        start = time.perf_counter()
+        try:
+            collector.collect()
+        except Exception:
+            reactor.callFromThread(d.errback, Failure())
+        else:
+            reactor.callFromThread(d.callback, None)  # ignored if the collection timed out
+        finally:
+            with self._lock:
+                self._running.discard(label)
+            self.duration_gauge.labels(label).set(time.perf_counter() - start)
+
+    def __handle_failure(self, failure, label: str) -> None:
+        if failure.check(defer.TimeoutError):
+            self.timeouts_counter.labels(label).inc()
+            self.log.warn(f"{label} metrics collection timed out after {self.collector_timeout}s")
+        else:
+            self.failures_counter.labels(label).inc()
+            self.log.warn(f"{label} metrics collection failed: {failure.getErrorMessage()}")
+
+
 def start_prometheus_exporter(ursula: 'Ursula',
                               prometheus_config: PrometheusMetricsConfig,
                               registry: CollectorRegistry = REGISTRY) -> None:
@@ -161,12 +272,16 @@ def start_prometheus_exporter(ursula: 'Ursula',
     for collector in metrics_collectors:
         collector.initialize(metrics_prefix=prometheus_config.metrics_prefix, registry=registry)
 
-    # TODO: was never used
-    # "requests_counter": Counter(f'{metrics_prefix}_http_failures', 'HTTP Failures', ['method', 'endpoint']),
+    # REST app request metrics
+    rest_metrics = RESTMetrics(metrics_prefix=prometheus_config.metrics_prefix, registry=registry)
+    rest_metrics.install(rest_app=ursula.rest_app)
 
     # Scheduling
-    metrics_task = task.LoopingCall(collect_prometheus_metrics,
-                                    metrics_collectors=metrics_collectors)
+    metrics_task = MetricsCollectionTask(metrics_collectors=metrics_collectors,
+                                         metrics_prefix=prometheus_config.metrics_prefix,
+                                         registry=registry,
+                                         collector_timeout=prometheus_config.collector_timeout,
+                                         max_threads=prometheus_config.collection_threads)
     metrics_task.start(interval=prometheus_config.collection_interval,
                        now=prometheus_config.start_now)
 
@@ -180,7 +295,8 @@ def start_prometheus_exporter(ursula: 'Ursula',
 
 def create_metrics_collectors(ursula: 'Ursula', metrics_prefix: str) -> List[MetricsCollector]:
     """Create collectors used to obtain metrics."""
-    collectors: List[MetricsCollector] = [UrsulaInfoMetricsCollector(ursula=ursula)]
+    collectors: List[MetricsCollector] = [UrsulaInfoMetricsCollector(ursula=ursula),
+                                          WorkerPoolMetricsCollector()]
 
     if not ursula.federated_only:
         # Blockchain prometheus
@@ -200,15 +316,24 @@ def create_metrics_collectors(ursula: 'Ursula', metrics_prefix: str) -> List[Met
         # Events
         #
 
+        # Event collectors read events from the same local index, and the events
+        # of each contract are fetched together by a single collector
+        staking_agent = ContractAgency.get_agent(StakingEscrowAgent, registry=ursula.registry)
+        event_index = ContractEventIndex.for_blockchain(staking_agent.blockchain)
+
         # Staking Events
         staking_events_collectors = create_staking_events_metric_collectors(ursula=ursula,
-                                                                            metrics_prefix=metrics_prefix)
-        collectors.extend(staking_events_collectors)
+                                                                            metrics_prefix=metrics_prefix,
+                                                                            event_index=event_index)
+        collectors.append(ContractEventsMetricsCollector(event_collectors=staking_events_collectors,
+                                                         event_index=event_index))
 
         # Policy Events
         policy_events_collectors = create_policy_events_metric_collectors(ursula=ursula,
-                                                                          metrics_prefix=metrics_prefix)
-        collectors.extend(policy_events_collectors)
+                                                                          metrics_prefix=metrics_prefix,
+                                                                          event_index=event_index)
+        collectors.append(ContractEventsMetricsCollector(event_collectors=policy_events_collectors,
+                                                         event_index=event_index))
 
         #
         # WorkLock information - only collected for mainnet
@@ -220,13 +345,18 @@ def create_metrics_collectors(ursula: 'Ursula', metrics_prefix: str) -> List[Met
 
             # WorkLock Events
             worklock_events_collectors = create_worklock_events_metric_collectors(ursula=ursula,
-                                                                                  metrics_prefix=metrics_prefix)
-            collectors.extend(worklock_events_collectors)
+                                                                                  metrics_prefix=metrics_prefix,
+                                                                                  event_index=event_index)
+            collectors.append(ContractEventsMetricsCollector(event_collectors=worklock_events_collectors,
+                                                             event_index=event_index))
 
     return collectors
 
 
-def create_staking_events_metric_collectors(ursula: 'Ursula', metrics_prefix: str) -> List[MetricsCollector]:
+def create_staking_events_metric_collectors(ursula: 'Ursula',
+                                            metrics_prefix: str,
+                                            event_index: Optional[ContractEventIndex] = None
+                                            ) -> List[MetricsCollector]:
     """Create collectors for staking-related events."""
     collectors: List[MetricsCollector] = []
     staking_agent = ContractAgency.get_agent(StakingEscrowAgent, registry=ursula.registry)
@@ -242,7 +372,8 @@ def create_staking_events_metric_collectors(ursula: 'Ursula', metrics_prefix: st
             "period": (Gauge, f'{metrics_prefix}_activity_confirmed_period', 'Commitment made for period')
         },
         staker_address=staker_address,
-        contract_agent=staking_agent))
+        contract_agent=staking_agent,
+        event_index=event_index))
 
     # Minted
     collectors.append(EventMetricsCollector(
@@ -253,7 +384,8 @@ def create_staking_events_metric_collectors(ursula: 'Ursula', metrics_prefix: st
             "block_number": (Gauge, f'{metrics_prefix}_mined_block_number', 'Minted block number')
         },
         argument_filters={'staker': staker_address},
-        contract_agent=staking_agent))
+        contract_agent=staking_agent,
+        event_index=event_index))
 
     # Slashed
     collectors.append(EventMetricsCollector(
@@ -265,7 +397,8 @@ def create_staking_events_metric_collectors(ursula: 'Ursula', metrics_prefix: st
                              'Slashed penalty block number')
         },
         argument_filters={'staker': staker_address},
-        contract_agent=staking_agent))
+        contract_agent=staking_agent,
+        event_index=event_index))
 
     # RestakeSet
     collectors.append(ReStakeEventMetricsCollector(
@@ -273,7 +406,8 @@ def create_staking_events_metric_collectors(ursula: 'Ursula', metrics_prefix: st
             "reStake": (Gauge, f'{metrics_prefix}_restaking', 'Restake set')
         },
         staker_address=staker_address,
-        contract_agent=staking_agent))
+        contract_agent=staking_agent,
+        event_index=event_index))
 
     # WindDownSet
     collectors.append(WindDownEventMetricsCollector(
@@ -281,7 +415,8 @@ def create_staking_events_metric_collectors(ursula: 'Ursula', metrics_prefix: st
             "windDown": (Gauge, f'{metrics_prefix}_wind_down', 'is windDown')
         },
         staker_address=staker_address,
-        contract_agent=staking_agent))
+        contract_agent=staking_agent,
+        event_index=event_index))
 
     # WorkerBonded
     collectors.append(WorkerBondedEventMetricsCollector(
@@ -291,12 +426,16 @@ def create_staking_events_metric_collectors(ursula: 'Ursula', metrics_prefix: st
         },
         staker_address=staker_address,
         worker_address=ursula.worker_address,
-        contract_agent=staking_agent))
+        contract_agent=staking_agent,
+        event_index=event_index))
 
     return collectors
 
 
-def create_worklock_events_metric_collectors(ursula: 'Ursula', metrics_prefix: str) -> List[MetricsCollector]:
+def create_worklock_events_metric_collectors(ursula: 'Ursula',
+                                             metrics_prefix: str,
+                                             event_index: Optional[ContractEventIndex] = None
+                                             ) -> List[MetricsCollector]:
     """Create collectors for worklock-related events."""
     collectors: List[MetricsCollector] = []
     worklock_agent = ContractAgency.get_agent(WorkLockAgent, registry=ursula.registry)
@@ -310,12 +449,15 @@ def create_worklock_events_metric_collectors(ursula: 'Ursula', metrics_prefix: s
         },
         staker_address=staker_address,
         contract_agent=worklock_agent,
-    ))
+        event_index=event_index))
 
     return collectors
 
 
-def create_policy_events_metric_collectors(ursula: 'Ursula', metrics_prefix: str) -> List[MetricsCollector]:
+def create_policy_events_metric_collectors(ursula: 'Ursula',
+                                           metrics_prefix: str,
+                                           event_index: Optional[ContractEventIndex] = None
+                                           ) -> List[MetricsCollector]:
     """Create collectors for policy-related events."""
     collectors: List[MetricsCollector] = []
     policy_manager_agent = ContractAgency.get_agent(PolicyManagerAgent, registry=ursula.registry)
@@ -327,6 +469,7 @@ def create_policy_events_metric_collectors(ursula: 'Ursula', metrics_prefix: str
             "value": (Gauge, f'{metrics_prefix}_policy_withdrawn_reward', 'Policy reward')
         },
         argument_filters={"recipient": ursula.checksum_address},
-        contract_agent=policy_manager_agent))
+        contract_agent=policy_manager_agent,
+        event_index=event_index))
 
     return collectors
@@ -0,0 +1,77 @@
+"""
+ This file is part of nucypher.
+
+ nucypher is free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published by
+ the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ nucypher is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+try:
+    from prometheus_client import Counter, Gauge, Histogram
+    from prometheus_client.registry import CollectorRegistry, REGISTRY
+except ImportError:
+    raise ImportError('"prometheus_client" must be installed - run "pip install nucypher[ursula]" and try again.')
+
+from flask import Flask
+
+from nucypher.network.server import REST_METRICS_EXTENSION
+
+
+class RESTMetrics:
+    """
+    Request metrics of a node's REST app: per-route request counts by status code, latencies and
+    requests in flight, along with the duration of each phase of re-encryption requests.
+    Installed in the REST app by the prometheus exporter, which then serves them.
+    """
+
+    CAPSULES_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+    def __init__(self, metrics_prefix: str, registry: CollectorRegistry = REGISTRY):
+        self.requests_counter = Counter(f'{metrics_prefix}_rest_requests',
+                                        'REST requests served',
+                                        ['endpoint', 'method', 'status'],
+                                        registry=registry)
+        self.latency_histogram = Histogram(f'{metrics_prefix}_rest_request_duration_seconds',
+                                           'REST request latency',
+                                           ['endpoint', 'method'],
+                                           registry=registry)
+        self.in_flight_gauge = Gauge(f'{metrics_prefix}_rest_requests_in_flight',
+                                     'REST requests in flight',
+                                     ['endpoint'],
+                                     registry=registry)
+        self.reencryption_phase_histogram = Histogram(f'{metrics_prefix}_reencryption_phase_duration_seconds',
+                                                      'Duration of each phase of re-encryption requests',
+                                                      ['phase'],
+                                                      registry=registry)
+        self.reencryption_capsules_histogram = Histogram(f'{metrics_prefix}_reencryption_capsules',
+                                                         'Capsules per re-encryption request',
+                                                         buckets=self.CAPSULES_BUCKETS,
+                                                         registry=registry)
+
+    def install(self, rest_app: Flask) -> None:
+        rest_app.extensions[REST_METRICS_EXTENSION] = self
+
+    def request_started(self, endpoint: str) -> None:
+        self.in_flight_gauge.labels(endpoint).inc()
+
+    def request_finished(self, endpoint: str) -> None:
+        self.in_flight_gauge.labels(endpoint).dec()
+
+    def observe_request(self, endpoint: str, method: str, status: int, duration: float) -> None:
+        self.requests_counter.labels(endpoint, method, status).inc()
+        self.latency_histogram.labels(endpoint, method).observe(duration)
+
+    def observe_reencryption_phase(self, phase: str, duration: float) -> None:
+        self.reencryption_phase_histogram.labels(phase).observe(duration)
+
+    def observe_reencryption_capsules(self, capsules: int) -> None:
+        self.reencryption_capsules_histogram.observe(capsules)
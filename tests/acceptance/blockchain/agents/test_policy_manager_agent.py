@@ -69,6 +69,28 @@ def test_create_policy(testerchain, agency, token_economics, test_registry):
     assert receipt['logs'][0]['address'] == policy_agent.contract_address
 
 
+def test_create_policies(testerchain, agency, token_economics, test_registry):
+    staking_agent = ContractAgency.get_agent(StakingEscrowAgent, registry=test_registry)
+    policy_agent = ContractAgency.get_agent(PolicyManagerAgent, registry=test_registry)
+    now = testerchain.w3.eth.getBlock('latest').timestamp
+    tpower = TransactingPower(account=testerchain.alice_account, signer=Web3Signer(testerchain.client))
+
+    # Each policy has its own nodes
+    policies = [(os.urandom(POLICY_ID_LENGTH),
+                 token_economics.minimum_allowed_locked,
+                 now + 10 * token_economics.hours_per_period * 60,
+                 list(staking_agent.get_stakers_reservoir(duration=1).draw(3)))
+                for _ in range(3)]
+    receipts = policy_agent.create_policies(transacting_power=tpower, policies=policies)
+
+    assert len(receipts) == len(policies)
+    for receipt, (policy_id, _value, _end_timestamp, node_addresses) in zip(receipts, policies):
+        assert receipt['status'] == 1, "Transaction Rejected"
+        assert receipt['logs'][0]['address'] == policy_agent.contract_address
+        arrangements = list(policy_agent.fetch_policy_arrangements(policy_id=policy_id))
+        assert [record[0] for record in arrangements] == node_addresses
+
+
 @pytest.mark.usefixtures('blockchain_ursulas')
 def test_fetch_policy_arrangements(agency, policy_meta, test_registry):
     policy_agent = ContractAgency.get_agent(PolicyManagerAgent, registry=test_registry)
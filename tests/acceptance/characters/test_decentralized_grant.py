@@ -53,3 +53,61 @@ def test_decentralized_grant(blockchain_alice, blockchain_bob, blockchain_ursula
             # TODO: try to decrypt?
             # TODO: Use a new type for EncryptedKFrags?
             assert isinstance(kfrag_kit, MessageKit)
+
+
+def test_decentralized_grant_many(blockchain_alice, blockchain_bob, blockchain_ursulas, mocker):
+    policy_end_datetime = maya.now() + datetime.timedelta(days=35)
+    grants = [(blockchain_bob,
+               f"grant_many_{i}".encode(),
+               dict(threshold=2, shares=3, rate=int(1e18), expiration=policy_end_datetime))
+              for i in range(3)]
+
+    get_stakers_spy = mocker.spy(blockchain_alice.staking_agent, 'get_all_active_stakers')
+    policies = blockchain_alice.grant_many(grants)
+
+    # One staker snapshot for all the policies with the same duration
+    assert get_stakers_spy.call_count == 1
+
+    assert [policy.label for policy in policies] == [label for _bob, label, _params in grants]
+    for policy in policies:
+        treasure_map = blockchain_bob._decrypt_treasure_map(policy.treasure_map)
+        assert len(treasure_map.destinations) == 3
+
+        # Each policy is published with the Ursulas it was arranged with
+        arrangements = blockchain_alice.policy_agent.fetch_policy_arrangements(policy_id=bytes(policy.hrac))
+        assert {record[0] for record in arrangements} == set(treasure_map.destinations)
+
+
+def test_decentralized_grant_many_partially_published(blockchain_alice, blockchain_bob, blockchain_ursulas, mocker):
+    policy_end_datetime = maya.now() + datetime.timedelta(days=35)
+    grants = [(blockchain_bob,
+               f"grant_many_partially_{i}".encode(),
+               dict(threshold=2, shares=3, rate=int(1e18), expiration=policy_end_datetime))
+              for i in range(3)]
+
+    # The second transaction cannot be built, after the first one was broadcast
+    blockchain = blockchain_alice.policy_agent.blockchain
+    build_contract_transaction = blockchain.build_contract_transaction
+    built = []
+
+    def failing_build_contract_transaction(*args, **kwargs):
+        built.append(kwargs)
+        if len(built) == 2:
+            raise ValueError("gas estimation failed")
+        return build_contract_transaction(*args, **kwargs)
+
+    mocker.patch.object(blockchain, 'build_contract_transaction', side_effect=failing_build_contract_transaction)
+
+    with pytest.raises(blockchain_alice.PartialGrant) as error:
+        blockchain_alice.grant_many(grants)
+
+    # The policies that were published can still be revoked by Alice
+    published = error.value.policies
+    assert [policy.label for policy in published] == [grants[0][1], grants[2][1]]
+    for policy in published:
+        assert blockchain_alice.active_policies[policy.hrac] == policy
+        assert list(blockchain_alice.policy_agent.fetch_policy_arrangements(policy_id=bytes(policy.hrac)))
+
+    [failed_policy] = error.value.failures
+    assert failed_policy.label == grants[1][1]
+    assert failed_policy.hrac not in blockchain_alice.active_policies
@@ -15,6 +15,7 @@ You should have received a copy of the GNU Affero General Public License
 along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 import csv
+import os
 import random
 import re
 from pathlib import Path
@@ -28,6 +29,7 @@ from nucypher.blockchain.eth.agents import (
     PolicyManagerAgent,
     StakingEscrowAgent
 )
+from nucypher.blockchain.eth.constants import POLICY_ID_LENGTH
 from nucypher.blockchain.eth.token import NU
 from nucypher.cli.commands.status import status
 from nucypher.config.constants import TEMPORARY_DOMAIN
@@ -215,3 +217,34 @@ def test_nucypher_status_events(click_runner, testerchain, agency_local_registry
                 # skip value
             line_count += 1
         assert line_count == 2, 'column names and single event row in csv file'
+
+
+def test_nucypher_status_events_bytes_filter(click_runner, testerchain, agency_local_registry, token_economics):
+    staking_agent = ContractAgency.get_agent(StakingEscrowAgent, registry=agency_local_registry)
+    policy_agent = ContractAgency.get_agent(PolicyManagerAgent, registry=agency_local_registry)
+    starting_block_number = testerchain.get_block_number()
+
+    # Two policies are created
+    now = testerchain.w3.eth.getBlock('latest').timestamp
+    tpower = TransactingPower(account=testerchain.alice_account, signer=Web3Signer(testerchain.client))
+    policy_ids = [os.urandom(POLICY_ID_LENGTH) for _ in range(2)]
+    for policy_id in policy_ids:
+        policy_agent.create_policy(policy_id=policy_id,
+                                   transacting_power=tpower,
+                                   value=token_economics.minimum_allowed_locked,
+                                   end_timestamp=now + 10 * token_economics.hours_per_period * 60,
+                                   node_addresses=list(staking_agent.get_stakers_reservoir(duration=1).draw(3)))
+
+    # Bytes arguments are filtered by their hex string
+    status_command = ('events',
+                      '--provider', TEST_PROVIDER_URI,
+                      '--network', TEMPORARY_DOMAIN,
+                      '--event-name', 'PolicyCreated',
+                      '--contract-name', 'PolicyManager',
+                      '--from-block', starting_block_number,
+                      '--event-filter', f'policyId=0x{policy_ids[0].hex()}')
+    result = click_runner.invoke(status, status_command, catch_exceptions=False)
+    assert result.exit_code == 0, result.output
+    events = [line for line in result.output.splitlines() if line.startswith('  - ')]
+    assert len(events) == 1, result.output
+    assert f'policyId: {policy_ids[0]}' in events[0]
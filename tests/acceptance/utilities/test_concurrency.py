@@ -17,11 +17,12 @@
 
 import random
 import time
+from threading import Event, Lock
 from typing import Iterable, Tuple
 
 import pytest
 
-from nucypher.utilities.concurrency import WorkerPool
+from nucypher.utilities.concurrency import SharedExecutor, WorkerPool
 
 
 class AllAtOnceFactory:
@@ -390,3 +391,133 @@ def test_buggy_factory_raises_on_join():
         pool.join()
     with pytest.raises(Exception, match="Buggy factory"):
         pool.join()
+
+
+def test_shared_executor_isolates_queues():
+    """
+    Checks that a queue with many slow tasks does not exceed its concurrency limit
+    and does not starve the other queues of the executor.
+    """
+    executor = SharedExecutor(max_threads=4)
+    slow_queue = executor.queue(name='slow', max_concurrency=2)
+    fast_queue = executor.queue(name='fast', max_concurrency=2)
+
+    release = Event()
+    lock = Lock()
+    running_slow = 0
+    max_running_slow = 0
+    fast_done = []
+
+    def slow_task():
+        nonlocal running_slow, max_running_slow
+        with lock:
+            running_slow += 1
+            max_running_slow = max(max_running_slow, running_slow)
+        release.wait(timeout=10)
+        with lock:
+            running_slow -= 1
+
+    try:
+        for _ in range(10):
+            slow_queue.submit(slow_task)
+        for i in range(5):
+            fast_queue.submit(fast_done.append, i)
+
+        t_start = time.monotonic()
+        while len(fast_done) < 5 and time.monotonic() - t_start < 5:
+            time.sleep(0.01)
+
+        # All the fast tasks are done while the slow ones are still blocked
+        assert sorted(fast_done) == list(range(5))
+        assert not release.is_set()
+        assert max_running_slow == 2
+        assert executor.queue_stats()['slow'] == (8, 2)
+        assert executor.threads() <= 4
+    finally:
+        release.set()
+
+
+def test_shared_executor_cancel():
+    executor = SharedExecutor(max_threads=4)
+    queue = executor.queue(name='test', max_concurrency=1)
+
+    started = Event()
+    release = Event()
+    done = []
+
+    def blocking_task():
+        started.set()
+        release.wait(timeout=10)
+        done.append(None)
+
+    queue.submit(blocking_task)
+    for _ in range(5):
+        queue.submit(blocking_task)
+    assert started.wait(timeout=5)
+
+    # The running task is not interrupted, the pending ones are dropped
+    assert queue.cancel() == 5
+    release.set()
+    t_start = time.monotonic()
+    while queue.running() and time.monotonic() - t_start < 5:
+        time.sleep(0.01)
+    assert done == [None]
+    assert queue.pending() == 0
+
+
+def test_shared_executor_nested_queues_do_not_deadlock():
+    """
+    Checks that tasks waiting for the tasks of other queues make progress
+    even if they take up all the threads of the executor.
+    """
+    executor = SharedExecutor(max_threads=2)
+    outer_queue = executor.queue(name='outer', max_concurrency=2)
+    done = []
+
+    def outer_task(i):
+        inner_done = Event()
+        inner_queue = executor.queue(name='inner', max_concurrency=2)
+        for _ in range(3):
+            inner_queue.submit(lambda: None)
+        inner_queue.submit(inner_done.set)
+        if inner_done.wait(timeout=5):
+            done.append(i)
+
+    for i in range(4):
+        outer_queue.submit(outer_task, i)
+
+    t_start = time.monotonic()
+    while len(done) < 4 and time.monotonic() - t_start < 10:
+        time.sleep(0.01)
+    assert sorted(done) == list(range(4))
+
+    # The extra threads exit once they are not needed
+    t_start = time.monotonic()
+    while executor.threads() > 2 and time.monotonic() - t_start < 5:
+        time.sleep(0.01)
+    assert executor.threads() <= 2
+
+
+def test_worker_pools_share_executor_threads(join_worker_pool):
+    """
+    Checks that consecutive pools run on the same threads of the executor
+    and that the queue wait of their workers is reported.
+    """
+    executor = SharedExecutor(max_threads=10)
+    waits = []
+    executor.add_wait_observer(lambda name, wait: waits.append((name, wait)))
+
+    for _ in range(3):
+        outcomes, worker = generate_workers([(WorkerRule(timeout_min=0.1, timeout_max=0.2), 10)], seed=123)
+        factory = AllAtOnceFactory(list(outcomes))
+        pool = WorkerPool(worker, factory, target_successes=10, timeout=10, threadpool_size=10,
+                          name='test', executor=executor)
+        join_worker_pool(pool)
+        pool.start()
+        successes = pool.block_until_target_successes()
+        pool.join()
+        assert len(successes) == 10
+
+    assert executor.threads() <= 10
+    assert len(waits) == 30
+    assert all(name == 'test' for name, _wait in waits)
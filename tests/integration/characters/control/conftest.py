@@ -115,6 +115,22 @@ def grant_control_request(federated_bob):
     return method_name, params
 
 
+@pytest.fixture(scope='module')
+def grant_many_control_request(federated_bob):
+    method_name = 'grant_many'
+    bob_pubkey_enc = federated_bob.public_keys(DecryptingPower)
+    grants = [{
+        'bob_encrypting_key': bytes(bob_pubkey_enc).hex(),
+        'bob_verifying_key': bytes(federated_bob.stamp).hex(),
+        'label': f'test-grant-many-{i}',
+        'threshold': 2,
+        'shares': 3,
+        'expiration': (maya.now() + datetime.timedelta(days=3)).iso8601(),
+    } for i in range(3)]
+    params = {'grants': grants}
+    return method_name, params
+
+
 @pytest.fixture(scope='module')
 def retrieve_control_request(federated_bob, enacted_federated_policy, capsule_side_channel):
     method_name = 'retrieve_and_decrypt'
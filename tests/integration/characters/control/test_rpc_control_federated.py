@@ -73,6 +73,14 @@ def test_alice_rpc_character_control_grant(alice_rpc_test_client, grant_control_
     assert 'jsonrpc' in response.data
 
 
+def test_alice_rpc_character_control_grant_many(alice_rpc_test_client, grant_many_control_request):
+    method_name, params = grant_many_control_request
+    request_data = {'method': method_name, 'params': params}
+    response = alice_rpc_test_client.send(request_data)
+    assert 'jsonrpc' in response.data
+    assert len(response.data['result']['policies']) == len(params['grants'])
+
+
 def test_enrico_rpc_character_control_encrypt_message(enrico_rpc_controller_test_client, encrypt_control_request):
     method_name, params = encrypt_control_request
     request_data = {'method': method_name, 'params': params}
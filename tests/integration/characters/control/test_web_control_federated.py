@@ -28,6 +28,7 @@ import nucypher
 from nucypher.crypto.powers import DecryptingPower
 from nucypher.policy.kits import MessageKit
 from nucypher.policy.maps import EncryptedTreasureMap
+from nucypher.policy.policies import FederatedPolicy
 
 click_runner = CliRunner()
 
@@ -108,6 +109,62 @@ def test_alice_web_character_control_grant(alice_web_controller_test_client, gra
     assert b'non-hexadecimal number found in fromhex' in response.data
 
 
+def test_alice_web_character_control_grant_many(alice_web_controller_test_client, grant_many_control_request):
+    method_name, params = grant_many_control_request
+    endpoint = f'/{method_name}'
+
+    response = alice_web_controller_test_client.put(endpoint, data=json.dumps(params))
+    assert response.status_code == 200
+
+    response_data = json.loads(response.data)
+    policies = response_data['result']['policies']
+    assert len(policies) == len(params['grants'])
+
+    hracs = set()
+    for policy in policies:
+        assert 'policy_encrypting_key' in policy
+        assert 'alice_verifying_key' in policy
+        encrypted_map = EncryptedTreasureMap.from_bytes(b64decode(policy['treasure_map']))
+        hracs.add(encrypted_map.hrac)
+    assert len(hracs) == len(params['grants'])
+
+    # Send bad data to assert error returns
+    response = alice_web_controller_test_client.put(endpoint, data=json.dumps({'bad': 'input'}))
+    assert response.status_code == 400
+
+    # Malform one of the grants
+    bad_grants = [dict(grant) for grant in params['grants']]
+    del(bad_grants[1]['bob_encrypting_key'])
+    response = alice_web_controller_test_client.put(endpoint, data=json.dumps({'grants': bad_grants}))
+    assert response.status_code == 400
+
+
+def test_alice_web_character_control_grant_many_partially_enacted(alice_web_controller_test_client,
+                                                                  grant_many_control_request,
+                                                                  mocker):
+    method_name, params = grant_many_control_request
+    grants = [dict(grant, label=f'partial-{i}') for i, grant in enumerate(params['grants'])]
+
+    enact_arrangements = FederatedPolicy._enact_arrangements
+
+    def mock_enact_arrangements(policy, arrangements):
+        if policy.label == b'partial-1':
+            raise RuntimeError("not published")
+        return enact_arrangements(policy, arrangements)
+
+    mocker.patch.object(FederatedPolicy, '_enact_arrangements', autospec=True, side_effect=mock_enact_arrangements)
+
+    # The enacted policies are returned along with the errors of the others
+    response = alice_web_controller_test_client.put(f'/{method_name}', data=json.dumps({'grants': grants}))
+    assert response.status_code == 200
+
+    result = json.loads(response.data)['result']
+    assert len(result['policies']) == 2
+    assert result['failures'] == [{'label': 'partial-1',
+                                   'bob_verifying_key': grants[1]['bob_verifying_key'],
+                                   'error': "not published"}]
+
+
 def test_alice_character_control_revoke(alice_web_controller_test_client, federated_bob):
     bob_pubkey_enc = federated_bob.public_keys(DecryptingPower)
 
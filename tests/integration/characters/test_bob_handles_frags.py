@@ -21,10 +21,13 @@ from twisted.internet import threads
 
 from nucypher.characters.lawful import Enrico, Bob
 from nucypher.config.constants import TEMPORARY_DOMAIN
+from nucypher.crypto.powers import DecryptingPower
+from nucypher.datastore.queries import get_reencryption_requests
 from nucypher.network.retrieval import RetrievalClient
+from nucypher.network.server import REST_METRICS_EXTENSION
 from nucypher.policy.kits import RetrievalKit
 
-from tests.utils.middleware import MockRestMiddleware, NodeIsDownMiddleware
+from tests.utils.middleware import MockRestMiddleware, NodeIsDownMiddleware, SluggishReencryptionMiddleware
 
 
 def _policy_info_kwargs(enacted_policy):
@@ -75,6 +78,171 @@ def test_single_retrieve(enacted_federated_policy, federated_bob, federated_ursu
     assert cleartexts == messages
 
 
+def test_retrieve_writes_reencryption_evidence(enacted_federated_policy, federated_bob, federated_ursulas):
+
+    federated_bob.start_learning_loop()
+    messages, message_kits = _make_message_kits(enacted_federated_policy.public_key)
+
+    requests_before = {ursula: len(get_reencryption_requests(ursula.datastore)) for ursula in federated_ursulas}
+    cleartexts = federated_bob.retrieve_and_decrypt(
+        message_kits=message_kits,
+        **_policy_info_kwargs(enacted_federated_policy),
+        )
+    assert cleartexts == messages
+
+    # Evidence is written in the background; flushing waits for it
+    for ursula in federated_ursulas:
+        ursula.reencryption_log.flush()
+    new_requests = sum(len(get_reencryption_requests(ursula.datastore)) - requests_before[ursula]
+                       for ursula in federated_ursulas)
+    assert new_requests >= enacted_federated_policy.threshold
+
+
+def test_retrieve_records_rest_metrics(enacted_federated_policy, federated_bob, federated_ursulas):
+    from prometheus_client import CollectorRegistry
+    from nucypher.utilities.prometheus.rest import RESTMetrics
+
+    federated_bob.start_learning_loop()
+    messages, message_kits = _make_message_kits(enacted_federated_policy.public_key)
+
+    registry = CollectorRegistry()
+    rest_metrics = RESTMetrics(metrics_prefix='test', registry=registry)
+    for ursula in federated_ursulas:
+        ursula.invalidate_policy(enacted_federated_policy.hrac)  # decrypt and verify kfrags again
+        rest_metrics.install(rest_app=ursula.rest_app)
+    try:
+        cleartexts = federated_bob.retrieve_and_decrypt(
+            message_kits=message_kits,
+            **_policy_info_kwargs(enacted_federated_policy),
+            )
+    finally:
+        for ursula in federated_ursulas:
+            del ursula.rest_app.extensions[REST_METRICS_EXTENSION]
+    assert cleartexts == messages
+
+    requests = registry.get_sample_value('test_rest_requests_total',
+                                         {'endpoint': '/reencrypt', 'method': 'POST', 'status': '200'})
+    assert requests >= enacted_federated_policy.threshold
+    assert registry.get_sample_value('test_rest_request_duration_seconds_count',
+                                     {'endpoint': '/reencrypt', 'method': 'POST'}) == requests
+    assert registry.get_sample_value('test_rest_requests_in_flight', {'endpoint': '/reencrypt'}) == 0
+
+    # Federated Ursulas do not check policy payments
+    for phase in ('kfrag_decryption', 'authorization', 'reencryption', 'datastore_write'):
+        assert registry.get_sample_value('test_reencryption_phase_duration_seconds_count', {'phase': phase}) == requests
+    assert registry.get_sample_value('test_reencryption_phase_duration_seconds_count', {'phase': 'payment'}) is None
+    assert registry.get_sample_value('test_reencryption_capsules_count') == requests
+    assert registry.get_sample_value('test_reencryption_capsules_sum') == requests * len(message_kits)
+
+
+def test_retrieve_reuses_verified_kfrags(mocker, enacted_federated_policy, federated_bob, federated_ursulas):
+
+    federated_bob.start_learning_loop()
+    messages, message_kits = _make_message_kits(enacted_federated_policy.public_key)
+
+    hrac = enacted_federated_policy.hrac
+    spies = dict()
+    for ursula in federated_ursulas:
+        ursula.invalidate_policy(hrac)
+        spies[ursula] = mocker.spy(ursula, 'verify_kfrag_authorization')
+
+    cleartexts = federated_bob.retrieve_and_decrypt(
+        message_kits=message_kits,
+        **_policy_info_kwargs(enacted_federated_policy),
+        )
+    assert cleartexts == messages
+    contacted = {ursula for ursula, spy in spies.items() if spy.call_count}
+    assert len(contacted) >= enacted_federated_policy.threshold
+    assert all(spies[ursula].call_count == 1 for ursula in contacted)
+
+    # The kfrags are not decrypted and verified again by the Ursulas that already did so
+    cleartexts = federated_bob.retrieve_and_decrypt(
+        message_kits=message_kits,
+        **_policy_info_kwargs(enacted_federated_policy),
+        )
+    assert cleartexts == messages
+    assert all(spies[ursula].call_count == 1 for ursula in contacted)
+
+    # ...until the policy is invalidated, e.g. after a revocation
+    for ursula in federated_ursulas:
+        ursula.invalidate_policy(hrac)
+    cleartexts = federated_bob.retrieve_and_decrypt(
+        message_kits=message_kits,
+        **_policy_info_kwargs(enacted_federated_policy),
+        )
+    assert cleartexts == messages
+    assert sum(spy.call_count for spy in spies.values()) >= len(contacted) + enacted_federated_policy.threshold
+
+
+def test_concurrent_retrieve(enacted_federated_policy, federated_bob, federated_ursulas):
+
+    federated_bob.start_learning_loop()
+    messages, message_kits = _make_message_kits(enacted_federated_policy.public_key)
+
+    cleartexts = federated_bob.retrieve_and_decrypt(
+        message_kits=message_kits,
+        concurrency=len(federated_ursulas),
+        **_policy_info_kwargs(enacted_federated_policy),
+        )
+
+    assert cleartexts == messages
+
+
+def test_concurrent_retrieve_with_nodes_down(enacted_federated_policy, federated_bob, federated_ursulas):
+
+    federated_bob.start_learning_loop()
+    messages, message_kits = _make_message_kits(enacted_federated_policy.public_key)
+
+    # Only `threshold` Ursulas are up; speculative requests have to find them.
+    federated_bob.network_middleware = NodeIsDownMiddleware()
+    ursulas = list(federated_ursulas)
+    for ursula in ursulas[enacted_federated_policy.threshold:]:
+        federated_bob.network_middleware.node_is_down(ursula)
+
+    cleartexts = federated_bob.retrieve_and_decrypt(
+        message_kits=message_kits,
+        concurrency=2,
+        **_policy_info_kwargs(enacted_federated_policy),
+        )
+
+    assert cleartexts == messages
+
+
+def test_concurrent_retrieve_sends_speculative_requests(enacted_federated_policy, federated_bob, federated_ursulas):
+
+    federated_bob.start_learning_loop()
+    messages, message_kits = _make_message_kits(enacted_federated_policy.public_key)
+
+    # The first `threshold` Ursulas to be asked are slow to respond
+    threshold = enacted_federated_policy.threshold
+    stagger_timeout = 0.1
+    slow_delay = 2
+    middleware = SluggishReencryptionMiddleware(slow_requests=threshold, delay=slow_delay)
+    federated_bob.network_middleware = middleware
+
+    treasure_map = federated_bob._decrypt_treasure_map(enacted_federated_policy.treasure_map)
+    client = RetrievalClient(learner=federated_bob,
+                             concurrency=len(federated_ursulas),
+                             stagger_timeout=stagger_timeout,
+                             request_timeout=slow_delay * 2)
+    results = client.retrieve_cfrags(
+        treasure_map=treasure_map,
+        retrieval_kits=[RetrievalKit(message_kit.capsule, []) for message_kit in message_kits],
+        alice_verifying_key=enacted_federated_policy.publisher_verifying_key,
+        bob_encrypting_key=federated_bob.public_keys(DecryptingPower),
+        bob_verifying_key=federated_bob.stamp.as_umbral_pubkey(),
+        policy_encrypting_key=enacted_federated_policy.public_key)
+
+    assert all(len(result.cfrags) >= threshold for result in results)
+
+    # Only `threshold` requests are sent at first; the extra ones are launched
+    # one by one while the slow ones are in flight.
+    request_times = middleware.request_times
+    assert len(request_times) > threshold
+    first_request, first_speculative_request = request_times[0], request_times[threshold]
+    assert stagger_timeout <= first_speculative_request - first_request < slow_delay
+
+
 def test_use_external_cache(enacted_federated_policy, federated_bob, federated_ursulas):
 
     federated_bob.start_learning_loop()
@@ -21,9 +21,10 @@ import datetime
 import maya
 import pytest
 
-from nucypher.characters.lawful import Enrico
+from nucypher.characters.lawful import Alice, Enrico
 from nucypher.crypto.utils import keccak_digest
 from nucypher.policy.kits import MessageKit
+from nucypher.policy.policies import FederatedPolicy
 from nucypher.policy.revocation import Revocation
 
 
@@ -55,6 +56,71 @@ def test_federated_grant(federated_alice, federated_bob, federated_ursulas):
             assert isinstance(kfrag_kit, MessageKit)
 
 
+def test_federated_grant_many(federated_alice, federated_bob, federated_ursulas):
+    policy_end_datetime = maya.now() + datetime.timedelta(days=5)
+    grants = [(federated_bob, f"grant_many_{i}".encode(), dict(threshold=2, shares=shares, expiration=policy_end_datetime))
+              for i, shares in enumerate((3, 4, 5, 3))]
+
+    policies = federated_alice.grant_many(grants)
+
+    # The policies are returned in the order of the grants
+    assert [policy.label for policy in policies] == [label for _bob, label, _params in grants]
+
+    ursula_addresses = {ursula.checksum_address for ursula in federated_ursulas}
+    for policy, (_bob, _label, params) in zip(policies, grants):
+        assert federated_alice.active_policies[policy.hrac] == policy
+        assert policy.public_key == federated_alice.get_policy_encrypting_key_from_label(policy.label)
+
+        treasure_map = federated_bob._decrypt_treasure_map(policy.treasure_map)
+        assert treasure_map.threshold == params['threshold']
+        assert len(treasure_map.destinations) == params['shares']
+        assert set(treasure_map.destinations) <= ursula_addresses
+
+    assert federated_alice.grant_many([]) == []
+
+
+def test_federated_grant_many_duplicate_policies(federated_alice, federated_bob):
+    policy_end_datetime = maya.now() + datetime.timedelta(days=5)
+    params = dict(threshold=2, shares=3, expiration=policy_end_datetime)
+    grants = [(federated_bob, b"duplicate", params),
+              (federated_bob, b"not_duplicate", params),
+              (federated_bob, b"duplicate", params)]
+    active_policies = dict(federated_alice.active_policies)
+
+    with pytest.raises(ValueError, match="duplicate"):
+        federated_alice.grant_many(grants)
+    assert federated_alice.active_policies == active_policies
+
+
+def test_federated_grant_many_partially_enacted(federated_alice, federated_bob, mocker):
+    policy_end_datetime = maya.now() + datetime.timedelta(days=5)
+    labels = [b"partial_0", b"partial_1", b"partial_2"]
+    grants = [(federated_bob, label, dict(threshold=2, shares=3, expiration=policy_end_datetime)) for label in labels]
+
+    failure = RuntimeError("not published")
+    enact_arrangements = FederatedPolicy._enact_arrangements
+
+    def mock_enact_arrangements(policy, arrangements):
+        if policy.label == labels[1]:
+            raise failure
+        return enact_arrangements(policy, arrangements)
+
+    mocker.patch.object(FederatedPolicy, '_enact_arrangements', autospec=True, side_effect=mock_enact_arrangements)
+
+    with pytest.raises(Alice.PartialGrant) as error:
+        federated_alice.grant_many(grants)
+
+    # The policies enacted before and after the failed one are kept
+    enacted = error.value.policies
+    assert [policy.label for policy in enacted] == [labels[0], labels[2]]
+    for policy in enacted:
+        assert federated_alice.active_policies[policy.hrac] == policy
+    [(failed_policy, exception)] = error.value.failures.items()
+    assert failed_policy.label == labels[1]
+    assert exception is failure
+    assert failed_policy.hrac not in federated_alice.active_policies
+
+
 def test_federated_alice_can_decrypt(federated_alice, federated_bob):
     """
     Test that alice can decrypt data encrypted by an enrico
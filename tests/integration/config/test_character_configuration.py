@@ -105,6 +105,29 @@ def test_federated_development_character_configurations(character, configuration
             alice.disenchant()
 
 
+@pytest.mark.parametrize("character,configuration", characters_and_configurations)
+def test_learning_concurrency_configuration(character, configuration):
+
+    config = configuration(dev_mode=True,
+                           federated_only=True,
+                           lonely=True,
+                           domain=TEMPORARY_DOMAIN)
+    assert config.learning_concurrency == configuration.DEFAULT_LEARNING_CONCURRENCY
+
+    config = configuration(dev_mode=True,
+                           federated_only=True,
+                           lonely=True,
+                           domain=TEMPORARY_DOMAIN,
+                           learning_concurrency=4)
+    assert config.static_payload()['learning_concurrency'] == 4
+
+    thing = config()
+    assert thing.learning_concurrency == 4
+
+    if character is Alice:
+        thing.disenchant()
+
+
 # TODO: This test is unnecessarily slow due to the blockchain configurations. Perhaps we should mock them -- See #2230
 @pytest.mark.parametrize('configuration_class', all_configurations)
 def test_default_character_configuration_preservation(configuration_class, testerchain, test_registry_source_manager, tmpdir):
@@ -15,13 +15,20 @@ You should have received a copy of the GNU Affero General Public License
 along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import multiprocessing
 import tempfile
+from pathlib import Path
 
 import pytest
 
 from nucypher.characters.lawful import Ursula
 from nucypher.config.constants import TEMPORARY_DOMAIN
-from nucypher.config.storages import ForgetfulNodeStorage, TemporaryFileBasedNodeStorage
+from nucypher.config.storages import (
+    ForgetfulNodeStorage,
+    LocalFileBasedNodeStorage,
+    NodeMetadataStore,
+    TemporaryFileBasedNodeStorage
+)
 from nucypher.network.nodes import Learner
 from nucypher.utilities.networking import LOOPBACK_ADDRESS
 from tests.utils.ursula import MOCK_URSULA_STARTING_PORT
@@ -105,29 +112,202 @@ class TestTemporaryFileBasedNodeStorage(BaseTestNodeStorageBackends):
 
     def test_invalid_metadata(self, light_ursula):
         self._read_and_write_metadata(ursula=light_ursula, node_storage=self.storage_backend)
-        some_node, another_node, *other = list(self.storage_backend.metadata_dir.iterdir())
+        metadata_store = self.storage_backend.metadata_store
+        some_node, another_node, *other = sorted(metadata_store.stamps())
 
         # Let's break the metadata (but not the version)
-        metadata_path = self.storage_backend.metadata_dir / some_node
-        with open(metadata_path, 'wb') as file:
-            file.write(Learner.LEARNER_VERSION.to_bytes(4, 'big') + b'invalid')
+        metadata_store.put(some_node, Learner.LEARNER_VERSION.to_bytes(4, 'big') + b'invalid')
 
         with pytest.raises(TemporaryFileBasedNodeStorage.InvalidNodeMetadata):
-            self.storage_backend.get(stamp=some_node.name[:-5],
+            self.storage_backend.get(stamp=some_node.hex(),
                                      federated_only=True,
                                      certificate_only=False)
 
         # Let's break the metadata, by putting a completely wrong version
-        metadata_path = self.storage_backend.metadata_dir / another_node
-        with open(metadata_path, 'wb') as file:
-            file.write(b'meh')  # Versions are expected to be 4 bytes, but this is 3 bytes
+        metadata_store.put(another_node, b'meh')  # Versions are expected to be 4 bytes, but this is 3 bytes
 
         with pytest.raises(TemporaryFileBasedNodeStorage.InvalidNodeMetadata):
-            self.storage_backend.get(stamp=another_node.name[:-5],
+            self.storage_backend.get(stamp=another_node.hex(),
                                      federated_only=True,
                                      certificate_only=False)
 
-        # Since there are 2 broken metadata files, we should get 2 nodes less when reading all
+        # Since there are 2 broken metadata records, we should get 2 nodes less when reading all
         restored_nodes = self.storage_backend.all(federated_only=True, certificates_only=False)
         total_nodes = 1 + ADDITIONAL_NODES_TO_LEARN_ABOUT
         assert total_nodes - 2 == len(restored_nodes)
+        self.storage_backend.clear()
+
+    def test_migrate_metadata_files(self):
+        self.storage_backend.clear()
+        nodes = [Ursula(rest_host=LOOPBACK_ADDRESS,
+                        db_filepath=Path(tempfile.mkdtemp()),
+                        rest_port=port,
+                        federated_only=True,
+                        domain=TEMPORARY_DOMAIN)
+                 for port in range(MOCK_URSULA_STARTING_PORT, MOCK_URSULA_STARTING_PORT + 3)]
+
+        # The layout of the previous version: one file per node, named by its stamp
+        metadata_dir = self.storage_backend.metadata_dir
+        metadata_dir.mkdir(parents=True, exist_ok=True)
+        for node in nodes:
+            (metadata_dir / f'{bytes(node.stamp).hex()}.node').write_bytes(bytes(node))
+        (metadata_dir / 'not-a-stamp.node').write_bytes(b'meh')
+
+        # A fresh storage object moves the files into the store on first access
+        storage = LocalFileBasedNodeStorage(character_class=self.character_class,
+                                            federated_only=self.federated_only,
+                                            storage_root=Path(self.storage_backend.root_dir),
+                                            metadata_dir=metadata_dir,
+                                            certificates_dir=self.storage_backend.certificates_dir)
+        stored_nodes = storage.all(federated_only=True)
+        assert sorted(n.checksum_address for n in stored_nodes) == sorted(n.checksum_address for n in nodes)
+        assert storage.get(stamp=nodes[0].stamp, federated_only=True) == nodes[0]
+        assert sorted(path.name for path in metadata_dir.iterdir()) == ['nodes.db', 'not-a-stamp.node']
+
+        storage.clear()
+        self.storage_backend.clear()
+
+
+    def test_read_and_write_without_file_locks(self, mocker):
+        mocker.patch('nucypher.config.storages.fcntl', None)
+        storage = TemporaryFileBasedNodeStorage(character_class=self.character_class,
+                                                federated_only=self.federated_only)
+        storage.initialize()
+        nodes = [Ursula(rest_host=LOOPBACK_ADDRESS,
+                        db_filepath=Path(tempfile.mkdtemp()),
+                        rest_port=port,
+                        federated_only=True,
+                        domain=TEMPORARY_DOMAIN)
+                 for port in range(MOCK_URSULA_STARTING_PORT, MOCK_URSULA_STARTING_PORT + 3)]
+        for node in nodes:
+            storage.store_node_metadata(node=node)
+
+        # Falls back to a file per node
+        stored_nodes = storage.all(federated_only=True)
+        assert sorted(n.checksum_address for n in stored_nodes) == sorted(n.checksum_address for n in nodes)
+        assert storage.get(stamp=nodes[0].stamp, federated_only=True) == nodes[0]
+        assert sorted(path.name for path in storage.metadata_dir.iterdir()) == \
+               sorted(f'{bytes(node.stamp).hex()}.node' for node in nodes)
+        storage.clear()
+
+    def test_store_standalone_metadata(self):
+        self.storage_backend.clear()
+        node = Ursula(rest_host=LOOPBACK_ADDRESS,
+                      db_filepath=Path(tempfile.mkdtemp()),
+                      rest_port=MOCK_URSULA_STARTING_PORT,
+                      federated_only=True,
+                      domain=TEMPORARY_DOMAIN)
+        filepath = self.storage_backend.generate_metadata_filepath(node.stamp)
+        assert self.storage_backend.store_node_metadata(node=node, filepath=filepath) == filepath
+        assert Ursula.from_bytes(filepath.read_bytes()) == node
+
+        # Not one of the known nodes
+        assert filepath.parent == Path(self.storage_backend.root_dir)
+        assert len(self.storage_backend.metadata_store) == 0
+        filepath.unlink()
+
+def test_node_metadata_store(tmp_path):
+    filepath = tmp_path / 'nodes.db'
+    store = NodeMetadataStore(filepath=filepath)
+    stamps = [bytes([i]) * NodeMetadataStore.STAMP_LENGTH for i in range(3)]
+
+    for i, stamp in enumerate(stamps):
+        store.put(stamp, b'metadata-%d' % i)
+    assert len(store) == 3
+    assert store.get(stamps[1]) == b'metadata-1'
+    with pytest.raises(KeyError):
+        store.get(b'\xff' * NodeMetadataStore.STAMP_LENGTH)
+    with pytest.raises(ValueError):
+        store.put(b'short', b'metadata')
+
+    # Later records supersede earlier ones
+    store.put(stamps[1], b'updated')
+    assert store.get(stamps[1]) == b'updated'
+    store.close()
+
+    # The index is rebuilt from the file; a record cut short by a crash is dropped
+    with open(filepath, 'ab') as file:
+        file.write((100).to_bytes(4, 'big') + stamps[0] + b'incomplete')
+    store = NodeMetadataStore(filepath=filepath)
+    assert dict(store.items()) == {stamps[0]: b'metadata-0', stamps[1]: b'updated', stamps[2]: b'metadata-2'}
+
+    # Superseded records are dropped when they outnumber the stored nodes
+    for _ in range(3):
+        store.put(stamps[0], b'again')
+    size = filepath.stat().st_size
+    store.close()
+    store = NodeMetadataStore(filepath=filepath)
+    assert store.get(stamps[0]) == b'again'
+    assert len(store) == 3
+    assert filepath.stat().st_size < size
+    store.close()
+
+    filepath.write_bytes(b'something else')
+    with pytest.raises(NodeMetadataStore.InvalidStore):
+        len(NodeMetadataStore(filepath=filepath))
+
+
+def _put_many(filepath, first, count):
+    store = NodeMetadataStore(filepath=filepath)
+    for i in range(first, first + count):
+        store.put(i.to_bytes(NodeMetadataStore.STAMP_LENGTH, 'big'), b'metadata-%d' % i)
+    store.close()
+
+
+def test_node_metadata_store_shared_by_processes(tmp_path):
+    filepath = tmp_path / 'nodes.db'
+    store = NodeMetadataStore(filepath=filepath)
+    assert len(store) == 0
+
+    # Several processes appending at once don't overwrite each other's records
+    processes, count = 4, 50
+    context = multiprocessing.get_context('fork')
+    workers = [context.Process(target=_put_many, args=(filepath, n * count, count)) for n in range(processes)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+    # ... and an open store sees them as soon as the file grows
+    assert len(store) == processes * count
+    for i in range(processes * count):
+        assert store.get(i.to_bytes(NodeMetadataStore.STAMP_LENGTH, 'big')) == b'metadata-%d' % i
+
+
+def test_node_metadata_store_compacted_by_another_store(tmp_path):
+    filepath = tmp_path / 'nodes.db'
+    stamp = b'\x01' * NodeMetadataStore.STAMP_LENGTH
+    first = NodeMetadataStore(filepath=filepath)
+    for i in range(3):
+        first.put(stamp, b'metadata-%d' % i)
+
+    # Opening another store compacts the file while the first one still has it open
+    second = NodeMetadataStore(filepath=filepath)
+    assert len(second) == 1
+
+    # Writes made through the first store go to the compacted file, not the replaced one
+    other_stamp = b'\x02' * NodeMetadataStore.STAMP_LENGTH
+    first.put(other_stamp, b'other')
+    assert second.get(other_stamp) == b'other'
+    assert first.get(stamp) == b'metadata-2'
+    first.close()
+    second.close()
+
+
+def test_node_metadata_store_incomplete_record_of_another_process(tmp_path):
+    filepath = tmp_path / 'nodes.db'
+    stamps = [bytes([i]) * NodeMetadataStore.STAMP_LENGTH for i in range(2)]
+    store = NodeMetadataStore(filepath=filepath)
+    store.put(stamps[0], b'metadata-0')
+
+    # A record being written by another process is neither indexed nor dropped by an open store
+    record = len(b'metadata-1').to_bytes(4, 'big') + stamps[1] + b'metadata-1'
+    with open(filepath, 'ab') as file:
+        file.write(record[:10])
+    assert stamps[1] not in store
+    with open(filepath, 'ab') as file:
+        file.write(record[10:])
+    assert store.get(stamps[1]) == b'metadata-1'
+    assert len(store) == 2
+    store.close()
@@ -0,0 +1,94 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import time
+
+import pytest
+
+from nucypher.characters.lawful import Ursula
+from tests.utils.middleware import NodeIsDownMiddleware
+
+
+def test_learning_from_several_teachers_at_once(federated_ursulas, lonely_ursula_maker):
+    learner = lonely_ursula_maker(quantity=1, learning_concurrency=3).pop()
+    teachers = list(federated_ursulas)[:3]
+    for teacher in teachers:
+        learner.remember_node(teacher, record_fleet_state=False)
+    learner.known_nodes.record_fleet_state()
+    learner.done_seeding = True
+
+    # Each of the teachers knows about a node the others don't.
+    new_nodes = lonely_ursula_maker(quantity=3)
+    for teacher, new_node in zip(teachers, new_nodes):
+        teacher.remember_node(Ursula.from_bytes(bytes(new_node)))
+
+    states = learner.known_nodes._archived_states
+    states_before = len(states)
+
+    learner.learn_from_teacher_node()
+
+    # All the teachers were queried in a single round...
+    for teacher in teachers:
+        assert learner.known_nodes.status_info(teacher).recorded_fleet_state is not None
+
+    # ...and everything they knew was recorded in a single fleet state.
+    assert len(states) == states_before + 1
+    for node in list(federated_ursulas) + list(new_nodes):
+        assert node in learner.known_nodes
+
+
+def test_concurrent_learning_with_teachers_down(federated_ursulas, lonely_ursula_maker):
+    learner = lonely_ursula_maker(quantity=1, learning_concurrency=3).pop()
+    teachers = list(federated_ursulas)[:3]
+    for teacher in teachers:
+        learner.remember_node(teacher)
+    learner.done_seeding = True
+
+    learner.network_middleware = NodeIsDownMiddleware()
+    for teacher in teachers[1:]:
+        learner.network_middleware.node_is_down(teacher)
+
+    # The teachers which are down are skipped, and we still learn from the remaining one.
+    learner.learn_from_teacher_node()
+    for node in federated_ursulas:
+        assert node in learner.known_nodes
+
+
+def test_invalid_learning_concurrency(lonely_ursula_maker):
+    with pytest.raises(ValueError):
+        lonely_ursula_maker(quantity=1, learning_concurrency=0)
+
+
+def test_background_verification(federated_ursulas, lonely_ursula_maker):
+    learner = lonely_ursula_maker(quantity=1, verification_workers=2).pop()
+    pipeline = learner.verification_pipeline
+
+    nodes = list(federated_ursulas)[:3]
+    for node in nodes:
+        assert learner.remember_node(node, eager=True) is node
+
+    start = time.monotonic()
+    while pipeline.metrics().outcomes[pipeline.VERIFIED] < len(nodes):
+        assert time.monotonic() - start < 10, "Nodes were not verified in the background"
+        time.sleep(0.1)
+
+    for node in nodes:
+        assert pipeline.bucket_of(node.checksum_address) == pipeline.VERIFIED
+        assert node.verified_node
+
+    learner.stop_learning_loop()
+    assert not pipeline.running
@@ -0,0 +1,102 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from functools import partial
+
+from nucypher.characters.lawful import Ursula
+from nucypher.network.middleware import RestMiddleware
+from tests.utils.middleware import MockRestMiddleware
+
+
+class LegacyTeacherMiddleware(MockRestMiddleware):
+    """
+    Emulates teachers which do not support delta learning.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requested_summaries = []
+
+    def get_nodes_via_rest(self, *args, fleet_summary=None, **kwargs):
+        self.requested_summaries.append(fleet_summary)
+        if fleet_summary is not None:
+            raise RestMiddleware.NotFound("No such route.")
+        return super().get_nodes_via_rest(*args, **kwargs)
+
+
+def test_learner_receives_only_unknown_nodes(federated_ursulas, lonely_ursula_maker):
+    _lonely_ursula_maker = partial(lonely_ursula_maker, quantity=1)
+    learner = _lonely_ursula_maker().pop()
+    teacher = list(federated_ursulas)[0]
+    learner.remember_node(teacher)
+
+    learner._current_teacher_node = teacher
+    learner.learn_from_teacher_node()
+    for ursula in federated_ursulas:
+        assert ursula in learner.known_nodes
+
+    # The learner knows about a node the teacher doesn't, so their fleet states differ,
+    # but the teacher has nothing new to tell.
+    learner.remember_node(_lonely_ursula_maker().pop())
+    assert learner.known_nodes.checksum != teacher.known_nodes.checksum
+    learner._current_teacher_node = teacher
+    sprouts = learner.learn_from_teacher_node()
+    assert sprouts == []
+
+    # The teacher learns about a new node...
+    new_node = _lonely_ursula_maker().pop()
+    teacher.remember_node(Ursula.from_bytes(bytes(new_node)))
+
+    # ...and only sends this node to the learner.
+    learner._current_teacher_node = teacher
+    sprouts = learner.learn_from_teacher_node()
+    assert [sprout.checksum_address for sprout in sprouts] == [new_node.checksum_address]
+    assert new_node in learner.known_nodes
+
+
+def test_learner_falls_back_to_full_node_list(federated_ursulas, lonely_ursula_maker):
+    learner = lonely_ursula_maker(quantity=1).pop()
+    teacher = list(federated_ursulas)[0]
+    learner.remember_node(teacher)
+    learner.network_middleware = LegacyTeacherMiddleware()
+
+    learner._current_teacher_node = teacher
+    sprouts = learner.learn_from_teacher_node()
+
+    # The delta request was rejected, so the teacher sent everything it knows.
+    assert learner.network_middleware.requested_summaries[0] is not None
+    assert learner.network_middleware.requested_summaries[1] is None
+    assert len(sprouts) == len(teacher.known_nodes) + 1
+    for ursula in federated_ursulas:
+        assert ursula in learner.known_nodes
+
+    # The learner remembers that this teacher only supports the full node list.
+    learner.network_middleware.requested_summaries.clear()
+    learner._current_teacher_node = teacher
+    learner.learn_from_teacher_node()
+    assert learner.network_middleware.requested_summaries == [None]
+
+
+def test_teacher_rejects_invalid_summary(federated_ursulas):
+    teacher = list(federated_ursulas)[0]
+    middleware = MockRestMiddleware()
+    try:
+        middleware.get_nodes_via_rest(node=teacher, fleet_summary=b'not a summary')
+    except RestMiddleware.BadRequest:
+        pass
+    else:
+        raise AssertionError("An invalid fleet summary was accepted")
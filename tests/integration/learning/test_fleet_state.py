@@ -20,6 +20,7 @@ from functools import partial
 from hendrix.experience import crosstown_traffic
 from hendrix.utils.test_utils import crosstownTaskListDecoratorFactory
 
+from nucypher.characters.lawful import Ursula
 from tests.utils.ursula import make_federated_ursulas
 
 
@@ -151,3 +152,27 @@ def test_teacher_records_new_fleet_state_upon_hearing_about_new_node(federated_u
 
     # ...is the same as the learner, because both have learned about everybody at this point.
     assert teacher_fleet_state_checksum == states[-1].checksum
+
+
+def test_signed_known_nodes_are_memoized_per_fleet_state(federated_ursulas, lonely_ursula_maker):
+    teacher = list(federated_ursulas)[0]
+
+    known_nodes_payload = teacher.signed_bytestring_of_known_nodes()
+    fleet_states_match_payload = teacher.signed_fleet_states_match()
+
+    # While the fleet state stays the same, the signed payloads are reused as is.
+    assert teacher.signed_bytestring_of_known_nodes() is known_nodes_payload
+    assert teacher.signed_fleet_states_match() is fleet_states_match_payload
+
+    # Recording a new fleet state invalidates them.
+    new_node = lonely_ursula_maker(quantity=1).pop()
+    teacher.remember_node(Ursula.from_bytes(bytes(new_node)))
+    new_known_nodes_payload = teacher.signed_bytestring_of_known_nodes()
+    assert new_known_nodes_payload != known_nodes_payload
+    assert teacher.signed_fleet_states_match() != fleet_states_match_payload
+
+    # The memoized payload is still a valid response for learners.
+    signature_length = len(bytes(teacher.stamp(b'')))
+    payload = new_known_nodes_payload[signature_length:]
+    assert payload == teacher.bytestring_of_known_nodes()
+    assert teacher.known_nodes.checksum in payload.hex()
@@ -98,7 +98,9 @@ def test_deserialize_ursulas_version_2():
 
         version, _ = Ursula.version_splitter(fossilized_ursula, return_remainder=True)
         assert version == expected_version
-        assert version == Ursula.LEARNER_VERSION
+        # Version 3 only changed the fleet state checksum, so version 2 metadata is still accepted
+        assert version == Ursula.LEARNER_VERSION - 1
+        assert Ursula.is_compatible_version(version)
 
         resurrected_ursula = Ursula.from_bytes(fossilized_ursula, fail_fast=True)
         assert TEMPORARY_DOMAIN == resurrected_ursula.domain
@@ -25,6 +25,7 @@ from bytestring_splitter import BytestringSplittingError
 from functools import partial
 from twisted.internet import threads
 
+from nucypher.acumen.perception import _NodeMap
 from nucypher.policy.policies import Policy
 from tests.utils.middleware import EvilMiddleWare, NodeIsDownMiddleware
 from tests.utils.ursula import make_federated_ursulas
@@ -34,7 +35,7 @@ def test_alice_can_grant_even_when_the_first_nodes_she_tries_are_down(federated_
     threshold, shares = 2, 3
     policy_end_datetime = maya.now() + datetime.timedelta(days=5)
     label = b"this_is_the_path_to_which_access_is_being_granted"
-    federated_alice.known_nodes.current_state._nodes = {}
+    federated_alice.known_nodes.current_state._nodes = _NodeMap()
 
     federated_alice.network_middleware = NodeIsDownMiddleware()
 
@@ -91,7 +92,7 @@ def test_alice_can_grant_even_when_the_first_nodes_she_tries_are_down(federated_
 
 
 def test_node_has_changed_cert(federated_alice, federated_ursulas):
-    federated_alice.known_nodes.current_state._nodes = {}
+    federated_alice.known_nodes.current_state._nodes = _NodeMap()
     federated_alice.network_middleware = NodeIsDownMiddleware()
     federated_alice.network_middleware.client.certs_are_broken = True
 
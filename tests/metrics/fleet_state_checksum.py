@@ -0,0 +1,87 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Compares the cost of recording a fleet state after a single node update:
+the Merkle tree used by ``FleetState`` against rehashing the metadata of the whole fleet.
+"""
+
+import os
+import time
+
+import tabulate
+from eth_utils import to_checksum_address
+
+from nucypher.acumen.perception import FleetState
+from nucypher.crypto.utils import keccak_digest
+
+FLEET_SIZES = (100, 1_000, 10_000)
+METADATA_SIZE = 1024  # roughly the size of Ursula's metadata
+UPDATES = 100
+
+
+class FakeNode:
+
+    def __init__(self, checksum_address=None):
+        self.checksum_address = checksum_address or to_checksum_address(os.urandom(20))
+        self._metadata = os.urandom(METADATA_SIZE)
+
+    def __bytes__(self):
+        return self._metadata
+
+
+def full_rehash(nodes) -> str:
+    """The checksum calculation used before the Merkle tree."""
+    all_nodes_sorted = sorted(nodes, key=lambda node: node.checksum_address)
+    joined_metadata = b"".join(bytes(node) for node in all_nodes_sorted)
+    return keccak_digest(joined_metadata).hex()
+
+
+def measure(fleet_size: int):
+    fleet = [FakeNode() for _ in range(fleet_size)]
+    state, _diff = FleetState.new().with_updated_nodes(nodes_to_add=fleet, nodes_to_remove=[])
+    updates = [FakeNode(node.checksum_address) for node in fleet[:UPDATES]]
+
+    start = time.perf_counter()
+    for update in updates:
+        state, _diff = state.with_updated_nodes(nodes_to_add=[update], nodes_to_remove=[])
+    merkle_time = (time.perf_counter() - start) / len(updates)
+
+    nodes = {node.checksum_address: node for node in fleet}
+    start = time.perf_counter()
+    for update in updates:
+        nodes[update.checksum_address] = update
+        full_rehash(nodes.values())
+    rehash_time = (time.perf_counter() - start) / len(updates)
+
+    return merkle_time, rehash_time
+
+
+def main():
+    rows = []
+    for fleet_size in FLEET_SIZES:
+        merkle_time, rehash_time = measure(fleet_size)
+        rows.append((fleet_size,
+                     f"{merkle_time * 1000:.3f}",
+                     f"{rehash_time * 1000:.3f}",
+                     f"{rehash_time / merkle_time:.1f}x"))
+
+    print(tabulate.tabulate(rows, headers=('Fleet size', 'Merkle tree (ms)', 'Full rehash (ms)', 'Speedup')))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Measures the Alice-side CPU throughput of granting (grants/sec) for a range of share counts:
+generating the kfrags, and constructing and encrypting the treasure map, without any networking.
+"""
+
+import os
+import time
+
+import tabulate
+from eth_utils import to_checksum_address
+
+from nucypher.crypto.encryption import BatchEncryptor
+from nucypher.crypto.powers import DecryptingPower
+from nucypher.crypto.signing import SignatureStamp
+from nucypher.crypto.umbral_adapter import SecretKey, Signer, generate_kfrags
+from nucypher.policy.hrac import HRAC
+from nucypher.policy.maps import TreasureMap
+
+SHARES = (1, 10, 20, 30)
+PROCESSES = (1, None)  # sequential, all cores
+GRANTS = 20
+
+
+class Stand:
+    """Just enough of a character to construct treasure maps."""
+
+    def __init__(self):
+        signing_key = SecretKey.random()
+        self.stamp = SignatureStamp(verifying_key=signing_key.public_key(), signer=Signer(signing_key))
+        self.checksum_address = to_checksum_address(os.urandom(20))
+        self.__decrypting_key = SecretKey.random().public_key()
+
+    def public_keys(self, power_up_class):
+        assert power_up_class is DecryptingPower
+        return self.__decrypting_key
+
+
+def grant(alice: Stand, bob: Stand, ursulas, shares: int, encryptor: BatchEncryptor) -> None:
+    delegating_key = SecretKey.random()
+    hrac = HRAC.derive(publisher_verifying_key=alice.stamp.as_umbral_pubkey(),
+                       bob_verifying_key=bob.stamp.as_umbral_pubkey(),
+                       label=os.urandom(16))
+    kfrags = generate_kfrags(delegating_sk=delegating_key,
+                             receiving_pk=bob.public_keys(DecryptingPower),
+                             signer=alice.stamp.as_umbral_signer(),
+                             threshold=max(1, shares // 2),
+                             num_kfrags=shares)
+    treasure_map = TreasureMap.construct_by_publisher(hrac=hrac,
+                                                      publisher=alice,
+                                                      ursulas=ursulas[:shares],
+                                                      verified_kfrags=kfrags,
+                                                      threshold=max(1, shares // 2),
+                                                      encryptor=encryptor)
+    bytes(treasure_map.encrypt(publisher=alice, bob=bob))
+
+
+def measure(encryptor: BatchEncryptor, shares: int) -> float:
+    alice, bob = Stand(), Stand()
+    ursulas = [Stand() for _ in range(shares)]
+    start = time.perf_counter()
+    for _ in range(GRANTS):
+        grant(alice, bob, ursulas, shares, encryptor)
+    elapsed = time.perf_counter() - start
+    return GRANTS / elapsed
+
+
+def main():
+    rows = []
+    for processes in PROCESSES:
+        encryptor = BatchEncryptor(processes=processes)
+        # Start the pool before measuring
+        measure(encryptor, encryptor.parallel_threshold)
+        try:
+            for shares in SHARES:
+                rate = measure(encryptor, shares)
+                rows.append((encryptor.processes, shares, f"{rate:.1f}"))
+        finally:
+            encryptor.shutdown()
+
+    print(tabulate.tabulate(rows, headers=('Processes', 'Shares', 'Grants/sec')))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Measures Ursula's re-encryption throughput (capsules/sec) for a range of batch sizes,
+including the signing and serialization of the response.
+"""
+
+import time
+
+import tabulate
+
+from nucypher.crypto.reencryption import BatchReencryptor
+from nucypher.crypto.signing import SignatureStamp
+from nucypher.crypto.umbral_adapter import SecretKey, Signer, encrypt, generate_kfrags
+from nucypher.network.retrieval import ReencryptionResponse
+
+BATCH_SIZES = (1, 10, 100, 1000)
+PROCESSES = (1, None)  # sequential, all cores
+
+
+def make_batch(size: int):
+    delegating_sk = SecretKey.random()
+    signer = Signer(SecretKey.random())
+    kfrag = generate_kfrags(delegating_sk=delegating_sk,
+                            receiving_pk=SecretKey.random().public_key(),
+                            signer=signer,
+                            threshold=1,
+                            num_kfrags=1)[0]
+    capsule, _ciphertext = encrypt(delegating_sk.public_key(), b'plaintext')
+    return kfrag, [capsule] * size
+
+
+def measure(reencryptor: BatchReencryptor, stamp: SignatureStamp, batch_size: int) -> float:
+    kfrag, capsules = make_batch(batch_size)
+    start = time.perf_counter()
+    serialized_cfrags = reencryptor.reencrypt(kfrag=kfrag, capsules=capsules)
+    response = ReencryptionResponse.construct_from_serialized_cfrags(capsules=capsules,
+                                                                     serialized_cfrags=serialized_cfrags,
+                                                                     stamp=stamp)
+    bytes(response)
+    elapsed = time.perf_counter() - start
+    return batch_size / elapsed
+
+
+def main():
+    signing_key = SecretKey.random()
+    stamp = SignatureStamp(verifying_key=signing_key.public_key(), signer=Signer(signing_key))
+
+    rows = []
+    for processes in PROCESSES:
+        reencryptor = BatchReencryptor(processes=processes)
+        # Start the pool before measuring
+        measure(reencryptor, stamp, reencryptor.parallel_threshold)
+        try:
+            for batch_size in BATCH_SIZES:
+                rate = measure(reencryptor, stamp, batch_size)
+                rows.append((reencryptor.processes, batch_size, f"{rate:.1f}"))
+        finally:
+            reencryptor.shutdown()
+
+    print(tabulate.tabulate(rows, headers=('Processes', 'Batch size', 'Capsules/sec')))
+
+
+if __name__ == '__main__':
+    main()
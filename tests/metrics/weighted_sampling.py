@@ -0,0 +1,94 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Compares the cost of sampling stakers for policies with ``WeightedSampler`` (a Fenwick tree)
+against the previous sampler, which adjusted every cumulative weight after each draw.
+"""
+
+import random
+import time
+from bisect import bisect_right
+from itertools import accumulate
+
+import tabulate
+
+from nucypher.blockchain.eth.agents import WeightedSampler
+
+POPULATIONS = (10_000, 100_000)
+SHARES = 30  # stakers drawn per policy
+POLICIES = 100
+
+
+def linear_sample_no_replacement(totals, elements, rng, quantity):
+    """The previous sampling algorithm, O(n) per draw."""
+    samples = []
+    for _ in range(quantity):
+        position = rng.randint(0, totals[-1] - 1)
+        idx = bisect_right(totals, position)
+        samples.append(elements[idx])
+        weight = totals[idx] - (totals[idx - 1] if idx > 0 else 0)
+        for j in range(idx, len(totals)):
+            totals[j] -= weight
+    return samples
+
+
+def measure(population: int):
+    rng = random.Random(population)
+    stakers = {f'staker-{i}': rng.randint(15_000, 10_000_000) for i in range(population)}
+
+    start = time.perf_counter()
+    sampler = WeightedSampler(stakers)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(POLICIES):
+        sampler.reset()
+        sampler.sample_no_replacement(rng, SHARES)
+    tree_time = (time.perf_counter() - start) / POLICIES
+
+    elements, weights = zip(*stakers.items())
+    start = time.perf_counter()
+    for _ in range(POLICIES):
+        # The previous reservoir rebuilt the cumulative weights for each policy
+        totals = list(accumulate(weights))
+        linear_sample_no_replacement(totals, elements, rng, SHARES)
+    linear_time = (time.perf_counter() - start) / POLICIES
+
+    return build_time, tree_time, linear_time
+
+
+def main():
+    rows = []
+    for population in POPULATIONS:
+        build_time, tree_time, linear_time = measure(population)
+        rows.append((population,
+                     f"{build_time * 1000:.3f}",
+                     f"{tree_time * 1000:.3f}",
+                     f"{linear_time * 1000:.3f}",
+                     f"{linear_time / tree_time:.1f}x"))
+
+    print(f"Drawing {SHARES} stakers per policy")
+    print(tabulate.tabulate(rows, headers=('Stakers',
+                                           'Tree build (ms)',
+                                           'Fenwick tree (ms/policy)',
+                                           'Linear (ms/policy)',
+                                           'Speedup')))
+
+
+if __name__ == '__main__':
+    main()
@@ -25,19 +25,24 @@ from threading import Lock
 from constant_sorrow.constants import MOCK_DB
 
 
-def mock_lmdb_open(db_path: Path, map_size=10485760):
+def mock_lmdb_open(db_path: Path, map_size=10485760, max_dbs=0):
     if db_path == MOCK_DB:
         return MockEnvironment()
     else:
-        return lmdb.Environment(str(db_path), map_size=map_size)
+        return lmdb.Environment(str(db_path), map_size=map_size, max_dbs=max_dbs)
 
 
 class MockEnvironment:
 
     def __init__(self):
         self._storage = {}
+        self._databases = {}
         self._lock = Lock()
 
+    def open_db(self, key=None):
+        self._databases.setdefault(key, {})
+        return key
+
     @contextmanager
     def begin(self, write=False):
         with self._lock:
@@ -50,6 +55,7 @@ class MockTransaction:
     def __init__(self, env, write=False):
         self._env = env
         self._storage = dict(env._storage)
+        self._databases = {name: dict(database) for name, database in env._databases.items()}
         self._write = write
         self._invalid = False
 
@@ -64,26 +70,31 @@ class MockTransaction:
         else:
             self.commit()
 
-    def put(self, key, value, overwrite=True):
+    def _database(self, db):
+        return self._storage if db is None else self._databases[db]
+
+    def put(self, key, value, overwrite=True, db=None):
         if self._invalid:
             raise lmdb.Error()
         assert self._write
-        if not overwrite and key in self._storage:
+        storage = self._database(db)
+        if not overwrite and key in storage:
             return False
-        self._storage[key] = value
+        storage[key] = value
         return True
 
-    def get(self, key, default=None):
+    def get(self, key, default=None, db=None):
         if self._invalid:
             raise lmdb.Error()
-        return self._storage.get(key, default)
+        return self._database(db).get(key, default)
 
-    def delete(self, key):
+    def delete(self, key, db=None):
         if self._invalid:
             raise lmdb.Error()
         assert self._write
-        if key in self._storage:
-            del self._storage[key]
+        storage = self._database(db)
+        if key in storage:
+            del storage[key]
             return True
         else:
             return False
@@ -93,38 +104,44 @@ class MockTransaction:
             raise lmdb.Error()
         self._invalidate()
         self._env._storage = self._storage
+        self._env._databases = self._databases
 
     def abort(self):
         self._invalidate()
         self._storage = self._env._storage
+        self._databases = self._env._databases
 
     def _invalidate(self):
         self._invalid = True
 
-    def cursor(self):
-        return MockCursor(self)
+    def cursor(self, db=None):
+        return MockCursor(self._database(db))
 
 
 class MockCursor:
 
-    def __init__(self, tx):
-        self._tx = tx
-        # TODO: assuming here that the keys are not changed while the cursor exists.
-        # Any way to enforce it?
-        self._keys = list(sorted(tx._storage))
-        self._pos = None
+    def __init__(self, storage):
+        # The cursor follows the live storage of the transaction,
+        # so that keys can be changed while the cursor exists.
+        self._storage = storage
+        self._key = None
 
     def set_range(self, key):
-        pos = bisect_left(self._keys, key)
-        if pos == len(self._keys):
-            self._pos = None
+        keys = sorted(self._storage)
+        pos = bisect_left(keys, key)
+        if pos == len(keys):
+            self._key = None
             return False
         else:
-            self._pos = pos
+            self._key = keys[pos]
             return True
 
     def key(self):
-        return self._keys[self._pos]
+        return self._key
+
+    def value(self):
+        return self._storage[self._key]
 
     def iternext(self, keys=True, values=True):
-        return iter(self._keys[self._pos:])
+        keys = sorted(self._storage)
+        return iter(keys[bisect_left(keys, self._key):])
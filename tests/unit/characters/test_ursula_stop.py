@@ -0,0 +1,36 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import pytest
+
+from nucypher.config.characters import UrsulaConfiguration
+from nucypher.config.constants import TEMPORARY_DOMAIN
+
+
+def test_ursula_stop_releases_reencryption_resources_first(mocker):
+    config = UrsulaConfiguration(dev_mode=True, federated_only=True, lonely=True, domain=TEMPORARY_DOMAIN)
+    ursula = config()
+
+    shutdown = mocker.spy(ursula._reencryptor, 'shutdown')
+    log_stop = mocker.spy(ursula.reencryption_log, 'stop')
+    mocker.patch.object(ursula, 'stop_learning_loop', side_effect=RuntimeError('teardown failed'))
+
+    with pytest.raises(RuntimeError):
+        ursula.stop()
+
+    shutdown.assert_called_once()
+    log_stop.assert_called_once()
@@ -0,0 +1,64 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import pytest
+
+from nucypher.crypto.reencryption import BatchReencryptor
+from nucypher.crypto.umbral_adapter import (
+    CapsuleFrag,
+    SecretKey,
+    Signer,
+    decrypt_reencrypted,
+    encrypt,
+    generate_kfrags
+)
+
+
+@pytest.fixture(scope='module')
+def delegation():
+    delegating_sk = SecretKey.random()
+    receiving_sk = SecretKey.random()
+    signer = Signer(SecretKey.random())
+    kfrags = generate_kfrags(delegating_sk=delegating_sk,
+                             receiving_pk=receiving_sk.public_key(),
+                             signer=signer,
+                             threshold=1,
+                             num_kfrags=1)
+    return delegating_sk.public_key(), receiving_sk, signer.verifying_key(), kfrags[0]
+
+
+@pytest.mark.parametrize('processes', (1, 2))
+def test_batch_reencryption(delegation, processes):
+    delegating_pk, receiving_sk, verifying_pk, kfrag = delegation
+
+    plaintexts = [f"message {i}".encode() for i in range(5)]
+    capsules, ciphertexts = zip(*(encrypt(delegating_pk, plaintext) for plaintext in plaintexts))
+
+    reencryptor = BatchReencryptor(processes=processes, parallel_threshold=2)
+    try:
+        serialized_cfrags = reencryptor.reencrypt(kfrag=kfrag, capsules=capsules)
+    finally:
+        reencryptor.shutdown()
+
+    assert len(serialized_cfrags) == len(capsules)
+    for capsule, ciphertext, plaintext, cfrag_bytes in zip(capsules, ciphertexts, plaintexts, serialized_cfrags):
+        cfrag = CapsuleFrag.from_bytes(cfrag_bytes).verify(capsule,
+                                                           verifying_pk=verifying_pk,
+                                                           delegating_pk=delegating_pk,
+                                                           receiving_pk=receiving_sk.public_key())
+        cleartext = decrypt_reencrypted(receiving_sk, delegating_pk, capsule, [cfrag], ciphertext)
+        assert cleartext == plaintext
@@ -158,6 +158,32 @@ def test_datastore_describe(mock_or_real_datastore):
         assert new_test_record.test == b'now it exists :)'
 
 
+def test_datastore_describe_many(mock_or_real_datastore):
+    storage = mock_or_real_datastore
+
+    # Several records are written within a single transaction
+    with storage.describe_many(TestRecord, ['many_1', 'many_2', 3], writeable=True) as test_records:
+        assert len(test_records) == 3
+        for index, test_record in enumerate(test_records):
+            test_record.test = f'record {index}'.encode()
+
+    with storage.describe_many(TestRecord, [3, 'many_1']) as test_records:
+        assert [test_record.test for test_record in test_records] == [b'record 2', b'record 0']
+
+    # Records can't be used outside the context manager
+    with pytest.raises(TypeError):
+        test_records[0].test = b'should not write'
+
+    # Nothing is written if any of the writes fails
+    with pytest.raises(datastore.DatastoreTransactionError):
+        with storage.describe_many(TestRecord, ['many_4', 'many_5'], writeable=True) as test_records:
+            test_records[0].test = b'record 4'
+            test_records[1].test = 'not bytes'
+    with pytest.raises(datastore.RecordNotFound):
+        with storage.describe(TestRecord, 'many_4') as test_record:
+            should_error = test_record.test
+
+
 def test_datastore_query_by(mock_or_real_datastore):
 
     storage = mock_or_real_datastore
@@ -258,6 +284,84 @@ def test_datastore_query_by(mock_or_real_datastore):
             assert len(records) == 'this never gets executed'
 
 
+def test_datastore_query_range(mock_or_real_datastore):
+
+    storage = mock_or_real_datastore
+
+    class TimedRecord(DatastoreRecord):
+        _name = RecordField(bytes)
+        _time = RecordField(int, index=lambda time: time.to_bytes(8, 'big'))
+
+    # Records are written out of order
+    for record_id, time in ((1, 30), ('two', 10), (3, 20), ('four', 40), (5, 20)):
+        with storage.describe(TimedRecord, record_id, writeable=True) as rec:
+            rec.name = str(record_id).encode()
+            rec.time = time
+
+    # ...and streamed in the order of the index
+    with storage.query_range(TimedRecord, 'time') as records:
+        assert [record.time for record in records] == [10, 20, 20, 30, 40]
+
+    # Bounds are inclusive
+    with storage.query_range(TimedRecord, 'time', start=20, end=30) as records:
+        assert sorted(record.name for record in records) == [b'1', b'3', b'5']
+
+    with storage.query_range(TimedRecord, 'time', end=15) as records:
+        assert [record._record_id for record in records] == ['two']
+
+    with storage.query_range(TimedRecord, 'time', limit=2) as records:
+        assert [record.time for record in records] == [10, 20]
+
+    # An empty range is not an error
+    with storage.query_range(TimedRecord, 'time', start=50) as records:
+        assert list(records) == []
+
+    # Updating an indexed field moves the record in the index
+    with storage.describe(TimedRecord, 'two', writeable=True) as rec:
+        rec.time = 50
+    with storage.query_range(TimedRecord, 'time') as records:
+        assert [record.time for record in records] == [20, 20, 30, 40, 50]
+
+    # Records are readonly unless the query is writeable
+    with pytest.raises(datastore.DatastoreTransactionError):
+        with storage.query_range(TimedRecord, 'time') as records:
+            for record in records:
+                record.time = 0
+
+    # Streamed records can be deleted while streaming
+    with storage.query_range(TimedRecord, 'time', end=30, writeable=True) as records:
+        for record in records:
+            record.delete()
+    with storage.query_range(TimedRecord, 'time') as records:
+        assert [record.time for record in records] == [40, 50]
+    with pytest.raises(datastore.RecordNotFound):
+        with storage.describe(TimedRecord, 1) as rec:
+            should_error = rec.name
+
+    # Only indexed fields can be queried by range
+    with pytest.raises(TypeError):
+        with storage.query_range(TimedRecord, 'name') as records:
+            assert records == 'this never gets executed'
+
+
+def test_datastore_query_range_indexes_existing_records(mock_or_real_datastore):
+
+    storage = mock_or_real_datastore
+
+    class TimedRecord(DatastoreRecord):
+        _time = RecordField(int)
+
+    # Records written before the field was indexed...
+    for record_id, time in ((1, 30), (2, 10), (3, 20)):
+        with storage.describe(TimedRecord, record_id, writeable=True) as rec:
+            rec.time = time
+
+    # ...are indexed on the first query.
+    TimedRecord._time = RecordField(int, index=lambda time: time.to_bytes(8, 'big'))
+    with storage.query_range(TimedRecord, 'time', end=20) as records:
+        assert [record._record_id for record in records] == [2, 3]
+
+
 def test_datastore_record_read(mock_or_real_lmdb_env):
     db_env = mock_or_real_lmdb_env
     with db_env.begin() as db_tx:
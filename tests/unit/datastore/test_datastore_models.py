@@ -21,6 +21,7 @@ import tempfile
 from nucypher.crypto import keypairs
 from nucypher.datastore import datastore
 from nucypher.datastore.models import PolicyArrangement, ReencryptionRequest
+from nucypher.datastore.queries import find_expired_policies
 
 
 def test_policy_arrangement_model(mock_or_real_datastore):
@@ -50,6 +51,27 @@ def test_policy_arrangement_model(mock_or_real_datastore):
             should_error = policy_arrangement.arrangement_id
 
 
+def test_find_expired_policies(mock_or_real_datastore):
+    storage = mock_or_real_datastore
+
+    now = maya.now()
+    expirations = {'aa': now.subtract(days=2), 'bb': now.add(days=1), 'cc': now.subtract(seconds=1), 'dd': now}
+    for arrangement_id_hex, expiration in expirations.items():
+        with storage.describe(PolicyArrangement, arrangement_id_hex, writeable=True) as policy_arrangement:
+            policy_arrangement.arrangement_id = bytes.fromhex(arrangement_id_hex)
+            policy_arrangement.expiration = expiration
+
+    with find_expired_policies(storage, now) as expired_policies:
+        assert [policy.arrangement_id.hex() for policy in expired_policies] == ['aa', 'cc', 'dd']
+
+    with find_expired_policies(storage, now, limit=1) as expired_policies:
+        for policy in expired_policies:
+            policy.delete()
+
+    with find_expired_policies(storage, now) as expired_policies:
+        assert [policy.arrangement_id.hex() for policy in expired_policies] == ['cc', 'dd']
+
+
 def test_reencryption_request_model(mock_or_real_datastore):
     storage = mock_or_real_datastore
     bob_keypair = keypairs.SigningKeypair(generate_keys_if_needed=True)
@@ -0,0 +1,96 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import time
+from threading import Event
+from unittest.mock import patch
+
+import pytest
+
+from nucypher.datastore import datastore
+from nucypher.datastore.base import DatastoreRecord, RecordField
+from nucypher.datastore.writer import BatchedRecordWriter
+
+
+class AuditRecord(DatastoreRecord):
+    _value = RecordField(bytes)
+
+
+def read_values(storage, record_ids):
+    with storage.describe_many(AuditRecord, record_ids) as records:
+        return [record.value for record in records]
+
+
+def test_batched_record_writer(mock_or_real_datastore):
+    storage = mock_or_real_datastore
+    writer = BatchedRecordWriter(datastore=storage, record_type=AuditRecord, flush_interval=60, max_batch_size=4)
+
+    # Full batches are written in the background, one transaction each
+    write_started = Event()
+    describe_many = storage.describe_many
+
+    def spy(*args, **kwargs):
+        write_started.set()
+        return describe_many(*args, **kwargs)
+
+    with patch.object(storage, 'describe_many', side_effect=spy) as describe_many_spy:
+        for index in range(10):
+            writer.put(f'audit_{index}', value=bytes([index]))
+        assert write_started.wait(timeout=10)
+
+        # The last, partial batch waits for the flush interval, or an explicit flush
+        writer.flush()
+        assert writer.pending() == 0
+        batch_sizes = [len(call.args[1]) for call in describe_many_spy.call_args_list]
+        assert batch_sizes == [4, 4, 2]
+    assert read_values(storage, [f'audit_{index}' for index in range(10)]) == [bytes([i]) for i in range(10)]
+
+    writer.put('audit_before_stop', value=b'pending')
+    writer.stop()
+    assert read_values(storage, ['audit_before_stop']) == [b'pending']
+
+    # Once stopped, records are written immediately
+    writer.put('audit_after_stop', value=b'late')
+    assert writer.pending() == 0
+    assert read_values(storage, ['audit_after_stop']) == [b'late']
+
+
+def test_batched_record_writer_flush_interval(mock_or_real_datastore):
+    storage = mock_or_real_datastore
+    writer = BatchedRecordWriter(datastore=storage, record_type=AuditRecord, flush_interval=0.1)
+    writer.put('audit_interval', value=b'soon')
+    for _ in range(100):
+        with writer._lock:
+            if writer._writer is None:  # idle writers exit
+                break
+        time.sleep(0.05)
+    assert read_values(storage, ['audit_interval']) == [b'soon']
+
+
+def test_batched_record_writer_durability_policies(mock_or_real_datastore):
+    storage = mock_or_real_datastore
+
+    with pytest.raises(ValueError):
+        BatchedRecordWriter(datastore=storage, record_type=AuditRecord, durability='eventually')
+
+    writer = BatchedRecordWriter(datastore=storage, record_type=AuditRecord, durability=BatchedRecordWriter.IMMEDIATE)
+    writer.put('audit_immediate', value=b'now')
+    assert read_values(storage, ['audit_immediate']) == [b'now']
+
+    # Immediate writes report their errors to the caller
+    with pytest.raises(datastore.DatastoreTransactionError):
+        writer.put('audit_invalid', value='not bytes')
@@ -0,0 +1,138 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import time
+from threading import Event
+from unittest.mock import Mock
+
+import maya
+import pytest
+import pytest_twisted
+from requests.exceptions import ConnectionError
+from twisted.internet.threads import blockingCallFromThread
+
+from nucypher.network.middleware import RestMiddleware
+from nucypher.network.trackers import AvailabilityTracker
+
+
+class FakeNode:
+
+    def __init__(self, checksum_address: str, delay: float = 0, status_code: int = 200, error: Exception = None):
+        self.checksum_address = checksum_address
+        self.delay = delay
+        self.status_code = status_code
+        self.error = error
+
+
+def check_rest_availability(initiator, responder):
+    time.sleep(responder.delay)
+    if responder.error:
+        raise responder.error
+    return Mock(status_code=responder.status_code)
+
+
+@pytest.fixture
+def tracker(mocker):
+    ursula = Mock()
+    ursula.NotStaking = type('NotStaking', (Exception,), {})
+    ursula.network_middleware = RestMiddleware()
+    mocker.patch.object(ursula.network_middleware, 'check_rest_availability', side_effect=check_rest_availability)
+    tracker = AvailabilityTracker(ursula=ursula)
+    tracker.SAMPLE_DEADLINE = 2
+    yield tracker
+
+
+def test_measure_sample_concurrently(tracker):
+    nodes = [FakeNode(f'0x{i}', delay=0.5) for i in range(5)]
+
+    start = time.monotonic()
+    tracker.measure_sample(ursulas=nodes)
+    assert time.monotonic() - start < 2  # not 5 * 0.5 seconds
+
+    assert tracker.responders == {node.checksum_address for node in nodes}
+    assert tracker.score == tracker.MAXIMUM_SCORE
+    assert set(tracker.latency_percentiles) == set(tracker.LATENCY_PERCENTILES)
+    assert all(0.5 <= latency < 2 for latency in tracker.latency_percentiles.values())
+
+
+def test_measure_sample_deadline_and_unreachable_nodes(tracker):
+    release = Event()
+    slow_node = FakeNode('0xslow')
+    reporting_node = FakeNode('0xreporting', status_code=400)
+    down_node = FakeNode('0xdown', error=ConnectionError())
+    incompatible_node = FakeNode('0xincompatible', error=RestMiddleware.NotFound('no ping'))
+
+    def check(initiator, responder):
+        if responder is slow_node:
+            release.wait(timeout=10)
+        return check_rest_availability(initiator, responder)
+
+    tracker._ursula.network_middleware.check_rest_availability.side_effect = check
+    try:
+        start = time.monotonic()
+        tracker.measure_sample(ursulas=[slow_node, reporting_node, down_node, incompatible_node])
+        assert time.monotonic() - start < tracker.SAMPLE_DEADLINE + 1
+    finally:
+        release.set()
+
+    # Only the node that responded changed the score
+    assert tracker.responders == {reporting_node.checksum_address}
+    assert tracker.score == tracker.CHARGE_RATE * tracker.MAXIMUM_SCORE
+    assert len(tracker.excuses) > 0
+
+    # The others are skipped when sampling, while there are enough other nodes
+    for node in (slow_node, down_node, incompatible_node):
+        assert node.checksum_address in tracker.unreachable
+    assert reporting_node.checksum_address not in tracker.unreachable
+
+    tracker._ursula.known_nodes = {node.checksum_address: node
+                                   for node in (slow_node, reporting_node, down_node, incompatible_node)}
+    assert tracker.sample(quantity=1) == [reporting_node]
+    assert len(tracker.sample(quantity=2)) == 2
+
+
+@pytest_twisted.inlineCallbacks
+def test_maintain_off_the_reactor_thread(tracker):
+    from twisted.internet import reactor
+
+    def check(initiator, responder):
+        # The reactor is free while the remote node is checked
+        assert blockingCallFromThread(reactor, lambda: True)
+        return check_rest_availability(initiator, responder)
+
+    tracker._ursula.network_middleware.check_rest_availability.side_effect = check
+    node = FakeNode('0x0', status_code=400)
+    tracker._ursula.known_nodes = {node.checksum_address: node}
+    tracker._start_time = maya.now()
+
+    yield tracker.maintain()
+    assert tracker.responders == {node.checksum_address}
+    assert tracker.score < tracker.MAXIMUM_SCORE
+
+
+def test_measure_sample_unexpected_error(tracker):
+    broken_node = FakeNode('0xbroken', error=RuntimeError('bug'))
+    with pytest.raises(RuntimeError, match='bug'):
+        tracker.measure_sample(ursulas=[broken_node])
+
+
+def test_latency_percentiles():
+    latencies = [0.1 * i for i in range(1, 11)]
+    assert AvailabilityTracker._percentile(latencies, 50) == pytest.approx(0.5)
+    assert AvailabilityTracker._percentile(latencies, 90) == pytest.approx(0.9)
+    assert AvailabilityTracker._percentile(latencies, 99) == pytest.approx(1.0)
+    assert AvailabilityTracker._percentile([0.3], 50) == 0.3
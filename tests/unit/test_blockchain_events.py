@@ -15,11 +15,32 @@
  along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-from unittest.mock import Mock, MagicMock
+import json
+from unittest.mock import Mock, MagicMock, patch
 
 import pytest
+from hexbytes import HexBytes
 
-from nucypher.blockchain.eth.events import ContractEventsThrottler
+from nucypher.blockchain.eth.calls import ContractCallBatcher
+from nucypher.blockchain.eth.events import BLOCK_TIMESTAMPS, BlockTimestampCache, ContractEvents, \
+    ContractEventsThrottler, EventRecord
+from nucypher.blockchain.eth.interfaces import BlockchainInterfaceFactory
+
+
+@pytest.fixture(scope='function')
+def mock_blockchain():
+    blockchain = MagicMock(provider_uri='tester://mock')
+    blockchain.client.get_block.side_effect = lambda block_number: {'timestamp': 1000 + block_number}
+    BLOCK_TIMESTAMPS.clear()
+    with patch.object(BlockchainInterfaceFactory, 'get_interface', return_value=blockchain):
+        yield blockchain
+    BLOCK_TIMESTAMPS.clear()
+
+
+def make_event(block_number: int) -> dict:
+    return {'args': {'value': block_number},
+            'blockNumber': block_number,
+            'transactionHash': HexBytes(block_number.to_bytes(32, 'big'))}
 
 
 def test_contract_events_throttler_to_block_check():
@@ -116,3 +137,177 @@ def test_contract_events_throttler_inclusive_block_ranges():
     mock_method.assert_any_call(**argument_filters, from_block=6, to_block=11)
     mock_method.assert_any_call(**argument_filters, from_block=12, to_block=17)
     mock_method.assert_any_call(**argument_filters, from_block=18, to_block=21)
+
+
+def test_block_timestamp_cache(mock_blockchain):
+    cache = BlockTimestampCache(max_blocks=2)
+
+    assert cache.resolve([1, 2, 1]) == {1: 1001, 2: 1002}
+    assert mock_blockchain.client.get_block.call_count == 2
+
+    # Cached blocks are not fetched again
+    assert cache.get(2) == 1002
+    assert mock_blockchain.client.get_block.call_count == 2
+
+    # The cache is bounded
+    assert cache.get(3) == 1003
+    assert cache.get(1) == 1001
+    assert mock_blockchain.client.get_block.call_count == 4
+
+
+def test_block_timestamp_cache_batches_requests_over_http(mock_blockchain):
+    from web3 import HTTPProvider, Web3
+
+    mock_blockchain.w3 = Web3(HTTPProvider('http://localhost:8545'))
+    batches = list()
+
+    def mock_post_request(endpoint_uri, data, **kwargs):
+        batch = json.loads(data)
+        batches.append(batch)
+        return json.dumps([{'jsonrpc': '2.0', 'id': request['id'],
+                            'result': {'number': request['params'][0],
+                                       'timestamp': hex(1000 + int(request['params'][0], 16))}}
+                           for request in batch]).encode()
+
+    cache = BlockTimestampCache()
+    with patch('nucypher.blockchain.eth.calls.make_post_request', side_effect=mock_post_request):
+        assert cache.get(5) == 1005
+        assert cache.resolve([5, 6, 7, 8, 8]) == {5: 1005, 6: 1006, 7: 1007, 8: 1008}
+
+    # A single block is fetched as usual, and the missing blocks of a page in a single batch request
+    assert mock_blockchain.client.get_block.call_count == 1
+    assert len(batches) == 1
+    assert [(request['method'], request['params']) for request in batches[0]] == \
+           [('eth_getBlockByNumber', [hex(block_number), False]) for block_number in (6, 7, 8)]
+
+
+def test_block_timestamp_cache_unknown_blocks(mock_blockchain):
+    from web3 import HTTPProvider, Web3
+    from web3.exceptions import BlockNotFound
+
+    latest_block = 10
+
+    def get_block(block_number):
+        if block_number > latest_block:
+            raise BlockNotFound(f"Block {block_number} not found")
+        return {'timestamp': 1000 + block_number}
+
+    mock_blockchain.client.get_block.side_effect = get_block
+    cache = BlockTimestampCache()
+    assert cache.resolve([10, 11]) == {10: 1010, 11: None}
+
+    # Unknown blocks are not cached, and are fetched again once mined
+    latest_block = 11
+    assert cache.get(11) == 1011
+    assert mock_blockchain.client.get_block.call_count == 3
+
+    # Same with batch requests, which are also split in batches of the default size
+    mock_blockchain.w3 = Web3(HTTPProvider('http://localhost:8545'))
+    batch_sizes = list()
+
+    def mock_post_request(endpoint_uri, data, **kwargs):
+        batch = json.loads(data)
+        batch_sizes.append(len(batch))
+        return json.dumps([{'jsonrpc': '2.0', 'id': request['id'],
+                            'result': get_block(int(request['params'][0], 16))
+                            if int(request['params'][0], 16) <= latest_block else None}
+                           for request in batch]).encode()
+
+    block_numbers = range(latest_block + 1, latest_block + 1 + ContractCallBatcher.DEFAULT_BATCH_SIZE + 1)
+    with patch('nucypher.blockchain.eth.calls.make_post_request', side_effect=mock_post_request), \
+            patch.object(mock_blockchain.w3.manager, 'request_blocking', return_value=None):
+        assert cache.resolve(block_numbers) == dict.fromkeys(block_numbers)
+        assert batch_sizes == [ContractCallBatcher.DEFAULT_BATCH_SIZE, 1]
+
+        latest_block = block_numbers[-1]
+        assert cache.resolve(block_numbers) == {block_number: 1000 + block_number for block_number in block_numbers}
+        assert len(batch_sizes) == 4
+
+
+def test_block_timestamp_cache_without_blockchain():
+    with patch.object(BlockchainInterfaceFactory, 'get_interface',
+                      side_effect=BlockchainInterfaceFactory.NoRegisteredInterfaces):
+        assert BlockTimestampCache().resolve([1, 2]) == {1: None, 2: None}
+        assert EventRecord(make_event(1)).timestamp is None
+
+
+def test_event_record_timestamps_are_lazy_and_batched(mock_blockchain):
+    events = [make_event(block_number) for block_number in (5, 5, 6, 7, 7, 7)]
+    contract_events = MagicMock(TestEvent=Mock(getLogs=Mock(return_value=events)))
+    contract_events.__iter__.return_value = iter([Mock(event_name='TestEvent')])
+    contract = Mock(events=contract_events)
+
+    records = list(ContractEvents(contract)['TestEvent'](from_block=0, to_block=10))
+    assert [record.block_number for record in records] == [5, 5, 6, 7, 7, 7]
+
+    # Nothing is fetched until a timestamp is accessed...
+    assert mock_blockchain.client.get_block.call_count == 0
+
+    # ...and then every unique block of the page is fetched once.
+    assert records[-1].timestamp == 1007
+    assert mock_blockchain.client.get_block.call_count == 3
+    assert [record.timestamp for record in records] == [1005, 1005, 1006, 1007, 1007, 1007]
+    assert mock_blockchain.client.get_block.call_count == 3
+
+
+def test_contract_events_logs_are_decoded_locally(mock_blockchain):
+    from eth_abi import encode_abi
+    from eth_utils import event_abi_to_log_topic
+    from web3 import Web3
+
+    def event_abi(name: str, value_name: str) -> dict:
+        return {'type': 'event', 'name': name, 'anonymous': False,
+                'inputs': [{'name': 'staker', 'type': 'address', 'indexed': True},
+                           {'name': value_name, 'type': 'uint256', 'indexed': False}]}
+
+    abis = [event_abi('Minted', 'value'), event_abi('Slashed', 'penalty'), event_abi('Deposited', 'value')]
+    staker = '0x' + 'ab' * 20
+    contract_address = '0x' + 'cd' * 20
+
+    def make_log(abi: dict, block_number: int, value: int) -> dict:
+        return {'address': contract_address,
+                'topics': [HexBytes(event_abi_to_log_topic(abi)), HexBytes(encode_abi(['address'], [staker]))],
+                'data': HexBytes(encode_abi(['uint256'], [value])).hex(),
+                'blockNumber': block_number,
+                'logIndex': 0,
+                'transactionIndex': 0,
+                'transactionHash': HexBytes(block_number.to_bytes(32, 'big')),
+                'blockHash': HexBytes(b'\x01' * 32)}
+
+    logs = [make_log(abis[0], 1, 10), make_log(abis[2], 2, 20), make_log(abis[1], 3, 30),
+            dict(make_log(abis[0], 4, 40), topics=[])]  # anonymous
+    contract_events = MagicMock()
+    contract_events.__iter__.return_value = iter([Mock(event_name=abi['name']) for abi in abis])
+    web3 = Mock(codec=Web3().codec)
+    web3.eth.getLogs.return_value = logs
+    contract = Mock(events=contract_events, abi=abis, address=contract_address, web3=web3)
+
+    contract_events = ContractEvents(contract)
+    records = contract_events.logs(event_names=['Minted', 'Slashed'], from_block=0, to_block=10)
+    topics = [[Web3.toHex(event_abi_to_log_topic(abis[0])), Web3.toHex(event_abi_to_log_topic(abis[1]))]]
+    web3.eth.getLogs.assert_called_once_with({'address': contract_address, 'fromBlock': 0, 'toBlock': 10,
+                                              'topics': topics})
+    assert [(record.raw_event['event'], record.block_number) for record in records] == [('Minted', 1), ('Slashed', 3)]
+    assert records[0].args == {'staker': Web3.toChecksumAddress(staker), 'value': 10}
+    assert records[1].args['penalty'] == 30
+
+    # Filters on indexed arguments are passed as topics, along with any of the event signatures
+    web3.eth.getLogs.reset_mock()
+    contract_events.logs(event_names=['Minted', 'Slashed'], from_block=0, to_block=10,
+                         staker=Web3.toChecksumAddress(staker))
+    web3.eth.getLogs.assert_called_once_with({'address': contract_address, 'fromBlock': 0, 'toBlock': 10,
+                                              'topics': topics + [Web3.toHex(encode_abi(['address'], [staker]))]})
+
+    with pytest.raises(TypeError):
+        contract_events.logs(event_names=['Minted', 'Unknown'], from_block=0, to_block=10)
+
+    # Events of several names are retrieved together, in batches, with their argument filters
+    agent = Mock(events=Mock(logs=Mock(return_value=[])))
+    throttler = ContractEventsThrottler(agent=agent, event_name=('Minted', 'Slashed'), from_block=0, to_block=1500)
+    assert list(throttler) == []
+    assert agent.events.logs.call_count == 2
+    agent.events.logs.assert_called_with(event_names=('Minted', 'Slashed'), from_block=1001, to_block=1500)
+    throttler = ContractEventsThrottler(agent=agent, event_name=('Minted', 'Slashed'), from_block=0, to_block=1,
+                                        staker=staker)
+    assert list(throttler) == []
+    agent.events.logs.assert_called_with(event_names=('Minted', 'Slashed'), from_block=0, to_block=1, staker=staker)
@@ -16,11 +16,14 @@
 """
 
 import pytest
+from hexbytes import HexBytes
 from web3.gas_strategies import time_based
 
 from constant_sorrow.constants import ALL_OF_THEM
 
+from nucypher.blockchain.eth.agents import PolicyManagerAgent
 from nucypher.blockchain.eth.interfaces import BlockchainInterface
+from nucypher.policy.policies import BlockchainPolicy
 from nucypher.utilities.gas_strategies import WEB3_GAS_STRATEGIES
 from tests.mock.interfaces import MockBlockchain
 
@@ -123,3 +126,168 @@ def test_use_pending_nonce_when_building_payload(mock_testerchain, mocker):
     assert payload['nonce'] == 6
     payload = mock_testerchain.build_payload(sender_address=sender, payload=None, use_pending_nonce=False)
     assert payload['nonce'] == 6
+
+
+def mock_transacting_power(mock_testerchain, mocker):
+    # Signed transactions are just their nonce, for the mocked broadcast
+    return mocker.Mock(account=mock_testerchain.unassigned_accounts[0],
+                       is_device=False,
+                       sign_transaction=mocker.Mock(side_effect=lambda transaction: bytes([transaction['nonce']])))
+
+
+def test_send_transactions_with_consecutive_nonces(mock_testerchain, mocker):
+    transacting_power = mock_transacting_power(mock_testerchain, mocker)
+    mock_testerchain.client.w3.eth.getTransactionCount = mocker.Mock(return_value=7)
+
+    def mock_build_contract_transaction(contract_function, sender_address, payload, nonce, **kwargs):
+        return dict(payload, nonce=nonce, gas=1, gasPrice=1)
+
+    events = []
+
+    def mock_send_raw_transaction(signed_raw_transaction):
+        events.append(('broadcast', signed_raw_transaction[0]))
+        return HexBytes(signed_raw_transaction)
+
+    def mock_wait_for_receipt(txhash, timeout, confirmations):
+        events.append(('receipt', txhash[0]))
+        return {'status': 1, 'transactionHash': txhash}
+
+    mocker.patch.object(mock_testerchain, 'build_contract_transaction', side_effect=mock_build_contract_transaction)
+    mocker.patch.object(mock_testerchain.client, 'send_raw_transaction', side_effect=mock_send_raw_transaction)
+    mocker.patch.object(mock_testerchain.client, 'wait_for_receipt', side_effect=mock_wait_for_receipt)
+
+    contract_function = mocker.Mock(fn_name='createPolicy')
+    transactions = [(contract_function, {'value': value}) for value in (1, 2, 3)]
+    receipts = mock_testerchain.send_transactions(transactions=transactions, transacting_power=transacting_power)
+
+    # The pending transaction count is only retrieved once
+    assert mock_testerchain.client.w3.eth.getTransactionCount.call_count == 1
+
+    # All the transactions are broadcast before waiting for the receipts
+    assert events == [('broadcast', 7), ('broadcast', 8), ('broadcast', 9),
+                      ('receipt', 7), ('receipt', 8), ('receipt', 9)]
+    assert [receipt['transactionHash'] for receipt in receipts] == [bytes([7]), bytes([8]), bytes([9])]
+
+    assert mock_testerchain.send_transactions(transactions=[], transacting_power=transacting_power) == []
+
+
+def test_send_transactions_collects_failures(mock_testerchain, mocker):
+    transacting_power = mock_transacting_power(mock_testerchain, mocker)
+    mock_testerchain.client.w3.eth.getTransactionCount = mocker.Mock(return_value=7)
+
+    def mock_build_contract_transaction(contract_function, sender_address, payload, nonce, **kwargs):
+        if payload['value'] == 2:
+            raise ValueError("gas estimation failed")
+        return dict(payload, nonce=nonce, gas=1, gasPrice=1)
+
+    broadcast_nonces = []
+
+    def mock_send_raw_transaction(signed_raw_transaction):
+        nonce = signed_raw_transaction[0]
+        if nonce == 9 and 9 not in broadcast_nonces:
+            broadcast_nonces.append(nonce)
+            raise ValueError("replacement transaction underpriced")  # rejected by the node
+        broadcast_nonces.append(nonce)
+        return HexBytes(signed_raw_transaction)
+
+    def mock_wait_for_receipt(txhash, timeout, confirmations):
+        # The transaction with nonce 8 is mined, but reverted
+        return {'status': 0 if txhash[0] == 8 else 1, 'transactionHash': txhash}
+
+    mocker.patch.object(mock_testerchain, 'build_contract_transaction', side_effect=mock_build_contract_transaction)
+    mocker.patch.object(mock_testerchain.client, 'send_raw_transaction', side_effect=mock_send_raw_transaction)
+    mocker.patch.object(mock_testerchain.client, 'wait_for_receipt', side_effect=mock_wait_for_receipt)
+
+    contract_function = mocker.Mock(fn_name='createPolicy')
+    transactions = [(contract_function, {'value': value}) for value in (1, 2, 3, 4, 5)]
+    with pytest.raises(BlockchainInterface.BatchTransactionFailed) as error:
+        mock_testerchain.send_transactions(transactions=transactions, transacting_power=transacting_power)
+
+    # The transactions that could not be built, or were rejected, do not leave a gap in the nonces,
+    # and the ones after the failures are still sent
+    assert broadcast_nonces == [7, 8, 9, 9]
+    assert set(error.value.failures) == {1, 2, 3}
+    assert str(error.value.failures[1]) == "gas estimation failed"
+    assert str(error.value.failures[3]) == "replacement transaction underpriced"
+    receipts = error.value.receipts
+    assert [receipt and receipt['transactionHash'][0] for receipt in receipts] == [7, None, None, None, 9]
+
+
+def test_send_transactions_stops_after_an_uncertain_broadcast(mock_testerchain, mocker):
+    transacting_power = mock_transacting_power(mock_testerchain, mocker)
+    mock_testerchain.client.w3.eth.getTransactionCount = mocker.Mock(return_value=7)
+
+    def mock_build_contract_transaction(contract_function, sender_address, payload, nonce, **kwargs):
+        return dict(payload, nonce=nonce, gas=1, gasPrice=1)
+
+    broadcast_nonces = []
+    lost_connection = ConnectionError("connection lost")
+
+    def mock_send_raw_transaction(signed_raw_transaction):
+        nonce = signed_raw_transaction[0]
+        broadcast_nonces.append(nonce)
+        if nonce == 8:
+            # The node may or may not have received the transaction
+            raise lost_connection
+        return HexBytes(signed_raw_transaction)
+
+    def mock_wait_for_receipt(txhash, timeout, confirmations):
+        return {'status': 1, 'transactionHash': txhash}
+
+    mocker.patch.object(mock_testerchain, 'build_contract_transaction', side_effect=mock_build_contract_transaction)
+    mocker.patch.object(mock_testerchain.client, 'send_raw_transaction', side_effect=mock_send_raw_transaction)
+    mocker.patch.object(mock_testerchain.client, 'wait_for_receipt', side_effect=mock_wait_for_receipt)
+
+    contract_function = mocker.Mock(fn_name='createPolicy')
+    transactions = [(contract_function, {'value': value}) for value in (1, 2, 3, 4)]
+    with pytest.raises(BlockchainInterface.BatchTransactionFailed) as error:
+        mock_testerchain.send_transactions(transactions=transactions, transacting_power=transacting_power)
+
+    # Neither the nonce of the failed broadcast nor the next one are used again
+    assert broadcast_nonces == [7, 8]
+    assert error.value.failures == {1: lost_connection, 2: lost_connection, 3: lost_connection}
+    assert error.value.receipts[0]['transactionHash'] == HexBytes(bytes([7]))
+    assert error.value.receipts[1:] == [None, None, None]
+
+
+def test_blockchain_policies_partially_published(mock_testerchain, mocker):
+    transacting_power = mock_transacting_power(mock_testerchain, mocker)
+    mock_testerchain.client.w3.eth.getTransactionCount = mocker.Mock(return_value=7)
+
+    contract = mocker.Mock()
+    contract.functions.createPolicy.side_effect = \
+        lambda policy_id, owner, end_timestamp, nodes: mocker.Mock(fn_name='createPolicy', policy_id=policy_id)
+    mocker.patch.object(PolicyManagerAgent, 'contract', new_callable=mocker.PropertyMock, return_value=contract)
+    policy_agent = PolicyManagerAgent.__new__(PolicyManagerAgent)
+    policy_agent.blockchain = mock_testerchain
+
+    def mock_build_contract_transaction(contract_function, sender_address, payload, nonce, **kwargs):
+        return dict(payload, policy_id=contract_function.policy_id, nonce=nonce, gas=1, gasPrice=1)
+
+    broadcast_nonces = []
+
+    def mock_send_raw_transaction(signed_raw_transaction):
+        nonce = signed_raw_transaction[0]
+        broadcast_nonces.append(nonce)
+        if len(broadcast_nonces) == 2:
+            raise ValueError("insufficient funds for gas * price + value")
+        return HexBytes(signed_raw_transaction)
+
+    def mock_wait_for_receipt(txhash, timeout, confirmations):
+        return {'status': 1, 'transactionHash': txhash}
+
+    mocker.patch.object(mock_testerchain, 'build_contract_transaction', side_effect=mock_build_contract_transaction)
+    mocker.patch.object(mock_testerchain.client, 'send_raw_transaction', side_effect=mock_send_raw_transaction)
+    mocker.patch.object(mock_testerchain.client, 'wait_for_receipt', side_effect=mock_wait_for_receipt)
+
+    publisher = mocker.Mock(policy_agent=policy_agent, transacting_power=transacting_power)
+    ursula = mocker.Mock(checksum_address=mock_testerchain.unassigned_accounts[1])
+    policies = [mocker.Mock(hrac=bytes([i]) * 16, value=i, publisher=publisher) for i in range(3)]
+    failures = BlockchainPolicy._enact_many_arrangements({policy: {ursula: mocker.Mock()} for policy in policies})
+
+    # The second policy was rejected, and the third one was published with its nonce
+    [(failed_policy, failure)] = failures.items()
+    assert failed_policy is policies[1]
+    assert "insufficient funds" in str(failure)
+    assert broadcast_nonces == [7, 8, 8]
+    assert contract.functions.createPolicy.call_count == 3
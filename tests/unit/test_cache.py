@@ -0,0 +1,79 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import pytest
+
+from nucypher.utilities.cache import LRUCache
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction():
+    cache = LRUCache(maxsize=2)
+    cache['a'] = 1
+    cache['b'] = 2
+
+    # Touch 'a' so that 'b' becomes the least recently used entry
+    assert cache['a'] == 1
+    cache['c'] = 3
+
+    assert 'b' not in cache
+    assert cache['a'] == 1
+    assert cache['c'] == 3
+    assert len(cache) == 2
+
+
+def test_expiration():
+    clock = FakeClock()
+    cache = LRUCache(maxsize=10, ttl=10, clock=clock)
+    cache.put('default', 1)
+    cache.put('short', 2, ttl=1)
+
+    clock.now = 5
+    assert cache.get('short') is None
+    assert cache.get('default') == 1
+    assert dict(cache.items()) == {'default': 1}
+
+    clock.now = 10
+    with pytest.raises(KeyError):
+        _ = cache['default']
+
+
+def test_invalidation():
+    cache = LRUCache(maxsize=10)
+    cache['a'] = 1
+    cache['b'] = 2
+
+    cache.invalidate('a')
+    cache.invalidate('nonexistent')
+    assert 'a' not in cache
+    assert 'b' in cache
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
@@ -0,0 +1,113 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+import requests
+from eth_abi import decode_abi, encode_abi
+from eth_tester import EthereumTester
+from web3 import EthereumTesterProvider, HTTPProvider, Web3
+
+from nucypher.blockchain.eth.calls import ContractCallBatcher
+
+CONTRACT_ADDRESS = '0x' + '12' * 20
+CONTRACT_ABI = [
+    {'type': 'function', 'name': 'stakers', 'stateMutability': 'view',
+     'inputs': [{'name': 'index', 'type': 'uint256'}],
+     'outputs': [{'name': '', 'type': 'address'}]},
+    {'type': 'function', 'name': 'getSubStakeInfo', 'stateMutability': 'view',
+     'inputs': [{'name': 'index', 'type': 'uint256'}],
+     'outputs': [{'name': 'firstPeriod', 'type': 'uint16'}, {'name': 'value', 'type': 'uint128'}]},
+]
+
+
+def staker_address(index: int) -> str:
+    return Web3.toChecksumAddress(index.to_bytes(20, 'big'))
+
+
+class MockJSONRPCEndpoint:
+    """Answers batches of `eth_call`s to the test contract, rejecting batches over `max_batch_size`."""
+
+    def __init__(self, max_batch_size: int):
+        self.max_batch_size = max_batch_size
+        self.batch_sizes = list()
+
+    def __call__(self, endpoint_uri, data, **kwargs):
+        requests_batch = json.loads(data)
+        self.batch_sizes.append(len(requests_batch))
+        if len(requests_batch) > self.max_batch_size:
+            raise requests.HTTPError("413 Request Entity Too Large")
+        return json.dumps([self.respond(request) for request in requests_batch]).encode()
+
+    @staticmethod
+    def respond(request):
+        call, block = request['params']
+        assert call['to'] == Web3.toChecksumAddress(CONTRACT_ADDRESS)
+        assert block == hex(1234)
+        data = bytes.fromhex(call['data'][2:])
+        selector, (index,) = data[:4], decode_abi(['uint256'], data[4:])
+        if selector == Web3.keccak(text='stakers(uint256)')[:4]:
+            result = encode_abi(['address'], [staker_address(index)])
+        else:
+            result = encode_abi(['uint16', 'uint128'], [index, index * 10])
+        return {'jsonrpc': '2.0', 'id': request['id'], 'result': '0x' + result.hex()}
+
+
+@pytest.fixture()
+def http_w3():
+    w3 = Web3(HTTPProvider('http://localhost:8545'))
+    with patch.object(type(w3.eth), 'blockNumber', 1234):
+        yield w3
+
+
+def test_batched_calls(http_w3):
+    contract = http_w3.eth.contract(address=Web3.toChecksumAddress(CONTRACT_ADDRESS), abi=CONTRACT_ABI)
+    batcher = ContractCallBatcher(w3=http_w3, batch_size=10)
+    endpoint = MockJSONRPCEndpoint(max_batch_size=10)
+
+    functions = [contract.functions.stakers(i) for i in range(25)]
+    functions.append(contract.functions.getSubStakeInfo(7))
+    with patch('nucypher.blockchain.eth.calls.make_post_request', side_effect=endpoint):
+        results = batcher.call(functions)
+
+    assert endpoint.batch_sizes == [10, 10, 6]
+    assert results[:25] == [staker_address(i) for i in range(25)]
+    assert results[25] == [7, 70]
+
+
+def test_rejected_batches_are_split(http_w3):
+    contract = http_w3.eth.contract(address=Web3.toChecksumAddress(CONTRACT_ADDRESS), abi=CONTRACT_ABI)
+    batcher = ContractCallBatcher(w3=http_w3, batch_size=16)
+    endpoint = MockJSONRPCEndpoint(max_batch_size=5)
+
+    with patch('nucypher.blockchain.eth.calls.make_post_request', side_effect=endpoint):
+        results = batcher.call(contract.functions.stakers(i) for i in range(16))
+
+    assert results == [staker_address(i) for i in range(16)]
+    assert endpoint.batch_sizes == [16, 8, 4, 4, 8, 4, 4]
+
+
+def test_calls_without_batching_provider():
+    w3 = Web3(EthereumTesterProvider(EthereumTester()))
+    batcher = ContractCallBatcher(w3=w3)
+    assert not batcher.batches_requests
+    assert batcher.call([]) == []
+
+    with pytest.raises(ValueError):
+        ContractCallBatcher(w3=w3, batch_size=0)
@@ -0,0 +1,230 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from unittest.mock import MagicMock, Mock
+
+import pytest
+from eth_utils import to_checksum_address
+from hexbytes import HexBytes
+
+from nucypher.blockchain.eth.event_index import ContractEventIndex
+from nucypher.blockchain.eth.events import EventRecord
+from nucypher.cli.utils import parse_event_filters_into_argument_filters
+
+EVENT_NAME = 'Minted'
+STAKERS = ('0xAbC0000000000000000000000000000000000001', '0xaBc0000000000000000000000000000000000002')
+
+
+class MockChain:
+    """Emits a Minted event per block, alternating stakers."""
+
+    def __init__(self, block_number: int):
+        self.block_number = block_number
+        self.fork = 0
+        self.requested_ranges = list()
+        self.requested_filters = list()
+        self.requested_logs = list()
+
+    def event(self, block_number: int, event_name: str = EVENT_NAME) -> dict:
+        return {'args': {'staker': STAKERS[block_number % 2], 'period': block_number, 'fork': self.fork,
+                         'data': HexBytes(bytes([block_number % 256]))},
+                'event': event_name,
+                'blockNumber': block_number,
+                'logIndex': 0,
+                'transactionIndex': 0,
+                'transactionHash': HexBytes(block_number.to_bytes(32, 'big')),
+                'blockHash': HexBytes(bytes([self.fork]) * 32)}
+
+    def get_events(self, from_block: int, to_block: int, **argument_filters):
+        self.requested_ranges.append((from_block, to_block))
+        self.requested_filters.append(argument_filters)
+        events = [EventRecord(self.event(block_number))
+                  for block_number in range(from_block, min(to_block, self.block_number) + 1)]
+        # Like topics, addresses are matched regardless of their case
+        return [event for event in events
+                if all(event.args[name].lower() == value.lower() for name, value in argument_filters.items())]
+
+    def get_logs(self, event_names, from_block: int, to_block: int):
+        self.requested_logs.append((tuple(event_names), from_block, to_block))
+        return [EventRecord(self.event(block_number, event_name))
+                for block_number in range(from_block, min(to_block, self.block_number) + 1)
+                for event_name in event_names]
+
+
+@pytest.fixture()
+def chain():
+    return MockChain(block_number=100)
+
+
+@pytest.fixture()
+def agent(chain):
+    agent = Mock(contract_address='0x' + 'cd' * 20, events=MagicMock(logs=Mock(side_effect=chain.get_logs)))
+    agent.events.__getitem__.return_value = Mock(side_effect=chain.get_events)
+    agent.events.indexed_inputs.return_value = {'staker': 'address', 'period': 'uint16'}
+    agent.blockchain = MagicMock()
+    agent.blockchain.client.chain_id = 1
+    type(agent.blockchain.client).block_number = property(lambda client: chain.block_number)
+    return agent
+
+
+def test_event_index_serves_ranges_locally(agent, chain):
+    event_index = ContractEventIndex(reorg_depth=0, max_blocks_per_call=1000)
+
+    events = event_index.events(agent=agent, event_name=EVENT_NAME, from_block=50)
+    assert [event.block_number for event in events] == list(range(50, 101))
+    assert chain.requested_ranges == [(50, 100)]
+    assert event_index.indexed_range(agent=agent, event_name=EVENT_NAME) == (50, 100)
+
+    # Indexed ranges are served without the provider, with argument filters
+    events = event_index.events(agent=agent, event_name=EVENT_NAME, from_block=60, to_block=70, staker=STAKERS[0])
+    assert [event.block_number for event in events] == [60, 62, 64, 66, 68, 70]
+    assert all(event.args['staker'] == STAKERS[0] for event in events)
+    assert events[0].args['data'] == HexBytes(b'\x3c')
+    assert events[0].raw_event['transactionHash'] == HexBytes((60).to_bytes(32, 'big'))
+    assert chain.requested_ranges == [(50, 100)]
+
+    # Addresses match regardless of their case, and lists of values match any of them
+    events = event_index.events(agent=agent, event_name=EVENT_NAME, from_block=60, to_block=63,
+                                staker=STAKERS[1].lower(), period=[61, 62, 63])
+    assert [event.block_number for event in events] == [61, 63]
+
+    # Only missing ranges are fetched, before and after the indexed range
+    chain.block_number = 120
+    events = event_index.events(agent=agent, event_name=EVENT_NAME, from_block=40)
+    assert [event.block_number for event in events] == list(range(40, 121))
+    assert chain.requested_ranges == [(50, 100), (40, 49), (101, 120)]
+
+
+def test_event_index_bytes_filters_from_the_cli(agent, chain):
+    event_index = ContractEventIndex(reorg_depth=0, max_blocks_per_call=1000)
+    event_index.sync(agent=agent, event_name=EVENT_NAME, from_block=50)
+
+    # `nucypher status events --event-filter data=0x3c`: bytes arguments are matched by their hex string
+    argument_filters = parse_event_filters_into_argument_filters(('data=0x3c',))
+    events = event_index.events(agent=agent, event_name=EVENT_NAME, from_block=50, to_block=100, **argument_filters)
+    assert [event.block_number for event in events] == [60]
+
+    argument_filters = parse_event_filters_into_argument_filters(('data=0x3C', f'staker={STAKERS[0]}'))
+    events = event_index.events(agent=agent, event_name=EVENT_NAME, from_block=50, to_block=100, **argument_filters)
+    assert [event.block_number for event in events] == [60]
+
+    for argument_filters in (dict(data='0x3c3c'), dict(data='not hex')):
+        assert not event_index.events(agent=agent, event_name=EVENT_NAME, from_block=50, to_block=100,
+                                      **argument_filters)
+
+
+def test_event_index_syncs_indexed_argument_filters(agent, chain):
+    event_index = ContractEventIndex(reorg_depth=0, max_blocks_per_call=1000)
+
+    # Filters on indexed arguments are passed to the provider, and only the matching events are indexed
+    events = event_index.events(agent=agent, event_name=EVENT_NAME, from_block=90,
+                                staker=STAKERS[0].lower(), data=b'\x5c')
+    assert [event.block_number for event in events] == [92]
+    assert chain.requested_ranges == [(90, 100)]
+    assert chain.requested_filters == [{'staker': to_checksum_address(STAKERS[0])}]
+    assert event_index.indexed_range(agent=agent, event_name=EVENT_NAME) is None
+    assert event_index.indexed_range(agent=agent, event_name=EVENT_NAME, staker=STAKERS[0]) == (90, 100)
+
+    # ... and served locally afterwards, whatever the case of the address
+    events = event_index.events(agent=agent, event_name=EVENT_NAME, from_block=90, to_block=100, staker=STAKERS[0])
+    assert [event.block_number for event in events] == list(range(90, 101, 2))
+    assert len(chain.requested_ranges) == 1
+
+    # Events of all the stakers are indexed separately
+    events = event_index.events(agent=agent, event_name=EVENT_NAME, from_block=90, to_block=100)
+    assert len(events) == 11
+    assert chain.requested_filters == [{'staker': to_checksum_address(STAKERS[0])}, {}]
+
+    # Once they cover the block range, they serve the filtered queries too
+    events = event_index.events(agent=agent, event_name=EVENT_NAME, from_block=95, to_block=100, staker=STAKERS[1])
+    assert [event.block_number for event in events] == [95, 97, 99]
+    assert len(chain.requested_ranges) == 2
+
+
+def test_event_index_rolls_back_reorg_depth(agent, chain):
+    event_index = ContractEventIndex(reorg_depth=5, max_blocks_per_call=1000)
+    event_index.sync(agent=agent, event_name=EVENT_NAME, from_block=90)
+
+    # The last blocks are replaced by a fork
+    chain.fork = 1
+    chain.block_number = 102
+    events = event_index.events(agent=agent, event_name=EVENT_NAME, from_block=90)
+    assert chain.requested_ranges == [(90, 100), (96, 102)]
+    assert [event.args['fork'] for event in events] == [0] * 6 + [1] * 7
+    assert [event.block_number for event in events] == list(range(90, 103))
+
+
+def test_event_index_syncs_events_together(agent, chain):
+    event_index = ContractEventIndex(reorg_depth=2, max_blocks_per_call=1000)
+    event_index.sync(agent=agent, event_name=EVENT_NAME, from_block=90)
+
+    # A single request per range for all event names, even those not indexed yet
+    chain.block_number = 105
+    event_index.sync_events(agent=agent, event_names=(EVENT_NAME, 'Slashed'), from_block=95)
+    assert chain.requested_logs == [((EVENT_NAME, 'Slashed'), 95, 105)]
+    assert event_index.indexed_range(agent=agent, event_name=EVENT_NAME) == (90, 105)
+    assert event_index.indexed_range(agent=agent, event_name='Slashed') == (95, 105)
+
+    # Indexed events are then served locally
+    events = event_index.events(agent=agent, event_name='Slashed', from_block=95, to_block=105)
+    assert [event.block_number for event in events] == list(range(95, 106))
+    assert all(event.raw_event['event'] == 'Slashed' for event in events)
+    events = event_index.events(agent=agent, event_name=EVENT_NAME, from_block=90, to_block=105)
+    assert [event.block_number for event in events] == list(range(90, 106))
+    assert chain.requested_ranges == [(90, 100)]
+    assert len(chain.requested_logs) == 1
+
+
+def test_event_index_pruning(agent, chain):
+    event_index = ContractEventIndex(reorg_depth=0)
+    event_index.sync_events(agent=agent, event_names=[EVENT_NAME, 'Slashed'], from_block=50)
+    event_index.sync(agent=agent, event_name=EVENT_NAME, from_block=50, staker=STAKERS[0])
+
+    # Events before the block are dropped, with any topic filters
+    assert event_index.prune(agent=agent, event_names=[EVENT_NAME], before_block=90) == 40 + 20
+    assert event_index.indexed_range(agent=agent, event_name=EVENT_NAME) == (90, 100)
+    assert event_index.indexed_range(agent=agent, event_name=EVENT_NAME, staker=STAKERS[0]) == (90, 100)
+    assert event_index.indexed_range(agent=agent, event_name='Slashed') == (50, 100)
+
+    # The remaining range is still served locally, and pruned blocks are fetched again if needed
+    chain.requested_ranges.clear()
+    events = event_index.events(agent=agent, event_name=EVENT_NAME, from_block=85, to_block=100)
+    assert [event.block_number for event in events] == list(range(85, 101))
+    assert chain.requested_ranges == [(85, 89)]
+
+    # Ranges entirely before the block are dropped
+    assert event_index.prune(agent=agent, event_names=['Slashed'], before_block=101) == 51
+    assert event_index.indexed_range(agent=agent, event_name='Slashed') is None
+
+
+def test_event_index_persistence(agent, chain, tmp_path):
+    db_filepath = tmp_path / 'index' / 'events.sqlite'
+    event_index = ContractEventIndex(db_filepath=db_filepath, reorg_depth=0)
+    event_index.sync(agent=agent, event_name=EVENT_NAME, from_block=95)
+    event_index.close()
+
+    event_index = ContractEventIndex(db_filepath=db_filepath, reorg_depth=0)
+    events = event_index.events(agent=agent, event_name=EVENT_NAME, from_block=95, to_block=100)
+    assert len(events) == 6
+    assert chain.requested_ranges == [(95, 100)]
+
+    # Indexes are kept per chain
+    agent.blockchain.client.chain_id = 5
+    assert event_index.indexed_range(agent=agent, event_name=EVENT_NAME) is None
+
+    with pytest.raises(ValueError):
+        ContractEventIndex(reorg_depth=-1)
@@ -0,0 +1,108 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+
+import pytest
+from eth_utils import to_checksum_address
+
+from nucypher.acumen.merkle import FleetMerkleTree
+from nucypher.crypto.utils import keccak_digest
+
+
+def random_address():
+    return to_checksum_address(os.urandom(20))
+
+
+def make_fleet(size):
+    return {random_address(): os.urandom(64) for _ in range(size)}
+
+
+def test_empty_tree():
+    tree = FleetMerkleTree()
+    assert tree.checksum == keccak_digest(b"").hex()
+    assert list(tree.addresses()) == []
+    assert tree.subtree_digests(level=4) == {}
+
+
+def test_checksum_does_not_depend_on_update_order():
+    fleet = make_fleet(50)
+    all_at_once = FleetMerkleTree().with_updates(fleet)
+
+    one_by_one = FleetMerkleTree()
+    for address, metadata in reversed(list(fleet.items())):
+        one_by_one = one_by_one.with_updates({address: metadata})
+
+    assert all_at_once.checksum == one_by_one.checksum
+    assert list(all_at_once.addresses()) == sorted(fleet, key=FleetMerkleTree.key_of)
+
+
+def test_updates_are_persistent():
+    fleet = make_fleet(20)
+    tree = FleetMerkleTree().with_updates(fleet)
+    checksum = tree.checksum
+
+    address = next(iter(fleet))
+    updated_tree = tree.with_updates({address: b'new metadata'})
+    assert updated_tree.checksum != checksum
+    assert tree.checksum == checksum
+
+    # Changing the metadata back restores the checksum
+    restored_tree = updated_tree.with_updates({address: fleet[address]})
+    assert restored_tree.checksum == checksum
+
+    # Removing and re-adding a node, too
+    reduced_tree = tree.with_updates({}, removed=[address])
+    assert address not in set(reduced_tree.addresses())
+    assert reduced_tree.with_updates({address: fleet[address]}).checksum == checksum
+
+    # Removing everything leads to an empty tree
+    assert tree.with_updates({}, removed=fleet).checksum == FleetMerkleTree().checksum
+
+
+@pytest.mark.parametrize('level', (0, 1, 8, FleetMerkleTree.DEPTH))
+def test_differing_subtrees(level):
+    fleet = make_fleet(100)
+    tree = FleetMerkleTree().with_updates(fleet)
+
+    assert tree.differing_subtrees(tree, level=level) == []
+
+    changed, removed = list(fleet)[:2]
+    added = random_address()
+    other_tree = tree.with_updates({changed: b'new metadata', added: b'metadata'}, removed=[removed])
+
+    expected = sorted({FleetMerkleTree.bucket_of(address) >> (FleetMerkleTree.DEPTH - level)
+                       for address in (changed, added, removed)})
+    assert tree.differing_subtrees(other_tree, level=level) == expected
+    assert other_tree.differing_subtrees(tree, level=level) == expected
+
+    # The same, but comparing with the digests of a remote tree
+    remote_digests = other_tree.subtree_digests(level=level)
+    assert tree.differing_subtrees(remote_digests, level=level) == expected
+
+    # The addresses to exchange are the ones in the differing subtrees
+    for prefix in expected:
+        assert set(tree.addresses(prefix, level)) ^ set(other_tree.addresses(prefix, level)) <= {added, removed}
+        assert tree.subtree_digest(prefix, level) != other_tree.subtree_digest(prefix, level)
+
+
+def test_invalid_level():
+    tree = FleetMerkleTree()
+    with pytest.raises(ValueError):
+        tree.subtree_digests(level=FleetMerkleTree.DEPTH + 1)
+    with pytest.raises(ValueError):
+        tree.differing_subtrees(tree, level=-1)
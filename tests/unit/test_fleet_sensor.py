@@ -0,0 +1,108 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+from threading import Barrier, Thread
+
+from eth_utils import to_checksum_address
+
+from nucypher.acumen.perception import FleetSensor, FleetState
+
+DOMAIN = 'fleet-sensor-test'
+
+
+class FakeNode:
+
+    def __init__(self):
+        self.checksum_address = to_checksum_address(os.urandom(20))
+        self.domain = DOMAIN
+        self._metadata = os.urandom(32)
+
+    def __bytes__(self):
+        return self._metadata
+
+
+def test_nodes_marked_while_recording_fleet_state():
+    sensor = FleetSensor(domain=DOMAIN)
+    nodes = [FakeNode() for _ in range(2000)]
+    for node in nodes:
+        sensor.record_node(node)
+    sensor.record_fleet_state()
+    assert len(sensor) == len(nodes)
+
+    # Verification and teacher threads mark (and record) nodes while the learning thread updates the state
+    threads_count = 4
+    barrier = Barrier(threads_count + 1)
+    errors = []
+
+    def mark(nodes_to_mark):
+        barrier.wait()
+        for node in nodes_to_mark:
+            sensor.mark_as(ValueError("invalid"), node)
+            sensor.record_node(FakeNode())
+
+    threads = [Thread(target=mark, args=(nodes[i::threads_count],)) for i in range(threads_count)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    while any(thread.is_alive() for thread in threads):
+        try:
+            sensor.record_fleet_state()
+        except RuntimeError as e:  # e.g. "Set changed size during iteration"
+            errors.append(e)
+    for thread in threads:
+        thread.join()
+    sensor.record_fleet_state()
+
+    # No update failed, and no mark was lost
+    assert not errors
+    assert not any(node.checksum_address in sensor for node in nodes)
+    assert len(sensor) == len(nodes)
+
+
+def test_fleet_state_updates_share_unchanged_nodes():
+    nodes = [FakeNode() for _ in range(1000)]
+    state, diff = FleetState.new().with_updated_nodes(nodes_to_add=nodes, nodes_to_remove=[])
+    assert len(state) == len(nodes)
+    assert set(state.addresses()) == {node.checksum_address for node in nodes}
+
+    # An update only affects the changed nodes, and the previous state is left untouched
+    added, removed = FakeNode(), nodes[0]
+    new_state, diff = state.with_updated_nodes(nodes_to_add=[added], nodes_to_remove=[removed.checksum_address])
+    assert diff.nodes_updated == [added.checksum_address]
+    assert diff.nodes_removed == [removed.checksum_address]
+    assert len(new_state) == len(nodes)
+    assert added in new_state and removed not in new_state
+    assert new_state[added.checksum_address] is added
+    assert removed in state and added not in state
+    assert len(state) == len(nodes)
+    assert set(new_state.addresses()) == {node.checksum_address for node in nodes[1:]} | {added.checksum_address}
+
+    # Updated metadata replaces the node
+    updated = FakeNode()
+    updated.checksum_address = nodes[1].checksum_address
+    newer_state, diff = new_state.with_updated_nodes(nodes_to_add=[updated], nodes_to_remove=[])
+    assert newer_state[updated.checksum_address] is updated
+    assert new_state[updated.checksum_address] is nodes[1]
+    assert len(newer_state) == len(new_state)
+
+    # Everything can be removed
+    empty_state, diff = newer_state.with_updated_nodes(nodes_to_add=[], nodes_to_remove=list(newer_state.addresses()))
+    assert len(empty_state) == 0
+    assert not empty_state
+    assert list(empty_state) == []
+    assert empty_state.checksum == FleetState.new().checksum
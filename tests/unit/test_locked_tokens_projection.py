@@ -0,0 +1,94 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from nucypher.blockchain.eth.agents import StakingEscrowAgent
+
+CURRENT_PERIOD = 100
+
+# staker -> [(first period, last period, locked value), ...]
+SUBSTAKES = {
+    'staker_a': [(90, 110, 1000), (101, 101, 5), (101, 130, 300)],
+    'staker_b': [(101, 105, 70), (80, 99, 123456)],  # the latter is already unlocked
+    'staker_c': [(100, 102, 9)],
+}
+
+
+class MockContractFunctions:
+    """Contract functions that just describe the call, resolved by `mock_batch_call`."""
+
+    def __getattr__(self, name):
+        return lambda *args: (name, *args)
+
+
+def mock_batch_call(calls):
+    results = list()
+    for name, staker, *args in calls:
+        if name == 'getSubStakesLength':
+            results.append(len(SUBSTAKES[staker]))
+        elif name == 'getSubStakeInfo':
+            first_period, last_period, locked_value = SUBSTAKES[staker][args[0]]
+            results.append((first_period, 0, 0, locked_value))
+        elif name == 'getLastPeriodOfSubStake':
+            results.append(SUBSTAKES[staker][args[0]][1])
+    return results
+
+
+def locked_tokens_at(offset: int) -> int:
+    """Locked tokens of all stakers at a period offset, as computed by StakingEscrow.getActiveStakers"""
+    period = CURRENT_PERIOD + offset
+    return sum(locked_value
+               for substakes in SUBSTAKES.values()
+               for first_period, last_period, locked_value in substakes
+               if first_period <= period <= last_period)
+
+
+@pytest.fixture()
+def agent():
+    agent = StakingEscrowAgent.__new__(StakingEscrowAgent)
+    agent._EthereumContractAgent__contract = Mock(functions=MockContractFunctions())
+    agent.get_current_period = Mock(return_value=CURRENT_PERIOD)
+    agent.get_all_active_stakers = Mock(return_value=(locked_tokens_at(1), dict.fromkeys(SUBSTAKES, 1)))
+    agent.batch_call = Mock(side_effect=mock_batch_call)
+    return agent
+
+
+def test_locked_tokens_projection(agent):
+    projection = agent.get_all_locked_tokens_projection(periods=40)
+    assert projection == [locked_tokens_at(offset) for offset in range(1, 41)]
+    assert projection[0] == 1000 + 5 + 300 + 70 + 9
+    assert projection[-1] == 0
+
+    # Stakers are enumerated once, only for the next period
+    agent.get_all_active_stakers.assert_called_once_with(periods=1, pagination_size=None)
+    assert agent.batch_call.call_count == 3
+
+    with pytest.raises(ValueError):
+        agent.get_all_locked_tokens_projection(periods=0)
+
+
+def test_locked_tokens_projection_is_cached_per_period(agent):
+    first_projection = agent.get_all_locked_tokens_projection(periods=10)
+    assert agent.get_all_locked_tokens_projection(periods=5) == first_projection[:5]
+    assert agent.get_all_active_stakers.call_count == 1
+
+    agent.get_current_period.return_value = CURRENT_PERIOD + 1
+    agent.get_all_locked_tokens_projection(periods=5)
+    assert agent.get_all_active_stakers.call_count == 2
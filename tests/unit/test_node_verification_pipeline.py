@@ -0,0 +1,109 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import time
+from threading import Event
+
+import pytest
+
+from nucypher.network.verification import NodeVerificationPipeline
+
+
+class FakeNode:
+
+    def __init__(self, checksum_address):
+        self.checksum_address = checksum_address
+
+
+def wait_until(condition, timeout=5):
+    start = time.monotonic()
+    while not condition():
+        if time.monotonic() - start > timeout:
+            raise TimeoutError
+        time.sleep(0.01)
+
+
+def test_nodes_are_bucketed():
+    outcomes = {
+        '0xA': NodeVerificationPipeline.VERIFIED,
+        '0xB': NodeVerificationPipeline.UNREACHABLE,
+        '0xC': NodeVerificationPipeline.NOT_STAKING,
+    }
+
+    def verify(node, force):
+        if node.checksum_address == '0xD':
+            raise RuntimeError("Something unexpected")
+        return outcomes[node.checksum_address]
+
+    pipeline = NodeVerificationPipeline(verify=verify, workers=2)
+    try:
+        for address in ('0xA', '0xB', '0xC', '0xD'):
+            assert pipeline.submit(FakeNode(address))
+        wait_until(lambda: sum(pipeline.metrics().outcomes.values()) == 4)
+    finally:
+        pipeline.stop()
+
+    assert pipeline.buckets == {
+        NodeVerificationPipeline.VERIFIED: {'0xA'},
+        NodeVerificationPipeline.UNREACHABLE: {'0xB'},
+        NodeVerificationPipeline.NOT_STAKING: {'0xC'},
+        NodeVerificationPipeline.INVALID: {'0xD'},
+    }
+    assert pipeline.bucket_of('0xA') == NodeVerificationPipeline.VERIFIED
+    assert pipeline.bucket_of('0xE') is None
+
+    metrics = pipeline.metrics()
+    assert metrics.submitted == 4
+    assert metrics.dropped == 0
+    assert metrics.queue_depth == 0
+    assert metrics.throughput > 0
+
+
+def test_queue_is_bounded():
+    release = Event()
+    started = Event()
+
+    def verify(node, force):
+        started.set()
+        release.wait()
+        return NodeVerificationPipeline.VERIFIED
+
+    pipeline = NodeVerificationPipeline(verify=verify, workers=1, queue_size=2)
+    try:
+        # The first node is taken by the worker, the next two fill the queue.
+        assert pipeline.submit(FakeNode('0x1'))
+        started.wait()
+        assert pipeline.submit(FakeNode('0x2'))
+        assert pipeline.submit(FakeNode('0x3'))
+
+        # Nodes already waiting in the queue are not queued twice
+        assert pipeline.submit(FakeNode('0x3'))
+
+        assert not pipeline.submit(FakeNode('0x4'))
+        metrics = pipeline.metrics()
+        assert metrics.queue_depth == 2
+        assert metrics.dropped == 1
+    finally:
+        release.set()
+        pipeline.stop()
+
+    assert not pipeline.running
+
+
+def test_invalid_number_of_workers():
+    with pytest.raises(ValueError):
+        NodeVerificationPipeline(verify=lambda node, force: NodeVerificationPipeline.VERIFIED, workers=0)
@@ -21,9 +21,10 @@ import json
 import sys
 import time
 import unittest
-from unittest.mock import Mock
+from unittest.mock import MagicMock, Mock
 
 import pytest
+import pytest_twisted
 
 TEST_PREFIX = 'test_prefix'
 
@@ -43,8 +44,14 @@ try:
     from prometheus_client.core import GaugeHistogramMetricFamily, Timestamp
 
     # include dependencies that have sub-dependencies on prometheus
-    from nucypher.utilities.prometheus.collector import BaseMetricsCollector, MetricsCollector
-    from nucypher.utilities.prometheus.metrics import JSONMetricsResource
+    from nucypher.utilities.prometheus.collector import (
+        BaseMetricsCollector,
+        ContractEventsMetricsCollector,
+        EventMetricsCollector,
+        MetricsCollector,
+        WorkerPoolMetricsCollector
+    )
+    from nucypher.utilities.prometheus.metrics import JSONMetricsResource, MetricsCollectionTask
     from nucypher.utilities.prometheus.metrics import PrometheusMetricsConfig
 
     # flag to skip tests
@@ -116,6 +123,195 @@ def test_base_metrics_collector():
     assert collector.collect_internal_run
 
 
+@pytest.mark.skipif(condition=(not PROMETHEUS_INSTALLED), reason="prometheus_client is required for test")
+def test_contract_events_metrics_collector():
+    from eth_utils import to_checksum_address
+    from hexbytes import HexBytes
+    from nucypher.blockchain.eth.events import EventRecord
+
+    staker = '0x' + 'ab' * 20
+
+    def get_logs(event_names, from_block, to_block, **argument_filters):
+        return EventRecord.from_page({'args': {'staker': staker, 'value': block_number},
+                                      'event': event_name,
+                                      'blockNumber': block_number,
+                                      'logIndex': log_index,
+                                      'transactionIndex': 0,
+                                      'transactionHash': HexBytes(block_number.to_bytes(32, 'big')),
+                                      'blockHash': HexBytes(b'\x01' * 32)}
+                                     for block_number in range(from_block, to_block + 1)
+                                     for log_index, event_name in enumerate(event_names))
+
+    agent = Mock(contract_address='0x' + 'cd' * 20, events=MagicMock(logs=Mock(side_effect=get_logs)))
+    agent.events.indexed_inputs.return_value = {'staker': 'address'}
+    agent.blockchain.client.chain_id = 1
+    agent.blockchain.client.block_number = 10
+
+    event_collectors = [EventMetricsCollector(event_name=event_name,
+                                              event_args_config={'value': (Gauge, f'{TEST_PREFIX}_{event_name}', '')},
+                                              argument_filters={'staker': staker},
+                                              contract_agent=agent)
+                        for event_name in ('Minted', 'Slashed', 'Withdrawn')]
+    collector = ContractEventsMetricsCollector(event_collectors=event_collectors)
+    assert all(event_collector.event_index is collector.event_index for event_collector in event_collectors)
+
+    registry = CollectorRegistry()
+    collector.initialize(metrics_prefix=TEST_PREFIX, registry=registry)
+
+    # No new blocks
+    collector.collect()
+    assert agent.events.logs.call_count == 0
+
+    # A single request for all events of the staker, dispatched to each event collector
+    agent.blockchain.client.block_number = 15
+    collector.collect()
+    agent.events.logs.assert_called_once_with(event_names=('Minted', 'Slashed', 'Withdrawn'),
+                                              from_block=10,
+                                              to_block=15,
+                                              staker=to_checksum_address(staker))
+    for event_name in ('Minted', 'Slashed', 'Withdrawn'):
+        assert registry.get_sample_value(f'{TEST_PREFIX}_{event_name}') == 15
+    assert all(event_collector.filter_current_from_block == 16 for event_collector in event_collectors)
+
+    # Processed events are pruned from the index, except for the blocks that may be reorganized
+    event_index = collector.event_index
+    agent.blockchain.client.block_number = 40
+    collector.collect()
+    for event_name in ('Minted', 'Slashed', 'Withdrawn'):
+        assert registry.get_sample_value(f'{TEST_PREFIX}_{event_name}') == 40
+        assert event_index.indexed_range(agent=agent, event_name=event_name, staker=to_checksum_address(staker)) \
+               == (41 - event_index.reorg_depth, 40)
+    events = event_index.events(agent=agent, event_name='Minted', from_block=41 - event_index.reorg_depth, to_block=40,
+                                staker=staker)
+    assert len(events) == event_index.reorg_depth
+    assert agent.events.logs.call_count == 2
+
+    # Collectors must monitor the same contract
+    other_agent = Mock(contract_address='0x' + 'ef' * 20)
+    other_agent.blockchain.client.block_number = 10
+    other_collector = EventMetricsCollector(event_name='Minted',
+                                            event_args_config={},
+                                            argument_filters={},
+                                            contract_agent=other_agent)
+    with pytest.raises(ValueError):
+        ContractEventsMetricsCollector(event_collectors=[*event_collectors, other_collector])
+
+
+@pytest.mark.skipif(condition=(not PROMETHEUS_INSTALLED), reason="prometheus_client is required for test")
+@pytest_twisted.inlineCallbacks
+def test_metrics_collection_task():
+    from threading import Event, get_ident
+    from twisted.internet import reactor
+    from twisted.internet.task import deferLater
+
+    reactor_thread = get_ident()
+    release_slow_collector = Event()
+
+    class TestCollector(BaseMetricsCollector):
+        def __init__(self, collect_function):
+            super().__init__()
+            self.collect_function = collect_function
+            self.collections = 0
+
+        def initialize(self, metrics_prefix: str, registry: CollectorRegistry) -> None:
+            self.metrics = dict(gauge=Gauge(f'{metrics_prefix}_{id(self)}', 'test', registry=registry))
+
+        def _collect_internal(self):
+            assert get_ident() != reactor_thread
+            self.collect_function()
+            self.collections += 1
+            self.metrics['gauge'].set(self.collections)
+
+    def fail():
+        raise RuntimeError('provider unavailable')
+
+    fast_collector = TestCollector(collect_function=lambda: None)
+    failing_collector = TestCollector(collect_function=fail)
+    slow_collector = TestCollector(collect_function=lambda: release_slow_collector.wait(timeout=10))
+
+    registry = CollectorRegistry()
+    collectors = [fast_collector, failing_collector, slow_collector]
+    for collector in collectors:
+        collector.initialize(metrics_prefix=TEST_PREFIX, registry=registry)
+
+    metrics_task = MetricsCollectionTask(metrics_collectors=collectors,
+                                         metrics_prefix=TEST_PREFIX,
+                                         registry=registry,
+                                         collector_timeout=0.5)
+    metrics_task.start(interval=3600)
+    try:
+        yield metrics_task.collect()
+        assert fast_collector.collections == 1
+        assert slow_collector.collections == 0
+
+        def sample(name: str, label: str):
+            return registry.get_sample_value(f'{TEST_PREFIX}_{name}', {'collector': label})
+
+        assert sample('collector_duration_seconds', 'TestCollector') is not None
+        assert sample('collector_failures_total', 'TestCollector_1') == 1
+        assert sample('collector_timeouts_total', 'TestCollector_2') == 1
+
+        # The slow collector is not started again while still running
+        yield metrics_task.collect()
+        assert fast_collector.collections == 2
+        assert sample('collector_failures_total', 'TestCollector_1') == 2
+        assert sample('collector_timeouts_total', 'TestCollector_2') == 1
+
+        # Once it finishes, its metrics are updated and it is collected again
+        release_slow_collector.set()
+        for _ in range(100):
+            if sample('collector_duration_seconds', 'TestCollector_2') is not None:
+                break
+            yield deferLater(reactor, 0.05, lambda: None)
+        assert registry.get_sample_value(f'{TEST_PREFIX}_{id(slow_collector)}') == 1
+        yield metrics_task.collect()
+        assert slow_collector.collections == 2
+    finally:
+        release_slow_collector.set()
+        metrics_task.stop()
+
+
+@pytest.mark.skipif(condition=(not PROMETHEUS_INSTALLED), reason="prometheus_client is required for test")
+def test_worker_pool_metrics_collector():
+    from threading import Event
+    from nucypher.utilities.concurrency import SharedExecutor
+
+    executor = SharedExecutor(max_threads=2)
+    registry = CollectorRegistry()
+    collector = WorkerPoolMetricsCollector(executor=executor)
+    collector.initialize(metrics_prefix=TEST_PREFIX, registry=registry)
+
+    started, release, done = Event(), Event(), Event()
+
+    def blocking_task():
+        started.set()
+        release.wait(timeout=10)
+
+    queue = executor.queue(name='test_pool', max_concurrency=1)
+    queue.submit(blocking_task)
+    queue.submit(done.set)
+    try:
+        assert started.wait(timeout=5)
+        collector.collect()
+        assert registry.get_sample_value(f'{TEST_PREFIX}_worker_pool_pending_tasks', {'pool': 'test_pool'}) == 1
+        assert registry.get_sample_value(f'{TEST_PREFIX}_worker_pool_running_tasks', {'pool': 'test_pool'}) == 1
+        assert registry.get_sample_value(f'{TEST_PREFIX}_worker_pool_threads') == 1
+    finally:
+        release.set()
+    assert done.wait(timeout=5)
+    while queue.running():
+        time.sleep(0.01)
+
+    # Both tasks reported the time they were queued for
+    assert registry.get_sample_value(f'{TEST_PREFIX}_worker_pool_queue_wait_seconds_count', {'pool': 'test_pool'}) == 2
+
+    # Pools that are gone are reported as idle
+    del queue
+    collector.collect()
+    assert registry.get_sample_value(f'{TEST_PREFIX}_worker_pool_pending_tasks', {'pool': 'test_pool'}) == 0
+    assert registry.get_sample_value(f'{TEST_PREFIX}_worker_pool_running_tasks', {'pool': 'test_pool'}) == 0
+
+
 @pytest.mark.skipif(condition=(not PROMETHEUS_INSTALLED), reason="prometheus_client is required for test")
 class TestGenerateJSON(unittest.TestCase):
     def setUp(self):
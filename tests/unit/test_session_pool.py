@@ -0,0 +1,163 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import pytest
+from constant_sorrow.constants import CERTIFICATE_NOT_SAVED, EXEMPT_FROM_VERIFICATION
+
+from nucypher.network.middleware import NucypherMiddlewareClient, SessionPool
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def closed_sessions(mocker):
+    closed = []
+    mocker.patch('requests.Session.close', autospec=True, side_effect=closed.append)
+    return closed
+
+
+def test_sessions_are_reused_per_node():
+    pool = SessionPool()
+    session = pool.get('127.0.0.1:9151', '/certs/node.pem')
+
+    assert pool.get('127.0.0.1:9151', '/certs/node.pem') is session
+
+    # Any difference in host, port or certificate means a different session
+    assert pool.get('127.0.0.1:9152', '/certs/node.pem') is not session
+    assert pool.get('127.0.0.2:9151', '/certs/node.pem') is not session
+    assert pool.get('127.0.0.1:9151', '/certs/another_node.pem') is not session
+    assert pool.get('127.0.0.1:9151', CERTIFICATE_NOT_SAVED) is not session
+    assert len(pool) == 5
+
+
+def test_least_recently_used_session_is_evicted(closed_sessions):
+    pool = SessionPool(max_sessions=2)
+    first = pool.get('127.0.0.1:9151', 'cert')
+    second = pool.get('127.0.0.1:9152', 'cert')
+    pool.get('127.0.0.1:9151', 'cert')  # the first one is now the most recently used
+
+    pool.get('127.0.0.1:9153', 'cert')
+    assert len(pool) == 2
+    assert pool.get('127.0.0.1:9151', 'cert') is first
+    assert pool.get('127.0.0.1:9152', 'cert') is not second
+
+    # Evicted sessions may still be in use by other threads, so they are not closed
+    assert closed_sessions == []
+
+
+def test_idle_sessions_are_evicted(closed_sessions):
+    clock = FakeClock()
+    pool = SessionPool(idle_timeout=10, clock=clock)
+    idle = pool.get('127.0.0.1:9151', 'cert')
+    clock.now = 5
+    active = pool.get('127.0.0.1:9152', 'cert')
+
+    clock.now = 12
+    assert pool.get('127.0.0.1:9152', 'cert') is active
+    assert len(pool) == 1
+    assert pool.get('127.0.0.1:9151', 'cert') is not idle
+    assert closed_sessions == []
+
+
+def test_close(closed_sessions):
+    pool = SessionPool()
+    sessions = [pool.get(f'127.0.0.1:{port}', 'cert') for port in (9151, 9152)]
+    pool.close()
+    assert len(pool) == 0
+    assert closed_sessions == sessions
+
+
+def test_client_uses_pooled_sessions():
+    client = NucypherMiddlewareClient()
+    host, certificate_filepath, http_client = client.parse_node_or_host_and_port(node=None,
+                                                                                 host='127.0.0.1',
+                                                                                 port=9151)
+    assert certificate_filepath is CERTIFICATE_NOT_SAVED
+    assert http_client is client.session_pool.get(host, certificate_filepath)
+
+
+class FakeNode:
+
+    def __init__(self, rest_url: str, certificate_filepath):
+        self._rest_url = rest_url
+        self.certificate_filepath = certificate_filepath
+
+    def rest_url(self):
+        return self._rest_url
+
+
+@pytest.fixture
+def requested_sessions(mocker):
+    """Records the session and the pinned certificate of each request sent by the client."""
+    requests_sent = []
+
+    def invoke_method(self, method, url, *args, **kwargs):
+        requests_sent.append((method.__self__, kwargs['verify']))
+        return mocker.Mock(status_code=200)
+
+    mocker.patch.object(NucypherMiddlewareClient, 'invoke_method', autospec=True, side_effect=invoke_method)
+    return requests_sent
+
+
+def test_pinned_certificate_gets_its_own_session(requested_sessions):
+    client = NucypherMiddlewareClient()
+
+    client.get(path='public_information', node_or_sprout=EXEMPT_FROM_VERIFICATION, host='127.0.0.1', port=9151)
+    client.node_information(host='127.0.0.1', port=9151, certificate_filepath='/certs/node.pem')
+    client.node_information(host='127.0.0.1', port=9151, certificate_filepath='/certs/another_node.pem')
+    client.node_information(host='127.0.0.1', port=9151, certificate_filepath='/certs/node.pem')
+
+    (unpinned, unpinned_cert), (pinned, pinned_cert), (other, other_cert), (pinned_again, _) = requested_sessions
+    assert unpinned_cert is CERTIFICATE_NOT_SAVED
+    assert pinned_cert == '/certs/node.pem'
+    assert other_cert == '/certs/another_node.pem'
+
+    # A connection verified against one certificate is never reused for a request pinned to another one
+    assert len({unpinned, pinned, other}) == 3
+    assert pinned_again is pinned
+    assert pinned is client.session_pool.get('127.0.0.1:9151', '/certs/node.pem')
+
+
+def test_node_session_uses_node_certificate(requested_sessions):
+    client = NucypherMiddlewareClient()
+    node = FakeNode(rest_url='127.0.0.1:9151', certificate_filepath='/certs/node.pem')
+
+    client.get(path='public_information', node_or_sprout=EXEMPT_FROM_VERIFICATION, host='127.0.0.1', port=9151)
+    host, certificate_filepath, http_client = client.parse_node_or_host_and_port(node=node, host=None, port=None)
+    assert certificate_filepath == '/certs/node.pem'
+    assert http_client is client.session_pool.get(host, '/certs/node.pem')
+    assert http_client is not requested_sessions[0][0]
+
+    # The same certificate can be passed explicitly, but not a different one
+    _host, _certificate_filepath, same_client = client.parse_node_or_host_and_port(node=node, host=None, port=None,
+                                                                                   certificate_filepath='/certs/node.pem')
+    assert same_client is http_client
+    with pytest.raises(ValueError):
+        client.parse_node_or_host_and_port(node=node, host=None, port=None,
+                                           certificate_filepath='/certs/another_node.pem')
+
+
+def test_invalid_pool_size():
+    with pytest.raises(ValueError):
+        SessionPool(max_sessions=0)
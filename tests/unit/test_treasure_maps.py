@@ -20,6 +20,7 @@ import os
 
 import pytest
 
+from nucypher.crypto.encryption import BatchEncryptor
 from nucypher.crypto.umbral_adapter import KeyFrag
 from nucypher.policy.hrac import HRAC
 from nucypher.policy.maps import TreasureMap, EncryptedTreasureMap, AuthorizedKeyFrag
@@ -74,6 +75,52 @@ def test_complete_treasure_map_journey(federated_alice, federated_bob, federated
     assert treasure_map.hrac == decrypted_map.hrac
 
 
+def test_construct_treasure_map_in_parallel(federated_alice, federated_bob, federated_ursulas, idle_federated_policy):
+    kfrags = idle_federated_policy.kfrags
+    ursulas = list(federated_ursulas)[:len(kfrags)]
+    hrac = HRAC.derive(publisher_verifying_key=federated_alice.stamp.as_umbral_pubkey(),
+                       bob_verifying_key=federated_bob.stamp.as_umbral_pubkey(),
+                       label=b'parallel')
+
+    def decrypted_kfrags(treasure_map):
+        auth_kfrags = dict()
+        for ursula in ursulas:
+            encrypted_kfrag = treasure_map.destinations[ursula.checksum_address]
+            auth_kfrag_bytes = ursula.verify_from(federated_alice, encrypted_kfrag, decrypt=True)
+            auth_kfrag = AuthorizedKeyFrag.from_bytes(auth_kfrag_bytes)
+            ursula.verify_kfrag_authorization(hrac=hrac,
+                                              author=federated_alice,
+                                              publisher=federated_alice,
+                                              authorized_kfrag=auth_kfrag)
+            auth_kfrags[ursula.checksum_address] = (auth_kfrag.writ, bytes(auth_kfrag.kfrag))
+        return auth_kfrags
+
+    sequential_map = TreasureMap.construct_by_publisher(hrac=hrac,
+                                                        publisher=federated_alice,
+                                                        ursulas=ursulas,
+                                                        verified_kfrags=kfrags,
+                                                        threshold=2)
+
+    encryptor = BatchEncryptor(processes=2, parallel_threshold=1)
+    try:
+        parallel_map = TreasureMap.construct_by_publisher(hrac=hrac,
+                                                          publisher=federated_alice,
+                                                          ursulas=ursulas,
+                                                          verified_kfrags=kfrags,
+                                                          threshold=2,
+                                                          encryptor=encryptor)
+    finally:
+        encryptor.shutdown()
+
+    # Signatures and encryption are randomized, so only the contents can be compared.
+    assert list(parallel_map.destinations) == list(sequential_map.destinations)
+    assert parallel_map.publisher_verifying_key == sequential_map.publisher_verifying_key
+    assert decrypted_kfrags(parallel_map) == decrypted_kfrags(sequential_map)
+
+    deserialized_map = TreasureMap.from_bytes(bytes(parallel_map))
+    assert deserialized_map.destinations == parallel_map.destinations
+
+
 @pytest.mark.skip(reason='Backwards-incompatible with umbral 0.2+')
 def test_treasure_map_versioning(mocker, federated_alice, federated_bob, federated_ursulas, idle_federated_policy):
     # Produced using f04d564a1
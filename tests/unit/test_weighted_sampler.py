@@ -0,0 +1,125 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import random
+from bisect import bisect_right
+from collections import Counter
+from itertools import accumulate, permutations
+
+import pytest
+
+from nucypher.blockchain.eth.agents import StakersReservoir, StakingEscrowAgent, WeightedSampler
+
+
+def linear_sample_no_replacement(weighted_elements, rng, quantity):
+    """The original sampling algorithm, adjusting all the cumulative weights after each draw."""
+    elements, weights = zip(*weighted_elements.items())
+    totals = list(accumulate(weights))
+    samples = []
+    for _ in range(quantity):
+        position = rng.randint(0, totals[-1] - 1)
+        idx = bisect_right(totals, position)
+        samples.append(elements[idx])
+        weight = totals[idx] - (totals[idx - 1] if idx > 0 else 0)
+        for j in range(idx, len(totals)):
+            totals[j] -= weight
+    return samples
+
+
+def probability_reference_no_replacement(weights, idxs):
+    if len(idxs) == 0:
+        return 1
+    weights = list(weights)
+    total = sum(weights)
+    weight = weights[idxs[0]]
+    weights[idxs[0]] = 0
+    return weight / total * probability_reference_no_replacement(weights, idxs[1:])
+
+
+@pytest.mark.parametrize('population', [1, 2, 7, 8, 9, 100, 1000])
+def test_weighted_sampler_matches_linear_sampling(population):
+    rng = random.Random(population)
+    weighted_elements = {f'staker-{i}': rng.choice([0, 1, rng.randint(1, 10**6)]) for i in range(population)}
+    weighted_elements['staker-0'] = 1  # at least one element can be drawn
+    drawable = sum(1 for weight in weighted_elements.values() if weight)
+
+    sampler = WeightedSampler(weighted_elements)
+    for seed in range(10):
+        sampler.reset()
+        samples = sampler.sample_no_replacement(random.Random(seed), drawable)
+        assert samples == linear_sample_no_replacement(weighted_elements, random.Random(seed), drawable)
+        assert len(set(samples)) == drawable
+        assert len(sampler) == population - drawable
+
+
+def test_weighted_sampler_no_replacement_across_draws():
+    weighted_elements = {element: element + 1 for element in range(10)}
+    sampler = WeightedSampler(weighted_elements)
+    rng = random.Random(0)
+
+    first = sampler.sample_no_replacement(rng, 4)
+    second = sampler.sample_no_replacement(rng, 6)
+    assert sorted(first + second) == list(weighted_elements)
+    assert len(sampler) == 0
+    with pytest.raises(ValueError):
+        sampler.sample_no_replacement(rng, 1)
+
+    sampler.reset()
+    assert len(sampler) == 10
+    assert sorted(sampler.sample_no_replacement(rng, 10)) == list(weighted_elements)
+
+
+def test_weighted_sampler_empty():
+    sampler = WeightedSampler({})
+    assert len(sampler) == 0
+    assert sampler.sample_no_replacement(random.Random(0), 0) == []
+    with pytest.raises(ValueError):
+        sampler.sample_no_replacement(random.Random(0), 1)
+
+
+@pytest.mark.parametrize('sample_size', [1, 2, 3])
+def test_weighted_sampler_distribution(sample_size):
+    weights = [1, 9, 100, 2, 18, 70]
+    elements = list(range(len(weights)))
+    weighted_elements = {element: weight for element, weight in zip(elements, weights)}
+
+    # Use a fixed seed to avoid flakyness of the test
+    rng = random.Random(123)
+    sampler = WeightedSampler(weighted_elements)
+
+    counter = Counter()
+    samples = 50000
+    for _ in range(samples):
+        sampler.reset()
+        counter[tuple(sampler.sample_no_replacement(rng, sample_size))] += 1
+
+    for idxs in permutations(elements, sample_size):
+        test_prob = counter[idxs] / samples
+        ref_prob = probability_reference_no_replacement(weights, idxs)
+        assert abs(test_prob - ref_prob) * samples**0.5 < 1
+
+
+def test_stakers_reservoir_reset():
+    stakers = {f'staker-{i}': 10 * i + 1 for i in range(5)}
+    reservoir = StakersReservoir(stakers)
+
+    assert len(reservoir.draw(5)) == 5
+    with pytest.raises(StakingEscrowAgent.NotEnoughStakers):
+        reservoir.draw(1)
+
+    reservoir.reset()
+    assert sorted(reservoir.draw_at_most(10)) == sorted(stakers)
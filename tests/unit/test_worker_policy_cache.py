@@ -0,0 +1,175 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from eth_utils import to_checksum_address
+
+from nucypher.blockchain.eth.actors import Worker
+from nucypher.blockchain.eth.agents import ContractAgency
+from nucypher.policy.hrac import HRAC
+from nucypher.policy.policies import Policy
+from nucypher.types import ArrangementInfo, PolicyInfo
+
+WORKER_ADDRESS = to_checksum_address('0x' + 'ab' * 20)
+OTHER_ADDRESS = to_checksum_address('0x' + 'cd' * 20)
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class WatchingWorker(Worker):
+    """A worker whose policy revocations are being watched, as in a running Ursula."""
+    watching_revocations = True
+
+
+def make_worker(mocker, worker_class=WatchingWorker):
+    """A worker whose agents are mocked, caching policy statuses on a fake clock."""
+    mocker.patch.object(ContractAgency, 'get_agent', side_effect=lambda agent_class, registry: mocker.Mock())
+    clock = FakeClock()
+    mocker.patch.object(worker_class, 'POLICY_STATUS_CLOCK', clock)
+    worker = worker_class(is_me=False, domain=None, registry=mocker.Mock(), checksum_address=WORKER_ADDRESS)
+    worker.clock = clock
+    return worker
+
+
+@pytest.fixture()
+def worker(mocker):
+    return make_worker(mocker)
+
+
+def make_policy_info(disabled: bool = False, days: int = 1) -> PolicyInfo:
+    end_timestamp = int((datetime.utcnow() + timedelta(days=days)).replace(tzinfo=timezone.utc).timestamp())
+    return PolicyInfo(disabled=disabled, sponsor=OTHER_ADDRESS, owner=OTHER_ADDRESS, fee_rate=1,
+                      start_timestamp=0, end_timestamp=end_timestamp)
+
+
+def set_policy_state(worker, arrangement_nodes, policy_info: PolicyInfo = None):
+    policy_agent = worker.policy_agent
+    policy_agent.fetch_policy_arrangements.side_effect = \
+        lambda policy_id: iter([ArrangementInfo(node=node, downtime_index=0, last_refunded_period=0)
+                                for node in arrangement_nodes])
+    policy_agent.fetch_policy.return_value = policy_info or make_policy_info()
+
+
+def test_verify_policy_is_cached(worker):
+    hrac = HRAC(b'\x01' * HRAC.SIZE)
+    set_policy_state(worker, arrangement_nodes=[WORKER_ADDRESS, OTHER_ADDRESS])
+
+    # Repeated checks only go to the blockchain once
+    for _ in range(3):
+        worker.verify_policy(hrac=hrac)
+    assert worker.policy_agent.fetch_policy_arrangements.call_count == 1
+    assert worker.policy_agent.fetch_policy.call_count == 1
+
+    # ... until the status expires
+    worker.clock.now = Worker.POLICY_STATUS_TTL
+    worker.verify_policy(hrac=hrac)
+    assert worker.policy_agent.fetch_policy_arrangements.call_count == 2
+    assert worker.policy_agent.fetch_policy.call_count == 2
+
+    # Expiration of the policy itself is checked on every call, against the cached end
+    set_policy_state(worker, arrangement_nodes=[WORKER_ADDRESS], policy_info=make_policy_info(days=-1))
+    worker.invalidate_policy(hrac)
+    with pytest.raises(Policy.Expired):
+        worker.verify_policy(hrac=hrac)
+
+
+def test_active_policies_are_not_cached_unless_revocations_are_watched(mocker):
+    worker = make_worker(mocker, worker_class=Worker)
+    assert not worker.watching_revocations
+
+    hrac = HRAC(b'\x05' * HRAC.SIZE)
+    set_policy_state(worker, arrangement_nodes=[WORKER_ADDRESS])
+    for _ in range(2):
+        worker.verify_policy(hrac=hrac)
+    assert worker.policy_agent.fetch_policy.call_count == 2
+
+    # A revocation is seen on the next check
+    set_policy_state(worker, arrangement_nodes=[WORKER_ADDRESS], policy_info=make_policy_info(disabled=True))
+    for _ in range(2):
+        with pytest.raises(Policy.Inactive):
+            worker.verify_policy(hrac=hrac)
+
+    # Disabled policies can not be enabled again, so they are still cached
+    assert worker.policy_agent.fetch_policy.call_count == 3
+
+
+@pytest.mark.parametrize('arrangement_nodes, policy_info, error', (
+        ([], None, Policy.Unknown),
+        ([OTHER_ADDRESS], None, Policy.Unpaid),
+        ([WORKER_ADDRESS], make_policy_info(disabled=True), Policy.Inactive),
+))
+def test_invalid_policy_statuses_expire_sooner(worker, arrangement_nodes, policy_info, error):
+    hrac = HRAC(b'\x02' * HRAC.SIZE)
+    set_policy_state(worker, arrangement_nodes=arrangement_nodes, policy_info=policy_info)
+
+    for _ in range(2):
+        with pytest.raises(error):
+            worker.verify_policy(hrac=hrac)
+    assert worker.policy_agent.fetch_policy_arrangements.call_count == 1
+
+    # Once paid (or enabled again), the policy is accepted after the shorter time-to-live
+    set_policy_state(worker, arrangement_nodes=[WORKER_ADDRESS])
+    worker.clock.now = Worker.INVALID_POLICY_STATUS_TTL - 1
+    with pytest.raises(error):
+        worker.verify_policy(hrac=hrac)
+    worker.clock.now = Worker.INVALID_POLICY_STATUS_TTL
+    worker.verify_policy(hrac=hrac)
+    assert worker.policy_agent.fetch_policy_arrangements.call_count == 2
+
+
+def test_revoked_policies_are_invalidated(worker, mocker):
+    revoked_hrac, other_hrac = HRAC(b'\x03' * HRAC.SIZE), HRAC(b'\x04' * HRAC.SIZE)
+    set_policy_state(worker, arrangement_nodes=[WORKER_ADDRESS])
+    worker.verify_policy(hrac=revoked_hrac)
+    worker.verify_policy(hrac=other_hrac)
+
+    client = worker.policy_agent.blockchain.client
+    revocations = [mocker.Mock(args={'policyId': bytes(revoked_hrac)}, raw_event={'event': 'ArrangementRevoked'})]
+    throttler = mocker.patch('nucypher.blockchain.eth.actors.ContractEventsThrottler',
+                             side_effect=lambda agent, event_name, from_block, to_block: revocations)
+
+    # The first call only records where to start from
+    client.block_number = 100
+    worker.invalidate_revoked_policies()
+    assert throttler.call_count == 0
+
+    # Both revocation events are retrieved together; the policy is no longer served from the cache
+    client.block_number = 110
+    worker.invalidate_revoked_policies()
+    throttler.assert_called_once_with(agent=worker.policy_agent,
+                                      event_name=('PolicyRevoked', 'ArrangementRevoked'),
+                                      from_block=101,
+                                      to_block=110)
+
+    set_policy_state(worker, arrangement_nodes=[WORKER_ADDRESS], policy_info=make_policy_info(disabled=True))
+    with pytest.raises(Policy.Inactive):
+        worker.verify_policy(hrac=revoked_hrac)
+    worker.verify_policy(hrac=other_hrac)
+    assert worker.policy_agent.fetch_policy.call_count == 3
+
+    # No new blocks, nothing to look for
+    worker.invalidate_revoked_policies()
+    assert throttler.call_count == 1
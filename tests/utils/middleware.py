@@ -14,6 +14,7 @@ GNU Affero General Public License for more details.
 You should have received a copy of the GNU Affero General Public License
 along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
+import threading
 import time
 import random
 
@@ -64,7 +65,7 @@ class _TestMiddlewareClient(NucypherMiddlewareClient):
              raise BadTestUrsulas(
                 "Can't find an Ursula with port {} - did you spin up the right test ursulas?".format(port))
 
-    def parse_node_or_host_and_port(self, node=None, host=None, port=None):
+    def parse_node_or_host_and_port(self, node=None, host=None, port=None, certificate_filepath=None):
         if node:
             if any((host, port)):
                 raise ValueError("Don't pass host and port if you are passing the node.")
@@ -111,7 +112,8 @@ class MockRestMiddlewareForLargeFleetTests(MockRestMiddleware):
                            node,
                            announce_nodes=None,
                            nodes_i_need=None,
-                           fleet_checksum=None):
+                           fleet_checksum=None,
+                           fleet_summary=None):
         known_nodes_bytestring = node.bytestring_of_known_nodes()
         signature = node.stamp(known_nodes_bytestring)
         r = Response(bytes(signature) + known_nodes_bytestring)
@@ -130,6 +132,28 @@ class SluggishLargeFleetMiddleware(MockRestMiddlewareForLargeFleetTests):
         return result
 
 
+class SluggishReencryptionMiddleware(MockRestMiddleware):
+    """
+    Delays the first ``slow_requests`` reencryption requests by ``delay`` seconds,
+    and records the time each reencryption request was sent at.
+    """
+
+    def __init__(self, slow_requests: int, delay: float, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.slow_requests = slow_requests
+        self.delay = delay
+        self.request_times = []
+        self._lock = threading.Lock()
+
+    def reencrypt(self, *args, **kwargs):
+        with self._lock:
+            slow = len(self.request_times) < self.slow_requests
+            self.request_times.append(time.monotonic())
+        if slow:
+            time.sleep(self.delay)
+        return super().reencrypt(*args, **kwargs)
+
+
 class _MiddlewareClientWithConnectionProblems(_TestMiddlewareClient):
 
     def __init__(self, *args, **kwargs):